@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark POS-aware batch lemmatization against the per-token path.
+
+Compares two ways of lemmatizing the same tokenized corpus with POS tags:
+
+- per-token: tag each sentence separately and call WordNet for every
+  token, mapping Penn tags to WordNet POS on each call (the old
+  lemmatize_with_pos_tags behaviour).
+- batch: Lemmatizer.lemmatize_batch, which tags the whole batch with one
+  tagger instance, maps tags through a precomputed table and serves
+  repeated (token, POS) pairs from the lemma cache.
+
+The batch path is timed from an empty lemma cache (cold), which gives the
+reported speedup, and again with the cache filled by a previous run (warm).
+
+Usage:
+    python scripts/benchmark_lemmatizer.py [--sentences N] [--repeat R]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import nltk
+
+from nlp_pipeline import Lemmatizer, Tokenizer
+
+SAMPLE_TEXT = """
+The cats were sitting on the warm mats while the dogs barked loudly.
+Researchers are running larger experiments and publishing better results.
+She quickly wrote the letters, then walked to the nearest post offices.
+The children played happily in the gardens until the geese flew over.
+Companies were building faster computers and hiring more engineers.
+He had been studying the oldest languages spoken by the ancient peoples.
+"""
+
+
+def build_corpus(tokenizer: Tokenizer, n_sentences: int, seed: int = 42) -> list[list[str]]:
+    """Build a tokenized corpus by sampling sentences from SAMPLE_TEXT."""
+    base = [tokenizer.tokenize_words(line) for line in SAMPLE_TEXT.strip().splitlines()]
+    rng = random.Random(seed)
+    return [list(rng.choice(base)) for _ in range(n_sentences)]
+
+
+def per_token_path(lemmatizer: Lemmatizer, sentences: list[list[str]]) -> list[list[str]]:
+    """Tag per sentence and lemmatize every token through WordNet."""
+    from nltk.corpus import wordnet
+
+    def penn_to_wordnet(tag: str) -> str:
+        if tag.startswith("V"):
+            return wordnet.VERB
+        elif tag.startswith("J"):
+            return wordnet.ADJ
+        elif tag.startswith("R"):
+            return wordnet.ADV
+        return wordnet.NOUN
+
+    wordnet_lemmatizer = lemmatizer._lemmatizer
+    result = []
+    for tokens in sentences:
+        tagged = nltk.pos_tag(tokens)
+        result.append([
+            wordnet_lemmatizer.lemmatize(word.lower(), pos=penn_to_wordnet(tag))
+            for word, tag in tagged
+        ])
+    return result
+
+
+def batch_path(lemmatizer: Lemmatizer, sentences: list[list[str]]) -> list[list[str]]:
+    """Tag the whole batch once and lemmatize through the cache."""
+    return lemmatizer.lemmatize_batch(sentences)
+
+
+def time_it(fn, *args, repeat: int, setup=None) -> tuple[float, list]:
+    """Return the best wall time over `repeat` runs and the last result.
+
+    `setup` is called untimed before every run.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch lemmatization")
+    parser.add_argument(
+        "--sentences",
+        type=int,
+        default=5000,
+        help="Number of sentences in the corpus (default: 5000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timing repetitions, best run is reported (default: 3)",
+    )
+    args = parser.parse_args()
+
+    tokenizer = Tokenizer()
+    sentences = build_corpus(tokenizer, args.sentences)
+    n_tokens = sum(len(s) for s in sentences)
+    print(f"Corpus: {len(sentences)} sentences, {n_tokens} tokens")
+
+    lemmatizer = Lemmatizer()
+    # Warm up WordNet and the tagger so load time is not measured
+    per_token_path(lemmatizer, sentences[:10])
+    batch_path(lemmatizer, sentences[:10])
+
+    per_token_time, expected = time_it(per_token_path, lemmatizer, sentences, repeat=args.repeat)
+    cold_time, actual = time_it(
+        batch_path, lemmatizer, sentences, repeat=args.repeat, setup=lemmatizer.clear_cache
+    )
+    cache_info = lemmatizer.cache_info()
+    warm_time, _ = time_it(batch_path, lemmatizer, sentences, repeat=args.repeat)
+
+    if actual != expected:
+        print("WARNING: batch output differs from per-token output")
+
+    print(f"\n{'path':<14}{'seconds':>10}{'tokens/sec':>14}")
+    for name, elapsed in [
+        ("per-token", per_token_time),
+        ("batch (cold)", cold_time),
+        ("batch (warm)", warm_time),
+    ]:
+        print(f"{name:<14}{elapsed:>10.3f}{n_tokens / elapsed:>14,.0f}")
+    print(f"\nSpeedup (cold cache): {per_token_time / cold_time:.1f}x")
+    print(f"Speedup (warm cache): {per_token_time / warm_time:.1f}x")
+    print(f"Lemma cache after one cold run: {cache_info}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Export a precompiled lemma table from WordNet.
+
+The table maps every (surface form, POS) pair of a vocabulary to its
+WordNet lemma. Pass it to Lemmatizer(lemma_table=...) to skip WordNet
+lookups (and WordNet loading) for every word in the table.
+
+Usage:
+    python scripts/build_lemma_table.py --vocab words.txt --output lemmas.npz
+
+Examples:
+    # From a word list (one word per line)
+    python scripts/build_lemma_table.py --vocab data/vocab.txt --output data/lemmas.npz
+
+    # From the vocabulary of an embeddings file
+    python scripts/build_lemma_table.py --embeddings data/glove.6B.50d.txt \\
+        --format glove --limit 100000 --output data/lemmas.npz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp_pipeline import LemmaTable, WordEmbeddings
+
+
+def read_vocab(path: Path) -> list[str]:
+    """Read one word per line, skipping blank lines."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export a (surface form, POS) -> lemma table from WordNet",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--vocab",
+        type=str,
+        help="Word list file, one word per line",
+    )
+    source.add_argument(
+        "--embeddings",
+        type=str,
+        help="Embeddings file whose vocabulary should be exported",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["word2vec", "glove"],
+        default="word2vec",
+        help="Embeddings format (default: word2vec)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of words to export",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="Output .npz path",
+    )
+    args = parser.parse_args()
+
+    if args.vocab:
+        words = read_vocab(Path(args.vocab))
+    else:
+        embeddings = WordEmbeddings()
+        if args.format == "glove":
+            embeddings.load_glove_format(args.embeddings, limit=args.limit)
+        else:
+            embeddings.load_word2vec_format(args.embeddings, limit=args.limit)
+        words = embeddings.vocab
+
+    if args.limit:
+        words = words[: args.limit]
+
+    print(f"Exporting lemmas for {len(words)} words...")
+    start = time.perf_counter()
+    table = LemmaTable.build(words)
+    path = table.save(args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {len(table)} surface forms to {path} "
+          f"({path.stat().st_size / 1024:.1f} KiB, {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Precompute the dashboard's clusters of an embeddings file.
+
+The clusters are written next to the embeddings, keyed by the file's hash
+and the clustering parameters, where run_dashboard.py finds them at startup.
+
+Usage:
+    python scripts/compute_clusters.py --embeddings path/to/embeddings.txt
+
+    # Whole GloVe vocabulary, same --limit/--clusters as the dashboard
+    python scripts/compute_clusters.py --embeddings path/to/glove.txt \\
+        --format glove --limit 2000000 --clusters 200
+
+    # Recompute even if cached clusters exist
+    python scripts/compute_clusters.py --embeddings path/to/embeddings.txt --force
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp_pipeline import WordEmbeddings
+from nlp_pipeline.dashboard.clusters import (
+    cache_path,
+    compute_clusters,
+    default_n_clusters,
+    save_clusters,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute the dashboard clusters of an embeddings file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument(
+        "--embeddings", "-e",
+        type=str,
+        required=True,
+        help="Path to embeddings file"
+    )
+    parser.add_argument(
+        "--format", "-f",
+        type=str,
+        choices=["word2vec", "glove"],
+        default="word2vec",
+        help="Embeddings format (default: word2vec)"
+    )
+    parser.add_argument(
+        "--limit", "-l",
+        type=int,
+        default=5000,
+        help="Maximum number of words to load, as passed to run_dashboard.py (default: 5000)"
+    )
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=None,
+        help="Number of clusters, as passed to run_dashboard.py (default: from the "
+             "vocabulary size)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if cached clusters exist"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.embeddings)
+    if not path.exists():
+        print(f"Error: Embeddings file not found: {path}")
+        sys.exit(1)
+
+    print(f"Loading embeddings from {path}...")
+    embeddings = WordEmbeddings()
+    if args.format == "glove":
+        embeddings.load_glove_format(path, limit=args.limit)
+    else:
+        embeddings.load_word2vec_format(path, limit=args.limit)
+    print(f"Loaded {embeddings.vocab_size} words ({embeddings.dimension}D)")
+
+    n_words = embeddings.vocab_size
+    n_clusters = min(args.clusters or default_n_clusters(n_words), n_words)
+    output = cache_path(path, n_words, n_clusters)
+    if output.exists() and not args.force:
+        print(f"Clusters already cached at {output} (use --force to recompute)")
+        return
+
+    start = time.perf_counter()
+    clusters = compute_clusters(embeddings, n_clusters)
+    save_clusters(clusters, output)
+    elapsed = time.perf_counter() - start
+    print(f"Clustered {n_words} words into {n_clusters} clusters in {elapsed:.1f}s -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Precompute the dashboard's 2-D projection of an embeddings file.
+
+The projection is written next to the embeddings, keyed by the file's hash
+and the projection parameters, where run_dashboard.py finds it at startup.
+
+Usage:
+    python scripts/compute_projection.py --embeddings path/to/embeddings.txt
+
+    # GloVe file, same --limit as the dashboard will use
+    python scripts/compute_projection.py --embeddings path/to/glove.txt \\
+        --format glove --limit 5000
+
+    # 100k words for the WebGL map (same --limit/--max-words as the dashboard)
+    python scripts/compute_projection.py --embeddings path/to/glove.txt \
+        --format glove --limit 100000 --max-words 100000
+
+    # Recompute even if a cached projection exists
+    python scripts/compute_projection.py --embeddings path/to/embeddings.txt --force
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp_pipeline import WordEmbeddings
+from nlp_pipeline.dashboard.projection import (
+    cache_path,
+    compute_projection,
+    save_projection,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute the dashboard projection of an embeddings file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument(
+        "--embeddings", "-e",
+        type=str,
+        required=True,
+        help="Path to embeddings file"
+    )
+    parser.add_argument(
+        "--format", "-f",
+        type=str,
+        choices=["word2vec", "glove"],
+        default="word2vec",
+        help="Embeddings format (default: word2vec)"
+    )
+    parser.add_argument(
+        "--limit", "-l",
+        type=int,
+        default=5000,
+        help="Maximum number of words to load, as passed to run_dashboard.py (default: 5000)"
+    )
+    parser.add_argument(
+        "--max-words",
+        type=int,
+        default=500,
+        help="Number of words to project (default: 500)"
+    )
+    parser.add_argument(
+        "--method",
+        type=str,
+        choices=["tsne", "pca"],
+        default="tsne",
+        help="Projection method: t-SNE after PCA to 50 dimensions, or PCA only (default: tsne)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if a cached projection exists"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.embeddings)
+    if not path.exists():
+        print(f"Error: Embeddings file not found: {path}")
+        sys.exit(1)
+
+    print(f"Loading embeddings from {path}...")
+    embeddings = WordEmbeddings()
+    if args.format == "glove":
+        embeddings.load_glove_format(path, limit=args.limit)
+    else:
+        embeddings.load_word2vec_format(path, limit=args.limit)
+    print(f"Loaded {embeddings.vocab_size} words ({embeddings.dimension}D)")
+
+    output = cache_path(path, min(args.max_words, embeddings.vocab_size), method=args.method)
+    if output.exists() and not args.force:
+        print(f"Projection already cached at {output} (use --force to recompute)")
+        return
+
+    start = time.perf_counter()
+    df = compute_projection(embeddings, max_words=args.max_words, method=args.method)
+    save_projection(df, output)
+    elapsed = time.perf_counter() - start
+    print(f"Projected {len(df)} words in {elapsed:.1f}s -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Load-test a running GraphQL API server.
+
+Fetches the example queries advertised at the server root (GET /), fires
+them round-robin from concurrent clients and reports throughput and
+latency percentiles per query and overall.
+
+Usage:
+    python scripts/load_test_graphql.py [--url URL] [--requests N] [--concurrency C]
+
+Examples:
+    # Against the default local server
+    python scripts/load_test_graphql.py
+
+    # Heavier run against a multi-worker server
+    python scripts/run_graphql.py --workers 4 --threads 4 &
+    python scripts/load_test_graphql.py --requests 5000 --concurrency 32
+
+    # Only some of the example queries
+    python scripts/load_test_graphql.py --query most_similar --query analogy
+
+The client is plain urllib in a thread pool, so at very high request
+rates it can become the bottleneck; run it from another machine (or
+several processes) to measure the server's ceiling.
+"""
+
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def fetch_example_queries(url: str, timeout: float) -> dict[str, str]:
+    """Get the example queries from the API index."""
+    with urllib.request.urlopen(url.rstrip("/") + "/", timeout=timeout) as response:
+        return json.load(response)["example_queries"]
+
+
+def run_query(endpoint: str, query: str, timeout: float) -> tuple[float, bool]:
+    """POST one query and time it.
+
+    Returns:
+        Tuple of (latency in seconds, whether the request succeeded).
+    """
+    body = json.dumps({"query": query}).encode("utf-8")
+    request = urllib.request.Request(
+        endpoint, data=body, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, TimeoutError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def print_row(name: str, latencies: list[float], errors: int, elapsed: float) -> None:
+    """Print one result line."""
+    ms = np.asarray(latencies) * 1000
+    print(f"{name:<16} {len(latencies):>8} {errors:>7} {len(latencies) / elapsed:>10.1f} "
+          f"{np.percentile(ms, 50):>9.2f} {np.percentile(ms, 99):>9.2f} {ms.max():>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the GraphQL API with its example queries",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:8081",
+        help="Server base URL (default: http://localhost:8081)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="Total number of requests (default: 2000)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Concurrent clients (default: 16)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=50,
+        help="Untimed requests sent first (default: 50)",
+    )
+    parser.add_argument(
+        "--query",
+        action="append",
+        default=None,
+        help="Example query name to include (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Per-request timeout in seconds (default: 30)",
+    )
+    args = parser.parse_args()
+
+    examples = fetch_example_queries(args.url, args.timeout)
+    if args.query:
+        unknown = set(args.query) - set(examples)
+        if unknown:
+            parser.error(f"unknown queries {sorted(unknown)}; choose from {sorted(examples)}")
+        examples = {name: examples[name] for name in args.query}
+
+    names = list(examples)
+    schedule = [names[i % len(names)] for i in range(args.requests)]
+    endpoint = args.url.rstrip("/") + "/graphql"
+
+    def task(name: str) -> tuple[str, float, bool]:
+        latency, ok = run_query(endpoint, examples[name], args.timeout)
+        return name, latency, ok
+
+    print(f"Target:      {endpoint}")
+    print(f"Queries:     {', '.join(names)}")
+    print(f"Requests:    {args.requests} ({args.concurrency} concurrent)")
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(task, [names[i % len(names)] for i in range(args.warmup)]))
+
+        start = time.perf_counter()
+        results = list(pool.map(task, schedule))
+        elapsed = time.perf_counter() - start
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    for name, latency, ok in results:
+        latencies[name].append(latency)
+        if not ok:
+            errors[name] += 1
+
+    print()
+    print(f"{'query':<16} {'requests':>8} {'errors':>7} {'req/s':>10} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name in names:
+        print_row(name, latencies[name], errors[name], elapsed)
+    print_row("total", [lat for _, lat, _ in results], sum(errors.values()), elapsed)
+
+
+if __name__ == "__main__":
+    main()
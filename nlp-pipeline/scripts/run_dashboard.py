@@ -12,6 +12,14 @@ Usage:
 
     # With GloVe embeddings:
     python scripts/run_dashboard.py --embeddings path/to/glove.txt --format glove
+
+    # Map 100k words (precompute the projection first, see below):
+    python scripts/run_dashboard.py --embeddings path/to/glove.txt --format glove \
+        --limit 100000 --max-words 100000
+
+The 2-D projection and the clusters are cached next to the embeddings file
+after the first launch. Compute them ahead of time with
+scripts/compute_projection.py and scripts/compute_clusters.py.
 """
 
 import argparse
@@ -49,6 +57,26 @@ def main():
         default=5000,
         help="Maximum number of words to load (default: 5000)"
     )
+    parser.add_argument(
+        "--max-words",
+        type=int,
+        default=500,
+        help="Number of words shown on the embedding map (default: 500)"
+    )
+    parser.add_argument(
+        "--method",
+        type=str,
+        choices=["tsne", "pca"],
+        default="tsne",
+        help="Projection method of the embedding map (default: tsne)"
+    )
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=None,
+        help="Number of clusters of the cluster overview (default: from the vocabulary "
+             "size, 0 to disable)"
+    )
     parser.add_argument(
         "--port", "-p",
         type=int,
@@ -64,6 +92,7 @@ def main():
     args = parser.parse_args()
 
     embeddings = None
+    path = None
 
     if args.embeddings:
         path = Path(args.embeddings)
@@ -85,7 +114,15 @@ def main():
         print("Tip: Use --embeddings to load your own Word2Vec or GloVe file")
 
     print()
-    run_dashboard(embeddings, debug=not args.no_debug, port=args.port)
+    run_dashboard(
+        embeddings,
+        debug=not args.no_debug,
+        port=args.port,
+        embeddings_path=path,
+        max_words=args.max_words,
+        method=args.method,
+        n_clusters=args.clusters,
+    )
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 """Run the GraphQL API server.
 
 Usage:
-    python scripts/run_graphql.py [--port PORT] [--embeddings PATH]
+    python scripts/run_graphql.py [--port PORT] [--embeddings PATH] [--workers N]
 
 Examples:
     # Run with sample embeddings
@@ -13,10 +13,38 @@ Examples:
 
     # Run on different port
     python scripts/run_graphql.py --port 8080
+
+    # Convert embeddings to the native format (fast, memory-mappable)
+    python scripts/run_graphql.py --embeddings data/glove.6B.50d.txt \
+        --export data/glove-native
+
+    # Production: 4 pre-forked workers x 4 threads sharing one mmap'd matrix
+    python scripts/run_graphql.py --embeddings data/glove-native --mmap \
+        --workers 4 --threads 4
+
+    # Async (ASGI) server: heavy similarity scans run on a bounded thread
+    # pool, cheap queries never wait behind them (requires uvicorn)
+    python scripts/run_graphql.py --asgi --executor-workers 4 --query-timeout 5
+
+    # Reload embeddings without dropping requests
+    kill -HUP <master pid>
+
+    # Single-process servers: reload in the background through the admin API
+    GRAPHQL_ADMIN_TOKEN=secret python scripts/run_graphql.py --embeddings data/glove-native --mmap
+    curl -X POST -H "Authorization: Bearer secret" -d '{"path": "data/glove-v2"}' \
+        http://localhost:8081/admin/reload
+
+    # Serve extra named models, selected with the model argument of every
+    # field; idle models are unloaded when over 512 MB
+    python scripts/run_graphql.py --embeddings data/glove-native --mmap \
+        --model news=data/news-native --model wiki=data/wiki-native \
+        --model-memory-budget 512
 """
 
 import argparse
+import os
 import sys
+from functools import partial
 from pathlib import Path
 
 # Add src to path for development
@@ -24,6 +52,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from nlp_pipeline.embeddings import WordEmbeddings
 from nlp_pipeline.graphql import create_app
+from nlp_pipeline.graphql.registry import ModelRegistry
+from nlp_pipeline.graphql.reload import EmbeddingsReloader
+
+
+def create_registry(args: argparse.Namespace) -> ModelRegistry:
+    """Create the registry of named models given with --model."""
+    budget = args.model_memory_budget
+    registry = ModelRegistry(int(budget * 1024 * 1024) if budget is not None else None)
+    for spec in args.model:
+        name, sep, path = spec.partition("=")
+        if not sep or not name or not path:
+            raise SystemExit(f"--model expects NAME=PATH, got '{spec}'")
+        try:
+            # Memory-mapped, so forked workers share each model's matrix
+            registry.register(name, path)
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+    if args.preload_models:
+        registry.preload()
+    print(f"Models: {', '.join(registry.names)}")
+    return registry
 
 
 def create_sample_embeddings() -> WordEmbeddings:
@@ -61,12 +110,14 @@ def create_sample_embeddings() -> WordEmbeddings:
     return embeddings
 
 
-def load_embeddings(path: str) -> WordEmbeddings:
-    """Load embeddings from file."""
+def load_embeddings(path: str, mmap: bool = False) -> WordEmbeddings:
+    """Load embeddings from a text file or a native-format directory."""
     embeddings = WordEmbeddings()
     path_obj = Path(path)
 
-    if path_obj.suffix in (".txt", ".vec"):
+    if path_obj.is_dir():
+        embeddings = WordEmbeddings.load(path_obj, mmap=mmap)
+    elif path_obj.suffix in (".txt", ".vec"):
         # Try Word2Vec format first (has header)
         try:
             embeddings.load_word2vec_format(path, limit=50000)
@@ -80,6 +131,18 @@ def load_embeddings(path: str) -> WordEmbeddings:
     return embeddings
 
 
+def load_and_report(path: str | None, mmap: bool = False) -> WordEmbeddings:
+    """Load the requested embeddings (or the samples) and print a summary."""
+    if path:
+        print(f"Loading embeddings from {path}...")
+        embeddings = load_embeddings(path, mmap=mmap)
+        print(f"Loaded {embeddings.vocab_size} words, {embeddings.dimension} dimensions")
+    else:
+        print("Using sample embeddings (23 words, 5 dimensions)")
+        embeddings = create_sample_embeddings()
+    return embeddings
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run GraphQL API server")
     parser.add_argument(
@@ -94,24 +157,225 @@ def main():
         default=None,
         help="Path to embeddings file (default: use sample embeddings)",
     )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map native-format embeddings instead of reading them",
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Save the loaded embeddings in native format to DIR and exit",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=1000,
+        help="Maximum operations per batched POST (default: 1000)",
+    )
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=0,
+        help="Threads executing chunks of large batches in parallel (default: 0)",
+    )
+    parser.add_argument(
+        "--max-query-cost",
+        type=int,
+        default=10_000,
+        help="Maximum estimated cost per operation; 0 disables cost analysis (default: 10000)",
+    )
+    parser.add_argument(
+        "--client-cost-rate",
+        type=float,
+        default=None,
+        help="Cost units per second each client may spend (default: unlimited)",
+    )
+    parser.add_argument(
+        "--client-cost-burst",
+        type=int,
+        default=None,
+        help="Cost units a client may spend at once (default: --max-request-cost)",
+    )
+    parser.add_argument(
+        "--max-request-cost",
+        type=int,
+        default=None,
+        help="Maximum summed cost of a batched POST (default: --max-query-cost)",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Do not collect metrics or serve /metrics",
+    )
+    parser.add_argument(
+        "--slow-query-seconds",
+        type=float,
+        default=None,
+        help="Log operations slower than this many seconds (default: off)",
+    )
+    parser.add_argument(
+        "--admin-token",
+        type=str,
+        default=os.environ.get("GRAPHQL_ADMIN_TOKEN"),
+        help="Token enabling the /admin endpoints (default: $GRAPHQL_ADMIN_TOKEN)",
+    )
+    parser.add_argument(
+        "--model",
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="Serve a native-format model under NAME (repeatable)",
+    )
+    parser.add_argument(
+        "--model-memory-budget",
+        type=float,
+        default=None,
+        help="Unload idle models when loaded models exceed this many MB (default: never)",
+    )
+    parser.add_argument(
+        "--preload-models",
+        action="store_true",
+        help="Load every --model at startup instead of on first use",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
         help="Run in debug mode",
     )
+    asgi = parser.add_argument_group("async server (requires uvicorn)")
+    asgi.add_argument(
+        "--asgi",
+        action="store_true",
+        help="Serve the ASGI app instead of the Flask app",
+    )
+    asgi.add_argument(
+        "--executor-workers",
+        type=int,
+        default=4,
+        help="Threads computing similarity batches (default: 4)",
+    )
+    asgi.add_argument(
+        "--max-pending",
+        type=int,
+        default=64,
+        help="Similarity batches allowed in flight before answering 503 (default: 64)",
+    )
+    asgi.add_argument(
+        "--query-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds an operation may run before answering 504 (default: 10)",
+    )
+    server = parser.add_argument_group("production server (requires gunicorn)")
+    server.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Pre-forked worker processes; 0 runs the Flask dev server (default: 0)",
+    )
+    server.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Threads per worker (default: 1)",
+    )
+    server.add_argument(
+        "--timeout",
+        type=int,
+        default=30,
+        help="Seconds before a hung worker is restarted (default: 30)",
+    )
+    server.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="Seconds workers get to finish requests on reload (default: 30)",
+    )
+    server.add_argument(
+        "--max-requests",
+        type=int,
+        default=0,
+        help="Recycle a worker after this many requests (default: 0, never)",
+    )
     args = parser.parse_args()
 
-    # Load embeddings
-    if args.embeddings:
-        print(f"Loading embeddings from {args.embeddings}...")
-        embeddings = load_embeddings(args.embeddings)
-        print(f"Loaded {embeddings.vocab_size} words, {embeddings.dimension} dimensions")
+    if args.export:
+        embeddings = load_and_report(args.embeddings)
+        path = embeddings.save(args.export)
+        print(f"Saved native-format embeddings to {path}")
+        return
+
+    cost_options = {
+        "max_query_cost": args.max_query_cost or None,
+        "client_cost_rate": args.client_cost_rate,
+        "client_cost_burst": args.client_cost_burst,
+        "max_request_cost": args.max_request_cost,
+        "metrics": not args.no_metrics,
+        "slow_query_seconds": args.slow_query_seconds,
+        "admin_token": args.admin_token,
+    }
+    if args.model:
+        cost_options["registry"] = create_registry(args)
+    if args.asgi:
+        app_options = {
+            "max_batch_size": args.max_batch_size,
+            "max_workers": args.executor_workers,
+            "max_pending": args.max_pending,
+            "timeout": args.query_timeout,
+            **cost_options,
+        }
     else:
-        print("Using sample embeddings (23 words, 5 dimensions)")
-        embeddings = create_sample_embeddings()
+        app_options = {
+            "max_batch_size": args.max_batch_size,
+            "batch_workers": args.batch_workers,
+            **cost_options,
+        }
+
+    if args.workers > 0:
+        from nlp_pipeline.graphql.server import serve
+
+        # A reload in one worker would not reach the others; the master
+        # reloads all of them on SIGHUP instead
+        if args.admin_token:
+            print("Admin reload is disabled with --workers; send SIGHUP to the master")
+
+        print(f"Starting {args.workers} workers x {args.threads} threads "
+              f"on http://0.0.0.0:{args.port}/graphql")
+        serve(
+            partial(load_and_report, args.embeddings, mmap=args.mmap),
+            port=args.port,
+            workers=args.workers,
+            threads=args.threads,
+            timeout=args.timeout,
+            graceful_timeout=args.graceful_timeout,
+            max_requests=args.max_requests,
+            app_options=app_options,
+            asgi=args.asgi,
+        )
+        return
+
+    # Reload from the given path, or the startup embeddings by default
+    app_options["reloader"] = EmbeddingsReloader(
+        lambda path: load_and_report(path or args.embeddings, mmap=args.mmap)
+    )
+
+    if args.asgi:
+        import uvicorn
+
+        from nlp_pipeline.graphql.asgi import create_asgi_app
+
+        embeddings = load_and_report(args.embeddings, mmap=args.mmap)
+        app = create_asgi_app(embeddings, **app_options)
+        print(f"\nAsync GraphQL API running at http://localhost:{args.port}/graphql")
+        uvicorn.run(app, host="0.0.0.0", port=args.port)
+        return
 
     # Create and run app
-    app = create_app(embeddings)
+    embeddings = load_and_report(args.embeddings, mmap=args.mmap)
+    app = create_app(embeddings, **app_options)
     print(f"\nGraphQL API running at http://localhost:{args.port}/graphql")
     print(f"GraphiQL interface at http://localhost:{args.port}/graphql")
     print("\nExample queries:")
@@ -1,19 +1,28 @@
 """NLP Pipeline - Text preprocessing and embedding utilities."""
 
+from nlp_pipeline.cache import PipelineCache
 from nlp_pipeline.classifier import EmbeddingClassifier, NaiveBayesClassifier
 from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.lemma_table import LemmaTable
 from nlp_pipeline.lemmatizer import Lemmatizer
 from nlp_pipeline.pipeline import Pipeline
+from nlp_pipeline.results import ResultStore
 from nlp_pipeline.stemmer import Stemmer
 from nlp_pipeline.stopwords import StopwordRemover
 from nlp_pipeline.tokenizer import Tokenizer
+from nlp_pipeline.vocabulary import TokenIds, Vocabulary
 
 __all__ = [
     "Tokenizer",
     "StopwordRemover",
     "Stemmer",
     "Lemmatizer",
+    "LemmaTable",
     "Pipeline",
+    "PipelineCache",
+    "ResultStore",
+    "Vocabulary",
+    "TokenIds",
     "WordEmbeddings",
     "NaiveBayesClassifier",
     "EmbeddingClassifier",
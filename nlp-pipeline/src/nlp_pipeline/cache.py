@@ -0,0 +1,200 @@
+"""Content-addressed cache for preprocessed text."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_BATCH = 500
+
+
+class PipelineCache:
+    """Two-tier cache of processed token lists.
+
+    Entries are keyed by a SHA-256 hash of the pipeline configuration and
+    the input text, so a cache can be shared between pipelines and a
+    configuration change never returns stale tokens. The first tier is an
+    in-memory LRU; the optional second tier is a SQLite file that survives
+    restarts, so re-running an experiment skips preprocessing for texts it
+    has already seen.
+    """
+
+    def __init__(self, maxsize: int = 10_000, path: str | Path | None = None):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept in memory.
+            path: SQLite file for the on-disk tier. Memory only if None.
+        """
+        self.maxsize = maxsize
+        self.path = Path(path) if path is not None else None
+
+        self._memory: OrderedDict[str, list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tokens "
+                "(key TEXT PRIMARY KEY, tokens TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def namespace(config: dict) -> str:
+        """Serialize a pipeline configuration for use in cache keys."""
+        return json.dumps(config, sort_keys=True)
+
+    @staticmethod
+    def make_key(text: str, namespace: str) -> str:
+        """Hash a text together with its pipeline namespace.
+
+        Args:
+            text: Input text.
+            namespace: Serialized pipeline configuration.
+
+        Returns:
+            Hex digest cache key.
+        """
+        digest = hashlib.sha256(namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[str] | None:
+        """Look up one entry.
+
+        Args:
+            key: Cache key from make_key().
+
+        Returns:
+            Copy of the cached token list, or None on a miss.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[str]]:
+        """Look up several entries, hitting the disk tier once per batch.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Mapping of found keys to copies of their token lists.
+        """
+        found: dict[str, list[str]] = {}
+        missing: list[str] = []
+        with self._lock:
+            for key in keys:
+                tokens = self._memory.get(key)
+                if tokens is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = list(tokens)
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if self._db is not None and missing:
+                unique = list(dict.fromkeys(missing))
+                for i in range(0, len(unique), _SQLITE_BATCH):
+                    chunk = unique[i : i + _SQLITE_BATCH]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, tokens FROM tokens WHERE key IN ({placeholders})",
+                        chunk,
+                    )
+                    for key, data in rows:
+                        tokens = json.loads(data)
+                        self._remember(key, tokens)
+                        found[key] = list(tokens)
+
+                disk_found = sum(1 for key in missing if key in found)
+                self.disk_hits += disk_found
+                self.misses += len(missing) - disk_found
+            else:
+                self.misses += len(missing)
+
+        return found
+
+    def put(self, key: str, tokens: list[str]) -> None:
+        """Store one entry in both tiers.
+
+        Args:
+            key: Cache key from make_key().
+            tokens: Processed token list.
+        """
+        self.put_many({key: tokens})
+
+    def put_many(self, entries: dict[str, list[str]]) -> None:
+        """Store several entries, writing the disk tier in one transaction.
+
+        Args:
+            entries: Mapping of cache keys to token lists.
+        """
+        if not entries:
+            return
+        with self._lock:
+            for key, tokens in entries.items():
+                self._remember(key, list(tokens))
+
+            if self._db is not None:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tokens (key, tokens) VALUES (?, ?)",
+                    [(key, json.dumps(tokens)) for key, tokens in entries.items()],
+                )
+                self._db.execute("COMMIT")
+
+    def _remember(self, key: str, tokens: list[str]) -> None:
+        """Insert into the memory tier, evicting least recently used."""
+        if self.maxsize <= 0:
+            return
+        self._memory[key] = tokens
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM tokens")
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and tier sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+    def __len__(self) -> int:
+        """Get number of entries in the memory tier."""
+        return len(self._memory)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        tier = f", path={str(self.path)!r}" if self.path is not None else ""
+        return f"PipelineCache(maxsize={self.maxsize}{tier})"
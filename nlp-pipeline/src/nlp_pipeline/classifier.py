@@ -7,12 +7,16 @@ import numpy as np
 
 from nlp_pipeline.embeddings import WordEmbeddings
 from nlp_pipeline.pipeline import Pipeline
+from nlp_pipeline.vocabulary import Vocabulary
 
 
 class NaiveBayesClassifier:
     """Multinomial Naive Bayes text classifier.
 
     Uses bag-of-words representation with optional preprocessing pipeline.
+    Training fits the pipeline's vocabulary and works on its int32 token
+    ids, so word counts and log-probabilities are dense numpy arrays
+    indexed by token id.
     """
 
     def __init__(
@@ -24,6 +28,7 @@ class NaiveBayesClassifier:
 
         Args:
             pipeline: Preprocessing pipeline. If None, uses default.
+                fit() builds this pipeline's vocabulary.
             alpha: Smoothing parameter (Laplace smoothing).
         """
         self.pipeline = pipeline or Pipeline()
@@ -31,9 +36,10 @@ class NaiveBayesClassifier:
 
         # Learned parameters
         self._classes: list[str] = []
-        self._class_priors: dict[str, float] = {}
-        self._word_probs: dict[str, dict[str, float]] = {}
-        self._vocab: set[str] = set()
+        self._vocabulary: Vocabulary | None = None
+        self._log_priors: np.ndarray = np.zeros(0)
+        # (n_classes, vocab_size) log P(word|class); column 0 (unknown) is 0
+        self._log_word_probs: np.ndarray = np.zeros((0, 0))
 
     def fit(self, texts: list[str], labels: list[str]) -> "NaiveBayesClassifier":
         """Train the classifier.
@@ -48,48 +54,50 @@ class NaiveBayesClassifier:
         if len(texts) != len(labels):
             raise ValueError("texts and labels must have same length")
 
-        # Preprocess all texts
-        processed = [self.pipeline.process(text) for text in texts]
-
-        # Build vocabulary
-        self._vocab = set()
-        for tokens in processed:
-            self._vocab.update(tokens)
+        # Preprocess all texts and build vocabulary
+        encoded = self.pipeline.fit_transform(texts, output="ids")
+        self._vocabulary = self.pipeline.vocabulary
+        vocab_size = len(self._vocabulary)
 
         # Count classes
         class_counts = Counter(labels)
         self._classes = list(class_counts.keys())
-        total_docs = len(labels)
+        class_index = {cls: i for i, cls in enumerate(self._classes)}
+        n_classes = len(self._classes)
 
         # Calculate class priors: P(class)
-        self._class_priors = {
-            cls: count / total_docs for cls, count in class_counts.items()
-        }
+        counts = np.array([class_counts[cls] for cls in self._classes], dtype=np.float64)
+        self._log_priors = np.log(counts / len(labels))
 
         # Count word occurrences per class
-        word_counts: dict[str, Counter] = defaultdict(Counter)
-        class_word_totals: dict[str, int] = defaultdict(int)
-
-        for tokens, label in zip(processed, labels):
-            for token in tokens:
-                word_counts[label][token] += 1
-                class_word_totals[label] += 1
+        doc_classes = np.array([class_index[label] for label in labels], dtype=np.int64)
+        token_classes = np.repeat(doc_classes, encoded.lengths)
+        word_counts = np.bincount(
+            token_classes * vocab_size + encoded.ids,
+            minlength=n_classes * vocab_size,
+        ).reshape(n_classes, vocab_size).astype(np.float64)
+        word_counts[:, 0] = 0  # unknown tokens don't count
 
         # Calculate word probabilities with Laplace smoothing: P(word|class)
-        vocab_size = len(self._vocab)
-        self._word_probs = {}
-
-        for cls in self._classes:
-            self._word_probs[cls] = {}
-            total = class_word_totals[cls]
-            for word in self._vocab:
-                count = word_counts[cls][word]
-                # Laplace smoothing
-                prob = (count + self.alpha) / (total + self.alpha * vocab_size)
-                self._word_probs[cls][word] = prob
+        n_words = vocab_size - 1
+        totals = word_counts.sum(axis=1, keepdims=True)
+        self._log_word_probs = np.log(
+            (word_counts + self.alpha) / (totals + self.alpha * n_words)
+        )
+        # Words not in vocab are ignored (could use unknown word prob)
+        self._log_word_probs[:, 0] = 0.0
 
         return self
 
+    def _log_scores(self, texts: list[str]) -> np.ndarray:
+        """Get unnormalized log posteriors, shape (n_texts, n_classes)."""
+        encoded = self._vocabulary.encode_batch(self.pipeline.process_batch(texts))
+        # Per-document sums of token log-probs via cumulative sums at offsets
+        cumulative = np.zeros((len(self._classes), len(encoded.ids) + 1))
+        np.cumsum(self._log_word_probs[:, encoded.ids], axis=1, out=cumulative[:, 1:])
+        doc_scores = cumulative[:, encoded.offsets[1:]] - cumulative[:, encoded.offsets[:-1]]
+        return (doc_scores + self._log_priors[:, None]).T
+
     def predict(self, texts: list[str]) -> list[str]:
         """Predict labels for texts.
 
@@ -99,30 +107,10 @@ class NaiveBayesClassifier:
         Returns:
             Predicted labels.
         """
-        return [self._predict_one(text) for text in texts]
-
-    def _predict_one(self, text: str) -> str:
-        """Predict label for a single text."""
-        tokens = self.pipeline.process(text)
-
-        best_class = self._classes[0]
-        best_score = float("-inf")
-
-        for cls in self._classes:
-            # Start with log prior
-            score = np.log(self._class_priors[cls])
-
-            # Add log probabilities for each word
-            for token in tokens:
-                if token in self._vocab:
-                    score += np.log(self._word_probs[cls][token])
-                # Words not in vocab are ignored (could use unknown word prob)
-
-            if score > best_score:
-                best_score = score
-                best_class = cls
-
-        return best_class
+        if not texts:
+            return []
+        best = np.argmax(self._log_scores(texts), axis=1)
+        return [self._classes[i] for i in best]
 
     def predict_proba(self, texts: list[str]) -> list[dict[str, float]]:
         """Predict class probabilities for texts.
@@ -133,26 +121,17 @@ class NaiveBayesClassifier:
         Returns:
             List of {class: probability} dictionaries.
         """
-        return [self._predict_proba_one(text) for text in texts]
-
-    def _predict_proba_one(self, text: str) -> dict[str, float]:
-        """Predict class probabilities for a single text."""
-        tokens = self.pipeline.process(text)
-
-        log_scores = {}
-        for cls in self._classes:
-            score = np.log(self._class_priors[cls])
-            for token in tokens:
-                if token in self._vocab:
-                    score += np.log(self._word_probs[cls][token])
-            log_scores[cls] = score
+        if not texts:
+            return []
+        log_scores = self._log_scores(texts)
 
         # Convert log scores to probabilities using log-sum-exp trick
-        max_score = max(log_scores.values())
-        exp_scores = {cls: np.exp(score - max_score) for cls, score in log_scores.items()}
-        total = sum(exp_scores.values())
+        exp_scores = np.exp(log_scores - log_scores.max(axis=1, keepdims=True))
+        probs = exp_scores / exp_scores.sum(axis=1, keepdims=True)
 
-        return {cls: score / total for cls, score in exp_scores.items()}
+        return [
+            {cls: float(p) for cls, p in zip(self._classes, row)} for row in probs
+        ]
 
     def score(self, texts: list[str], labels: list[str]) -> float:
         """Calculate accuracy on test data.
@@ -176,7 +155,7 @@ class NaiveBayesClassifier:
     @property
     def vocab_size(self) -> int:
         """Get vocabulary size."""
-        return len(self._vocab)
+        return len(self._vocabulary) - 1 if self._vocabulary is not None else 0
 
 
 class EmbeddingClassifier:
@@ -1,20 +1,63 @@
 """Main Dash application for NLP Pipeline visualization."""
 
+from collections.abc import Callable
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, Input, Output, State, dcc, html
-from sklearn.manifold import TSNE
+from dash import Dash, Input, Output, Patch, State, ctx, dcc, html, no_update
 
+from nlp_pipeline.dashboard.clusters import Clusters, get_clusters, project_centroids
+from nlp_pipeline.dashboard.explore import empty_graph, expand
+from nlp_pipeline.dashboard.jobs import Job, JobRunner, scan_neighbors
+from nlp_pipeline.dashboard.projection import compute_projection, get_projection
 from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.results import ResultStore, default_store
+
+# Most words labeled at once; zooming in reveals the labels of rarer words
+MAX_LABELS = 150
+
+# How often the browser polls a running job
+POLL_INTERVAL_MS = 250
+
+# Cluster members listed per page of the cluster overview
+MEMBERS_PAGE = 100
 
 
-def create_app(embeddings: WordEmbeddings | None = None) -> Dash:
+def create_app(
+    embeddings: WordEmbeddings | None = None,
+    embeddings_path: str | Path | None = None,
+    projection: pd.DataFrame | None = None,
+    max_words: int = 500,
+    method: str = "tsne",
+    jobs: JobRunner | None = None,
+    store: ResultStore | None = default_store,
+    clusters: Clusters | None = None,
+    n_clusters: int | None = None,
+) -> Dash:
     """Create the Dash application.
 
     Args:
         embeddings: Pre-loaded word embeddings. If None, uses sample data.
+        embeddings_path: File the embeddings were loaded from. If given, the
+            2-D projection is read from (or written to) the cache next to
+            it instead of being computed on every launch.
+        projection: Precomputed projection ("word", "x", "y" columns).
+            Takes precedence over embeddings_path.
+        max_words: Number of words to project. The map is rendered with
+            WebGL, so 100k words stay interactive.
+        method: Projection method, "tsne" or "pca" (see
+            nlp_pipeline.dashboard.projection.compute_projection).
+        jobs: Runner for similarity searches and analogies. Defaults to a
+            new JobRunner with two workers.
+        store: Nearest-neighbor results shared with the GraphQL API. None
+            disables result caching.
+        clusters: Precomputed clusters of the vocabulary. Takes precedence
+            over n_clusters.
+        n_clusters: Number of clusters of the cluster overview, computed
+            over the whole vocabulary (cached next to embeddings_path).
+            None chooses it from the vocabulary size; 0 hides the overview.
 
     Returns:
         Configured Dash application.
@@ -25,8 +68,12 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Dash:
     if embeddings is None:
         embeddings = _create_sample_embeddings()
 
-    # Pre-compute t-SNE for visualization
-    tsne_df = _compute_tsne(embeddings)
+    # Projection for visualization, cached on disk when the source is known
+    tsne_df = projection if projection is not None else get_projection(
+        embeddings, embeddings_path, max_words=max_words, method=method
+    )
+    if clusters is None and n_clusters != 0:
+        clusters = get_clusters(embeddings, embeddings_path, n_clusters)
 
     app.layout = html.Div([
         # Header
@@ -44,7 +91,7 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Dash:
         html.Div([
             # Left panel: Embedding visualization
             html.Div([
-                html.H3("Embedding Space (t-SNE)"),
+                html.H3(f"Embedding Space ({'PCA' if method == 'pca' else 't-SNE'})"),
                 dcc.Graph(
                     id="tsne-plot",
                     figure=_create_tsne_figure(tsne_df),
@@ -150,11 +197,61 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Dash:
             }),
         ], style={"display": "flex", "justifyContent": "space-between"}),
 
-        # Hidden store for embeddings data
-        dcc.Store(id="embeddings-store", data={
-            "vocab": embeddings.vocab[:1000],  # Limit for performance
-            "dimension": embeddings.dimension
-        }),
+        # Neighborhood explorer: grows as the user clicks words
+        html.Div([
+            html.H3("Neighborhood Explorer"),
+            html.P(
+                "Click a word on the map or in the graph to add its nearest neighbors.",
+                style={"color": "#666"}
+            ),
+            html.Div([
+                dcc.Input(
+                    id="explore-input",
+                    type="text",
+                    placeholder="Start from a word, e.g. king",
+                    style={"width": "60%", "padding": "8px", "marginRight": "5px"}
+                ),
+                html.Button("Explore", id="explore-button", style={"padding": "8px 16px"}),
+                html.Button("Clear", id="explore-clear", style={
+                    "padding": "8px 16px",
+                    "marginLeft": "5px"
+                }),
+            ]),
+            html.Div(id="explore-status"),
+            dcc.Graph(
+                id="explore-graph",
+                figure=_create_explore_figure(),
+                style={"height": "500px"}
+            ),
+            # Expanded nodes are kept in the browser; the server only sends additions
+            dcc.Store(id="explore-store", data=empty_graph()),
+        ], style={"padding": "10px", "marginTop": "20px"}),
+
+        # Cluster overview of the whole vocabulary
+        html.Div([
+            html.H3("Cluster Overview"),
+            html.P(
+                f"{embeddings.vocab_size} words in {clusters.n_clusters} clusters. "
+                "Click a cluster to list its members.",
+                style={"color": "#666"}
+            ),
+            dcc.Graph(
+                id="cluster-plot",
+                figure=_create_cluster_figure(clusters, embeddings),
+                style={"height": "500px"}
+            ),
+            html.Div(id="cluster-members"),
+            html.Button("More members", id="cluster-more", style={"padding": "8px 16px"}),
+            dcc.Store(id="cluster-selected"),
+        ], style={"padding": "10px", "marginTop": "20px"}) if clusters is not None else None,
+
+        # Running job of each panel, polled until it finishes
+        dcc.Store(id="search-job"),
+        dcc.Interval(id="search-poll", interval=POLL_INTERVAL_MS, disabled=True),
+        dcc.Store(id="analogy-job"),
+        dcc.Interval(id="analogy-poll", interval=POLL_INTERVAL_MS, disabled=True),
+        dcc.Store(id="explore-job"),
+        dcc.Interval(id="explore-poll", interval=POLL_INTERVAL_MS, disabled=True),
     ], style={
         "maxWidth": "1400px",
         "margin": "0 auto",
@@ -163,7 +260,7 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Dash:
     })
 
     # Register callbacks
-    _register_callbacks(app, embeddings)
+    _register_callbacks(app, embeddings, tsne_df, jobs or JobRunner(), store, clusters)
 
     return app
 
@@ -211,71 +308,298 @@ def _create_sample_embeddings() -> WordEmbeddings:
 
 
 def _compute_tsne(embeddings: WordEmbeddings, max_words: int = 500) -> pd.DataFrame:
-    """Compute t-SNE projection of embeddings."""
-    words = embeddings.vocab[:max_words]
-    vectors = np.array([embeddings[w] for w in words])
-
-    n_samples = len(words)
-
-    # t-SNE requires perplexity < n_samples
-    # For very small datasets, fall back to simple 2D projection
-    if n_samples < 5:
-        # Use first two dimensions or PCA-like projection
-        if vectors.shape[1] >= 2:
-            coords = vectors[:, :2]
-        else:
-            coords = np.column_stack([vectors[:, 0], np.zeros(n_samples)])
-    else:
-        # Perplexity must be < n_samples and typically 5-50
-        perplexity = min(30, max(2, (n_samples - 1) // 2))
-        tsne = TSNE(n_components=2, random_state=42, perplexity=perplexity)
-        coords = tsne.fit_transform(vectors)
-
-    return pd.DataFrame({
-        "word": words,
-        "x": coords[:, 0],
-        "y": coords[:, 1]
-    })
+    """Compute t-SNE projection of embeddings (uncached)."""
+    return compute_projection(embeddings, max_words)
 
 
-def _create_tsne_figure(df: pd.DataFrame) -> go.Figure:
-    """Create t-SNE scatter plot."""
-    fig = px.scatter(
-        df,
-        x="x",
-        y="y",
-        text="word",
-        title="Word Embeddings Visualization"
-    )
+def _create_tsne_figure(df: pd.DataFrame, max_labels: int = MAX_LABELS) -> go.Figure:
+    """Create the embedding map.
 
-    fig.update_traces(
-        textposition="top center",
-        marker=dict(size=10, color="#007bff"),
-        textfont=dict(size=10)
+    Points are drawn with WebGL (Scattergl), which stays responsive with
+    100k+ points. Every point shows its word on hover, but only up to
+    max_labels words are labeled: the most frequent ones in view, updated
+    by _visible_labels() as the user zooms.
+    """
+    labels = _visible_labels(df, None, max_labels)
+    fig = go.Figure([
+        go.Scattergl(
+            x=df["x"],
+            y=df["y"],
+            mode="markers",
+            hovertext=df["word"],
+            hoverinfo="text",
+            marker=dict(size=10 if len(df) <= 1000 else 4, color="#007bff", opacity=0.8)
+        ),
+        go.Scatter(
+            x=labels["x"],
+            y=labels["y"],
+            mode="text",
+            text=labels["word"],
+            textposition="top center",
+            textfont=dict(size=10),
+            hoverinfo="skip"
+        ),
+    ])
+
+    fig.update_layout(
+        title="Word Embeddings Visualization",
+        showlegend=False,
+        xaxis_title="Dimension 1",
+        yaxis_title="Dimension 2",
+        hovermode="closest",
+        # Keep the zoom when the labels are updated
+        uirevision="embedding-map"
     )
 
+    return fig
+
+
+def _create_explore_figure() -> go.Figure:
+    """Create the empty neighborhood graph: an edge trace and a node trace.
+
+    Both traces only grow; the explore callback appends to them.
+    """
+    fig = go.Figure([
+        go.Scatter(
+            x=[],
+            y=[],
+            mode="lines",
+            line=dict(width=1, color="#bbb"),
+            hoverinfo="skip"
+        ),
+        go.Scatter(
+            x=[],
+            y=[],
+            mode="markers+text",
+            text=[],
+            textposition="top center",
+            hoverinfo="text",
+            marker=dict(size=10, color="#28a745")
+        ),
+    ])
     fig.update_layout(
         showlegend=False,
-        xaxis_title="t-SNE dimension 1",
-        yaxis_title="t-SNE dimension 2",
-        hovermode="closest"
+        hovermode="closest",
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False, scaleanchor="x"),
+        uirevision="explore-graph"
     )
+    return fig
+
 
+def _create_cluster_figure(clusters: Clusters, embeddings: WordEmbeddings) -> go.Figure:
+    """Create the cluster overview: one point per centroid.
+
+    Centroids are placed by PCA of the centroids, sized by the number of
+    members and labeled with the words closest to them. Only the
+    centroids are sent to the browser, whatever the vocabulary size.
+    """
+    coords = project_centroids(clusters.centroids)
+    representatives = clusters.representatives(embeddings)
+    sizes = clusters.sizes
+    fig = go.Figure(go.Scatter(
+        x=coords[:, 0],
+        y=coords[:, 1],
+        mode="markers+text",
+        text=[", ".join(words[:3]) for words in representatives],
+        textposition="top center",
+        hovertext=[
+            f"Cluster {c} ({sizes[c]} words): {', '.join(words)}"
+            for c, words in enumerate(representatives)
+        ],
+        hoverinfo="text",
+        customdata=list(range(clusters.n_clusters)),
+        marker=dict(
+            size=8 + 32 * np.sqrt(sizes / max(sizes.max(), 1)),
+            color="#6f42c1",
+            opacity=0.6
+        )
+    ))
+    fig.update_layout(
+        showlegend=False,
+        hovermode="closest",
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+    )
     return fig
 
 
-def _register_callbacks(app: Dash, embeddings: WordEmbeddings) -> None:
-    """Register Dash callbacks."""
+def _clicked_word(
+    click_data: dict | None, projection: pd.DataFrame | None = None
+) -> str | None:
+    """Get the word of a clicked point.
+
+    Args:
+        click_data: clickData of the map or the neighborhood graph.
+        projection: Projection of the map, whose points carry no text and
+            are looked up by index. None for the neighborhood graph.
+    """
+    if not click_data or not click_data.get("points"):
+        return None
+    point = click_data["points"][0]
+    if point.get("text"):
+        return point["text"]
+    index = point.get("pointIndex")
+    if projection is None or index is None or point.get("curveNumber") != 0:
+        return None
+    if index < len(projection):
+        return projection["word"].iat[index]
+    return None
+
+
+def _visible_labels(
+    df: pd.DataFrame, relayout_data: dict | None, max_labels: int = MAX_LABELS
+) -> pd.DataFrame:
+    """Select the words to label inside the visible axis ranges.
+
+    Args:
+        df: Projection with "word", "x" and "y" columns, in vocabulary order.
+        relayout_data: Plotly relayout event with the new axis ranges. None
+            or autorange means the whole map is visible.
+        max_labels: Maximum number of labels.
+
+    Returns:
+        Rows of df to label.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for axis in ("x", "y"):
+        bounds = _axis_range(relayout_data or {}, f"{axis}axis")
+        if bounds is not None:
+            values = df[axis].to_numpy()
+            mask &= (values >= min(bounds)) & (values <= max(bounds))
+    # Vocabularies are sorted by frequency: label the most common words first
+    return df[mask].head(max_labels)
+
+
+def _axis_range(relayout_data: dict, axis: str) -> tuple[float, float] | None:
+    """Get an axis range from a relayout event, if it sets one."""
+    if f"{axis}.range[0]" in relayout_data:
+        return relayout_data[f"{axis}.range[0]"], relayout_data[f"{axis}.range[1]"]
+    if f"{axis}.range" in relayout_data:
+        return tuple(relayout_data[f"{axis}.range"])
+    return None
+
+
+def _register_callbacks(
+    app: Dash,
+    embeddings: WordEmbeddings,
+    projection: pd.DataFrame,
+    jobs: JobRunner,
+    store: ResultStore | None,
+    clusters: Clusters | None = None,
+) -> None:
+    """Register Dash callbacks.
+
+    Similarity searches, analogies and explorer expansions run as
+    background jobs: the triggering callback submits the job and enables a
+    dcc.Interval, whose callback shows the job's progress until its result
+    is ready. Results are looked up in (and added to) the shared result
+    store first.
+    """
+
+    @app.callback(
+        Output("tsne-plot", "figure"),
+        Input("tsne-plot", "relayoutData"),
+        prevent_initial_call=True
+    )
+    def update_labels(relayout_data: dict | None):
+        if not relayout_data or not any(k.startswith(("xaxis", "yaxis")) for k in relayout_data):
+            return no_update
+
+        # Send only the label trace, not the (possibly 100k) points
+        labels = _visible_labels(projection, relayout_data)
+        patched = Patch()
+        patched["data"][1]["x"] = labels["x"].tolist()
+        patched["data"][1]["y"] = labels["y"].tolist()
+        patched["data"][1]["text"] = labels["word"].tolist()
+        return patched
+
+    @app.callback(
+        Output("explore-status", "children"),
+        Output("explore-job", "data"),
+        Output("explore-poll", "disabled"),
+        Input("tsne-plot", "clickData"),
+        Input("explore-graph", "clickData"),
+        Input("explore-button", "n_clicks"),
+        State("explore-input", "value"),
+        State("explore-store", "data"),
+        State("explore-job", "data"),
+        prevent_initial_call=True
+    )
+    def explore(map_click: dict | None, graph_click: dict | None, n_clicks: int,
+                typed: str | None, graph: dict, previous: dict | None):
+        if ctx.triggered_id == "explore-button":
+            word = (typed or "").strip().lower()
+        elif ctx.triggered_id == "explore-graph":
+            word = _clicked_word(graph_click)
+        else:
+            word = _clicked_word(map_click, projection)
+
+        if not word or word not in embeddings or word in graph["expanded"]:
+            return no_update, no_update, no_update
+
+        def compute(job: Job) -> dict:
+            job.report(0.0)
+            return expand(embeddings, graph, [word], store=store)
+
+        # The additions are computed against the current graph, so a new
+        # expansion supersedes one still running in this tab
+        job_id = jobs.submit(compute, supersedes=previous["id"] if previous else None)
+        return _progress_bar(0.0), {"id": job_id, "word": word}, False
+
+    @app.callback(
+        Output("explore-store", "data"),
+        Output("explore-graph", "figure"),
+        Output("explore-status", "children", allow_duplicate=True),
+        Output("explore-poll", "disabled", allow_duplicate=True),
+        Input("explore-poll", "n_intervals"),
+        State("explore-job", "data"),
+        State("explore-store", "data"),
+        prevent_initial_call=True
+    )
+    def poll_explore(n_intervals: int, job: dict | None, graph: dict):
+        if not job:
+            return no_update, no_update, no_update, True
+        status = jobs.status(job["id"])
+        if status is None or status["state"] != "done":
+            children, stop = _job_output(status, lambda _: None)
+            return no_update, no_update, children, stop
+        additions = status["result"]
+        if not additions["expanded"]:
+            return no_update, no_update, None, True
+        return (*_explore_patches(graph, additions), None, True)
+
+    @app.callback(
+        Output("explore-store", "data", allow_duplicate=True),
+        Output("explore-graph", "figure", allow_duplicate=True),
+        Output("explore-status", "children", allow_duplicate=True),
+        Output("explore-job", "data", allow_duplicate=True),
+        Output("explore-poll", "disabled", allow_duplicate=True),
+        Input("explore-clear", "n_clicks"),
+        State("explore-job", "data"),
+        prevent_initial_call=True
+    )
+    def clear_explore(n_clicks: int, job: dict | None):
+        if job:
+            jobs.cancel(job["id"])
+        return empty_graph(), _create_explore_figure(), None, None, True
 
     @app.callback(
         Output("search-results", "children"),
+        Output("search-job", "data"),
+        Output("search-poll", "disabled"),
         Input("search-button", "n_clicks"),
         State("search-input", "value"),
+        State("search-job", "data"),
         prevent_initial_call=True
     )
-    def search_similar(n_clicks: int, word: str):
+    def search_similar(n_clicks: int, word: str, previous: dict | None):
+        # A new search supersedes the one still running in this tab
+        if previous:
+            jobs.cancel(previous["id"])
+
         if not word or word.strip() == "":
-            return html.P("Please enter a word", style={"color": "#666"})
+            return html.P("Please enter a word", style={"color": "#666"}), None, True
 
         word = word.strip().lower()
 
@@ -283,44 +607,56 @@ def _register_callbacks(app: Dash, embeddings: WordEmbeddings) -> None:
             return html.P(
                 f"'{word}' not in vocabulary",
                 style={"color": "#dc3545"}
-            )
-
-        similar = embeddings.most_similar(word, topn=10)
-
-        return html.Div([
-            html.H4(f"Words similar to '{word}':", style={"marginBottom": "10px"}),
-            html.Table([
-                html.Thead(html.Tr([
-                    html.Th("Word", style={"textAlign": "left", "padding": "8px"}),
-                    html.Th("Similarity", style={"textAlign": "right", "padding": "8px"})
-                ])),
-                html.Tbody([
-                    html.Tr([
-                        html.Td(w, style={"padding": "8px"}),
-                        html.Td(
-                            f"{sim:.3f}",
-                            style={"textAlign": "right", "padding": "8px"}
-                        )
-                    ]) for w, sim in similar
-                ])
-            ], style={
-                "width": "100%",
-                "borderCollapse": "collapse",
-                "backgroundColor": "white"
-            })
-        ])
+            ), None, True
+
+        query = ("word", word)
+        cached = store.get(embeddings, query, 10) if store is not None else None
+        if cached is not None:
+            return _similar_table(word, cached), None, True
+
+        def compute(job: Job) -> list[tuple[str, float]]:
+            similar = scan_neighbors(embeddings, embeddings[word], {word}, 10, job)
+            if store is not None:
+                store.put(embeddings, query, 10, similar)
+            return similar
+
+        job_id = jobs.submit(compute)
+        return _progress_bar(0.0), {"id": job_id, "word": word}, False
+
+    @app.callback(
+        Output("search-results", "children", allow_duplicate=True),
+        Output("search-poll", "disabled", allow_duplicate=True),
+        Input("search-poll", "n_intervals"),
+        State("search-job", "data"),
+        prevent_initial_call=True
+    )
+    def poll_search(n_intervals: int, job: dict | None):
+        if not job:
+            return no_update, True
+        return _job_output(
+            jobs.status(job["id"]),
+            lambda similar: _similar_table(job["word"], similar)
+        )
 
     @app.callback(
         Output("analogy-results", "children"),
+        Output("analogy-job", "data"),
+        Output("analogy-poll", "disabled"),
         Input("analogy-button", "n_clicks"),
         State("analogy-a", "value"),
         State("analogy-b", "value"),
         State("analogy-c", "value"),
+        State("analogy-job", "data"),
         prevent_initial_call=True
     )
-    def solve_analogy(n_clicks: int, word_a: str, word_b: str, word_c: str):
+    def solve_analogy(
+        n_clicks: int, word_a: str, word_b: str, word_c: str, previous: dict | None
+    ):
+        if previous:
+            jobs.cancel(previous["id"])
+
         if not all([word_a, word_b, word_c]):
-            return html.P("Please fill in all fields", style={"color": "#666"})
+            return html.P("Please fill in all fields", style={"color": "#666"}), None, True
 
         word_a = word_a.strip().lower()
         word_b = word_b.strip().lower()
@@ -331,54 +667,198 @@ def _register_callbacks(app: Dash, embeddings: WordEmbeddings) -> None:
             return html.P(
                 f"Words not in vocabulary: {', '.join(missing)}",
                 style={"color": "#dc3545"}
-            )
-
-        try:
-            results = embeddings.analogy(
-                positive=[word_a, word_c],
-                negative=[word_b],
-                topn=5
-            )
-
-            return html.Div([
-                html.H4(
-                    f"{word_a} - {word_b} + {word_c} = ?",
-                    style={"marginBottom": "10px"}
-                ),
-                html.Table([
-                    html.Thead(html.Tr([
-                        html.Th("Answer", style={"textAlign": "left", "padding": "8px"}),
-                        html.Th("Score", style={"textAlign": "right", "padding": "8px"})
-                    ])),
-                    html.Tbody([
-                        html.Tr([
-                            html.Td(
-                                w,
-                                style={
-                                    "padding": "8px",
-                                    "fontWeight": "bold" if i == 0 else "normal"
-                                }
-                            ),
-                            html.Td(
-                                f"{sim:.3f}",
-                                style={"textAlign": "right", "padding": "8px"}
-                            )
-                        ]) for i, (w, sim) in enumerate(results)
-                    ])
-                ], style={
-                    "width": "100%",
-                    "borderCollapse": "collapse",
-                    "backgroundColor": "white"
-                })
+            ), None, True
+
+        words = [word_a, word_b, word_c]
+        query = ("analogy", (word_a, word_c), (word_b,))
+        cached = store.get(embeddings, query, 5) if store is not None else None
+        if cached is not None:
+            return _analogy_table(words, cached), None, True
+
+        def compute(job: Job) -> list[tuple[str, float]]:
+            vector = embeddings.analogy_vector([word_a, word_c], [word_b])
+            results = scan_neighbors(embeddings, vector, set(words), 5, job)
+            if store is not None:
+                store.put(embeddings, query, 5, results)
+            return results
+
+        job_id = jobs.submit(compute)
+        return _progress_bar(0.0), {"id": job_id, "words": words}, False
+
+    @app.callback(
+        Output("analogy-results", "children", allow_duplicate=True),
+        Output("analogy-poll", "disabled", allow_duplicate=True),
+        Input("analogy-poll", "n_intervals"),
+        State("analogy-job", "data"),
+        prevent_initial_call=True
+    )
+    def poll_analogy(n_intervals: int, job: dict | None):
+        if not job:
+            return no_update, True
+        return _job_output(
+            jobs.status(job["id"]),
+            lambda results: _analogy_table(job["words"], results)
+        )
+
+    if clusters is None:
+        return
+
+    @app.callback(
+        Output("cluster-members", "children"),
+        Output("cluster-selected", "data"),
+        Input("cluster-plot", "clickData"),
+        Input("cluster-more", "n_clicks"),
+        State("cluster-selected", "data"),
+        prevent_initial_call=True
+    )
+    def show_members(click_data: dict | None, n_clicks: int, selected: dict | None):
+        if ctx.triggered_id == "cluster-plot":
+            points = (click_data or {}).get("points") or [{}]
+            if points[0].get("customdata") is None:
+                return no_update, no_update
+            selected = {"cluster": int(points[0]["customdata"]), "offset": 0}
+        elif selected:
+            # Next page, wrapping around to the closest members
+            offset = selected["offset"] + MEMBERS_PAGE
+            size = int(clusters.sizes[selected["cluster"]])
+            selected = {**selected, "offset": offset if offset < size else 0}
+        else:
+            return no_update, no_update
+
+        rows = clusters.members(selected["cluster"], MEMBERS_PAGE, selected["offset"])
+        words = embeddings.words_at(rows)
+        return _members_list(clusters, selected, words), selected
+
+
+def _explore_patches(graph: dict, additions: dict) -> tuple[Patch, Patch]:
+    """Append the additions of expand() to the browser's graph and figure."""
+    nodes = {**graph["nodes"], **additions["nodes"]}
+    patched_graph = Patch()
+    patched_graph["nodes"].update(additions["nodes"])
+    patched_graph["edges"].extend(additions["edges"])
+    patched_graph["expanded"].extend(additions["expanded"])
+
+    edge_x, edge_y = [], []
+    for source, target, _ in additions["edges"]:
+        edge_x += [nodes[source][0], nodes[target][0], None]
+        edge_y += [nodes[source][1], nodes[target][1], None]
+    patched_figure = Patch()
+    patched_figure["data"][0]["x"].extend(edge_x)
+    patched_figure["data"][0]["y"].extend(edge_y)
+    patched_figure["data"][1]["x"].extend([x for x, _ in additions["nodes"].values()])
+    patched_figure["data"][1]["y"].extend([y for _, y in additions["nodes"].values()])
+    patched_figure["data"][1]["text"].extend(list(additions["nodes"]))
+    return patched_graph, patched_figure
+
+
+def _job_output(status: dict | None, render: Callable[[list], html.Div]) -> tuple:
+    """Render a polled job: progress while running, then its result.
+
+    Returns:
+        (children, whether to stop polling).
+    """
+    if status is None:
+        return html.P("Request expired, please retry", style={"color": "#666"}), True
+    if status["state"] == "done":
+        return render(status["result"]), True
+    if status["state"] == "failed":
+        return html.P(f"Error: {status['error']}", style={"color": "#dc3545"}), True
+    if status["state"] == "cancelled":
+        return no_update, True
+    return _progress_bar(status["progress"]), False
+
+
+def _progress_bar(progress: float) -> html.Div:
+    """Show the progress of a running job."""
+    return html.Div([
+        html.Progress(value=str(progress), max="1", style={"width": "100%"}),
+        html.P(f"Searching... {progress:.0%}", style={"color": "#666"}),
+    ])
+
+
+def _similar_table(word: str, similar: list) -> html.Div:
+    """Render the words most similar to word."""
+    return html.Div([
+        html.H4(f"Words similar to '{word}':", style={"marginBottom": "10px"}),
+        html.Table([
+            html.Thead(html.Tr([
+                html.Th("Word", style={"textAlign": "left", "padding": "8px"}),
+                html.Th("Similarity", style={"textAlign": "right", "padding": "8px"})
+            ])),
+            html.Tbody([
+                html.Tr([
+                    html.Td(w, style={"padding": "8px"}),
+                    html.Td(
+                        f"{sim:.3f}",
+                        style={"textAlign": "right", "padding": "8px"}
+                    )
+                ]) for w, sim in similar
+            ])
+        ], style={
+            "width": "100%",
+            "borderCollapse": "collapse",
+            "backgroundColor": "white"
+        })
+    ])
+
+
+def _members_list(clusters: Clusters, selected: dict, words: list[str]) -> html.Div:
+    """Render a page of the members of a cluster."""
+    cluster, offset = selected["cluster"], selected["offset"]
+    return html.Div([
+        html.H4(
+            f"Cluster {cluster}: words {offset + 1}-{offset + len(words)} "
+            f"of {clusters.sizes[cluster]}, closest to the centroid first",
+            style={"marginBottom": "10px"}
+        ),
+        html.P(", ".join(words)),
+    ])
+
+
+def _analogy_table(words: list[str], results: list) -> html.Div:
+    """Render the answers of the analogy words[0] - words[1] + words[2]."""
+    word_a, word_b, word_c = words
+    return html.Div([
+        html.H4(
+            f"{word_a} - {word_b} + {word_c} = ?",
+            style={"marginBottom": "10px"}
+        ),
+        html.Table([
+            html.Thead(html.Tr([
+                html.Th("Answer", style={"textAlign": "left", "padding": "8px"}),
+                html.Th("Score", style={"textAlign": "right", "padding": "8px"})
+            ])),
+            html.Tbody([
+                html.Tr([
+                    html.Td(
+                        w,
+                        style={
+                            "padding": "8px",
+                            "fontWeight": "bold" if i == 0 else "normal"
+                        }
+                    ),
+                    html.Td(
+                        f"{sim:.3f}",
+                        style={"textAlign": "right", "padding": "8px"}
+                    )
+                ]) for i, (w, sim) in enumerate(results)
             ])
-        except Exception as e:
-            return html.P(f"Error: {str(e)}", style={"color": "#dc3545"})
+        ], style={
+            "width": "100%",
+            "borderCollapse": "collapse",
+            "backgroundColor": "white"
+        })
+    ])
 
 
 def run_dashboard(
     embeddings: WordEmbeddings | None = None,
     debug: bool = True,
-    port: int = 8050
+    port: int = 8050,
+    embeddings_path: str | Path | None = None,
+    max_words: int = 500,
+    method: str = "tsne",
+    n_clusters: int | None = None,
 ) -> None:
     """Run the dashboard server.
 
@@ -386,8 +866,17 @@ def run_dashboard(
         embeddings: Word embeddings to visualize.
         debug: Enable debug mode.
         port: Port to run server on.
+        embeddings_path: File the embeddings were loaded from, used to
+            cache their projection and clusters.
+        max_words: Number of words to project.
+        method: Projection method, "tsne" or "pca".
+        n_clusters: Number of clusters of the cluster overview. None
+            chooses it from the vocabulary size; 0 hides the overview.
     """
-    app = create_app(embeddings)
+    app = create_app(
+        embeddings, embeddings_path, max_words=max_words, method=method,
+        n_clusters=n_clusters,
+    )
     print(f"Starting dashboard at http://localhost:{port}")
     app.run(debug=debug, port=str(port))
 
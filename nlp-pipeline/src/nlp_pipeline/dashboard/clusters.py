@@ -0,0 +1,341 @@
+"""Mini-batch k-means clustering of the vocabulary, cached on disk."""
+
+import hashlib
+import json
+import logging
+import math
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import kmeans_plusplus
+
+from nlp_pipeline.dashboard.projection import file_hash
+from nlp_pipeline.embeddings import WordEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the clustering algorithm changes, to invalidate cached files
+CLUSTERS_VERSION = 1
+
+# Matrix rows read from the (possibly memory-mapped) matrix at a time
+CHUNK_ROWS = 65_536
+
+# Largest number of clusters chosen automatically
+MAX_AUTO_CLUSTERS = 100
+
+# Words shown for each cluster in the overview
+REPRESENTATIVES = 10
+
+
+class Clusters:
+    """Cluster assignments of a vocabulary.
+
+    Members are kept sorted by cluster, then by decreasing similarity to
+    their centroid (CSR layout: the members of cluster c are
+    order[offsets[c]:offsets[c + 1]]), so listing the closest members of a
+    cluster is a slice, whatever the vocabulary size.
+    """
+
+    def __init__(self, centroids: np.ndarray, labels: np.ndarray, similarity: np.ndarray):
+        """Initialize clusters.
+
+        Args:
+            centroids: Unit-length centroids, one row per cluster.
+            labels: Cluster of every vocabulary row.
+            similarity: Cosine similarity of every row to its centroid.
+        """
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int32)
+        self.similarity = np.asarray(similarity, dtype=np.float32)
+        self.sizes = np.bincount(self.labels, minlength=len(self.centroids))
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)])
+        self.order = np.lexsort((-self.similarity, self.labels)).astype(np.int32)
+
+    @property
+    def n_clusters(self) -> int:
+        """Get number of clusters."""
+        return len(self.centroids)
+
+    def members(self, cluster: int, limit: int | None = None, offset: int = 0) -> np.ndarray:
+        """Get the vocabulary rows of a cluster, closest to the centroid first.
+
+        Args:
+            cluster: Cluster index.
+            limit: Maximum number of rows. None returns all of them.
+            offset: Rows to skip, for paging.
+
+        Returns:
+            Array of row indices.
+
+        Raises:
+            ValueError: If cluster is out of range.
+        """
+        if not 0 <= cluster < self.n_clusters:
+            raise ValueError(f"Cluster {cluster} out of range (0-{self.n_clusters - 1})")
+        start = self.offsets[cluster] + offset
+        stop = self.offsets[cluster + 1]
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self.order[start:stop]
+
+    def representatives(
+        self, embeddings: WordEmbeddings, n: int = REPRESENTATIVES
+    ) -> list[list[str]]:
+        """Get the n words closest to each centroid."""
+        return [embeddings.words_at(self.members(c, n)) for c in range(self.n_clusters)]
+
+    def __len__(self) -> int:
+        """Get number of clustered words."""
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"Clusters(n_clusters={self.n_clusters}, words={len(self)})"
+
+
+def project_centroids(centroids: np.ndarray) -> np.ndarray:
+    """Project centroids onto their top two principal components.
+
+    Args:
+        centroids: One row per cluster.
+
+    Returns:
+        Array of shape (n_clusters, 2).
+    """
+    centered = centroids - centroids.mean(axis=0)
+    if len(centroids) < 2 or not np.any(centered):
+        return np.zeros((len(centroids), 2))
+    _, _, vt = np.linalg.svd(centered, full_matrices=False)
+    coords = centered @ vt[:2].T
+    if coords.shape[1] == 1:
+        coords = np.column_stack([coords[:, 0], np.zeros(len(coords))])
+    return coords
+
+
+def default_n_clusters(n_words: int) -> int:
+    """Choose a number of clusters for a vocabulary (sqrt(n / 2), capped)."""
+    return max(1, min(MAX_AUTO_CLUSTERS, round(math.sqrt(n_words / 2))))
+
+
+def _normalized(matrix: np.ndarray, norms: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Read rows start:stop of a matrix scaled to unit length."""
+    rows = np.array(matrix[start:stop], dtype=np.float32)
+    scale = norms[start:stop]
+    np.divide(rows, scale[:, None], out=rows, where=scale[:, None] > 0)
+    return rows
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale the non-zero rows of vectors to unit length, in place."""
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, lengths, out=vectors, where=lengths > 0)
+    return vectors
+
+
+def compute_clusters(
+    embeddings: WordEmbeddings,
+    n_clusters: int | None = None,
+    batch_size: int = 4096,
+    epochs: int = 2,
+    random_state: int = 42,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Clusters:
+    """Cluster the whole vocabulary with mini-batch k-means on unit vectors.
+
+    The matrix is streamed in chunks of chunk_rows rows, so a memory-mapped
+    matrix is never loaded whole. Centroids are seeded with k-means++ on a
+    random sample, then refined over epochs shuffled passes: each batch
+    moves every centroid towards the mean of its batch members with a
+    per-centroid learning rate of 1 / (members seen so far), as in Sculley's
+    mini-batch k-means, using cosine similarity (spherical k-means). A last
+    pass assigns every word to its most similar centroid. Time grows
+    linearly with the vocabulary and memory with chunk_rows.
+
+    Args:
+        embeddings: Embeddings to cluster.
+        n_clusters: Number of clusters. Defaults to default_n_clusters().
+            Capped at the vocabulary size.
+        batch_size: Rows per k-means update.
+        epochs: Passes over the matrix.
+        random_state: Seed of the seeding and shuffling.
+        chunk_rows: Rows read from the matrix at a time.
+
+    Returns:
+        Clusters of the vocabulary.
+
+    Raises:
+        ValueError: If the embeddings are empty or n_clusters is not
+            positive.
+    """
+    matrix = embeddings.matrix
+    norms = embeddings.norms
+    n_rows = len(matrix)
+    if n_rows == 0:
+        raise ValueError("Cannot cluster empty embeddings")
+    if n_clusters is None:
+        n_clusters = default_n_clusters(n_rows)
+    if n_clusters < 1:
+        raise ValueError("n_clusters must be positive")
+    n_clusters = min(n_clusters, n_rows)
+    rng = np.random.default_rng(random_state)
+
+    # Seed on a sample: k-means++ is O(n k), too slow for the whole matrix
+    n_sample = min(n_rows, max(10 * n_clusters, batch_size))
+    sample = np.sort(rng.choice(n_rows, n_sample, replace=False))
+    sample_rows = np.array(matrix[sample], dtype=np.float32)
+    scale = norms[sample]
+    np.divide(sample_rows, scale[:, None], out=sample_rows, where=scale[:, None] > 0)
+    centroids, _ = kmeans_plusplus(sample_rows, n_clusters, random_state=random_state)
+    centroids = _unit_rows(centroids.astype(np.float32))
+
+    counts = np.zeros(n_clusters)
+    starts = np.arange(0, n_rows, chunk_rows)
+    for _ in range(epochs):
+        for start in rng.permutation(starts):
+            chunk = _normalized(matrix, norms, start, min(start + chunk_rows, n_rows))
+            rng.shuffle(chunk)
+            for batch_start in range(0, len(chunk), batch_size):
+                batch = chunk[batch_start:batch_start + batch_size]
+                assigned = (batch @ centroids.T).argmax(axis=1)
+                batch_counts = np.bincount(assigned, minlength=n_clusters)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assigned, batch)
+                counts += batch_counts
+                hit = batch_counts > 0
+                rate = (batch_counts[hit] / counts[hit])[:, None]
+                means = sums[hit] / batch_counts[hit][:, None]
+                centroids[hit] += rate * (means - centroids[hit])
+                centroids = _unit_rows(centroids)
+
+    labels = np.empty(n_rows, dtype=np.int32)
+    similarity = np.empty(n_rows, dtype=np.float32)
+    for start in starts:
+        stop = min(start + chunk_rows, n_rows)
+        sims = _normalized(matrix, norms, start, stop) @ centroids.T
+        labels[start:stop] = sims.argmax(axis=1)
+        similarity[start:stop] = sims[np.arange(stop - start), labels[start:stop]]
+
+    return Clusters(centroids, labels, similarity)
+
+
+def cache_key(
+    embeddings_hash: str, n_words: int, n_clusters: int, random_state: int = 42
+) -> str:
+    """Get the cache key of a clustering.
+
+    Args:
+        embeddings_hash: file_hash() of the embeddings.
+        n_words: Number of words clustered.
+        n_clusters: Number of clusters.
+        random_state: Seed of the clustering.
+
+    Returns:
+        Short hex key.
+    """
+    params = {
+        "embeddings": embeddings_hash,
+        "words": n_words,
+        "clusters": n_clusters,
+        "random_state": random_state,
+        "version": CLUSTERS_VERSION,
+    }
+    encoded = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def cache_path(
+    embeddings_path: str | Path, n_words: int, n_clusters: int, random_state: int = 42
+) -> Path:
+    """Get the cache file of a clustering of an embeddings file.
+
+    Args:
+        embeddings_path: File or directory the embeddings were loaded from.
+        n_words: Number of words clustered.
+        n_clusters: Number of clusters.
+        random_state: Seed of the clustering.
+
+    Returns:
+        Path of the .npz cache file (which may not exist yet).
+    """
+    embeddings_path = Path(embeddings_path)
+    key = cache_key(file_hash(embeddings_path), n_words, n_clusters, random_state)
+    return embeddings_path.parent / f"{embeddings_path.name}.clusters-{key}.npz"
+
+
+def save_clusters(clusters: Clusters, path: str | Path) -> Path:
+    """Save clusters as an .npz file.
+
+    Args:
+        clusters: Clusters to save.
+        path: Output file.
+
+    Returns:
+        Path of the saved file.
+    """
+    path = Path(path)
+    # Write to a temporary file first, so readers never see a partial file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            centroids=clusters.centroids,
+            labels=clusters.labels,
+            similarity=clusters.similarity,
+        )
+    tmp.replace(path)
+    return path
+
+
+def load_clusters(path: str | Path) -> Clusters:
+    """Load clusters saved by save_clusters()."""
+    with np.load(path, allow_pickle=False) as data:
+        return Clusters(data["centroids"], data["labels"], data["similarity"])
+
+
+def get_clusters(
+    embeddings: WordEmbeddings,
+    embeddings_path: str | Path | None = None,
+    n_clusters: int | None = None,
+    random_state: int = 42,
+    recompute: bool = False,
+) -> Clusters:
+    """Get the clusters of embeddings, from the on-disk cache when possible.
+
+    Like get_projection(), the cache file lives next to the embeddings and
+    is keyed by their file hash and the clustering parameters. Compute it
+    ahead of time with scripts/compute_clusters.py.
+
+    Args:
+        embeddings: Loaded embeddings.
+        embeddings_path: File or directory the embeddings were loaded
+            from. None disables caching.
+        n_clusters: Number of clusters. Defaults to default_n_clusters().
+        random_state: Seed of the clustering.
+        recompute: Ignore an existing cache file and overwrite it.
+
+    Returns:
+        Clusters of the vocabulary.
+    """
+    n_words = embeddings.vocab_size
+    if n_clusters is None:
+        n_clusters = default_n_clusters(n_words)
+    if embeddings_path is None:
+        return compute_clusters(embeddings, n_clusters, random_state=random_state)
+
+    path = cache_path(embeddings_path, n_words, min(n_clusters, n_words), random_state)
+    if path.exists() and not recompute:
+        try:
+            clusters = load_clusters(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable clusters cache %s: %s", path, e)
+        else:
+            if len(clusters) == n_words:
+                return clusters
+            logger.warning("Clusters cache %s does not match the vocabulary", path)
+
+    clusters = compute_clusters(embeddings, n_clusters, random_state=random_state)
+    try:
+        save_clusters(clusters, path)
+    except OSError as e:
+        logger.warning("Could not write clusters cache %s: %s", path, e)
+    return clusters
@@ -0,0 +1,149 @@
+"""Incremental k-NN neighborhood graph for the dashboard's explore view."""
+
+import numpy as np
+
+from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.results import ResultStore
+
+# Neighbors added around every expanded word
+NEIGHBORS_PER_WORD = 8
+
+# Distance between the centers of unconnected seed words
+SEED_SPACING = 3.0
+
+# Minimum distance of a neighbor from its center (the farthest is at 1),
+# so near-duplicates stay visible
+MIN_RADIUS = 0.1
+
+
+def empty_graph() -> dict:
+    """Create an empty neighborhood graph.
+
+    The graph is a JSON-serializable dict kept in the browser (dcc.Store):
+    "nodes" maps each word to its [x, y] position, "edges" lists
+    [word, neighbor, similarity] triples and "expanded" lists the words
+    whose neighbors have been fetched.
+    """
+    return {"nodes": {}, "edges": [], "expanded": []}
+
+
+def expand(
+    embeddings: WordEmbeddings,
+    graph: dict,
+    words: list[str],
+    k: int = NEIGHBORS_PER_WORD,
+    store: ResultStore | None = None,
+) -> dict:
+    """Fetch the neighbors of words and lay them out around them.
+
+    Only the additions are computed and returned, so the browser can append
+    them to its copy of the graph: words already expanded are skipped,
+    neighbors already placed keep their position, and the neighbors of all
+    remaining words are fetched with one batched query (rankings found in
+    store are reused).
+
+    Each new neighbor is placed around its center by a local projection:
+    the direction comes from the top two principal components of the
+    center's neighborhood, and the distance from 1 - cosine similarity
+    (scaled so the farthest neighbor is at distance 1), so closer words
+    sit closer.
+
+    Args:
+        embeddings: Embeddings to search.
+        graph: Current graph (see empty_graph()).
+        words: Words to expand. Unknown words are ignored.
+        k: Neighbors per word.
+        store: Shared result store, if any.
+
+    Returns:
+        Additions in the same format as the graph.
+    """
+    done = set(graph["expanded"])
+    todo = [w for w in dict.fromkeys(words) if w in embeddings and w not in done]
+    additions = empty_graph()
+    if not todo:
+        return additions
+
+    rankings = _neighbors(embeddings, todo, k, store)
+    placed = dict(graph["nodes"])
+
+    for word, neighbors in zip(todo, rankings):
+        if word not in placed:
+            placed[word] = additions["nodes"][word] = _seed_position(placed)
+        center = np.array(placed[word])
+
+        new = [w for w, _ in neighbors if w not in placed]
+        offsets = _local_layout(embeddings, word, neighbors)
+        for (neighbor, sim), offset in zip(neighbors, offsets):
+            additions["edges"].append([word, neighbor, round(sim, 4)])
+            if neighbor in new:
+                position = [round(float(v), 4) for v in center + offset]
+                placed[neighbor] = additions["nodes"][neighbor] = position
+        additions["expanded"].append(word)
+    return additions
+
+
+def merge(graph: dict, additions: dict) -> dict:
+    """Apply additions from expand() to a graph, returning the new graph."""
+    return {
+        "nodes": {**graph["nodes"], **additions["nodes"]},
+        "edges": graph["edges"] + additions["edges"],
+        "expanded": graph["expanded"] + additions["expanded"],
+    }
+
+
+def _neighbors(
+    embeddings: WordEmbeddings, words: list[str], k: int, store: ResultStore | None
+) -> list[list[tuple[str, float]]]:
+    """Get the k nearest neighbors of each word, batching the store misses."""
+    rankings: list = [store.get(embeddings, ("word", w), k) if store else None for w in words]
+    misses = [i for i, ranking in enumerate(rankings) if ranking is None]
+    if misses:
+        vectors = embeddings.matrix[embeddings.row_indices([words[i] for i in misses])]
+        computed = embeddings.most_similar_batch(vectors, k, [{words[i]} for i in misses])
+        for i, ranking in zip(misses, computed):
+            rankings[i] = ranking
+            if store is not None:
+                store.put(embeddings, ("word", words[i]), k, ranking)
+    return rankings
+
+
+def _seed_position(placed: dict) -> list[float]:
+    """Place a word unconnected to the graph to the right of it."""
+    if not placed:
+        return [0.0, 0.0]
+    right = max(x for x, _ in placed.values())
+    return [round(right + SEED_SPACING, 4), 0.0]
+
+
+def _local_layout(
+    embeddings: WordEmbeddings, center: str, neighbors: list[tuple[str, float]]
+) -> np.ndarray:
+    """Project a word's neighborhood to 2-D offsets around the word."""
+    if not neighbors:
+        return np.zeros((0, 2))
+    rows = embeddings.row_indices([w for w, _ in neighbors])
+    diffs = embeddings.matrix[rows] - embeddings[center]
+    spread = diffs - diffs.mean(axis=0)
+
+    # Top two principal directions of the neighborhood (SVD of k rows)
+    if len(diffs) >= 2 and np.any(spread):
+        _, _, vt = np.linalg.svd(spread, full_matrices=False)
+        coords = spread @ vt[:2].T
+        if coords.shape[1] == 1:
+            coords = np.column_stack([coords[:, 0], np.zeros(len(coords))])
+    else:
+        coords = np.zeros((len(diffs), 2))
+
+    # Spread words without a direction (identical offsets) evenly on a circle
+    lengths = np.linalg.norm(coords, axis=1)
+    angles = np.linspace(0, 2 * np.pi, len(coords), endpoint=False)
+    circle = np.column_stack([np.cos(angles), np.sin(angles)])
+    directions = np.where(
+        lengths[:, None] > 1e-9, coords / np.maximum(lengths, 1e-9)[:, None], circle
+    )
+
+    # Cosine distance, scaled so the farthest neighbor is at distance 1
+    distances = 1.0 - np.array([sim for _, sim in neighbors])
+    radius = np.maximum(distances / max(distances.max(), 1e-9), MIN_RADIUS)
+    return directions * radius[:, None]
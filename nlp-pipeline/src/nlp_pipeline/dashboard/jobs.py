@@ -0,0 +1,261 @@
+"""Background jobs for dashboard callbacks."""
+
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# Matrix rows scored between progress reports and cancellation checks
+SCAN_CHUNK_ROWS = 50_000
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that was cancelled."""
+
+
+class Job:
+    """One unit of background work and its progress."""
+
+    def __init__(self, job_id: str, fn: Callable[["Job"], Any]):
+        """Initialize job.
+
+        Args:
+            job_id: Unique job identifier.
+            fn: Work to run. Receives the job, to report progress and
+                check for cancellation.
+        """
+        self.id = job_id
+        self.fn = fn
+        self.state = "queued"
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self._cancelled = threading.Event()
+
+    def report(self, progress: float) -> None:
+        """Report progress between 0 and 1, raising if the job was cancelled.
+
+        Raises:
+            JobCancelled: If cancel() was called.
+        """
+        self.check_cancelled()
+        self.progress = min(1.0, max(0.0, progress))
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if the job was cancelled."""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.id)
+
+    def cancel(self) -> None:
+        """Ask the job to stop at its next progress report."""
+        self._cancelled.set()
+        if self.state == "queued":
+            self.state = "cancelled"
+
+    @property
+    def finished(self) -> bool:
+        """Check if the job is done, failed or cancelled."""
+        return self.state in ("done", "failed", "cancelled")
+
+    def status(self) -> dict:
+        """Get the job's state, progress and (once done) result or error."""
+        return {
+            "id": self.id,
+            "state": self.state,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"Job(id={self.id!r}, state={self.state!r}, progress={self.progress:.2f})"
+
+
+class JobRunner:
+    """Run dashboard computations on a worker pool and track their progress.
+
+    A Dash callback submits a job and returns immediately; a dcc.Interval
+    then polls status() until the job is finished, so a slow scan never
+    blocks the server thread answering other users. Submitting a job that
+    supersedes an earlier one (e.g. a new search from the same browser
+    tab) cancels the earlier job: a queued job never starts, a running one
+    stops at its next progress report.
+
+    Jobs live in process memory, so polls must reach the process that
+    accepted the job: serve the dashboard from a single process.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 1000):
+        """Initialize runner.
+
+        Args:
+            max_workers: Jobs running at the same time.
+            max_jobs: Jobs remembered for polling; the oldest finished
+                jobs are forgotten first.
+        """
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="dashboard-job")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._prefix = uuid.uuid4().hex[:8]
+
+    def submit(self, fn: Callable[[Job], Any], supersedes: str | None = None) -> str:
+        """Start a job in the background.
+
+        Args:
+            fn: Work to run. Receives the Job; long computations should
+                call job.report() regularly.
+            supersedes: Id of a job this one replaces, cancelled first.
+
+        Returns:
+            Id of the new job, for status() and cancel().
+        """
+        if supersedes is not None:
+            self.cancel(supersedes)
+        job = Job(f"{self._prefix}-{next(self._ids)}", fn)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        self._executor.submit(self._run, job)
+        return job.id
+
+    def _run(self, job: Job) -> None:
+        """Run a job, recording its result or error."""
+        if job.state == "cancelled":
+            return
+        job.state = "running"
+        try:
+            result = job.fn(job)
+        except JobCancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            logger.exception("Dashboard job %s failed", job.id)
+            job.error = str(e)
+            job.state = "failed"
+        else:
+            job.result = result
+            job.progress = 1.0
+            job.state = "done"
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job.
+
+        Returns:
+            True if the job existed and had not finished.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def status(self, job_id: str) -> dict | None:
+        """Get a job's status, or None if the job is unknown or forgotten."""
+        job = self._jobs.get(job_id)
+        return job.status() if job is not None else None
+
+    def _forget_finished(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [i for i, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        """Cancel pending jobs and stop the workers."""
+        for job in list(self._jobs.values()):
+            job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __len__(self) -> int:
+        """Get number of remembered jobs."""
+        return len(self._jobs)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"JobRunner(max_workers={self.max_workers}, jobs={len(self)})"
+
+
+def scan_neighbors(
+    embeddings: WordEmbeddings,
+    vector: np.ndarray,
+    exclude: set[str],
+    topn: int,
+    job: Job | None = None,
+    chunk_rows: int = SCAN_CHUNK_ROWS,
+) -> list[tuple[str, float]]:
+    """Find the words most similar to a vector, scanning the matrix in chunks.
+
+    Returns the same ranking as WordEmbeddings.most_similar_batch (ties in
+    vocabulary order), but reports progress and honors cancellation after
+    every chunk of rows.
+
+    Args:
+        embeddings: Embeddings to search.
+        vector: Query vector.
+        exclude: Words left out of the results.
+        topn: Number of results.
+        job: Job to report progress to, if any.
+        chunk_rows: Matrix rows per chunk.
+
+    Returns:
+        List of (word, similarity) tuples.
+
+    Raises:
+        JobCancelled: If the job was cancelled.
+    """
+    matrix = embeddings.matrix
+    norms = embeddings.norms
+    n_rows = len(matrix)
+    query = np.asarray(vector, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query))
+    excluded = embeddings.row_indices(list(exclude))
+    excluded = excluded[excluded >= 0]
+    k = min(topn, n_rows - len(excluded))
+    if k <= 0:
+        return []
+
+    candidates = []
+    scores = []
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        sims = matrix[start:stop] @ query
+        denom = norms[start:stop] * query_norm
+        np.divide(sims, denom, out=sims, where=denom > 0)
+        sims[denom == 0] = 0.0
+        local = excluded[(excluded >= start) & (excluded < stop)] - start
+        sims[local] = -np.inf
+
+        # Keep every row tied with the chunk's k-th score, so ties can be
+        # broken by vocabulary order across chunks
+        if k < len(sims):
+            threshold = sims[np.argpartition(-sims, k - 1)[:k]].min()
+            keep = np.flatnonzero(sims >= threshold)
+        else:
+            keep = np.flatnonzero(sims > -np.inf)
+        candidates.append(keep + start)
+        scores.append(sims[keep])
+        if job is not None:
+            job.report(stop / n_rows)
+
+    rows = np.concatenate(candidates)
+    sims = np.concatenate(scores)
+    order = np.lexsort((rows, -sims))[:k]
+    words = embeddings.words_at(rows[order])
+    return [(word, float(sim)) for word, sim in zip(words, sims[order])]
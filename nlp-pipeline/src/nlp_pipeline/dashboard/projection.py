@@ -0,0 +1,341 @@
+"""2-D projection of embeddings for the dashboard, cached on disk."""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the projection algorithm changes, to invalidate cached files
+PROJECTION_VERSION = 2
+
+METHODS = ("tsne", "pca")
+
+_CHUNK_SIZE = 1 << 20
+
+# Files modified more recently are rehashed every time: another write in the
+# same timestamp tick would leave their size and mtime unchanged
+_RACY_SECONDS = 2
+
+# Digests computed by this process, keyed by (path, stamp)
+_hashes: dict[tuple[str, str], str] = {}
+
+
+def compute_projection(
+    embeddings: WordEmbeddings,
+    max_words: int = 500,
+    random_state: int = 42,
+    method: str = "tsne",
+    pca_components: int = 50,
+) -> pd.DataFrame:
+    """Project the first max_words words of the vocabulary to 2-D.
+
+    Vectors wider than pca_components are first reduced with randomized
+    PCA, which keeps most of the neighborhood structure while making the
+    t-SNE neighbor search cheaper on 100-300 dimensional embeddings.
+    t-SNE then uses the Barnes-Hut approximation, O(n log n), but 100k
+    words still take tens of minutes; cache the result with
+    get_projection() or scripts/compute_projection.py. method="pca" skips
+    t-SNE entirely and projects onto the top two principal components in
+    seconds, at the cost of less separated clusters.
+
+    Args:
+        embeddings: Embeddings to project.
+        max_words: Number of words to project, in vocabulary order.
+        random_state: Seed of the PCA and t-SNE optimizations.
+        method: "tsne" or "pca".
+        pca_components: Dimensions kept before t-SNE. 0 disables the
+            pre-reduction.
+
+    Returns:
+        DataFrame with "word", "x" and "y" columns.
+
+    Raises:
+        ValueError: If method is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown projection method '{method}'. Use one of {METHODS}")
+
+    words = embeddings.vocab[:max_words]
+    # Rows follow vocab order, so the first rows are the projected words
+    vectors = embeddings.matrix[:len(words)]
+
+    n_samples = len(words)
+
+    # t-SNE requires perplexity < n_samples
+    # For very small datasets, fall back to simple 2D projection
+    if n_samples < 5 or (method == "pca" and vectors.shape[1] <= 2):
+        # Use first two dimensions or PCA-like projection
+        if vectors.shape[1] >= 2:
+            coords = vectors[:, :2]
+        else:
+            coords = np.column_stack([vectors[:, 0], np.zeros(n_samples)])
+    elif method == "pca":
+        coords = _pca(vectors, 2, random_state)
+    else:
+        if 0 < pca_components < min(vectors.shape):
+            vectors = _pca(vectors, pca_components, random_state)
+        # Perplexity must be < n_samples and typically 5-50
+        perplexity = min(30, max(2, (n_samples - 1) // 2))
+        tsne = TSNE(
+            n_components=2, random_state=random_state, perplexity=perplexity, n_jobs=-1
+        )
+        coords = tsne.fit_transform(vectors)
+
+    return pd.DataFrame({
+        "word": words,
+        "x": coords[:, 0],
+        "y": coords[:, 1]
+    })
+
+
+def _pca(vectors: np.ndarray, n_components: int, random_state: int) -> np.ndarray:
+    """Reduce vectors to n_components dimensions with randomized PCA."""
+    pca = PCA(n_components=n_components, svd_solver="randomized", random_state=random_state)
+    return pca.fit_transform(vectors)
+
+
+def file_hash(path: str | Path) -> str:
+    """Get the SHA-256 of an embeddings file, or of every file of a directory.
+
+    Hashing reads the whole file, so the digest is memoized, keyed by the
+    size and modification time (st_size, st_mtime_ns) of every file read:
+    in process memory, so the projection and clusters caches of one launch
+    share it, and in a sidecar <path>.sha256 file next to the embeddings,
+    so later launches skip the read too.
+
+    Args:
+        path: Text/binary embeddings file or native-format directory.
+
+    Returns:
+        Hex digest.
+    """
+    path = Path(path)
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    stamp = _stamp(path, files)
+    if stamp is not None:
+        key = (str(path.resolve()), stamp)
+        cached = _hashes.get(key) or _read_sidecar(path, stamp)
+        if cached is not None:
+            _hashes[key] = cached
+            return cached
+
+    digest = hashlib.sha256()
+    for file in files:
+        if path.is_dir():
+            digest.update(file.relative_to(path).as_posix().encode("utf-8") + b"\0")
+        with open(file, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+    digest = digest.hexdigest()
+
+    if stamp is not None:
+        _hashes[key] = digest
+        _write_sidecar(path, stamp, digest)
+    return digest
+
+
+def hash_sidecar(path: str | Path) -> Path:
+    """Get the file memoizing the file_hash() of embeddings."""
+    path = Path(path)
+    return path.parent / f"{path.name}.sha256"
+
+
+def _stamp(path: Path, files: list[Path]) -> str | None:
+    """Get the (name, size, mtime) of every hashed file, as a string.
+
+    Returns None if a file was modified too recently for its stamp to
+    identify its contents.
+    """
+    now = time.time_ns()
+    stats = []
+    for file in files:
+        stat = file.stat()
+        if now - stat.st_mtime_ns < _RACY_SECONDS * 1_000_000_000:
+            return None
+        name = file.relative_to(path).as_posix() if file != path else ""
+        stats.append([name, stat.st_size, stat.st_mtime_ns])
+    return json.dumps(stats)
+
+
+def _read_sidecar(path: Path, stamp: str) -> str | None:
+    """Get the digest memoized next to the embeddings, if still valid."""
+    try:
+        memo = json.loads(hash_sidecar(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(memo, dict) or memo.get("stamp") != stamp:
+        return None
+    return memo.get("sha256")
+
+
+def _write_sidecar(path: Path, stamp: str, digest: str) -> None:
+    """Memoize a digest next to the embeddings, if the directory is writable."""
+    sidecar = hash_sidecar(path)
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps({"stamp": stamp, "sha256": digest}), encoding="utf-8")
+        tmp.replace(sidecar)
+    except OSError as e:
+        logger.debug("Could not write hash sidecar %s: %s", sidecar, e)
+
+
+def cache_key(
+    embeddings_hash: str,
+    n_words: int,
+    random_state: int = 42,
+    method: str = "tsne",
+    pca_components: int = 50,
+) -> str:
+    """Get the cache key of a projection.
+
+    Args:
+        embeddings_hash: file_hash() of the embeddings.
+        n_words: Number of words projected.
+        random_state: Seed of the projection.
+        method: Projection method.
+        pca_components: Dimensions kept before t-SNE.
+
+    Returns:
+        Short hex key.
+    """
+    params = {
+        "embeddings": embeddings_hash,
+        "words": n_words,
+        "random_state": random_state,
+        "method": method,
+        "pca_components": pca_components,
+        "version": PROJECTION_VERSION,
+    }
+    encoded = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def projection_path(embeddings_path: str | Path, key: str) -> Path:
+    """Get the cache file of a projection, next to the embeddings."""
+    embeddings_path = Path(embeddings_path)
+    return embeddings_path.parent / f"{embeddings_path.name}.projection-{key}.npz"
+
+
+def cache_path(
+    embeddings_path: str | Path,
+    n_words: int,
+    random_state: int = 42,
+    method: str = "tsne",
+    pca_components: int = 50,
+) -> Path:
+    """Get the cache file of a projection of an embeddings file.
+
+    Args:
+        embeddings_path: File or directory the embeddings were loaded from.
+        n_words: Number of words projected.
+        random_state: Seed of the projection.
+        method: Projection method.
+        pca_components: Dimensions kept before t-SNE.
+
+    Returns:
+        Path of the .npz cache file (which may not exist yet).
+    """
+    key = cache_key(
+        file_hash(embeddings_path), n_words, random_state, method, pca_components
+    )
+    return projection_path(embeddings_path, key)
+
+
+def save_projection(df: pd.DataFrame, path: str | Path) -> Path:
+    """Save a projection as a compressed .npz file.
+
+    Args:
+        df: Projection with "word", "x" and "y" columns.
+        path: Output file.
+
+    Returns:
+        Path of the saved file.
+    """
+    path = Path(path)
+    # Write to a temporary file first, so readers never see a partial file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(
+            f,
+            words=np.array(df["word"].tolist(), dtype=str),
+            coords=df[["x", "y"]].to_numpy(dtype=np.float32),
+        )
+    tmp.replace(path)
+    return path
+
+
+def load_projection(path: str | Path) -> pd.DataFrame:
+    """Load a projection saved by save_projection()."""
+    with np.load(path, allow_pickle=False) as data:
+        words, coords = data["words"], data["coords"]
+    return pd.DataFrame({
+        "word": words.tolist(),
+        "x": coords[:, 0],
+        "y": coords[:, 1]
+    })
+
+
+def get_projection(
+    embeddings: WordEmbeddings,
+    embeddings_path: str | Path | None = None,
+    max_words: int = 500,
+    random_state: int = 42,
+    method: str = "tsne",
+    pca_components: int = 50,
+    recompute: bool = False,
+) -> pd.DataFrame:
+    """Get the projection of embeddings, from the on-disk cache when possible.
+
+    The cache file lives next to the embeddings and is keyed by their file
+    hash and the projection parameters, so it is reused across launches
+    and invalidated when the embeddings change. A missing cache is computed
+    and written (if the directory is writable); compute it ahead of time
+    with scripts/compute_projection.py to keep startup instant.
+
+    Args:
+        embeddings: Loaded embeddings.
+        embeddings_path: File or directory the embeddings were loaded
+            from. None disables caching.
+        max_words: Number of words to project.
+        random_state: Seed of the projection.
+        method: "tsne" or "pca" (see compute_projection()).
+        pca_components: Dimensions kept before t-SNE.
+        recompute: Ignore an existing cache file and overwrite it.
+
+    Returns:
+        DataFrame with "word", "x" and "y" columns.
+    """
+    options = {"random_state": random_state, "method": method, "pca_components": pca_components}
+    if embeddings_path is None:
+        return compute_projection(embeddings, max_words, **options)
+
+    words = embeddings.vocab[:max_words]
+    path = cache_path(embeddings_path, len(words), **options)
+
+    if path.exists() and not recompute:
+        try:
+            df = load_projection(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable projection cache %s: %s", path, e)
+        else:
+            # The same file loaded with a different limit has other words
+            if df["word"].tolist() == words:
+                return df
+            logger.warning("Projection cache %s does not match the vocabulary", path)
+
+    df = compute_projection(embeddings, max_words, **options)
+    try:
+        save_projection(df, path)
+    except OSError as e:
+        logger.warning("Could not write projection cache %s: %s", path, e)
+    return df
@@ -4,6 +4,13 @@ from pathlib import Path
 
 import numpy as np
 
+# Files of the native format written by WordEmbeddings.save()
+VECTORS_FILE = "vectors.npy"
+VOCAB_FILE = "vocab.txt"
+
+# Maximum number of similarity scores held in memory per batched scan
+_SCORE_BLOCK = 1 << 24
+
 
 class WordEmbeddings:
     """Load and query word embeddings.
@@ -12,6 +19,8 @@ class WordEmbeddings:
     - Word2Vec text format (.txt, .vec)
     - GloVe text format (.txt)
     - Binary Word2Vec format (.bin) - limited support
+    - Native format (directory with vectors.npy + vocab.txt), optionally
+      memory-mapped
 
     All formats are loaded into a common interface for querying.
     """
@@ -21,6 +30,10 @@ class WordEmbeddings:
         self._vectors: dict[str, np.ndarray] = {}
         self._dimension: int = 0
         self._source: str | None = None
+        self._matrix: np.ndarray | None = None
+        self._norms: np.ndarray | None = None
+        self._words: list[str] = []
+        self._row_index: dict[str, int] = {}
 
     @property
     def dimension(self) -> int:
@@ -37,6 +50,71 @@ class WordEmbeddings:
         """Get list of words in vocabulary."""
         return list(self._vectors.keys())
 
+    @property
+    def matrix(self) -> np.ndarray:
+        """Get all vectors as one (vocab_size, dimension) float32 array.
+
+        Rows follow vocab order. The matrix is built on first access and
+        the per-word vectors are re-pointed at its rows, so the embeddings
+        occupy a single block of memory instead of one allocation per word.
+        """
+        if self._matrix is None:
+            words = list(self._vectors)
+            if words:
+                matrix = np.stack([self._vectors[w] for w in words]).astype(
+                    np.float32, copy=False
+                )
+            else:
+                matrix = np.zeros((0, self._dimension), dtype=np.float32)
+            self._set_matrix(words, matrix)
+        return self._matrix
+
+    @property
+    def norms(self) -> np.ndarray:
+        """Get the L2 norm of every matrix row."""
+        if self._norms is None:
+            self._norms = np.linalg.norm(self.matrix, axis=1)
+        return self._norms
+
+    def _set_matrix(self, words: list[str], matrix: np.ndarray) -> None:
+        """Use matrix as storage, mapping each word to a row view."""
+        self._matrix = matrix
+        self._norms = None
+        self._vectors = dict(zip(words, matrix))
+        self._words = list(self._vectors)
+        self._row_index = {word: i for i, word in enumerate(self._words)}
+
+    def _invalidate_matrix(self) -> None:
+        """Drop the matrix after the vocabulary changed."""
+        self._matrix = None
+        self._norms = None
+
+    def row_indices(self, words: list[str]) -> np.ndarray:
+        """Get the matrix row of each word.
+
+        Args:
+            words: Words to look up.
+
+        Returns:
+            int64 array of row indices, -1 for words not in vocabulary.
+        """
+        self.matrix
+        get = self._row_index.get
+        return np.fromiter((get(w, -1) for w in words), dtype=np.int64, count=len(words))
+
+    def words_at(self, rows) -> list[str]:
+        """Get the words of matrix rows, without copying the vocabulary.
+
+        Args:
+            rows: Row indices.
+
+        Returns:
+            The word of each row.
+        """
+        self.matrix
+        words = self._words
+        return [words[i] for i in rows]
+
     def __len__(self) -> int:
         """Get vocabulary size."""
         return len(self._vectors)
@@ -85,6 +163,7 @@ class WordEmbeddings:
         else:
             self._load_text(path, limit, has_header=True)
 
+        self._invalidate_matrix()
         return self
 
     def load_glove_format(
@@ -104,6 +183,7 @@ class WordEmbeddings:
         path = Path(path)
         self._source = str(path)
         self._load_text(path, limit, has_header=False)
+        self._invalidate_matrix()
         return self
 
     def _load_text(
@@ -172,6 +252,65 @@ class WordEmbeddings:
                     self._vectors[word] = vector.copy()
                     count += 1
 
+    def save(self, path: str | Path) -> Path:
+        """Save embeddings in the native format.
+
+        Writes a directory with vectors.npy (the float32 matrix) and
+        vocab.txt (one word per line, in row order). Loading it back needs
+        no parsing and can memory-map the matrix.
+
+        Args:
+            path: Output directory (created if missing).
+
+        Returns:
+            Path to the directory.
+
+        Raises:
+            ValueError: If a word contains a newline.
+        """
+        path = Path(path)
+        words = self.vocab
+        if any("\n" in word for word in words):
+            raise ValueError("Words containing newlines cannot be saved")
+
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / VECTORS_FILE, self.matrix)
+        with open(path / VOCAB_FILE, "w", encoding="utf-8", newline="") as f:
+            f.writelines(word + "\n" for word in words)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = False) -> "WordEmbeddings":
+        """Load embeddings saved with save().
+
+        Args:
+            path: Directory written by save().
+            mmap: Memory-map the matrix read-only instead of reading it.
+                Pages are loaded on demand and shared through the OS page
+                cache by every process mapping the same file.
+
+        Returns:
+            WordEmbeddings instance.
+
+        Raises:
+            ValueError: If vocabulary and matrix sizes disagree.
+        """
+        path = Path(path)
+        matrix = np.load(path / VECTORS_FILE, mmap_mode="r" if mmap else None)
+        with open(path / VOCAB_FILE, encoding="utf-8", newline="") as f:
+            words = f.read().split("\n")[:-1]
+
+        if matrix.ndim != 2 or len(words) != matrix.shape[0]:
+            raise ValueError(
+                f"Vocabulary has {len(words)} words but matrix has shape {matrix.shape}"
+            )
+
+        embeddings = cls()
+        embeddings._source = str(path)
+        embeddings._dimension = matrix.shape[1]
+        embeddings._set_matrix(words, matrix)
+        return embeddings
+
     def similarity(self, word1: str, word2: str) -> float:
         """Calculate cosine similarity between two words.
 
@@ -241,15 +380,83 @@ class WordEmbeddings:
         exclude: set[str],
     ) -> list[tuple[str, float]]:
         """Internal method to find similar words."""
-        similarities = []
-        for word, vec in self._vectors.items():
-            if word in exclude:
-                continue
-            sim = self._cosine_similarity(vector, vec)
-            similarities.append((word, sim))
+        return self.most_similar_batch(np.asarray(vector)[None, :], topn, [exclude])[0]
+
+    def most_similar_batch(
+        self,
+        vectors: np.ndarray,
+        topn: int = 10,
+        exclude: list[set[str]] | None = None,
+    ) -> list[list[tuple[str, float]]]:
+        """Find the most similar words to several query vectors at once.
+
+        All queries are scored against the embedding matrix with one matrix
+        product (in blocks for very large batches) instead of one
+        vocabulary scan per query. Ties are broken by vocabulary order.
+
+        Args:
+            vectors: Query vectors of shape (n_queries, dimension).
+            topn: Number of results per query.
+            exclude: Words to leave out of each query's results.
+
+        Returns:
+            One list of (word, similarity) tuples per query.
+        """
+        matrix = self.matrix
+        norms = self.norms
+        queries = np.asarray(vectors, dtype=np.float32)
+        query_norms = np.linalg.norm(queries, axis=1)
+        block = max(1, _SCORE_BLOCK // max(len(matrix), 1))
+
+        results = []
+        for start in range(0, len(queries), block):
+            scores = queries[start : start + block] @ matrix.T
+            denom = np.outer(query_norms[start : start + block], norms)
+            np.divide(scores, denom, out=scores, where=denom > 0)
+            scores[denom == 0] = 0.0
+
+            for i, sims in enumerate(scores, start):
+                excluded = exclude[i] if exclude is not None else ()
+                rows = {self._row_index[w] for w in excluded if w in self._row_index}
+                if rows:
+                    sims[list(rows)] = -np.inf
+                results.append(self._top_k(sims, min(topn, len(sims) - len(rows))))
+        return results
+
+    def _top_k(self, sims: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Select the k highest scores, ties in vocabulary order."""
+        if k <= 0:
+            return []
+        if k < len(sims):
+            threshold = sims[np.argpartition(-sims, k - 1)[:k]].min()
+            candidates = np.flatnonzero(sims >= threshold)
+        else:
+            candidates = np.flatnonzero(sims > -np.inf)
+        top = candidates[np.lexsort((candidates, -sims[candidates]))[:k]]
+        return [(self._words[i], float(sims[i])) for i in top]
+
+    def similarity_batch(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Calculate cosine similarities for several word pairs at once.
+
+        Args:
+            pairs: (word1, word2) tuples.
+
+        Returns:
+            Cosine similarity of each pair.
+
+        Raises:
+            KeyError: If any word not in vocabulary.
+        """
+        matrix = self.matrix
+        norms = self.norms
+        index = self._row_index
+        rows1 = np.fromiter((index[a] for a, _ in pairs), dtype=np.intp, count=len(pairs))
+        rows2 = np.fromiter((index[b] for _, b in pairs), dtype=np.intp, count=len(pairs))
 
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:topn]
+        dots = np.einsum("ij,ij->i", matrix[rows1], matrix[rows2])
+        denom = norms[rows1] * norms[rows2]
+        sims = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+        return sims.tolist()
 
     def analogy(
         self,
@@ -270,24 +477,34 @@ class WordEmbeddings:
         Returns:
             List of (word, similarity) tuples.
         """
+        result = self.analogy_vector(positive, negative)
+        return self._most_similar_to_vector(result, topn, set(positive) | set(negative))
+
+    def analogy_vector(self, positive: list[str], negative: list[str]) -> np.ndarray:
+        """Build the normalized query vector of an analogy.
+
+        Args:
+            positive: Words to add.
+            negative: Words to subtract.
+
+        Returns:
+            Unit-length sum of positive minus negative vectors.
+        """
         # Build result vector
         result = np.zeros(self._dimension, dtype=np.float32)
 
-        exclude = set()
         for word in positive:
             result += self._vectors[word]
-            exclude.add(word)
 
         for word in negative:
             result -= self._vectors[word]
-            exclude.add(word)
 
         # Normalize
         norm = np.linalg.norm(result)
         if norm > 0:
             result /= norm
 
-        return self._most_similar_to_vector(result, topn, exclude)
+        return result
 
     def doesnt_match(self, words: list[str]) -> str:
         """Find the word that doesn't match the others.
@@ -334,6 +551,7 @@ class WordEmbeddings:
                 f"embedding dimension {self._dimension}"
             )
         self._vectors[word] = np.array(vector, dtype=np.float32)
+        self._invalidate_matrix()
 
     @classmethod
     def from_dict(
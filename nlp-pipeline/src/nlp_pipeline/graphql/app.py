@@ -1,41 +1,107 @@
 """Flask application for GraphQL API."""
 
-from flask import Flask, jsonify, request
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, Response, g, jsonify, request
+from graphql import ExecutionResult
 
 from nlp_pipeline.embeddings import WordEmbeddings
-from nlp_pipeline.graphql.schema import schema, set_embeddings
-
-# Simple HTML for GraphiQL interface
-GRAPHIQL_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>NLP Pipeline GraphQL</title>
-    <link href="https://unpkg.com/graphiql/graphiql.min.css" rel="stylesheet" />
-</head>
-<body style="margin: 0;">
-    <div id="graphiql" style="height: 100vh;"></div>
-    <script crossorigin src="https://unpkg.com/react/umd/react.production.min.js"></script>
-    <script crossorigin src="https://unpkg.com/react-dom/umd/react-dom.production.min.js"></script>
-    <script crossorigin src="https://unpkg.com/graphiql/graphiql.min.js"></script>
-    <script>
-        const fetcher = GraphiQL.createFetcher({ url: '/graphql' });
-        ReactDOM.render(
-            React.createElement(GraphiQL, { fetcher: fetcher }),
-            document.getElementById('graphiql'),
-        );
-    </script>
-</body>
-</html>
-"""
-
-
-def create_app(embeddings: WordEmbeddings | None = None) -> Flask:
+from nlp_pipeline.graphql.cost import CostLimiter, CostLimitExceeded
+from nlp_pipeline.graphql.http import (
+    API_INFO,
+    GRAPHIQL_HTML,
+    batch_error,
+    format_result,
+    is_authorized,
+    is_persisted_query_miss,
+    is_runnable,
+    retry_after,
+)
+from nlp_pipeline.graphql.metrics import CONTENT_TYPE, Metrics
+from nlp_pipeline.graphql.registry import ModelRegistry
+from nlp_pipeline.graphql.reload import EmbeddingsReloader
+from nlp_pipeline.graphql.schema import (
+    document_cache,
+    execute,
+    execute_batch,
+    get_embeddings,
+    set_embeddings,
+    set_registry,
+    versions,
+)
+from nlp_pipeline.graphql.vectors import (
+    DTYPES,
+    encode_base64,
+    gather_vectors,
+    npy_chunks,
+    npy_header,
+)
+from nlp_pipeline.results import default_store
+
+
+def create_app(
+    embeddings: WordEmbeddings | None = None,
+    max_batch_size: int = 1000,
+    batch_workers: int = 0,
+    batch_chunk_size: int = 256,
+    max_vector_words: int = 10_000,
+    max_query_cost: int | None = 10_000,
+    client_cost_rate: float | None = None,
+    client_cost_burst: int | None = None,
+    max_request_cost: int | None = None,
+    metrics: bool = True,
+    slow_query_seconds: float | None = None,
+    reloader: EmbeddingsReloader | None = None,
+    admin_token: str | None = None,
+    registry: ModelRegistry | None = None,
+) -> Flask:
     """Create Flask app with GraphQL endpoint.
 
+    The endpoint also accepts a JSON array of operations (Apollo-style
+    batching) and returns an array of results in the same order.
+
+    Every operation's cost is estimated before execution (see
+    nlp_pipeline.graphql.cost); operations over max_query_cost are
+    rejected, as are batched POSTs whose operations together cost more
+    than max_request_cost. With client_cost_rate set each client address
+    gets a cost budget, answered with 429 once exhausted.
+
+    With metrics enabled, per-route request latency, root resolver latency
+    and cache and memory gauges are served at /metrics in the Prometheus
+    text format.
+
+    With admin_token set, /admin/embeddings reports the served embeddings
+    versions and POST /admin/reload starts a background reload through
+    reloader; both require "Authorization: Bearer <admin_token>".
+
+    With a registry, every field takes a model argument selecting one of
+    its named models instead of the default embeddings.
+
     Args:
         embeddings: WordEmbeddings instance to use. If None, must call
             set_embeddings() before making queries.
+        max_batch_size: Maximum number of operations in one batched POST.
+        batch_workers: Threads executing chunks of large batches in
+            parallel. 0 executes every batch on the request thread.
+        batch_chunk_size: Operations per parallel chunk.
+        max_vector_words: Maximum number of words per /vectors request.
+        max_query_cost: Maximum estimated cost per operation. None disables
+            cost analysis.
+        client_cost_rate: Cost units per second each client may spend.
+            None disables per-client budgets.
+        client_cost_burst: Cost units a client may spend at once. Defaults
+            to max_request_cost.
+        max_request_cost: Maximum summed cost of the operations of one
+            batched POST. Defaults to max_query_cost.
+        metrics: Collect metrics and serve them at /metrics.
+        slow_query_seconds: Log operations slower than this many seconds
+            (requires metrics). None disables the slow query log.
+        reloader: Reloader used by POST /admin/reload.
+        admin_token: Token required by the /admin endpoints. The
+            endpoints are disabled if None.
+        registry: Named models selectable with the model argument.
 
     Returns:
         Flask application.
@@ -44,6 +110,49 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Flask:
 
     if embeddings is not None:
         set_embeddings(embeddings)
+    if registry is not None:
+        set_registry(registry)
+
+    executor = ThreadPoolExecutor(batch_workers) if batch_workers > 0 else None
+    cost_limiter = None
+    if max_query_cost is not None:
+        cost_limiter = CostLimiter(
+            max_query_cost, client_cost_rate, client_cost_burst,
+            max_request_cost=max_request_cost,
+        )
+    collector = Metrics(slow_query_seconds) if metrics else None
+
+    if collector is not None:
+
+        @app.before_request
+        def start_timer():
+            """Remember when the request started."""
+            g.request_start = time.perf_counter()
+
+        @app.after_request
+        def record_request(response):
+            """Record the request latency by route."""
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            collector.observe_request(
+                request.method,
+                route,
+                response.status_code,
+                time.perf_counter() - g.request_start,
+            )
+            return response
+
+        @app.route("/metrics")
+        def metrics_endpoint():
+            """Serve metrics in the Prometheus text format."""
+            try:
+                emb = get_embeddings()
+            except RuntimeError:
+                emb = None
+            text = collector.render(
+                emb, document_cache, cost_limiter, versions=versions, registry=registry,
+                result_store=default_store,
+            )
+            return Response(text, content_type=CONTENT_TYPE)
 
     @app.route("/graphql", methods=["GET"])
     def graphiql():
@@ -55,6 +164,9 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Flask:
         """Handle GraphQL queries."""
         data = request.get_json()
 
+        if isinstance(data, list):
+            return graphql_batch(data)
+
         if not data:
             return jsonify({"errors": [{"message": "No query provided"}]}), 400
 
@@ -62,23 +174,145 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Flask:
         variables = data.get("variables")
         operation_name = data.get("operationName")
 
-        result = schema.execute(
+        result = execute(
             query,
             variables=variables,
             operation_name=operation_name,
+            extensions=data.get("extensions"),
+            cost_limiter=cost_limiter,
+            client=request.remote_addr,
+            metrics=collector,
         )
 
-        response = {}
-        if result.data:
-            response["data"] = result.data
-        if result.errors:
-            response["errors"] = [
-                {"message": str(e), "locations": e.locations, "path": e.path}
-                for e in result.errors
+        wait = retry_after(result)
+        if wait is not None:
+            return jsonify(format_result(result)), 429, {"Retry-After": str(wait)}
+
+        # Persisted query misses are part of the protocol: the client
+        # retries with the full query, so they are not bad requests
+        status = 200 if not result.errors or is_persisted_query_miss(result) else 400
+        return jsonify(format_result(result)), status
+
+    def graphql_batch(operations: list):
+        """Handle a JSON array of GraphQL operations."""
+        error = batch_error(operations, max_batch_size)
+        if error:
+            return jsonify({"errors": [{"message": error}]}), 400
+
+        valid = [i for i, op in enumerate(operations) if is_runnable(op)]
+        responses = [{"errors": [{"message": "No query provided"}]}] * len(operations)
+        try:
+            results = execute_batch(
+                [operations[i] for i in valid],
+                executor=executor,
+                chunk_size=batch_chunk_size,
+                cost_limiter=cost_limiter,
+                client=request.remote_addr,
+                metrics=collector,
+            )
+        except CostLimitExceeded as exc:
+            result = ExecutionResult(data=None, errors=[exc.error])
+            wait = retry_after(result)
+            if wait is not None:
+                return jsonify(format_result(result)), 429, {"Retry-After": str(wait)}
+            return jsonify(format_result(result)), 400
+        for i, result in zip(valid, results):
+            responses[i] = format_result(result)
+        return jsonify(responses), 200
+
+    @app.route("/vectors", methods=["GET", "POST"])
+    def vectors():
+        """Get the vectors of several words as base64 JSON or a .npy payload.
+
+        GET takes ?words=a,b,c (or repeated ?word=), POST a JSON body with
+        "words". Optional "dtype" is float32 (default) or float16, optional
+        "format" is json (default) or npy; "Accept: application/octet-stream"
+        also selects npy.
+        """
+        if request.method == "POST":
+            params = request.get_json(silent=True) or {}
+            words = params.get("words")
+        else:
+            params = request.args
+            words = request.args.getlist("word") or [
+                w for w in request.args.get("words", "").split(",") if w
             ]
+        dtype = params.get("dtype", "float32")
+        fmt = params.get("format")
+        if fmt is None:
+            wants_binary = request.accept_mimetypes.best == "application/octet-stream"
+            fmt = "npy" if wants_binary else "json"
+
+        error = None
+        if not words or not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+            error = "Provide a non-empty list of words"
+        elif len(words) > max_vector_words:
+            error = f"Request for {len(words)} words exceeds limit of {max_vector_words}"
+        elif dtype not in DTYPES:
+            error = f"dtype must be one of {list(DTYPES)}"
+        elif fmt not in ("json", "npy"):
+            error = "format must be 'json' or 'npy'"
+        if error:
+            return jsonify({"errors": [{"message": error}]}), 400
+
+        try:
+            emb = get_embeddings()
+        except RuntimeError as e:
+            return jsonify({"errors": [{"message": str(e)}]}), 503
+
+        found, missing, array = gather_vectors(emb, words, dtype)
+        if fmt == "npy":
+            response = Response(npy_chunks(array), mimetype="application/octet-stream")
+            response.headers["Content-Length"] = str(len(npy_header(array)) + array.nbytes)
+            response.headers["Content-Disposition"] = "attachment; filename=vectors.npy"
+            response.headers["X-Missing-Words"] = json.dumps(missing)
+            return response
+
+        return jsonify({
+            "words": found,
+            "missing": missing,
+            "dimension": emb.dimension,
+            "dtype": dtype,
+            "shape": list(array.shape),
+            "data": encode_base64(array),
+        })
+
+    if admin_token:
+
+        def unauthorized():
+            """Response for requests without a valid admin token."""
+            response = jsonify({"errors": [{"message": "Unauthorized"}]})
+            response.headers["WWW-Authenticate"] = "Bearer"
+            return response, 401
 
-        status = 200 if not result.errors else 400
-        return jsonify(response), status
+        @app.route("/admin/embeddings")
+        def admin_embeddings():
+            """Report the served embeddings versions and the last reload."""
+            if not is_authorized(request.headers.get("Authorization"), admin_token):
+                return unauthorized()
+            return jsonify({
+                "versions": versions.info(),
+                "reload": reloader.status() if reloader is not None else None,
+                "models": registry.info() if registry is not None else [],
+            })
+
+        @app.route("/admin/reload", methods=["POST"])
+        def admin_reload():
+            """Start reloading the embeddings in the background.
+
+            Takes an optional JSON body with the "path" to load; without
+            one the default source is reloaded.
+            """
+            if not is_authorized(request.headers.get("Authorization"), admin_token):
+                return unauthorized()
+            if reloader is None:
+                return jsonify({"errors": [{"message": "Reloading is not configured"}]}), 404
+            path = (request.get_json(silent=True) or {}).get("path")
+            if path is not None and not isinstance(path, str):
+                return jsonify({"errors": [{"message": "path must be a string"}]}), 400
+            if not reloader.start(path):
+                return jsonify({"errors": [{"message": "A reload is already running"}]}), 409
+            return jsonify(reloader.status()), 202
 
     @app.route("/health")
     def health():
@@ -88,20 +322,6 @@ def create_app(embeddings: WordEmbeddings | None = None) -> Flask:
     @app.route("/")
     def index():
         """Root endpoint with API info."""
-        return jsonify({
-            "name": "NLP Pipeline GraphQL API",
-            "version": "1.0.0",
-            "endpoints": {
-                "graphql": "/graphql",
-                "graphiql": "/graphql (GET in browser)",
-                "health": "/health",
-            },
-            "example_queries": {
-                "info": "{ info { vocabSize dimension } }",
-                "similarity": '{ similarity(word1: "king", word2: "queen") }',
-                "most_similar": '{ mostSimilar(word: "king", topN: 5) { word similarity } }',
-                "analogy": '{ analogy(positive: ["king", "woman"], negative: ["man"]) { word similarity } }',
-            },
-        })
+        return jsonify(API_INFO)
 
     return app
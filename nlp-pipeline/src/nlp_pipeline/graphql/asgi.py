@@ -0,0 +1,400 @@
+"""ASGI application for GraphQL API."""
+
+import asyncio
+import json
+import time
+
+from graphql import ExecutionResult, GraphQLError
+
+from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.graphql.cost import CostLimiter
+from nlp_pipeline.graphql.http import (
+    API_INFO,
+    GRAPHIQL_HTML,
+    batch_error,
+    format_result,
+    is_authorized,
+    is_persisted_query_miss,
+    is_runnable,
+    retry_after,
+)
+from nlp_pipeline.graphql.loaders import BusyError, Offloader
+from nlp_pipeline.graphql.metrics import CONTENT_TYPE, Metrics
+from nlp_pipeline.graphql.registry import ModelRegistry
+from nlp_pipeline.graphql.reload import EmbeddingsReloader
+from nlp_pipeline.graphql.schema import (
+    check_batch_cost,
+    create_context,
+    document_cache,
+    execute_operation,
+    finish_context,
+    get_embeddings,
+    set_embeddings,
+    set_registry,
+    versions,
+)
+from nlp_pipeline.results import default_store
+
+TIMEOUT = "TIMEOUT"
+
+# Endpoints served by this app (the binary /vectors route is Flask only)
+ASGI_API_INFO = {
+    **API_INFO,
+    "endpoints": {k: v for k, v in API_INFO["endpoints"].items() if k != "vectors"},
+}
+
+ROUTES = ("/", "/graphql", "/health", "/metrics", "/admin/embeddings", "/admin/reload")
+
+
+class GraphQLASGIApp:
+    """Asynchronous GraphQL API as a plain ASGI application.
+
+    Requests are executed with schema.execute_async semantics on the event
+    loop, while the batched similarity computations (mostSimilar, analogy,
+    similarity) run on a bounded thread pool. Cheap fields such as info or
+    hasWord therefore answer immediately even while heavy scans are in
+    progress.
+
+    Backpressure: when max_pending batches are already running or queued,
+    further heavy fields fail fast and the response is 503 with
+    Retry-After. Every operation also gets a timeout; an operation that
+    exceeds it returns 504 (or a TIMEOUT error inside a batch). Estimated
+    query costs are limited as in create_app(): 400 over max_query_cost
+    (or max_request_cost for a whole batch), 429 once a client's budget is
+    spent. Metrics (/metrics) and the admin
+    endpoints (/admin/embeddings, /admin/reload) work as in create_app().
+
+    Serve it with any ASGI server, e.g. uvicorn or gunicorn's
+    uvicorn.workers.UvicornWorker.
+    """
+
+    def __init__(
+        self,
+        embeddings: WordEmbeddings | None = None,
+        max_workers: int = 4,
+        max_pending: int = 64,
+        timeout: float = 10.0,
+        max_batch_size: int = 1000,
+        max_body_size: int = 1 << 20,
+        max_query_cost: int | None = 10_000,
+        client_cost_rate: float | None = None,
+        client_cost_burst: int | None = None,
+        max_request_cost: int | None = None,
+        metrics: bool = True,
+        slow_query_seconds: float | None = None,
+        reloader: EmbeddingsReloader | None = None,
+        admin_token: str | None = None,
+        registry: ModelRegistry | None = None,
+    ):
+        """Initialize app.
+
+        Args:
+            embeddings: WordEmbeddings instance to use. If None, must call
+                set_embeddings() before making queries.
+            max_workers: Threads computing similarity batches.
+            max_pending: Maximum similarity batches running or queued.
+            timeout: Seconds an operation may take before it is abandoned.
+            max_batch_size: Maximum number of operations in one batched POST.
+            max_body_size: Maximum request body size in bytes.
+            max_query_cost: Maximum estimated cost per operation. None
+                disables cost analysis.
+            client_cost_rate: Cost units per second each client may spend.
+                None disables per-client budgets.
+            client_cost_burst: Cost units a client may spend at once.
+                Defaults to max_request_cost.
+            max_request_cost: Maximum summed cost of the operations of
+                one batched POST. Defaults to max_query_cost.
+            metrics: Collect metrics and serve them at /metrics.
+            slow_query_seconds: Log operations slower than this many
+                seconds (requires metrics). None disables the log.
+            reloader: Reloader used by POST /admin/reload.
+            admin_token: Token required by the /admin endpoints. The
+                endpoints are disabled if None.
+            registry: Named models selectable with the model argument.
+        """
+        if embeddings is not None:
+            set_embeddings(embeddings)
+        if registry is not None:
+            set_registry(registry)
+        self.offloader = Offloader(max_workers, max_pending)
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.max_body_size = max_body_size
+        self.cost_limiter = None
+        if max_query_cost is not None:
+            self.cost_limiter = CostLimiter(
+                max_query_cost, client_cost_rate, client_cost_burst,
+                max_request_cost=max_request_cost,
+            )
+        self.metrics = Metrics(slow_query_seconds) if metrics else None
+        self.reloader = reloader
+        self.admin_token = admin_token
+        self.registry = registry
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if self.metrics is None:
+            await self._route(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self._route(scope, receive, send_with_status)
+        finally:
+            route = scope["path"] if scope["path"] in ROUTES else "<unmatched>"
+            self.metrics.observe_request(
+                scope["method"], route, status, time.perf_counter() - start
+            )
+
+    async def _route(self, scope: dict, receive, send) -> None:
+        """Dispatch an HTTP request to its handler."""
+        method, path = scope["method"], scope["path"]
+        if path == "/graphql" and method == "POST":
+            await self._graphql(scope, receive, send)
+        elif path == "/graphql" and method == "GET":
+            await _send(send, 200, GRAPHIQL_HTML.encode("utf-8"), "text/html; charset=utf-8")
+        elif path == "/health":
+            await _send_json(send, 200, {"status": "ok"})
+        elif path == "/metrics" and self.metrics is not None:
+            await _send(send, 200, self._render_metrics().encode("utf-8"), CONTENT_TYPE)
+        elif path.startswith("/admin/") and self.admin_token:
+            await self._admin(scope, receive, send)
+        elif path == "/":
+            await _send_json(send, 200, ASGI_API_INFO)
+        else:
+            await _send_json(send, 404, {"errors": [{"message": "Not found"}]})
+
+    def _render_metrics(self) -> str:
+        """Render metrics in the Prometheus text format."""
+        try:
+            emb = get_embeddings()
+        except RuntimeError:
+            emb = None
+        return self.metrics.render(
+            emb, document_cache, self.cost_limiter, self.offloader, versions, self.registry,
+            default_store,
+        )
+
+    async def _admin(self, scope: dict, receive, send) -> None:
+        """Handle the token-protected admin endpoints."""
+        method, path = scope["method"], scope["path"]
+        if not is_authorized(_header(scope, b"authorization"), self.admin_token):
+            await _send_json(
+                send, 401, {"errors": [{"message": "Unauthorized"}]},
+                [(b"www-authenticate", b"Bearer")],
+            )
+        elif path == "/admin/embeddings" and method == "GET":
+            await _send_json(send, 200, {
+                "versions": versions.info(),
+                "reload": self.reloader.status() if self.reloader is not None else None,
+                "models": self.registry.info() if self.registry is not None else [],
+            })
+        elif path == "/admin/reload" and method == "POST":
+            await self._reload(receive, send)
+        else:
+            await _send_json(send, 404, {"errors": [{"message": "Not found"}]})
+
+    async def _reload(self, receive, send) -> None:
+        """Start a background reload (POST /admin/reload)."""
+        if self.reloader is None:
+            await _send_json(send, 404, {"errors": [{"message": "Reloading is not configured"}]})
+            return
+        body = await _read_body(receive, self.max_body_size)
+        if body is None:
+            await _send_json(send, 413, {"errors": [{"message": "Request body too large"}]})
+            return
+        try:
+            params = json.loads(body) if body else {}
+        except ValueError:
+            params = None
+        path = params.get("path") if isinstance(params, dict) else None
+        if params is None or (path is not None and not isinstance(path, str)):
+            await _send_json(send, 400, {"errors": [{"message": "path must be a string"}]})
+        elif not self.reloader.start(path):
+            await _send_json(send, 409, {"errors": [{"message": "A reload is already running"}]})
+        else:
+            await _send_json(send, 202, self.reloader.status())
+
+    async def _lifespan(self, receive, send) -> None:
+        """Handle server startup and shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.offloader.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _graphql(self, scope: dict, receive, send) -> None:
+        """Handle a single or batched GraphQL POST."""
+        body = await _read_body(receive, self.max_body_size)
+        if body is None:
+            await _send_json(send, 413, {"errors": [{"message": "Request body too large"}]})
+            return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            await _send_json(send, 400, {"errors": [{"message": "Invalid JSON body"}]})
+            return
+
+        if isinstance(data, list):
+            error = batch_error(data, self.max_batch_size)
+        elif not data or not isinstance(data, dict):
+            error = "No query provided"
+        else:
+            error = None
+        if error:
+            await _send_json(send, 400, {"errors": [{"message": error}]})
+            return
+
+        client = scope["client"][0] if scope.get("client") else None
+        context = create_context(self.offloader, self.cost_limiter, client, self.metrics)
+        rejection = None
+        try:
+            if isinstance(data, list):
+                # Estimate the whole batch first: its summed cost is checked
+                # and charged to the client once
+                indexes = [i for i, op in enumerate(data) if is_runnable(op)]
+                rejection, costs = check_batch_cost([data[i] for i in indexes], context)
+                costs = dict(zip(indexes, costs))
+                if rejection is None:
+                    results = await asyncio.gather(*(
+                        self._run(op, context, costs[i]) if i in costs else _no_query()
+                        for i, op in enumerate(data)
+                    ))
+                else:
+                    result = ExecutionResult(data=None, errors=[rejection])
+            else:
+                result = await self._run(data, context)
+        finally:
+            finish_context(context)
+
+        if isinstance(data, list) and rejection is None:
+            await _send_json(send, 200, [format_result(r) for r in results])
+            return
+
+        headers = []
+        wait = retry_after(result)
+        if wait is not None:
+            status = 429
+            headers.append((b"retry-after", str(wait).encode("latin-1")))
+        elif _has_error(result, lambda e: isinstance(e.original_error, BusyError)):
+            status = 503
+            headers.append((b"retry-after", b"1"))
+        elif _has_error(result, lambda e: (e.extensions or {}).get("code") == TIMEOUT):
+            status = 504
+        elif not result.errors or is_persisted_query_miss(result):
+            status = 200
+        else:
+            status = 400
+        await _send_json(send, status, format_result(result), headers)
+
+    async def _run(
+        self, operation: dict, context: dict, cost: int | None = None
+    ) -> ExecutionResult:
+        """Execute one operation with the per-operation timeout.
+
+        cost is the operation's estimate from check_batch_cost(), if any.
+        """
+        try:
+            return await asyncio.wait_for(
+                execute_operation(
+                    operation.get("query"),
+                    operation.get("variables"),
+                    operation.get("operationName"),
+                    operation.get("extensions"),
+                    context,
+                    cost,
+                ),
+                self.timeout,
+            )
+        except asyncio.TimeoutError:
+            error = GraphQLError(
+                f"Query timed out after {self.timeout:g}s",
+                extensions={"code": TIMEOUT},
+            )
+            return ExecutionResult(data=None, errors=[error])
+
+
+def create_asgi_app(embeddings: WordEmbeddings | None = None, **options) -> GraphQLASGIApp:
+    """Create the ASGI app with GraphQL endpoint.
+
+    Args:
+        embeddings: WordEmbeddings instance to use. If None, must call
+            set_embeddings() before making queries.
+        **options: Limits passed to GraphQLASGIApp (max_workers,
+            max_pending, timeout, max_batch_size, max_body_size,
+            max_query_cost, client_cost_rate, client_cost_burst,
+            max_request_cost, metrics, slow_query_seconds, reloader,
+            admin_token, registry).
+
+    Returns:
+        ASGI application.
+    """
+    return GraphQLASGIApp(embeddings, **options)
+
+
+async def _no_query() -> ExecutionResult:
+    """Result for a batch entry without a query."""
+    return ExecutionResult(data=None, errors=[GraphQLError("No query provided")])
+
+
+def _has_error(result: ExecutionResult, predicate) -> bool:
+    """Check if any error of a result matches predicate."""
+    return any(predicate(e) for e in result.errors or ())
+
+
+def _header(scope: dict, name: bytes) -> str | None:
+    """Get a request header by lowercase name."""
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _read_body(receive, limit: int) -> bytes | None:
+    """Read the request body, or None if it exceeds limit bytes."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, body: bytes, content_type: str, headers=()) -> None:
+    """Send a complete HTTP response."""
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, data, headers=()) -> None:
+    """Send a JSON response."""
+    await _send(send, status, json.dumps(data).encode("utf-8"), "application/json", headers)
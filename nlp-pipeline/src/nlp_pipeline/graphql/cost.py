@@ -0,0 +1,342 @@
+"""Static query cost analysis and per-client cost budgets."""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    GraphQLError,
+    GraphQLIncludeDirective,
+    GraphQLNamedType,
+    GraphQLSchema,
+    GraphQLSkipDirective,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    is_leaf_type,
+)
+from graphql.execution.values import (
+    get_argument_values,
+    get_directive_values,
+    get_variable_values,
+)
+from graphql.type.introspection import SchemaMetaFieldDef, TypeMetaFieldDef
+
+QUERY_TOO_COMPLEX = "QUERY_TOO_COMPLEX"
+RATE_LIMITED = "RATE_LIMITED"
+
+# Vocabulary words scanned per cost unit
+SCAN_WORDS_PER_UNIT = 10_000
+
+
+def scan_cost(vocab_size: int) -> int:
+    """Get the cost of one pass over the vocabulary."""
+    return max(1, math.ceil(vocab_size / SCAN_WORDS_PER_UNIT))
+
+
+def _result_size(n, vocab_size: int) -> int:
+    """Get the number of results a top-n/limit argument can produce."""
+    return max(0, min(n or 0, vocab_size))
+
+
+def _neighbors_cost(args: dict, vocab_size: int) -> tuple[int, int]:
+    """Cost of mostSimilar/analogy: a scan plus input words plus results."""
+    top_n = _result_size(args.get("top_n", 10), vocab_size)
+    words = len(args.get("positive") or ()) + len(args.get("negative") or ())
+    return scan_cost(vocab_size) + words + top_n, top_n
+
+
+def _search_vocab_cost(args: dict, vocab_size: int) -> tuple[int, int]:
+    """Cost of searchVocab: a scan plus results."""
+    limit = _result_size(args.get("limit", 20), vocab_size)
+    return scan_cost(vocab_size) + limit, limit
+
+
+def _words_cost(args: dict, vocab_size: int) -> tuple[int, int]:
+    """Cost of fields doing one lookup per word of a list argument."""
+    return 1 + len(args.get("words") or ()), 1
+
+
+# Cost functions of "Type.field": (arguments, vocab size) -> (cost of the
+# field itself, number of items its sub-selection is resolved for). Other
+# fields cost 1 if they are root fields or return objects, 0 otherwise.
+FIELD_COSTS: dict[str, Callable[[dict, int], tuple[int, int]]] = {
+    "Query.mostSimilar": _neighbors_cost,
+    "Query.analogy": _neighbors_cost,
+    "Query.searchVocab": _search_vocab_cost,
+    "Query.doesntMatch": _words_cost,
+    "Query.wordVectors": _words_cost,
+}
+
+
+def estimate_cost(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    vocab_size: int | Callable[[str | None], int],
+    variables: dict | None = None,
+    operation_name: str | None = None,
+) -> int:
+    """Estimate the cost of executing a validated document, without executing it.
+
+    Costs grow with vocabulary scans (mostSimilar, analogy, searchVocab),
+    requested result counts (topN, limit) and list arguments (words,
+    positive, negative). Aliased fields and fragments are counted every
+    time they appear, and a sub-selection is counted once per list item.
+
+    Args:
+        schema: Schema the document was validated against.
+        document: Parsed and validated document.
+        vocab_size: Number of words in the served embeddings, or a
+            function mapping a field's model argument to the size of that
+            model's vocabulary.
+        variables: Variable values of the request.
+        operation_name: Operation to run if the document has several.
+
+    Returns:
+        Estimated cost. 0 if the operation or its variables are invalid;
+        execution reports those errors.
+    """
+    operation = _get_operation(document, operation_name)
+    if operation is None:
+        return 0
+    coerced = get_variable_values(schema, operation.variable_definitions or (), variables or {})
+    if isinstance(coerced, list):
+        return 0
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    root = schema.get_root_type(operation.operation)
+
+    def selection_cost(parent: GraphQLNamedType, selection_set: SelectionSetNode) -> int:
+        total = 0
+        for selection in selection_set.selections:
+            if not _is_included(selection, coerced):
+                continue
+            if isinstance(selection, FieldNode):
+                total += field_cost(parent, selection)
+            elif isinstance(selection, InlineFragmentNode):
+                condition = selection.type_condition
+                type_ = schema.get_type(condition.name.value) if condition else parent
+                total += selection_cost(type_, selection.selection_set)
+            else:
+                fragment = fragments[selection.name.value]
+                type_ = schema.get_type(fragment.type_condition.name.value)
+                total += selection_cost(type_, fragment.selection_set)
+        return total
+
+    def field_cost(parent: GraphQLNamedType, node: FieldNode) -> int:
+        field_def = _get_field_def(schema, parent, node.name.value)
+        if field_def is None:
+            return 0
+        named = get_named_type(field_def.type)
+        weight = FIELD_COSTS.get(f"{parent.name}.{node.name.value}")
+        if weight is not None:
+            args = get_argument_values(field_def, node, coerced)
+            size = vocab_size(args.get("model")) if callable(vocab_size) else vocab_size
+            cost, items = weight(args, size)
+        else:
+            cost, items = (1 if parent is root or not is_leaf_type(named) else 0), 1
+        if node.selection_set:
+            cost += items * selection_cost(named, node.selection_set)
+        return cost
+
+    return selection_cost(root, operation.selection_set)
+
+
+def _get_operation(
+    document: DocumentNode, operation_name: str | None
+) -> OperationDefinitionNode | None:
+    """Find the operation to execute, as graphql-core does."""
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if operation_name is None:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
+
+
+def _get_field_def(schema: GraphQLSchema, parent: GraphQLNamedType, name: str):
+    """Get a field definition, including the introspection meta fields."""
+    if name == "__typename":
+        return None
+    if parent is schema.query_type and name == "__schema":
+        return SchemaMetaFieldDef
+    if parent is schema.query_type and name == "__type":
+        return TypeMetaFieldDef
+    return getattr(parent, "fields", {}).get(name)
+
+
+def _is_included(node, variables: dict) -> bool:
+    """Evaluate @skip and @include on a selection."""
+    skip = get_directive_values(GraphQLSkipDirective, node, variables)
+    if skip and skip["if"]:
+        return False
+    include = get_directive_values(GraphQLIncludeDirective, node, variables)
+    return not (include and not include["if"])
+
+
+class CostLimitExceeded(Exception):
+    """Raised when a batched request is rejected as a whole by the cost limiter."""
+
+    def __init__(self, error: GraphQLError):
+        super().__init__(error.message)
+        self.error = error
+
+
+class CostLimiter:
+    """Reject operations over a cost limit and throttle clients over a budget.
+
+    Each operation may cost at most max_cost, and all operations of one
+    (batched) request together at most max_request_cost. With client_rate
+    set, every client additionally has a token bucket holding up to
+    client_burst cost units and refilled at client_rate units per second;
+    a request whose cost exceeds the client's remaining tokens is refused
+    until enough have been refilled. Buckets live in process memory, so
+    with several worker processes each worker enforces its own budget.
+    """
+
+    def __init__(
+        self,
+        max_cost: int = 10_000,
+        client_rate: float | None = None,
+        client_burst: int | None = None,
+        max_clients: int = 10_000,
+        max_request_cost: int | None = None,
+    ):
+        """Initialize limiter.
+
+        Args:
+            max_cost: Maximum estimated cost of one operation.
+            client_rate: Cost units per second each client may spend. None
+                disables per-client budgets.
+            client_burst: Bucket size of each client. Defaults to
+                max_request_cost.
+            max_clients: Number of client buckets kept; the least recently
+                seen clients are forgotten first.
+            max_request_cost: Maximum summed cost of the operations of one
+                batched request. Defaults to max_cost.
+
+        Raises:
+            ValueError: If a limit is not positive, max_request_cost is less
+                than max_cost or client_burst is less than max_request_cost.
+        """
+        if max_cost <= 0:
+            raise ValueError("max_cost must be positive")
+        if client_rate is not None and client_rate <= 0:
+            raise ValueError("client_rate must be positive")
+        max_request_cost = max_request_cost or max_cost
+        if max_request_cost < max_cost:
+            raise ValueError("max_request_cost must be at least max_cost")
+        client_burst = client_burst or max_request_cost
+        if client_burst < max_request_cost:
+            raise ValueError("client_burst must be at least max_request_cost")
+
+        self.max_cost = max_cost
+        self.max_request_cost = max_request_cost
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.throttled = 0
+
+    def check(self, cost: int, client: str | None = None) -> GraphQLError | None:
+        """Check an operation against the limits, charging the client's budget.
+
+        Args:
+            cost: Estimated cost of the operation.
+            client: Client identifier (e.g. remote address). Budgets are not
+                applied if None.
+
+        Returns:
+            None if the operation may run, otherwise the error to report.
+            Throttling errors carry retryAfter (seconds) in their extensions.
+        """
+        if cost > self.max_cost:
+            self.rejected += 1
+            return GraphQLError(
+                f"Query cost {cost} exceeds limit of {self.max_cost}",
+                extensions={"code": QUERY_TOO_COMPLEX, "cost": cost, "maxCost": self.max_cost},
+            )
+        return self._charge(cost, client)
+
+    def check_request(self, costs: list[int], client: str | None = None) -> GraphQLError | None:
+        """Check the summed cost of a batched request, charging the client once.
+
+        Operations over max_cost are left out of the sum: they are rejected
+        on their own by check() and never run.
+
+        Args:
+            costs: Estimated cost of every operation of the request.
+            client: Client identifier (e.g. remote address). Budgets are not
+                applied if None.
+
+        Returns:
+            None if the request may run, otherwise the error to report for
+            the whole request.
+        """
+        cost = sum(c for c in costs if c <= self.max_cost)
+        if cost > self.max_request_cost:
+            self.rejected += 1
+            return GraphQLError(
+                f"Request cost {cost} exceeds limit of {self.max_request_cost}",
+                extensions={
+                    "code": QUERY_TOO_COMPLEX,
+                    "cost": cost,
+                    "maxRequestCost": self.max_request_cost,
+                },
+            )
+        return self._charge(cost, client)
+
+    def _charge(self, cost: int, client: str | None) -> GraphQLError | None:
+        """Charge a client's budget, returning the throttling error if it is spent."""
+        if self.client_rate is None or client is None:
+            return None
+
+        wait = self._consume(client, cost)
+        if wait > 0:
+            self.throttled += 1
+            return GraphQLError(
+                f"Query cost budget exhausted, retry in {wait:.1f}s",
+                extensions={"code": RATE_LIMITED, "cost": cost, "retryAfter": math.ceil(wait)},
+            )
+        return None
+
+    def _consume(self, client: str, cost: int) -> float:
+        """Take cost tokens from a client's bucket.
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until enough are
+            available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (self.client_burst, now))
+            tokens = min(self.client_burst, tokens + (now - last) * self.client_rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / self.client_rate
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"CostLimiter(max_cost={self.max_cost}, max_request_cost={self.max_request_cost}, "
+            f"client_rate={self.client_rate}, client_burst={self.client_burst})"
+        )
@@ -0,0 +1,157 @@
+"""Cache of parsed and validated GraphQL documents, with persisted queries."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, validate
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+INVALID_PERSISTED_QUERY_HASH = "INVALID_PERSISTED_QUERY_HASH"
+
+
+def hash_query(query: str) -> str:
+    """Get the SHA-256 hex digest of a query (the persisted query id)."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def persisted_query_hash(extensions: dict | None) -> str | None:
+    """Get the sha256Hash of an Automatic Persisted Query request, if any.
+
+    Args:
+        extensions: The "extensions" member of a GraphQL request body.
+
+    Returns:
+        Query hash, or None if the request is not a persisted query.
+    """
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get("persistedQuery")
+    if not isinstance(persisted, dict):
+        return None
+    query_hash = persisted.get("sha256Hash")
+    return query_hash if isinstance(query_hash, str) else None
+
+
+class DocumentCache:
+    """LRU cache of parsed and validated documents keyed by query hash.
+
+    Clients usually send the same few query shapes, so parsing and
+    validation run once per shape instead of once per request. Documents
+    that fail to parse or validate are cached with their errors as well.
+
+    The cache doubles as the store for Automatic Persisted Queries: a
+    request may send only the SHA-256 hash of a query it sent before. If
+    the hash is unknown (never seen, or evicted) the request fails with
+    PersistedQueryNotFound and the client retries with the full query.
+    """
+
+    def __init__(self, schema: GraphQLSchema, maxsize: int = 1000):
+        """Initialize cache.
+
+        Args:
+            schema: Schema documents are validated against.
+            maxsize: Maximum number of cached documents.
+        """
+        self.schema = schema
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[DocumentNode | None, list[GraphQLError]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        query: str | None,
+        query_hash: str | None = None,
+    ) -> tuple[DocumentNode | None, list[GraphQLError]]:
+        """Get the parsed and validated document of a query.
+
+        Args:
+            query: Query text. May be None for a persisted query.
+            query_hash: SHA-256 hash sent with a persisted query.
+
+        Returns:
+            Tuple of (document, errors). Document is None if errors is
+            not empty.
+        """
+        if query is None and query_hash is not None:
+            with self._lock:
+                entry = self._entries.get(query_hash)
+                if entry is not None:
+                    self._entries.move_to_end(query_hash)
+                    self.hits += 1
+                    return entry
+                self.misses += 1
+            error = GraphQLError(
+                "PersistedQueryNotFound",
+                extensions={"code": PERSISTED_QUERY_NOT_FOUND},
+            )
+            return None, [error]
+
+        if not isinstance(query, str):
+            return None, [GraphQLError(f"Must provide query string. Received: {query!r}.")]
+
+        key = hash_query(query)
+        if query_hash is not None and query_hash != key:
+            error = GraphQLError(
+                "provided sha does not match query",
+                extensions={"code": INVALID_PERSISTED_QUERY_HASH},
+            )
+            return None, [error]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._parse_and_validate(query)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _parse_and_validate(
+        self, query: str
+    ) -> tuple[DocumentNode | None, list[GraphQLError]]:
+        """Parse and validate a query without the cache."""
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            return None, [error]
+
+        errors = validate(self.schema, document)
+        if errors:
+            return None, errors
+        return document, []
+
+    def clear(self) -> None:
+        """Remove all cached documents."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        """Get number of cached documents."""
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"DocumentCache(maxsize={self.maxsize}, size={len(self)})"
@@ -0,0 +1,116 @@
+"""Framework-independent pieces of the GraphQL HTTP API."""
+
+import hmac
+
+from graphql import ExecutionResult, GraphQLError
+
+from nlp_pipeline.graphql.cost import RATE_LIMITED
+from nlp_pipeline.graphql.documents import (
+    PERSISTED_QUERY_NOT_FOUND,
+    persisted_query_hash,
+)
+
+# Simple HTML for GraphiQL interface
+GRAPHIQL_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>NLP Pipeline GraphQL</title>
+    <link href="https://unpkg.com/graphiql/graphiql.min.css" rel="stylesheet" />
+</head>
+<body style="margin: 0;">
+    <div id="graphiql" style="height: 100vh;"></div>
+    <script crossorigin src="https://unpkg.com/react/umd/react.production.min.js"></script>
+    <script crossorigin src="https://unpkg.com/react-dom/umd/react-dom.production.min.js"></script>
+    <script crossorigin src="https://unpkg.com/graphiql/graphiql.min.js"></script>
+    <script>
+        const fetcher = GraphiQL.createFetcher({ url: '/graphql' });
+        ReactDOM.render(
+            React.createElement(GraphiQL, { fetcher: fetcher }),
+            document.getElementById('graphiql'),
+        );
+    </script>
+</body>
+</html>
+"""
+
+# Served at the API root
+API_INFO = {
+    "name": "NLP Pipeline GraphQL API",
+    "version": "1.0.0",
+    "endpoints": {
+        "graphql": "/graphql",
+        "graphiql": "/graphql (GET in browser)",
+        "batch": "/graphql (POST a JSON array of operations)",
+        "vectors": "/vectors?words=king,queen[&dtype=float16][&format=npy]",
+        "health": "/health",
+        "metrics": "/metrics (Prometheus text format)",
+    },
+    "example_queries": {
+        "info": "{ info { vocabSize dimension } }",
+        "similarity": '{ similarity(word1: "king", word2: "queen") }',
+        "most_similar": '{ mostSimilar(word: "king", topN: 5) { word similarity } }',
+        "analogy": '{ analogy(positive: ["king", "woman"], negative: ["man"]) { word similarity } }',
+    },
+}
+
+
+def format_result(result: ExecutionResult) -> dict:
+    """Convert an execution result to a JSON response body."""
+    response = {}
+    if result.data:
+        response["data"] = result.data
+    if result.errors:
+        response["errors"] = [format_error(e) for e in result.errors]
+    return response
+
+
+def format_error(error: GraphQLError) -> dict:
+    """Convert a GraphQL error to JSON."""
+    formatted = {"message": str(error), "locations": error.locations, "path": error.path}
+    if error.extensions:
+        formatted["extensions"] = error.extensions
+    return formatted
+
+
+def is_persisted_query_miss(result: ExecutionResult) -> bool:
+    """Check if a result only reports an unknown persisted query hash."""
+    return len(result.errors) == 1 and (
+        (result.errors[0].extensions or {}).get("code") == PERSISTED_QUERY_NOT_FOUND
+    )
+
+
+def retry_after(result: ExecutionResult) -> int | None:
+    """Get the Retry-After seconds of a result throttled by the cost limiter."""
+    for error in result.errors or ():
+        extensions = error.extensions or {}
+        if extensions.get("code") == RATE_LIMITED:
+            return extensions["retryAfter"]
+    return None
+
+
+def is_authorized(authorization: str | None, token: str) -> bool:
+    """Check an "Authorization: Bearer <token>" header against the admin token."""
+    if not authorization or not authorization.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(authorization[7:].encode("utf-8"), token.encode("utf-8"))
+
+
+def is_runnable(operation) -> bool:
+    """Check if a batch entry carries a query or a persisted query hash."""
+    return isinstance(operation, dict) and bool(
+        operation.get("query") or persisted_query_hash(operation.get("extensions"))
+    )
+
+
+def batch_error(operations: list, max_batch_size: int) -> str | None:
+    """Validate the size of a batched request.
+
+    Returns:
+        Error message, or None if the batch is acceptable.
+    """
+    if not operations:
+        return "Empty batch"
+    if len(operations) > max_batch_size:
+        return f"Batch of {len(operations)} operations exceeds limit of {max_batch_size}"
+    return None
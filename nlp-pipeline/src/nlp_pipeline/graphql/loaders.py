@@ -0,0 +1,257 @@
+"""Per-request batching of similarity lookups (DataLoader pattern)."""
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.results import ResultStore, default_store
+
+
+class BusyError(RuntimeError):
+    """Raised when too many batches are already waiting for the executor."""
+
+
+class Offloader:
+    """Bounded thread pool for CPU-heavy batch functions.
+
+    Batches run off the event loop, so cheap fields (info, hasWord, ...)
+    resolve immediately instead of queueing behind a large analogy scan.
+    At most max_pending batches may be running or queued; beyond that
+    submit() fails fast with BusyError instead of growing the queue. A
+    slot is freed when its batch finishes, or when it is cancelled before
+    starting because every request waiting for it gave up.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        """Initialize offloader.
+
+        Args:
+            max_workers: Threads running batch functions. The matrix
+                products release the GIL, so threads run them in parallel.
+            max_pending: Maximum batches running or waiting for a thread.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="graphql-batch")
+
+    def submit(self, fn: Callable, *args) -> asyncio.Future:
+        """Run fn(*args) on the pool.
+
+        Must be called from the event loop thread.
+
+        Returns:
+            Future resolving to the return value.
+
+        Raises:
+            BusyError: If max_pending batches are already in flight.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise BusyError("Server busy: too many similarity computations queued")
+            self.pending += 1
+        job = self._executor.submit(fn, *args)
+        job.add_done_callback(self._release)
+        return asyncio.wrap_future(job, loop=loop)
+
+    def _release(self, job: Future) -> None:
+        """Free the slot of a finished (or cancelled) batch."""
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the pool, dropping batches that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class BatchLoader:
+    """Collect the keys requested during one execution step and load them together.
+
+    load() returns a future immediately. The first load after a dispatch
+    schedules the next one with loop.call_soon, so every resolver that runs
+    before control returns to the event loop - all sibling fields of a
+    selection set, aliases included - joins the same batch. Results are
+    memoized per key for the lifetime of the loader (one request).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Hashable]], list[Any]],
+        offloader: Offloader | None = None,
+    ):
+        """Initialize loader.
+
+        Args:
+            batch_fn: Function mapping a list of keys to a list of results
+                in the same order.
+            offloader: Run batch_fn on this pool instead of on the event
+                loop thread.
+        """
+        self.batch_fn = batch_fn
+        self.offloader = offloader
+        self.batches = 0
+        self.loads = 0
+        self.hits = 0
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self._queue: list[tuple[Hashable, asyncio.Future]] = []
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        """Request the result for a key.
+
+        Must be called from a coroutine or callback running in an event loop.
+
+        Args:
+            key: Hashable key passed to batch_fn.
+
+        Returns:
+            Future resolving to the result for key.
+        """
+        self.loads += 1
+        future = self._futures.get(key)
+        if future is not None:
+            self.hits += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        self._queue.append((key, future))
+        if len(self._queue) == 1:
+            loop.call_soon(self._dispatch)
+        return future
+
+    def _dispatch(self) -> None:
+        """Run batch_fn over all queued keys and resolve their futures."""
+        queue, self._queue = self._queue, []
+        self.batches += 1
+        keys = [key for key, _ in queue]
+
+        if self.offloader is None:
+            try:
+                results = self.batch_fn(keys)
+            except Exception as e:
+                self._fail(queue, e)
+                return
+            self._resolve(queue, results)
+            return
+
+        try:
+            task = self.offloader.submit(self.batch_fn, keys)
+        except BusyError as e:
+            self._fail(queue, e)
+            return
+        task.add_done_callback(lambda t: self._complete(queue, t))
+
+        def cancel_if_abandoned(_):
+            # Drop the batch if it hasn't started and nobody waits for it
+            if all(future.cancelled() for _, future in queue):
+                task.cancel()
+
+        for _, future in queue:
+            future.add_done_callback(cancel_if_abandoned)
+
+    def _complete(self, queue: list, task: asyncio.Future) -> None:
+        """Resolve queued futures from a finished offloaded batch."""
+        if task.cancelled():
+            for _, future in queue:
+                future.cancel()
+        elif task.exception() is not None:
+            self._fail(queue, task.exception())
+        else:
+            self._resolve(queue, task.result())
+
+    @staticmethod
+    def _resolve(queue: list, results: list) -> None:
+        """Set results on futures still being waited for."""
+        for (_, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(queue: list, error: BaseException) -> None:
+        """Set an error on futures still being waited for."""
+        for _, future in queue:
+            if not future.done():
+                future.set_exception(error)
+
+
+class Loaders:
+    """The batch loaders of one GraphQL request.
+
+    Nearest-neighbor keys are ("word", word, top_n) for mostSimilar and
+    ("analogy", positive, negative, top_n) for analogy; all of them are
+    answered by one WordEmbeddings.most_similar_batch call, except those
+    already in the shared result store. Similarity keys are (word1, word2)
+    pairs answered by one similarity_batch call.
+    """
+
+    def __init__(
+        self,
+        embeddings: WordEmbeddings,
+        offloader: Offloader | None = None,
+        store: ResultStore | None = default_store,
+    ):
+        """Initialize loaders.
+
+        Args:
+            embeddings: Embeddings every lookup of the request runs against.
+            offloader: Pool for the batched computations. They run on the
+                event loop thread if None.
+            store: Nearest-neighbor rankings shared across requests (and
+                with the dashboard). None disables it.
+        """
+        self.embeddings = embeddings
+        self.store = store
+        self.neighbors = BatchLoader(self._load_neighbors, offloader)
+        self.similarity = BatchLoader(embeddings.similarity_batch, offloader)
+
+    def _load_neighbors(self, keys: list[tuple]) -> list[list[tuple[str, float]]]:
+        """Answer all nearest-neighbor keys with one batched scan."""
+        emb = self.embeddings
+        store = self.store
+        answers = {}
+        misses = []
+        for key in keys:
+            cached = store.get(emb, key[:-1], key[-1]) if store is not None else None
+            if cached is not None:
+                answers[key] = cached
+            else:
+                misses.append(key)
+
+        if misses:
+            vectors = []
+            exclude = []
+            for key in misses:
+                if key[0] == "word":
+                    vectors.append(emb[key[1]])
+                    exclude.append({key[1]})
+                else:
+                    _, positive, negative, _ = key
+                    vectors.append(emb.analogy_vector(list(positive), list(negative)))
+                    exclude.append(set(positive) | set(negative))
+
+            # Rankings are deterministic, so each key's top_n is a prefix of the max
+            top_n = max(key[-1] for key in misses)
+            results = emb.most_similar_batch(vectors, topn=top_n, exclude=exclude)
+            for key, result in zip(misses, results):
+                if store is not None:
+                    store.put(emb, key[:-1], top_n, result)
+                answers[key] = result[: key[-1]]
+        return [answers[key] for key in keys]
+
+
+def get_loaders(info) -> Loaders | None:
+    """Get the request's loaders from the resolver info, if any.
+
+    Queries executed without a loader context (e.g. schema.execute()) get
+    None and resolve each field on its own.
+    """
+    context = info.context
+    if isinstance(context, dict):
+        return context.get("loaders")
+    return None
@@ -0,0 +1,387 @@
+"""Request metrics, resolver timing and Prometheus exposition for the GraphQL API."""
+
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from inspect import isawaitable
+
+from graphql import MiddlewareManager
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+slow_query_logger = logging.getLogger("nlp_pipeline.graphql.slow_queries")
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _escape(value) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    """Format a Prometheus label set."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        """Initialize counter.
+
+        Args:
+            name: Metric name.
+            help: Help text.
+            labels: Label names.
+        """
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        """Increment the counter of a label set."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        """Get the current value of a label set."""
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        """Render in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, count in sorted(self._values.items()):
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}{labels} {_format_value(count)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name.
+            help: Help text.
+            labels: Label names.
+            buckets: Upper bounds of the buckets, ascending.
+        """
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, *label_values) -> int:
+        """Get the number of observations of a label set."""
+        entry = self._values.get(label_values)
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> list[str]:
+        """Render in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = (*self.buckets, float("inf"))
+        with self._lock:
+            for values, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    le = _format_labels(self.labels, values, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{labels} {total!r}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def _sample(name: str, help: str, value: float, kind: str = "gauge") -> list[str]:
+    """Render a metric with a single unlabeled sample."""
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {_format_value(value)}"]
+
+
+def resident_memory_bytes() -> int | None:
+    """Get the resident set size of this process, if the platform reports it."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ResolverTimingMiddleware:
+    """graphql-core middleware timing the root fields of every operation.
+
+    Only root fields (mostSimilar, analogy, info, ...) are timed: they do
+    the actual work, while nested fields just read attributes. Fields
+    resolved through batch loaders are timed until their batch completes.
+    """
+
+    def __init__(self, histogram: Histogram):
+        """Initialize middleware.
+
+        Args:
+            histogram: Histogram with a single "field" label.
+        """
+        self.histogram = histogram
+
+    def resolve(self, next_, root, info, **args):
+        """Resolve a field, timing it if it is a root field."""
+        if info.path.prev is not None:
+            return next_(root, info, **args)
+        field = f"{info.parent_type.name}.{info.field_name}"
+        start = time.perf_counter()
+        result = next_(root, info, **args)
+        if isawaitable(result):
+            return self._await(result, field, start)
+        self.histogram.observe(time.perf_counter() - start, field)
+        return result
+
+    async def _await(self, result, field: str, start: float):
+        """Finish timing a field once its awaitable result is ready."""
+        try:
+            return await result
+        finally:
+            self.histogram.observe(time.perf_counter() - start, field)
+
+
+class Metrics:
+    """Metrics of one GraphQL API process.
+
+    Collects per-route HTTP latency, per-resolver latency, operation counts
+    and batch loader cache counters, and renders them together with cache
+    and memory gauges in the Prometheus text format. Values are kept per
+    process; with several workers, scrape each worker or aggregate them.
+    """
+
+    def __init__(self, slow_query_seconds: float | None = None):
+        """Initialize metrics.
+
+        Args:
+            slow_query_seconds: Log operations slower than this to the
+                "nlp_pipeline.graphql.slow_queries" logger. None disables
+                the slow query log.
+        """
+        self.slow_query_seconds = slow_query_seconds
+        self.requests = Histogram(
+            "nlp_graphql_http_request_duration_seconds",
+            "HTTP request latency by route.",
+            ("method", "route", "status"),
+        )
+        self.resolvers = Histogram(
+            "nlp_graphql_resolver_duration_seconds",
+            "Root field resolver latency.",
+            ("field",),
+        )
+        self.operations = Counter(
+            "nlp_graphql_operations_total",
+            "Executed GraphQL operations by outcome.",
+            ("outcome",),
+        )
+        self.slow_operations = Counter(
+            "nlp_graphql_slow_operations_total",
+            "Operations slower than the slow query threshold.",
+        )
+        self.loader_loads = Counter(
+            "nlp_graphql_loader_loads_total",
+            "Keys requested from batch loaders.",
+            ("loader",),
+        )
+        self.loader_hits = Counter(
+            "nlp_graphql_loader_cache_hits_total",
+            "Batch loader keys answered from the per-request cache.",
+            ("loader",),
+        )
+        self.loader_batches = Counter(
+            "nlp_graphql_loader_batches_total",
+            "Batched computations run by batch loaders.",
+            ("loader",),
+        )
+        # One manager for all requests, so wrapped resolvers are built once
+        self.middleware = MiddlewareManager(ResolverTimingMiddleware(self.resolvers))
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Record one HTTP request."""
+        self.requests.observe(seconds, method, route, status)
+
+    def observe_operation(
+        self,
+        query: str | None,
+        operation_name: str | None,
+        seconds: float,
+        errors: list | None,
+    ) -> None:
+        """Record one executed operation, logging it if it was slow."""
+        self.operations.inc("error" if errors else "ok")
+        if self.slow_query_seconds is None or seconds < self.slow_query_seconds:
+            return
+        self.slow_operations.inc()
+        query = _WHITESPACE.sub(" ", query or "").strip()
+        slow_query_logger.warning(
+            "Slow GraphQL operation (%.3fs) %s: %s",
+            seconds,
+            operation_name or "<anonymous>",
+            query[:1000],
+        )
+
+    def observe_loaders(self, loaders) -> None:
+        """Record the counters of a finished request's batch loaders."""
+        for name in ("neighbors", "similarity"):
+            loader = getattr(loaders, name)
+            self.loader_loads.inc(name, amount=loader.loads)
+            self.loader_hits.inc(name, amount=loader.hits)
+            self.loader_batches.inc(name, amount=loader.batches)
+
+    def render(
+        self,
+        embeddings: WordEmbeddings | None = None,
+        document_cache=None,
+        cost_limiter=None,
+        offloader=None,
+        versions=None,
+        registry=None,
+        result_store=None,
+    ) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Args:
+            embeddings: Served embeddings, for vocabulary and matrix size.
+            document_cache: DocumentCache, for its hit rate.
+            cost_limiter: CostLimiter, for rejected and throttled counts.
+            offloader: Offloader, for the number of pending batches.
+            versions: VersionedEmbeddings, for the current version and the
+                versions still draining.
+            registry: ModelRegistry, for loaded models and their memory.
+            result_store: ResultStore, for its hit rate.
+
+        Returns:
+            Exposition text.
+        """
+        lines = []
+        for metric in (
+            self.requests,
+            self.resolvers,
+            self.operations,
+            self.slow_operations,
+            self.loader_loads,
+            self.loader_hits,
+            self.loader_batches,
+        ):
+            lines += metric.render()
+
+        samples = []
+        if document_cache is not None:
+            stats = document_cache.stats
+            samples += [
+                ("nlp_graphql_document_cache_hits_total", "Parsed document cache hits.",
+                 stats["hits"], "counter"),
+                ("nlp_graphql_document_cache_misses_total", "Parsed document cache misses.",
+                 stats["misses"], "counter"),
+                ("nlp_graphql_document_cache_hit_ratio", "Parsed document cache hit rate.",
+                 stats["hit_rate"], "gauge"),
+                ("nlp_graphql_document_cache_size", "Cached parsed documents.",
+                 stats["size"], "gauge"),
+            ]
+        if result_store is not None:
+            stats = result_store.stats
+            samples += [
+                ("nlp_result_store_hits_total", "Nearest-neighbor result store hits.",
+                 stats["hits"], "counter"),
+                ("nlp_result_store_misses_total", "Nearest-neighbor result store misses.",
+                 stats["misses"], "counter"),
+                ("nlp_result_store_hit_ratio", "Nearest-neighbor result store hit rate.",
+                 stats["hit_rate"], "gauge"),
+                ("nlp_result_store_size", "Rankings in the result store.",
+                 stats["size"], "gauge"),
+            ]
+        if cost_limiter is not None:
+            samples += [
+                ("nlp_graphql_cost_rejected_total", "Operations rejected as too complex.",
+                 cost_limiter.rejected, "counter"),
+                ("nlp_graphql_cost_throttled_total", "Operations refused by client budgets.",
+                 cost_limiter.throttled, "counter"),
+            ]
+        if offloader is not None:
+            samples.append(("nlp_graphql_executor_pending", "Similarity batches running or queued.",
+                            offloader.pending, "gauge"))
+        if embeddings is not None:
+            matrix_bytes = embeddings.matrix.nbytes if embeddings.vocab_size else 0
+            samples += [
+                ("nlp_embeddings_vocab_size", "Words in the served embeddings.",
+                 embeddings.vocab_size, "gauge"),
+                ("nlp_embeddings_matrix_bytes", "Bytes of the packed embedding matrix.",
+                 matrix_bytes, "gauge"),
+            ]
+        if versions is not None:
+            current = versions.current
+            samples += [
+                ("nlp_embeddings_version", "Version number of the served embeddings.",
+                 current.number if current is not None else 0, "gauge"),
+                ("nlp_embeddings_in_flight_requests", "Requests using the current embeddings.",
+                 current.refs if current is not None else 0, "gauge"),
+                ("nlp_embeddings_draining_versions", "Replaced versions still in use.",
+                 len(versions.draining), "gauge"),
+                ("nlp_embeddings_retired_versions_total", "Replaced versions released.",
+                 versions.retired, "counter"),
+            ]
+        if registry is not None:
+            models = registry.info()
+            samples += [
+                ("nlp_models_registered", "Models in the registry.", len(models), "gauge"),
+                ("nlp_models_loaded", "Registry models currently loaded.",
+                 sum(model["loaded"] for model in models), "gauge"),
+                ("nlp_models_memory_bytes", "Estimated private memory of loaded models.",
+                 sum(model["memory_bytes"] for model in models), "gauge"),
+                ("nlp_models_loads_total", "Registry model loads.", registry.loads, "counter"),
+                ("nlp_models_evictions_total", "Registry models evicted to stay in budget.",
+                 registry.evictions, "counter"),
+            ]
+        rss = resident_memory_bytes()
+        if rss is not None:
+            samples.append(("process_resident_memory_bytes", "Resident memory size in bytes.",
+                            rss, "gauge"))
+
+        for name, help, value, kind in samples:
+            lines += _sample(name, help, value, kind)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,261 @@
+"""Registry of named embedding models served side by side."""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# Approximate per-word cost of the vocabulary structures (word string,
+# vector view, dict and index entries), on top of the matrix itself
+WORD_OVERHEAD_BYTES = 250
+
+
+def memory_bytes(embeddings: WordEmbeddings) -> int:
+    """Estimate the private memory held by loaded embeddings.
+
+    A memory-mapped matrix lives in the OS page cache, shared by every
+    process mapping the file and reclaimable by the kernel, so it is not
+    counted; an in-memory matrix is.
+    """
+    matrix = embeddings.matrix
+    total = embeddings.vocab_size * WORD_OVERHEAD_BYTES + embeddings.norms.nbytes
+    if not isinstance(matrix, np.memmap):
+        total += matrix.nbytes
+    return total
+
+
+class _Model:
+    """Registry entry: how to load a model and its loaded state."""
+
+    def __init__(self, name: str, loader: Callable[[], WordEmbeddings], source: str | None):
+        self.name = name
+        self.loader = loader
+        self.source = source
+        self.embeddings: WordEmbeddings | None = None
+        self.memory = 0
+        self.refs = 0
+        self.vocab_size: int | None = None
+        self.load_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Named embedding models, loaded on first use and evicted when idle.
+
+    Models are registered by name with either the path of a native-format
+    directory (see WordEmbeddings.save()), which is memory-mapped by
+    default, or a loader callable. A model is loaded the first time a
+    request asks for it. When the estimated private memory of the loaded
+    models exceeds memory_budget, the least recently used models that no
+    request is currently using are unloaded; they are loaded again on
+    their next use.
+
+    Memory-mapped models share their matrix through the page cache: every
+    worker process serving the same file maps the same physical pages, and
+    only the vocabulary structures count against the budget.
+    """
+
+    def __init__(self, memory_budget: int | None = None):
+        """Initialize registry.
+
+        Args:
+            memory_budget: Maximum estimated bytes of loaded models. None
+                never evicts.
+        """
+        self.memory_budget = memory_budget
+        self._models: OrderedDict[str, _Model] = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def register(
+        self,
+        name: str,
+        source: str | Path | Callable[[], WordEmbeddings],
+        mmap: bool = True,
+    ) -> None:
+        """Register a model.
+
+        Args:
+            name: Model name used in queries.
+            source: Native-format directory, or a callable returning the
+                embeddings.
+            mmap: Memory-map a native-format matrix.
+
+        Raises:
+            ValueError: If the name is taken or the path is not a
+                native-format directory.
+        """
+        if callable(source):
+            loader, description = source, None
+        else:
+            path = Path(source)
+            if not path.is_dir():
+                raise ValueError(
+                    f"'{path}' is not a native-format embeddings directory; "
+                    "convert it with WordEmbeddings.save() or pass a loader"
+                )
+            loader, description = (lambda: WordEmbeddings.load(path, mmap=mmap)), str(path)
+
+        with self._lock:
+            if name in self._models:
+                raise ValueError(f"Model '{name}' is already registered")
+            self._models[name] = _Model(name, loader, description)
+
+    @property
+    def names(self) -> list[str]:
+        """Get the registered model names."""
+        return list(self._models)
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a model is registered."""
+        return name in self._models
+
+    def acquire(self, name: str) -> WordEmbeddings:
+        """Get a model for one request, loading it if needed.
+
+        The model cannot be evicted until release() is called.
+
+        Raises:
+            ValueError: If no model of that name is registered.
+        """
+        model = self._entry(name)
+        with self._lock:
+            model.refs += 1
+        try:
+            return self._ensure_loaded(model)
+        except BaseException:
+            with self._lock:
+                model.refs -= 1
+            raise
+
+    def acquire_loaded(self, name: str) -> WordEmbeddings | None:
+        """Acquire a model only if it is already loaded.
+
+        Lets callers on an event loop pin warm models directly and move
+        the (slow) loading of cold ones to a thread with acquire().
+
+        Returns:
+            The pinned embeddings (call release() when done), or None
+            without pinning if the model is not loaded.
+
+        Raises:
+            ValueError: If no model of that name is registered.
+        """
+        model = self._entry(name)
+        with self._lock:
+            embeddings = model.embeddings
+            if embeddings is None:
+                return None
+            model.refs += 1
+            self._models.move_to_end(model.name)
+        return embeddings
+
+    def release(self, name: str) -> None:
+        """Release a model acquired for a finished request."""
+        with self._lock:
+            self._models[name].refs -= 1
+        self._evict()
+
+    def get(self, name: str) -> WordEmbeddings:
+        """Get a model without pinning it, loading it if needed.
+
+        Raises:
+            ValueError: If no model of that name is registered.
+        """
+        return self._ensure_loaded(self._entry(name))
+
+    def preload(self, names: list[str] | None = None) -> None:
+        """Load models ahead of their first request.
+
+        Args:
+            names: Models to load. All registered models if None.
+        """
+        for name in names if names is not None else self.names:
+            self.get(name)
+
+    def vocab_size(self, name: str) -> int | None:
+        """Get a model's vocabulary size if it has been loaded before."""
+        model = self._models.get(name)
+        return model.vocab_size if model is not None else None
+
+    def _entry(self, name: str) -> _Model:
+        """Look up a registered model."""
+        model = self._models.get(name)
+        if model is None:
+            raise ValueError(f"Unknown model '{name}'. Available: {self.names}")
+        return model
+
+    def _ensure_loaded(self, model: _Model) -> WordEmbeddings:
+        """Load a model if needed and mark it most recently used."""
+        embeddings = model.embeddings
+        if embeddings is None:
+            # Concurrent requests for the same cold model wait for one load
+            with model.load_lock:
+                embeddings = model.embeddings
+                if embeddings is None:
+                    embeddings = model.loader()
+                    memory = memory_bytes(embeddings)
+                    with self._lock:
+                        model.embeddings = embeddings
+                        model.memory = memory
+                        model.vocab_size = embeddings.vocab_size
+                        self.loads += 1
+                    logger.info("Loaded model '%s' (%d words)", model.name, embeddings.vocab_size)
+                    self._evict(keep=model)
+        with self._lock:
+            self._models.move_to_end(model.name)
+        return embeddings
+
+    def _evict(self, keep: _Model | None = None) -> None:
+        """Unload idle models, least recently used first, while over budget."""
+        if self.memory_budget is None:
+            return
+        with self._lock:
+            total = self.memory_used
+            for model in list(self._models.values()):
+                if total <= self.memory_budget:
+                    break
+                if model is keep or model.embeddings is None or model.refs > 0:
+                    continue
+                total -= model.memory
+                model.embeddings = None
+                model.memory = 0
+                self.evictions += 1
+                logger.info("Evicted model '%s'", model.name)
+
+    @property
+    def memory_used(self) -> int:
+        """Get the estimated bytes of all loaded models."""
+        return sum(model.memory for model in self._models.values())
+
+    def info(self) -> list[dict]:
+        """Get a JSON-serializable description of every model."""
+        with self._lock:
+            return [
+                {
+                    "name": model.name,
+                    "source": model.source,
+                    "loaded": model.embeddings is not None,
+                    "vocab_size": model.vocab_size,
+                    "dimension": model.embeddings.dimension if model.embeddings else None,
+                    "memory_bytes": model.memory,
+                    "in_flight": model.refs,
+                }
+                for model in self._models.values()
+            ]
+
+    def __len__(self) -> int:
+        """Get number of registered models."""
+        return len(self._models)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        loaded = sum(model.embeddings is not None for model in self._models.values())
+        return f"ModelRegistry(models={len(self)}, loaded={loaded})"
@@ -0,0 +1,110 @@
+"""Background reloading of the served embeddings."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.graphql.schema import set_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingsReloader:
+    """Load new embeddings on a background thread and swap them in.
+
+    The loader runs off the request path; the new embeddings are then
+    prepared (packed matrix, row norms and word index built, memory-mapped
+    pages touched) before they are published with set_embeddings(), so the
+    first queries against them are as fast as any other. Requests keep
+    being answered from the current embeddings throughout, and requests
+    still running when the swap happens finish on the version they
+    started with.
+
+    Only one reload runs at a time. If the loader fails, the current
+    embeddings stay in place and the error is reported in status().
+    """
+
+    def __init__(self, loader: Callable[[str | None], WordEmbeddings]):
+        """Initialize reloader.
+
+        Args:
+            loader: Callable taking a path (None for the default source)
+                and returning the embeddings to serve.
+        """
+        self.loader = loader
+        self.state = "idle"
+        self.error: str | None = None
+        self.source: str | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self, path: str | None = None) -> bool:
+        """Start reloading in the background.
+
+        Args:
+            path: Embeddings to load. None reloads the default source.
+
+        Returns:
+            True if a reload was started, False if one is already running.
+        """
+        with self._lock:
+            if self.state == "loading":
+                return False
+            self.state = "loading"
+            self.error = None
+            self.source = path
+            self.started_at = time.time()
+            self.finished_at = None
+            self._thread = threading.Thread(
+                target=self._run, args=(path,), name="embeddings-reload", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _run(self, path: str | None) -> None:
+        """Load, prepare and publish new embeddings."""
+        try:
+            embeddings = self.loader(path)
+            # Build the matrix, norms and word index before publishing
+            embeddings.norms
+            set_embeddings(embeddings, source=path)
+        except Exception as e:
+            logger.exception("Reloading embeddings failed; keeping current ones")
+            state, error = "failed", f"{type(e).__name__}: {e}"
+        else:
+            logger.info("Reloaded embeddings (%d words)", embeddings.vocab_size)
+            state, error = "idle", None
+        with self._lock:
+            self.state = state
+            self.error = error
+            self.finished_at = time.time()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the running reload to finish.
+
+        Returns:
+            True if no reload is running anymore.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.state != "loading"
+
+    def status(self) -> dict:
+        """Get a JSON-serializable description of the last reload."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "source": self.source,
+                "error": self.error,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"EmbeddingsReloader(state={self.state!r})"
@@ -1,21 +1,61 @@
 """GraphQL schema for word embeddings API."""
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor
+from inspect import isawaitable
+from typing import Any
+
 import graphene
+from graphql import DocumentNode, ExecutionResult, GraphQLError
+from graphql import execute as execute_document
 
 from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.graphql.cost import CostLimiter, CostLimitExceeded, estimate_cost
+from nlp_pipeline.graphql.documents import DocumentCache, persisted_query_hash
+from nlp_pipeline.graphql.loaders import Loaders, Offloader, get_loaders
+from nlp_pipeline.graphql.metrics import Metrics
+from nlp_pipeline.graphql.registry import ModelRegistry
+from nlp_pipeline.graphql.vectors import DTYPES, encode_base64, gather_vectors
+from nlp_pipeline.graphql.versions import VersionedEmbeddings
 
 # Global embeddings instance (set via set_embeddings)
 _embeddings: WordEmbeddings | None = None
 
+# Published versions of the global embeddings and the requests using them
+versions = VersionedEmbeddings()
+
+# Named models (set via set_registry)
+_registry: ModelRegistry | None = None
+
 
-def set_embeddings(embeddings: WordEmbeddings) -> None:
-    """Set the embeddings instance for the API."""
+def set_embeddings(embeddings: WordEmbeddings, source: str | None = None) -> None:
+    """Set the embeddings instance for the API.
+
+    The swap is atomic: requests already running keep the embeddings they
+    started with, new requests get the new ones.
+
+    Args:
+        embeddings: Embeddings to serve.
+        source: Where the embeddings were loaded from, for reporting.
+    """
     global _embeddings
+    versions.publish(embeddings, source)
     _embeddings = embeddings
 
 
-def get_embeddings() -> WordEmbeddings:
-    """Get the embeddings instance."""
+def get_embeddings(info=None) -> WordEmbeddings:
+    """Get the embeddings instance.
+
+    Args:
+        info: Resolver info. If given, the embeddings pinned for the
+            request by create_context() are returned.
+    """
+    if info is not None and isinstance(info.context, dict):
+        pinned = info.context.get("embeddings")
+        if pinned is not None:
+            return pinned
     if _embeddings is None:
         raise RuntimeError("Embeddings not initialized. Call set_embeddings() first.")
     return _embeddings
@@ -35,12 +75,219 @@ class EmbeddingInfo(graphene.ObjectType):
     dimension = graphene.Int(required=True, description="Embedding vector dimension")
 
 
+class VectorDType(graphene.Enum):
+    """Element type of packed vector buffers (little-endian)."""
+
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+
+
 class WordVector(graphene.ObjectType):
     """A word and its embedding vector."""
 
     word = graphene.String(required=True, description="The word")
     vector = graphene.List(graphene.Float, required=True, description="Embedding vector")
     dimension = graphene.Int(required=True, description="Vector dimension")
+    packed = graphene.String(
+        required=True,
+        dtype=VectorDType(default_value="float32"),
+        description="Embedding vector as a base64-encoded little-endian buffer",
+    )
+
+    def resolve_vector(self, info) -> list[float]:
+        """Convert the vector to a float list only when requested."""
+        return self.vector.tolist()
+
+    def resolve_packed(self, info, dtype: VectorDType = VectorDType.FLOAT32) -> str:
+        """Encode the vector as base64."""
+        return encode_base64(self.vector.astype(DTYPES[_dtype_name(dtype)], copy=False))
+
+
+class PackedVectors(graphene.ObjectType):
+    """Vectors of several words in one base64-encoded buffer."""
+
+    words = graphene.List(
+        graphene.NonNull(graphene.String),
+        required=True,
+        description="Words found, in buffer row order",
+    )
+    missing = graphene.List(
+        graphene.NonNull(graphene.String),
+        required=True,
+        description="Requested words not in the vocabulary",
+    )
+    dimension = graphene.Int(required=True, description="Vector dimension")
+    dtype = graphene.String(required=True, description="Element type (float32 or float16)")
+    data = graphene.String(
+        required=True,
+        description="Row-major little-endian (len(words), dimension) buffer, base64",
+    )
+
+
+def _dtype_name(dtype) -> str:
+    """Get the name ("float32"/"float16") of a VectorDType argument."""
+    return getattr(dtype, "value", dtype)
+
+
+def set_registry(registry: ModelRegistry | None) -> None:
+    """Set the registry of named models selectable with the model argument."""
+    global _registry
+    _registry = registry
+
+
+def get_registry() -> ModelRegistry:
+    """Get the model registry."""
+    if _registry is None:
+        raise RuntimeError("No model registry configured. Call set_registry() first.")
+    return _registry
+
+
+def get_model(info, model: str | None) -> tuple[WordEmbeddings, Loaders | None] | Awaitable:
+    """Get the embeddings and batch loaders a field should use.
+
+    Without a model name these are the default embeddings. A named model
+    is acquired from the registry once per request and stays pinned, so it
+    cannot be evicted, until finish_context(). A model that is not loaded
+    yet is loaded on the request's offloader, so the event loop keeps
+    serving other requests meanwhile; fields of the same request share
+    that load.
+
+    Args:
+        info: Resolver info.
+        model: Registered model name, or None for the default embeddings.
+
+    Returns:
+        Tuple of (embeddings, loaders), or an awaitable of it while the
+        model loads. Loaders is None when executing without a request
+        context.
+    """
+    if model is None:
+        return get_embeddings(info), get_loaders(info)
+    context = info.context if isinstance(info.context, dict) else None
+    if context is None:
+        return get_registry().get(model), None
+
+    models = context.setdefault("models", {})
+    pinned = models.get(model)
+    if pinned is not None:
+        return pinned
+    registry = context.get("registry") or get_registry()
+    context["registry"] = registry
+    offloader = context.get("offloader")
+    embeddings = registry.acquire_loaded(model)
+    if embeddings is None and offloader is None:
+        embeddings = registry.acquire(model)
+    if embeddings is not None:
+        return _pin_model(context, model, embeddings)
+
+    loading = context.setdefault("loading", {})
+    task = loading.get(model)
+    if task is None:
+        task = loading[model] = asyncio.ensure_future(
+            _load_model(context, registry, model, offloader)
+        )
+    return task
+
+
+def _pin_model(
+    context: dict, model: str, embeddings: WordEmbeddings
+) -> tuple[WordEmbeddings, Loaders]:
+    """Record an acquired model in the request context."""
+    pinned = (embeddings, Loaders(embeddings, context.get("offloader")))
+    context["models"][model] = pinned
+    return pinned
+
+
+async def _load_model(
+    context: dict, registry: ModelRegistry, model: str, offloader: Offloader
+) -> tuple[WordEmbeddings, Loaders]:
+    """Acquire a cold model on the offloader and pin it for the request."""
+    job = offloader.submit(registry.acquire, model)
+    try:
+        embeddings = await asyncio.shield(job)
+    except asyncio.CancelledError:
+        # The request gave up: release the model once the load is done
+        job.add_done_callback(
+            lambda j: j.cancelled() or j.exception() or registry.release(model)
+        )
+        raise
+    return _pin_model(context, model, embeddings)
+
+
+def _with_model(info, model: str | None, resolve: Callable) -> Any:
+    """Call resolve(embeddings, loaders) with the field's model.
+
+    Returns the result directly when the model is at hand, or an awaitable
+    of it while the model loads (see get_model()).
+    """
+    pinned = get_model(info, model)
+    if not isawaitable(pinned):
+        return resolve(*pinned)
+    return _resolve_loaded(pinned, resolve)
+
+
+async def _resolve_loaded(pinned: Awaitable, resolve: Callable) -> Any:
+    """Await a loading model, then resolve the field with it."""
+    result = resolve(*await pinned)
+    return await result if isawaitable(result) else result
+
+
+def _offload(info, fn: Callable, *args) -> Any:
+    """Run an O(vocab) computation on the request's offloader, if any.
+
+    Returns an awaitable of fn(*args) with an offloader, so the scan does
+    not hold the event loop; its result without one.
+    """
+    context = info.context if isinstance(info.context, dict) else None
+    offloader = context.get("offloader") if context is not None else None
+    if offloader is None:
+        return fn(*args)
+    return offloader.submit(fn, *args)
+
+
+def _search_vocab(embeddings: WordEmbeddings, prefix: str, limit: int) -> list[str]:
+    """Get the first words starting with prefix, in sorted order."""
+    matches = [w for w in embeddings.vocab if w.startswith(prefix)]
+    return sorted(matches)[:limit]
+
+
+def _packed_vectors(embeddings: WordEmbeddings, words: list[str], dtype: str) -> PackedVectors:
+    """Gather and encode the vectors of words."""
+    found, missing, array = gather_vectors(embeddings, words, dtype)
+    return PackedVectors(
+        words=found,
+        missing=missing,
+        dimension=embeddings.dimension,
+        dtype=dtype,
+        data=encode_base64(array),
+    )
+
+
+def _check_top_n(top_n: int) -> None:
+    """Reject a negative topN, which would slice rankings from the end."""
+    if top_n < 0:
+        raise ValueError(f"topN must be non-negative, got {top_n}")
+
+
+async def _similar_words(future: asyncio.Future) -> list[SimilarWord]:
+    """Convert a batched neighbor result to SimilarWord objects."""
+    return [SimilarWord(word=w, similarity=s) for w, s in await future]
+
+
+class ModelInfo(graphene.ObjectType):
+    """A named embedding model of the registry."""
+
+    name = graphene.String(required=True, description="Model name")
+    loaded = graphene.Boolean(required=True, description="Whether the model is in memory")
+    vocab_size = graphene.Int(description="Number of words, once loaded")
+    dimension = graphene.Int(description="Embedding dimension, if loaded")
+
+
+def _model_argument() -> graphene.String:
+    """Create the model argument shared by all embedding fields."""
+    return graphene.String(
+        description="Registered model to query (default: the default embeddings)"
+    )
 
 
 class Query(graphene.ObjectType):
@@ -49,12 +296,21 @@ class Query(graphene.ObjectType):
     # Embedding info
     info = graphene.Field(
         EmbeddingInfo,
+        model=_model_argument(),
         description="Get information about loaded embeddings",
     )
 
+    # Registered models
+    models = graphene.List(
+        graphene.NonNull(ModelInfo),
+        required=True,
+        description="List the models available through the model argument",
+    )
+
     # Check if word exists
     has_word = graphene.Boolean(
         word=graphene.String(required=True),
+        model=_model_argument(),
         description="Check if a word exists in the vocabulary",
     )
 
@@ -62,13 +318,24 @@ class Query(graphene.ObjectType):
     word_vector = graphene.Field(
         WordVector,
         word=graphene.String(required=True),
+        model=_model_argument(),
         description="Get the embedding vector for a word",
     )
 
+    # Vectors of several words in one compact buffer
+    word_vectors = graphene.Field(
+        PackedVectors,
+        words=graphene.List(graphene.NonNull(graphene.String), required=True),
+        dtype=VectorDType(default_value="float32"),
+        model=_model_argument(),
+        description="Get the vectors of several words as one base64-encoded buffer",
+    )
+
     # Similarity between two words
     similarity = graphene.Float(
         word1=graphene.String(required=True),
         word2=graphene.String(required=True),
+        model=_model_argument(),
         description="Calculate cosine similarity between two words",
     )
 
@@ -77,6 +344,7 @@ class Query(graphene.ObjectType):
         SimilarWord,
         word=graphene.String(required=True),
         top_n=graphene.Int(default_value=10),
+        model=_model_argument(),
         description="Find words most similar to the given word",
     )
 
@@ -86,12 +354,14 @@ class Query(graphene.ObjectType):
         positive=graphene.List(graphene.String, required=True),
         negative=graphene.List(graphene.String, required=True),
         top_n=graphene.Int(default_value=10),
+        model=_model_argument(),
         description="Solve word analogies (e.g., king - man + woman = queen)",
     )
 
     # Doesn't match
     doesnt_match = graphene.String(
         words=graphene.List(graphene.String, required=True),
+        model=_model_argument(),
         description="Find the word that doesn't match the others",
     )
 
@@ -100,50 +370,92 @@ class Query(graphene.ObjectType):
         graphene.String,
         prefix=graphene.String(required=True),
         limit=graphene.Int(default_value=20),
+        model=_model_argument(),
         description="Search vocabulary for words starting with prefix",
     )
 
-    def resolve_info(self, info) -> EmbeddingInfo:
+    def resolve_info(self, info, model: str | None = None) -> EmbeddingInfo:
         """Resolve embedding info query."""
-        emb = get_embeddings()
-        return EmbeddingInfo(
+        return _with_model(info, model, lambda emb, _: EmbeddingInfo(
             vocab_size=emb.vocab_size,
             dimension=emb.dimension,
-        )
+        ))
 
-    def resolve_has_word(self, info, word: str) -> bool:
+    def resolve_models(self, info) -> list[ModelInfo]:
+        """List the registered models."""
+        if _registry is None:
+            return []
+        return [
+            ModelInfo(
+                name=m["name"],
+                loaded=m["loaded"],
+                vocab_size=m["vocab_size"],
+                dimension=m["dimension"],
+            )
+            for m in _registry.info()
+        ]
+
+    def resolve_has_word(self, info, word: str, model: str | None = None) -> bool:
         """Check if word exists in vocabulary."""
-        emb = get_embeddings()
-        return word in emb
+        return _with_model(info, model, lambda emb, _: word in emb)
 
-    def resolve_word_vector(self, info, word: str) -> WordVector | None:
+    def resolve_word_vector(
+        self, info, word: str, model: str | None = None
+    ) -> WordVector | None:
         """Get embedding vector for a word."""
-        emb = get_embeddings()
-        if word not in emb:
-            return None
-        vector = emb[word]
-        return WordVector(
-            word=word,
-            vector=vector.tolist(),
-            dimension=len(vector),
+        def resolve(emb, _):
+            if word not in emb:
+                return None
+            vector = emb[word]
+            return WordVector(
+                word=word,
+                vector=vector,
+                dimension=len(vector),
+            )
+
+        return _with_model(info, model, resolve)
+
+    def resolve_word_vectors(
+        self,
+        info,
+        words: list[str],
+        dtype: VectorDType = VectorDType.FLOAT32,
+        model: str | None = None,
+    ) -> PackedVectors:
+        """Get the vectors of several words as one buffer."""
+        dtype = _dtype_name(dtype)
+        return _with_model(
+            info, model, lambda emb, _: _offload(info, _packed_vectors, emb, words, dtype)
         )
 
-    def resolve_similarity(self, info, word1: str, word2: str) -> float | None:
+    def resolve_similarity(
+        self, info, word1: str, word2: str, model: str | None = None
+    ) -> float | None:
         """Calculate similarity between two words."""
-        emb = get_embeddings()
-        if word1 not in emb or word2 not in emb:
-            return None
-        return emb.similarity(word1, word2)
+        def resolve(emb, loaders):
+            if word1 not in emb or word2 not in emb:
+                return None
+            if loaders is not None:
+                return loaders.similarity.load((word1, word2))
+            return emb.similarity(word1, word2)
+
+        return _with_model(info, model, resolve)
 
     def resolve_most_similar(
-        self, info, word: str, top_n: int = 10
+        self, info, word: str, top_n: int = 10, model: str | None = None
     ) -> list[SimilarWord]:
         """Find most similar words."""
-        emb = get_embeddings()
-        if word not in emb:
-            return []
-        results = emb.most_similar(word, topn=top_n)
-        return [SimilarWord(word=w, similarity=s) for w, s in results]
+        _check_top_n(top_n)
+
+        def resolve(emb, loaders):
+            if word not in emb:
+                return []
+            if loaders is not None:
+                return _similar_words(loaders.neighbors.load(("word", word, top_n)))
+            results = emb.most_similar(word, topn=top_n)
+            return [SimilarWord(word=w, similarity=s) for w, s in results]
+
+        return _with_model(info, model, resolve)
 
     def resolve_analogy(
         self,
@@ -151,32 +463,403 @@ class Query(graphene.ObjectType):
         positive: list[str],
         negative: list[str],
         top_n: int = 10,
+        model: str | None = None,
     ) -> list[SimilarWord]:
         """Solve word analogies."""
-        emb = get_embeddings()
-        # Check all words exist
-        for word in positive + negative:
-            if word not in emb:
-                return []
-        results = emb.analogy(positive=positive, negative=negative, topn=top_n)
-        return [SimilarWord(word=w, similarity=s) for w, s in results]
-
-    def resolve_doesnt_match(self, info, words: list[str]) -> str | None:
+        _check_top_n(top_n)
+
+        def resolve(emb, loaders):
+            # Check all words exist
+            for word in positive + negative:
+                if word not in emb:
+                    return []
+            if loaders is not None:
+                key = ("analogy", tuple(positive), tuple(negative), top_n)
+                return _similar_words(loaders.neighbors.load(key))
+            results = emb.analogy(positive=positive, negative=negative, topn=top_n)
+            return [SimilarWord(word=w, similarity=s) for w, s in results]
+
+        return _with_model(info, model, resolve)
+
+    def resolve_doesnt_match(
+        self, info, words: list[str], model: str | None = None
+    ) -> str | None:
         """Find the word that doesn't match."""
-        emb = get_embeddings()
-        # Check all words exist
-        for word in words:
-            if word not in emb:
-                return None
-        return emb.doesnt_match(words)
+        def resolve(emb, _):
+            # Check all words exist
+            for word in words:
+                if word not in emb:
+                    return None
+            return _offload(info, emb.doesnt_match, words)
+
+        return _with_model(info, model, resolve)
 
     def resolve_search_vocab(
-        self, info, prefix: str, limit: int = 20
+        self, info, prefix: str, limit: int = 20, model: str | None = None
     ) -> list[str]:
         """Search vocabulary by prefix."""
-        emb = get_embeddings()
-        matches = [w for w in emb.vocab if w.startswith(prefix)]
-        return sorted(matches)[:limit]
+        return _with_model(
+            info, model, lambda emb, _: _offload(info, _search_vocab, emb, prefix, limit)
+        )
 
 
 schema = graphene.Schema(query=Query)
+
+# Parsed + validated documents and persisted queries, shared by all requests
+document_cache = DocumentCache(schema.graphql_schema)
+
+
+def create_context(
+    offloader: Offloader | None = None,
+    cost_limiter: CostLimiter | None = None,
+    client: str | None = None,
+    metrics: Metrics | None = None,
+) -> dict:
+    """Create the execution context of one request with fresh batching loaders.
+
+    Args:
+        offloader: Pool the loaders run their batches on.
+        cost_limiter: Limits checked against each operation's estimated
+            cost before it runs.
+        client: Client identifier charged by the cost limiter.
+        metrics: Metrics recording resolver timings and operations.
+
+    Returns:
+        Context dict passed to execute_operation(). Pass it to
+        finish_context() when the request is done.
+    """
+    context = {
+        "cost_limiter": cost_limiter,
+        "client": client,
+        "metrics": metrics,
+        "offloader": offloader,
+        "registry": _registry,
+    }
+    # Pin the embeddings for the whole request, even if they are swapped
+    embeddings = _embeddings
+    if embeddings is not None:
+        context["embeddings"] = embeddings
+        context["version"] = versions.acquire(embeddings)
+        context["loaders"] = Loaders(embeddings, offloader)
+    return context
+
+
+async def execute_operation(
+    query: str | None,
+    variables: dict | None,
+    operation_name: str | None,
+    extensions: dict | None,
+    context: dict,
+    cost: int | None = None,
+) -> ExecutionResult:
+    """Execute one operation using the document cache.
+
+    Args:
+        query: GraphQL document. May be None for a persisted query.
+        variables: Variable values.
+        operation_name: Operation to run if the document has several.
+        extensions: Request extensions (persisted query hash).
+        context: Context from create_context(), shared by all operations
+            that should batch together.
+        cost: Estimated cost already charged to the client by
+            check_batch_cost(). If None, the cost is estimated and charged
+            here.
+
+    Returns:
+        Execution result.
+    """
+    document, errors = document_cache.get(query, persisted_query_hash(extensions))
+    if errors:
+        return ExecutionResult(data=None, errors=errors)
+
+    cost_limiter = context.get("cost_limiter")
+    if cost_limiter is not None:
+        if cost is None:
+            cost = _estimate_cost(document, variables, operation_name, context)
+            error = cost_limiter.check(cost, context.get("client"))
+        else:
+            error = cost_limiter.check(cost)
+        if error is not None:
+            return ExecutionResult(data=None, errors=[error])
+
+    metrics = context.get("metrics")
+    start = time.perf_counter()
+    result = execute_document(
+        schema.graphql_schema,
+        document,
+        context_value=context,
+        variable_values=variables,
+        operation_name=operation_name,
+        middleware=metrics.middleware if metrics is not None else None,
+    )
+    if isawaitable(result):
+        result = await result
+    if metrics is not None:
+        metrics.observe_operation(
+            query, operation_name, time.perf_counter() - start, result.errors
+        )
+    return result
+
+
+def check_batch_cost(
+    operations: list[dict], context: dict
+) -> tuple[GraphQLError | None, list[int | None]]:
+    """Estimate every operation of a batch and check their summed cost.
+
+    The client's budget is charged once with the total, so the operations
+    must then be run with the returned costs (see execute_operation()).
+
+    Args:
+        operations: Operation dicts, see execute_batch_async().
+        context: Context from create_context().
+
+    Returns:
+        (error, costs): the error rejecting the whole batch, or None, and
+        the estimated cost of each operation (all None without a cost
+        limiter).
+    """
+    cost_limiter = context.get("cost_limiter")
+    if cost_limiter is None:
+        return None, [None] * len(operations)
+
+    costs = []
+    for operation in operations:
+        document, errors = document_cache.get(
+            operation.get("query"), persisted_query_hash(operation.get("extensions"))
+        )
+        costs.append(0 if errors else _estimate_cost(
+            document, operation.get("variables"), operation.get("operationName"), context
+        ))
+    return cost_limiter.check_request(costs, context.get("client")), costs
+
+
+def _estimate_cost(
+    document: DocumentNode,
+    variables: dict | None,
+    operation_name: str | None,
+    context: dict,
+) -> int:
+    """Estimate the cost of a parsed operation with the request's vocabularies."""
+    return estimate_cost(
+        schema.graphql_schema, document, _vocab_sizes(context), variables, operation_name
+    )
+
+
+def _vocab_sizes(context: dict) -> Callable[[str | None], int]:
+    """Get the vocabulary size of a model argument, for cost estimation.
+
+    Models that have never been loaded are assumed to be as large as the
+    default embeddings.
+    """
+    loaders = context.get("loaders")
+    default = loaders.embeddings.vocab_size if loaders is not None else 0
+    registry = context.get("registry")
+
+    def vocab_size(model: str | None) -> int:
+        if model is not None and registry is not None and model in registry:
+            size = registry.vocab_size(model)
+            if size is not None:
+                return size
+        return default
+
+    return vocab_size
+
+
+def finish_context(context: dict) -> None:
+    """Release a finished request's embeddings and record its loader counters."""
+    version = context.pop("version", None)
+    if version is not None:
+        versions.release(version)
+    context.pop("loading", None)
+    models = context.pop("models", {})
+    for name in models:
+        context["registry"].release(name)
+    metrics = context.get("metrics")
+    if metrics is not None:
+        if "loaders" in context:
+            metrics.observe_loaders(context["loaders"])
+        for _, loaders in models.values():
+            metrics.observe_loaders(loaders)
+
+
+async def execute_async(
+    query: str | None,
+    variables: dict | None = None,
+    operation_name: str | None = None,
+    extensions: dict | None = None,
+    cost_limiter: CostLimiter | None = None,
+    client: str | None = None,
+    metrics: Metrics | None = None,
+) -> ExecutionResult:
+    """Execute a query with per-request batching loaders.
+
+    All mostSimilar/analogy fields of the document are answered by one
+    batched matrix product, and all similarity fields by another, instead
+    of one vocabulary scan per field. Parsing and validation are cached
+    per query text (see document_cache).
+
+    Args:
+        query: GraphQL document. May be None for a persisted query.
+        variables: Variable values.
+        operation_name: Operation to run if the document has several.
+        extensions: Request extensions; extensions.persistedQuery.sha256Hash
+            identifies an Automatic Persisted Query.
+        cost_limiter: Reject the query if its estimated cost is over the
+            limit or the client's budget.
+        client: Client identifier charged by the cost limiter.
+        metrics: Metrics recording resolver timings and operations.
+
+    Returns:
+        Execution result.
+    """
+    context = create_context(cost_limiter=cost_limiter, client=client, metrics=metrics)
+    try:
+        return await execute_operation(query, variables, operation_name, extensions, context)
+    finally:
+        finish_context(context)
+
+
+def execute(
+    query: str | None,
+    variables: dict | None = None,
+    operation_name: str | None = None,
+    extensions: dict | None = None,
+    cost_limiter: CostLimiter | None = None,
+    client: str | None = None,
+    metrics: Metrics | None = None,
+) -> ExecutionResult:
+    """Execute a query with per-request batching loaders (blocking).
+
+    See execute_async(). Must not be called from a running event loop.
+    """
+    return asyncio.run(execute_async(
+        query, variables, operation_name, extensions, cost_limiter, client, metrics
+    ))
+
+
+async def execute_batch_async(
+    operations: list[dict],
+    cost_limiter: CostLimiter | None = None,
+    client: str | None = None,
+    metrics: Metrics | None = None,
+) -> list[ExecutionResult]:
+    """Execute several operations with loaders shared between them.
+
+    The operations run concurrently in one event loop, so similarity-type
+    fields of all of them are batched into the same matrix products.
+
+    Args:
+        operations: Dicts with "query" and optional "variables",
+            "operationName" and "extensions", as in a single GraphQL POST
+            body.
+        cost_limiter: Limits checked for each operation and for the summed
+            cost of the batch, which is charged to the client once.
+        client: Client identifier charged by the cost limiter.
+        metrics: Metrics recording resolver timings and operations.
+
+    Returns:
+        One execution result per operation, in order.
+
+    Raises:
+        CostLimitExceeded: If the batch is over the per-request cost limit
+            or the client's budget.
+    """
+    context = create_context(cost_limiter=cost_limiter, client=client, metrics=metrics)
+    try:
+        error, costs = check_batch_cost(operations, context)
+        if error is not None:
+            raise CostLimitExceeded(error)
+        return await _execute_operations(operations, costs, context)
+    finally:
+        finish_context(context)
+
+
+async def _execute_operations(
+    operations: list[dict], costs: list[int | None], context: dict
+) -> list[ExecutionResult]:
+    """Execute operations concurrently in one context."""
+    results = await asyncio.gather(*(
+        execute_operation(
+            operation.get("query"),
+            operation.get("variables"),
+            operation.get("operationName"),
+            operation.get("extensions"),
+            context,
+            cost,
+        )
+        for operation, cost in zip(operations, costs)
+    ))
+    return list(results)
+
+
+async def _execute_chunk(
+    operations: list[dict],
+    costs: list[int | None],
+    cost_limiter: CostLimiter | None,
+    client: str | None,
+    metrics: Metrics | None,
+) -> list[ExecutionResult]:
+    """Execute an already cost-checked chunk of a batch with its own loaders."""
+    context = create_context(cost_limiter=cost_limiter, client=client, metrics=metrics)
+    try:
+        return await _execute_operations(operations, costs, context)
+    finally:
+        finish_context(context)
+
+
+def execute_batch(
+    operations: list[dict],
+    executor: Executor | None = None,
+    chunk_size: int = 256,
+    cost_limiter: CostLimiter | None = None,
+    client: str | None = None,
+    metrics: Metrics | None = None,
+) -> list[ExecutionResult]:
+    """Execute several operations (blocking), optionally on a thread pool.
+
+    Without an executor the whole batch shares one set of loaders. With
+    one, batches larger than chunk_size are split into chunks that run in
+    parallel, each sharing loaders within the chunk; the matrix products
+    release the GIL, so large batches use several cores.
+
+    Args:
+        operations: Operation dicts, see execute_batch_async().
+        executor: Thread pool for parallel chunks.
+        chunk_size: Operations per chunk when an executor is given.
+        cost_limiter: Limits checked as in execute_batch_async(), for the
+            whole batch before it is split into chunks.
+        client: Client identifier charged by the cost limiter.
+        metrics: Metrics recording resolver timings and operations.
+
+    Returns:
+        One execution result per operation, in order.
+
+    Raises:
+        CostLimitExceeded: If the batch is over the per-request cost limit
+            or the client's budget.
+    """
+    if executor is None or len(operations) <= chunk_size:
+        return asyncio.run(execute_batch_async(operations, cost_limiter, client, metrics))
+
+    context = create_context(cost_limiter=cost_limiter, client=client)
+    try:
+        error, costs = check_batch_cost(operations, context)
+    finally:
+        finish_context(context)
+    if error is not None:
+        raise CostLimitExceeded(error)
+
+    futures = [
+        executor.submit(
+            asyncio.run,
+            _execute_chunk(
+                operations[i : i + chunk_size],
+                costs[i : i + chunk_size],
+                cost_limiter,
+                client,
+                metrics,
+            ),
+        )
+        for i in range(0, len(operations), chunk_size)
+    ]
+    return [result for future in futures for result in future.result()]
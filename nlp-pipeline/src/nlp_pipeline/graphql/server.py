@@ -0,0 +1,145 @@
+"""Pre-fork production server for the GraphQL API."""
+
+import gc
+import logging
+import os
+from collections.abc import Callable
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from nlp_pipeline.embeddings import WordEmbeddings
+from nlp_pipeline.graphql.app import create_app
+from nlp_pipeline.graphql.asgi import GraphQLASGIApp, create_asgi_app
+
+logger = logging.getLogger("gunicorn.error")
+
+
+class GraphQLServer(BaseApplication):
+    """Gunicorn application serving the GraphQL API from pre-forked workers.
+
+    The embeddings are loaded once in the master process (preload_app) and
+    packed into a single matrix before the workers are forked, so all
+    workers share the same physical pages copy-on-write instead of each
+    holding a private copy. Loading with WordEmbeddings.load(mmap=True)
+    shares them through the page cache as well.
+
+    With asgi=True the workers serve the ASGI app (create_asgi_app) and
+    must use an ASGI worker class such as uvicorn.workers.UvicornWorker.
+
+    Sending SIGHUP to the master runs the loader again and replaces the
+    workers gracefully: old workers finish their in-flight requests (up to
+    graceful_timeout) while new ones start on the fresh embeddings.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], WordEmbeddings],
+        options: dict | None = None,
+        app_options: dict | None = None,
+        asgi: bool = False,
+    ):
+        """Initialize server.
+
+        Args:
+            loader: Callable returning the embeddings to serve. Called in
+                the master at startup and again on every reload.
+            options: Gunicorn settings (bind, workers, threads, ...).
+            app_options: Keyword arguments for create_app(), or for
+                create_asgi_app() if asgi is True.
+            asgi: Serve the ASGI app instead of the Flask app.
+        """
+        self.loader = loader
+        self.app_options = app_options or {}
+        self.asgi = asgi
+        self.options = {"preload_app": True, **(options or {})}
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply the options to the gunicorn configuration."""
+        for key, value in self.options.items():
+            if key not in self.cfg.settings:
+                raise ValueError(f"Unknown gunicorn setting: {key}")
+            self.cfg.set(key, value)
+
+    def load(self) -> Flask | GraphQLASGIApp:
+        """Load embeddings and build the WSGI (or ASGI) app."""
+        embeddings = self.loader()
+        # Pack vectors into one block (and precompute row norms) so forked
+        # workers share them instead of building private copies
+        embeddings.norms
+        factory = create_asgi_app if self.asgi else create_app
+        app = factory(embeddings, **self.app_options)
+        # Keep the cyclic GC from touching (and un-sharing) the loaded objects
+        gc.freeze()
+        return app
+
+    def reload(self) -> None:
+        """Reload configuration and embeddings (SIGHUP).
+
+        If the loader fails, the current embeddings keep being served.
+        """
+        super().reload()
+        gc.unfreeze()
+        try:
+            app = self.load()
+        except Exception:
+            logger.exception("Reloading embeddings failed; keeping current ones")
+            gc.freeze()
+            return
+        self.callable = app
+
+
+def default_workers() -> int:
+    """Get the default worker count (one per CPU)."""
+    return os.cpu_count() or 1
+
+
+def serve(
+    loader: Callable[[], WordEmbeddings],
+    host: str = "0.0.0.0",
+    port: int = 8081,
+    workers: int | None = None,
+    threads: int = 1,
+    timeout: int = 30,
+    graceful_timeout: int = 30,
+    max_requests: int = 0,
+    app_options: dict | None = None,
+    asgi: bool = False,
+    **options,
+) -> None:
+    """Run the GraphQL API with gunicorn until interrupted.
+
+    Args:
+        loader: Callable returning the embeddings to serve.
+        host: Interface to bind.
+        port: Port to bind.
+        workers: Number of worker processes. One per CPU if None.
+        threads: Threads per worker. Values above 1 use the gthread worker.
+            Ignored with asgi=True.
+        timeout: Seconds before a silent worker is killed and restarted.
+        graceful_timeout: Seconds workers get to finish requests on reload
+            or shutdown.
+        max_requests: Restart a worker after this many requests (0 never).
+        app_options: Keyword arguments for create_app(), e.g.
+            max_batch_size or batch_workers (or create_asgi_app(), e.g.
+            max_pending or timeout, if asgi is True).
+        asgi: Serve the ASGI app with uvicorn workers (needs uvicorn).
+        **options: Additional gunicorn settings.
+    """
+    if asgi:
+        worker_class = "uvicorn.workers.UvicornWorker"
+    else:
+        worker_class = "gthread" if threads > 1 else "sync"
+    settings = {
+        "bind": f"{host}:{port}",
+        "workers": workers or default_workers(),
+        "threads": threads,
+        "worker_class": worker_class,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        **options,
+    }
+    GraphQLServer(loader, settings, app_options, asgi).run()
@@ -0,0 +1,104 @@
+"""Compact binary encodings of embedding vectors."""
+
+import base64
+import io
+from collections.abc import Iterator
+
+import numpy as np
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+# Wire dtypes, always little-endian
+DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+}
+
+
+def gather_vectors(
+    embeddings: WordEmbeddings,
+    words: list[str],
+    dtype: str = "float32",
+) -> tuple[list[str], list[str], np.ndarray]:
+    """Collect the vectors of several words into one contiguous array.
+
+    The rows are read straight from the embedding matrix: a run of
+    consecutive vocabulary rows is returned as a view, anything else is
+    gathered with one indexing operation. float16 needs one conversion.
+
+    Args:
+        embeddings: Embeddings to read from.
+        words: Words to look up.
+        dtype: "float32" or "float16".
+
+    Returns:
+        Tuple of (found words, missing words, array of shape
+        (len(found), dimension)). Rows follow the order of found words.
+
+    Raises:
+        ValueError: If dtype is not supported.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype '{dtype}' not supported. Available: {list(DTYPES)}")
+
+    rows = embeddings.row_indices(words)
+    known = rows >= 0
+    found = [w for w, ok in zip(words, known) if ok]
+    missing = [w for w, ok in zip(words, known) if not ok]
+    rows = rows[known]
+
+    matrix = embeddings.matrix
+    if len(rows) and np.array_equal(rows, np.arange(rows[0], rows[0] + len(rows))):
+        array = matrix[rows[0] : rows[0] + len(rows)]
+    else:
+        array = matrix[rows]
+    return found, missing, np.ascontiguousarray(array.astype(DTYPES[dtype], copy=False))
+
+
+def encode_base64(array: np.ndarray) -> str:
+    """Base64-encode the raw buffer of a contiguous array."""
+    return base64.b64encode(memoryview(np.ascontiguousarray(array))).decode("ascii")
+
+
+def decode_base64(data: str, dimension: int, dtype: str = "float32") -> np.ndarray:
+    """Decode a base64 buffer produced by encode_base64().
+
+    Args:
+        data: Base64 text.
+        dimension: Vector dimension.
+        dtype: "float32" or "float16".
+
+    Returns:
+        Array of shape (n, dimension).
+    """
+    buffer = base64.b64decode(data)
+    return np.frombuffer(buffer, dtype=DTYPES[dtype]).reshape(-1, dimension)
+
+
+def npy_header(array: np.ndarray) -> bytes:
+    """Get the .npy header describing an array."""
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, np.lib.format.header_data_from_array_1_0(array)
+    )
+    return header.getvalue()
+
+
+def npy_chunks(array: np.ndarray, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Serialize an array as .npy, streaming its buffer in chunks.
+
+    WSGI bodies must be bytes, so each chunk is copied out of the array
+    buffer as it is sent; the full payload is never materialized.
+
+    Args:
+        array: C-contiguous array.
+        chunk_size: Maximum bytes per chunk.
+
+    Yields:
+        The .npy header, then the raw data; the concatenation is a valid
+        .npy file of len(npy_header(array)) + array.nbytes bytes.
+    """
+    yield npy_header(array)
+    data = memoryview(array.reshape(-1).view(np.uint8))
+    for start in range(0, len(data), chunk_size):
+        yield bytes(data[start : start + chunk_size])
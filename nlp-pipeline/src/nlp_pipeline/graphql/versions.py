@@ -0,0 +1,122 @@
+"""Versioned embeddings with reference-counted retirement."""
+
+import threading
+import time
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+
+class EmbeddingsVersion:
+    """One published set of embeddings and the requests still using it."""
+
+    def __init__(self, embeddings: WordEmbeddings, number: int, source: str | None = None):
+        """Initialize version.
+
+        Args:
+            embeddings: The embeddings.
+            number: Version number, increasing with every publish.
+            source: Where the embeddings were loaded from, for reporting.
+        """
+        self.embeddings = embeddings
+        self.number = number
+        self.source = source
+        self.published_at = time.time()
+        self.refs = 0
+
+    def info(self) -> dict:
+        """Get a JSON-serializable description."""
+        return {
+            "version": self.number,
+            "source": self.source,
+            "published_at": self.published_at,
+            "vocab_size": self.embeddings.vocab_size,
+            "dimension": self.embeddings.dimension,
+            "in_flight": self.refs,
+        }
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"EmbeddingsVersion(number={self.number}, refs={self.refs})"
+
+
+class VersionedEmbeddings:
+    """The current embeddings version and the old ones still draining.
+
+    A request acquires the current version once and keeps using it until it
+    releases it, so a swap never changes the embeddings under a running
+    query. Publishing a new version is a single reference assignment; the
+    previous version is retired once its last request releases it, at
+    which point it is dropped and its memory (or mapping) can be freed.
+    """
+
+    def __init__(self):
+        """Initialize with no version published."""
+        self.current: EmbeddingsVersion | None = None
+        self.draining: list[EmbeddingsVersion] = []
+        self.retired = 0
+        self._next = 1
+        self._lock = threading.Lock()
+
+    def publish(
+        self, embeddings: WordEmbeddings | None, source: str | None = None
+    ) -> EmbeddingsVersion | None:
+        """Make embeddings the current version.
+
+        Args:
+            embeddings: New embeddings, or None to unpublish.
+            source: Where the embeddings were loaded from.
+
+        Returns:
+            The new version, or None if embeddings is None.
+        """
+        with self._lock:
+            old = self.current
+            if embeddings is None:
+                self.current = None
+            else:
+                self.current = EmbeddingsVersion(embeddings, self._next, source)
+                self._next += 1
+            if old is not None:
+                self._retire(old)
+            return self.current
+
+    def acquire(self, embeddings: WordEmbeddings) -> EmbeddingsVersion | None:
+        """Pin the current version for one request.
+
+        Args:
+            embeddings: Embeddings the request is about to use. Only
+                counted if they are the current version.
+
+        Returns:
+            The pinned version (pass it to release()), or None.
+        """
+        with self._lock:
+            version = self.current
+            if version is None or version.embeddings is not embeddings:
+                return None
+            version.refs += 1
+            return version
+
+    def release(self, version: EmbeddingsVersion) -> None:
+        """Unpin a version acquired for a finished request."""
+        with self._lock:
+            version.refs -= 1
+            if version is not self.current and version.refs == 0 and version in self.draining:
+                self.draining.remove(version)
+                self.retired += 1
+
+    def _retire(self, version: EmbeddingsVersion) -> None:
+        """Retire a replaced version now or when its last request ends."""
+        if version.refs > 0:
+            self.draining.append(version)
+        else:
+            self.retired += 1
+
+    def info(self) -> dict:
+        """Get a JSON-serializable description of all live versions."""
+        with self._lock:
+            return {
+                "current": self.current.info() if self.current is not None else None,
+                "draining": [version.info() for version in self.draining],
+                "retired": self.retired,
+            }
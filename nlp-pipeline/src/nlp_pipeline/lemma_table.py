@@ -0,0 +1,150 @@
+"""Precompiled lemma lookup table exported from WordNet."""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+# Column order of the lemma_ids array on disk (WordNet POS constants).
+POS_TAGS = ("n", "v", "a", "r")
+_POS_COLUMN = {pos: i for i, pos in enumerate(POS_TAGS)}
+_POS_NAMES = {"n": "noun", "v": "verb", "a": "adj", "r": "adv"}
+
+
+class LemmaTable:
+    """Flat (surface form, POS) -> lemma table.
+
+    On disk the table is a compressed .npz file holding three arrays:
+
+    - surfaces: sorted unique surface forms, shape (n,)
+    - lemmas: unique lemma strings, shape (m,)
+    - lemma_ids: int32 index into lemmas per (surface, POS column), shape
+      (n, 4) in POS_TAGS order, -1 where no lemma was exported
+
+    Loading turns the arrays into one dict keyed by surface form, so a lookup
+    is a single hash probe plus a tuple index.
+    """
+
+    def __init__(self, entries: dict[tuple[str, str], str] | None = None):
+        """Initialize table.
+
+        Args:
+            entries: Mapping of (surface form, WordNet POS) to lemma.
+                POS must be one of 'n', 'v', 'a', 'r'.
+
+        Raises:
+            ValueError: If an entry uses an unknown POS.
+        """
+        self._rows: dict[str, tuple[str | None, ...]] = {}
+        for (surface, pos), lemma in (entries or {}).items():
+            if pos not in _POS_COLUMN:
+                raise ValueError(
+                    f"POS '{pos}' not supported. Choose from: {POS_TAGS}"
+                )
+            row = list(self._rows.get(surface, (None,) * len(POS_TAGS)))
+            row[_POS_COLUMN[pos]] = lemma
+            self._rows[surface] = tuple(row)
+
+    def __len__(self) -> int:
+        """Get number of surface forms."""
+        return len(self._rows)
+
+    def __contains__(self, word: str) -> bool:
+        """Check if a surface form is in the table."""
+        return word in self._rows
+
+    def lookup(self, word: str, pos: str) -> str | None:
+        """Look up the lemma of a lowercased word.
+
+        Args:
+            word: Surface form (already lowercased).
+            pos: WordNet POS ('n', 'v', 'a', 'r').
+
+        Returns:
+            Lemma, or None if the (word, POS) pair was not exported.
+        """
+        row = self._rows.get(word)
+        if row is None:
+            return None
+        column = _POS_COLUMN.get(pos)
+        return row[column] if column is not None else None
+
+    @classmethod
+    def build(
+        cls,
+        words: Iterable[str],
+        pos_tags: Iterable[str] = POS_TAGS,
+    ) -> "LemmaTable":
+        """Export lemmas for a vocabulary from WordNet.
+
+        Args:
+            words: Surface forms to export. Lowercased and deduplicated.
+            pos_tags: WordNet POS to export for every word.
+
+        Returns:
+            LemmaTable covering every (word, POS) pair.
+        """
+        from nlp_pipeline.lemmatizer import Lemmatizer
+
+        lemmatizer = Lemmatizer(cache_size=0)
+        pos_tags = tuple(pos_tags)
+        entries = {}
+        for word in dict.fromkeys(w.lower() for w in words if w):
+            for pos in pos_tags:
+                entries[(word, pos)] = lemmatizer.lemmatize(word, _POS_NAMES[pos])
+        return cls(entries)
+
+    def save(self, path: str | Path) -> Path:
+        """Save table as a compressed .npz file.
+
+        Args:
+            path: Output path. '.npz' is appended if missing.
+
+        Returns:
+            Path that was written.
+        """
+        path = Path(path)
+        if path.suffix != ".npz":
+            path = path.with_name(path.name + ".npz")
+
+        surfaces = sorted(self._rows)
+        lemma_index: dict[str, int] = {}
+        lemma_ids = np.full((len(surfaces), len(POS_TAGS)), -1, dtype=np.int32)
+        for i, surface in enumerate(surfaces):
+            for j, lemma in enumerate(self._rows[surface]):
+                if lemma is not None:
+                    lemma_ids[i, j] = lemma_index.setdefault(lemma, len(lemma_index))
+
+        np.savez_compressed(
+            path,
+            surfaces=np.array(surfaces, dtype=str),
+            lemmas=np.array(list(lemma_index), dtype=str),
+            lemma_ids=lemma_ids,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LemmaTable":
+        """Load a table written by save().
+
+        Args:
+            path: Path to .npz file.
+
+        Returns:
+            LemmaTable instance.
+        """
+        with np.load(Path(path)) as data:
+            surfaces = data["surfaces"].tolist()
+            lemmas = data["lemmas"].tolist() + [None]  # -1 indexes None
+            lemma_ids = data["lemma_ids"].tolist()
+
+        table = cls()
+        table._rows = {
+            surface: tuple(lemmas[j] for j in row)
+            for surface, row in zip(surfaces, lemma_ids)
+        }
+        return table
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"LemmaTable(size={len(self)})"
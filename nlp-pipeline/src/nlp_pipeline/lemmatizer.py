@@ -1,26 +1,88 @@
 """Lemmatization module using WordNet."""
 
+from functools import lru_cache
+from pathlib import Path
 from typing import Literal
 
 import nltk
 from nltk.stem import WordNetLemmatizer
 
+from nlp_pipeline.lemma_table import LemmaTable
+
 POS = Literal["noun", "verb", "adj", "adv"]
 
+# WordNet POS constants (same values as nltk.corpus.wordnet.NOUN etc.).
+# Spelled out here so that mapping a POS never touches the lazy corpus loader.
+WORDNET_NOUN = "n"
+WORDNET_VERB = "v"
+WORDNET_ADJ = "a"
+WORDNET_ADV = "r"
+
+_POS_TO_WORDNET = {
+    "noun": WORDNET_NOUN,
+    "verb": WORDNET_VERB,
+    "adj": WORDNET_ADJ,
+    "adv": WORDNET_ADV,
+}
+
+# Penn Treebank tags map to WordNet by their first letter; anything else is a noun.
+_PENN_PREFIX_TO_WORDNET = {
+    "V": WORDNET_VERB,
+    "J": WORDNET_ADJ,
+    "R": WORDNET_ADV,
+}
+
 
 class Lemmatizer:
     """Word lemmatizer using WordNet."""
 
-    def __init__(self, default_pos: POS = "noun"):
+    def __init__(
+        self,
+        default_pos: POS = "noun",
+        cache_size: int | None = 100_000,
+        lemma_table: LemmaTable | str | Path | None = None,
+    ):
         """Initialize lemmatizer.
 
         Args:
             default_pos: Default part-of-speech for lemmatization.
                 Options: 'noun', 'verb', 'adj', 'adv'.
+            cache_size: Maximum number of (word, POS) lemmas to memoize.
+                None for an unbounded cache, 0 to disable caching.
+            lemma_table: Precompiled LemmaTable (or path to one) consulted
+                before WordNet. WordNet data is only checked and loaded on
+                the first table miss.
         """
-        self._ensure_nltk_data()
+        if isinstance(lemma_table, (str, Path)):
+            lemma_table = LemmaTable.load(lemma_table)
+        self.lemma_table = lemma_table
+
+        self._wordnet_ready = False
+        if lemma_table is None:
+            self._ensure_wordnet()
         self._lemmatizer = WordNetLemmatizer()
+        self._tagger = None
         self.default_pos = default_pos
+        self.cache_size = cache_size
+        self._init_cache()
+
+    def _init_cache(self) -> None:
+        """Create the per-instance (word, POS) lemma cache."""
+        self._lemmatize_cached = lru_cache(maxsize=self.cache_size)(
+            self._lemmatize_wordnet
+        )
+
+    def __getstate__(self) -> dict:
+        # The cache wraps a bound method and cannot be pickled; the tagger
+        # is reloaded on first use
+        state = self.__dict__.copy()
+        del state["_lemmatize_cached"]
+        state["_tagger"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._init_cache()
 
     def _ensure_nltk_data(self) -> None:
         """Download required NLTK data if not present."""
@@ -30,17 +92,41 @@ class Lemmatizer:
             except LookupError:
                 nltk.download(resource, quiet=True)
 
+    def _ensure_wordnet(self) -> None:
+        """Make sure WordNet data is available before the first lookup."""
+        if not self._wordnet_ready:
+            self._ensure_nltk_data()
+            self._wordnet_ready = True
+
+    def _get_tagger(self):
+        """Load the averaged perceptron POS tagger on first use."""
+        if self._tagger is None:
+            try:
+                nltk.data.find("taggers/averaged_perceptron_tagger_eng")
+            except LookupError:
+                nltk.download("averaged_perceptron_tagger_eng", quiet=True)
+
+            from nltk.tag import PerceptronTagger
+
+            self._tagger = PerceptronTagger()
+        return self._tagger
+
     def _get_wordnet_pos(self, pos: POS) -> str:
         """Convert POS string to WordNet POS constant."""
-        from nltk.corpus import wordnet
+        return _POS_TO_WORDNET.get(pos, WORDNET_NOUN)
 
-        pos_map = {
-            "noun": wordnet.NOUN,
-            "verb": wordnet.VERB,
-            "adj": wordnet.ADJ,
-            "adv": wordnet.ADV,
-        }
-        return pos_map.get(pos, wordnet.NOUN)
+    def _lemmatize_wordnet(self, word: str, wordnet_pos: str) -> str:
+        """Look up the lemma of a lowercased word in WordNet."""
+        self._ensure_wordnet()
+        return self._lemmatizer.lemmatize(word, pos=wordnet_pos)
+
+    def _lookup(self, word: str, wordnet_pos: str) -> str:
+        """Look up a lowercased word in the lemma table, then WordNet."""
+        if self.lemma_table is not None:
+            lemma = self.lemma_table.lookup(word, wordnet_pos)
+            if lemma is not None:
+                return lemma
+        return self._lemmatize_cached(word, wordnet_pos)
 
     def lemmatize(self, word: str, pos: POS | None = None) -> str:
         """Lemmatize a single word.
@@ -58,7 +144,7 @@ class Lemmatizer:
 
         pos = pos or self.default_pos
         wordnet_pos = self._get_wordnet_pos(pos)
-        return self._lemmatizer.lemmatize(word.lower(), pos=wordnet_pos)
+        return self._lookup(word.lower(), wordnet_pos)
 
     def lemmatize_tokens(
         self,
@@ -112,21 +198,61 @@ class Lemmatizer:
         Returns:
             List of lemmatized words.
         """
-        result = []
-        for word, tag in tagged_tokens:
-            pos = self._penn_to_wordnet(tag)
-            result.append(self._lemmatizer.lemmatize(word.lower(), pos=pos))
-        return result
+        lemmatize = self._lookup
+        return [
+            lemmatize(word.lower(), _PENN_PREFIX_TO_WORDNET.get(tag[:1], WORDNET_NOUN))
+            if word
+            else word
+            for word, tag in tagged_tokens
+        ]
+
+    def tag_sentences(
+        self,
+        sentences: list[list[str]],
+    ) -> list[list[tuple[str, str]]]:
+        """POS-tag a batch of tokenized sentences.
+
+        The tagger is loaded once per Lemmatizer and reused for every batch.
+
+        Args:
+            sentences: List of token lists.
+
+        Returns:
+            List of (word, Penn Treebank tag) lists, one per sentence.
+        """
+        tagger = self._get_tagger()
+        return [tagger.tag(tokens) if tokens else [] for tokens in sentences]
+
+    def lemmatize_batch(self, sentences: list[list[str]]) -> list[list[str]]:
+        """POS-tag and lemmatize a batch of tokenized sentences.
+
+        Unlike lemmatize_tokens, each token is lemmatized with the POS the
+        tagger assigns it in context, so "running" in "the dog is running"
+        becomes "run".
+
+        Args:
+            sentences: List of token lists.
+
+        Returns:
+            List of lemmatized token lists, one per sentence.
+        """
+        return [
+            self.lemmatize_with_pos_tags(tagged)
+            for tagged in self.tag_sentences(sentences)
+        ]
+
+    def clear_cache(self) -> None:
+        """Drop all memoized lemmas."""
+        self._lemmatize_cached.cache_clear()
+
+    def cache_info(self):
+        """Return hit, miss and size statistics of the lemma cache.
+
+        Returns:
+            functools cache info named tuple (hits, misses, maxsize, currsize).
+        """
+        return self._lemmatize_cached.cache_info()
 
     def _penn_to_wordnet(self, tag: str) -> str:
         """Convert Penn Treebank POS tag to WordNet POS."""
-        from nltk.corpus import wordnet
-
-        if tag.startswith("V"):
-            return wordnet.VERB
-        elif tag.startswith("J"):
-            return wordnet.ADJ
-        elif tag.startswith("R"):
-            return wordnet.ADV
-        else:
-            return wordnet.NOUN
+        return _PENN_PREFIX_TO_WORDNET.get(tag[:1], WORDNET_NOUN)
@@ -2,12 +2,17 @@
 
 from typing import Literal
 
+import numpy as np
+
+from nlp_pipeline.cache import PipelineCache
 from nlp_pipeline.lemmatizer import Lemmatizer
 from nlp_pipeline.stemmer import Stemmer
 from nlp_pipeline.stopwords import StopwordRemover
 from nlp_pipeline.tokenizer import Tokenizer
+from nlp_pipeline.vocabulary import TokenIds, Vocabulary
 
 NormalizerType = Literal["stem", "lemmatize", None]
+OutputType = Literal["tokens", "ids"]
 
 
 class Pipeline:
@@ -27,6 +32,10 @@ class Pipeline:
         lemmatizer_pos: Literal["noun", "verb", "adj", "adv"] = "noun",
         extra_stopwords: list[str] | None = None,
         keep_stopwords: list[str] | None = None,
+        output: OutputType = "tokens",
+        min_freq: int = 1,
+        max_vocab_size: int | None = None,
+        cache: PipelineCache | None = None,
     ):
         """Initialize preprocessing pipeline.
 
@@ -39,11 +48,29 @@ class Pipeline:
             lemmatizer_pos: Default POS for lemmatization.
             extra_stopwords: Additional stopwords to remove.
             keep_stopwords: Words to keep (not remove as stopwords).
+            output: What transform() returns - 'tokens' for token lists or
+                'ids' for int32 ids against the vocabulary built by fit().
+            min_freq: Minimum token count for the fitted vocabulary.
+            max_vocab_size: Maximum fitted vocabulary size (including the
+                unknown token).
+            cache: Optional PipelineCache. Processed texts are looked up by
+                a hash of the text and this pipeline's config before being
+                processed.
         """
         self.lowercase = lowercase
         self.remove_stopwords = remove_stopwords
         self.normalizer = normalizer
         self.language = language
+        self.stemmer_algorithm = stemmer_algorithm
+        self.lemmatizer_pos = lemmatizer_pos
+        self.extra_stopwords = sorted(extra_stopwords or [])
+        self.keep_stopwords = sorted(keep_stopwords or [])
+        self.cache = cache
+        self._cache_namespace = PipelineCache.namespace(self.config)
+        self.output = output
+        self.min_freq = min_freq
+        self.max_vocab_size = max_vocab_size
+        self.vocabulary: Vocabulary | None = None
 
         # Initialize components
         self._tokenizer = Tokenizer(lowercase=lowercase, language=language)
@@ -76,6 +103,18 @@ class Pipeline:
         Returns:
             List of processed tokens.
         """
+        if self.cache is None:
+            return self._normalize(self._tokenize_and_filter(text))
+
+        key = PipelineCache.make_key(text, self._cache_namespace)
+        tokens = self.cache.get(key)
+        if tokens is None:
+            tokens = self._normalize(self._tokenize_and_filter(text))
+            self.cache.put(key, tokens)
+        return tokens
+
+    def _tokenize_and_filter(self, text: str) -> list[str]:
+        """Tokenize text and remove stopwords (if enabled)."""
         # Step 1: Tokenize
         tokens = self._tokenizer.tokenize_words(text)
 
@@ -83,6 +122,10 @@ class Pipeline:
         if self._stopword_remover:
             tokens = self._stopword_remover.remove(tokens)
 
+        return tokens
+
+    def _normalize(self, tokens: list[str]) -> list[str]:
+        """Stem or lemmatize tokens (if enabled)."""
         # Step 3: Normalize (if enabled)
         if self._normalizer:
             if isinstance(self._normalizer, Stemmer):
@@ -106,46 +149,131 @@ class Pipeline:
     def process_batch(self, texts: list[str]) -> list[list[str]]:
         """Process multiple texts.
 
+        With stemming, each unique word in the batch is stemmed once. With a
+        cache, only texts missing from it are processed.
+
         Args:
             texts: List of texts to process.
 
         Returns:
             List of processed token lists.
         """
-        return [self.process(text) for text in texts]
+        if self.cache is None:
+            return self._process_uncached(texts)
+
+        keys = [PipelineCache.make_key(text, self._cache_namespace) for text in texts]
+        found = self.cache.get_many(keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            processed = dict(zip(missing, self._process_uncached(list(missing.values()))))
+            self.cache.put_many(processed)
+            found.update(processed)
+
+        return [list(found[key]) for key in keys]
+
+    def _process_uncached(self, texts: list[str]) -> list[list[str]]:
+        """Process a batch of texts without consulting the cache."""
+        token_lists = [self._tokenize_and_filter(text) for text in texts]
+        if isinstance(self._normalizer, Stemmer):
+            return self._normalizer.stem_batch(token_lists)
+        return [self._normalize(tokens) for tokens in token_lists]
 
     def fit(self, texts: list[str]) -> "Pipeline":
-        """Placeholder for sklearn-style API (no-op for now).
+        """Build the token vocabulary from training texts.
 
         Args:
-            texts: Training texts (unused).
+            texts: Training texts.
 
         Returns:
             Self for method chaining.
         """
+        self._fit_tokens(self.process_batch(texts))
         return self
 
-    def transform(self, texts: list[str]) -> list[list[str]]:
+    def _fit_tokens(self, token_lists: list[list[str]]) -> None:
+        """Build the vocabulary from processed token lists."""
+        self.vocabulary = Vocabulary.build(
+            token_lists,
+            min_freq=self.min_freq,
+            max_size=self.max_vocab_size,
+        )
+
+    def _check_fitted(self) -> Vocabulary:
+        """Get the fitted vocabulary or raise."""
+        if self.vocabulary is None:
+            raise RuntimeError("Pipeline vocabulary not fitted. Call fit() first.")
+        return self.vocabulary
+
+    def encode(self, text: str) -> np.ndarray:
+        """Process text and map tokens to vocabulary ids.
+
+        Args:
+            text: Input text to process.
+
+        Returns:
+            int32 array of token ids (0 for unknown tokens).
+
+        Raises:
+            RuntimeError: If the pipeline has not been fitted.
+        """
+        return self._check_fitted().encode(self.process(text))
+
+    def encode_batch(self, texts: list[str]) -> TokenIds:
+        """Process texts and map tokens to vocabulary ids.
+
+        Args:
+            texts: Texts to process.
+
+        Returns:
+            TokenIds holding all sequences as one int32 array plus offsets.
+
+        Raises:
+            RuntimeError: If the pipeline has not been fitted.
+        """
+        vocabulary = self._check_fitted()
+        return vocabulary.encode_batch(self.process_batch(texts))
+
+    def transform(
+        self,
+        texts: list[str],
+        output: OutputType | None = None,
+    ) -> list[list[str]] | TokenIds:
         """Transform texts (sklearn-style API).
 
         Args:
             texts: Texts to transform.
+            output: Override the pipeline's output mode.
 
         Returns:
-            List of processed token lists.
+            List of processed token lists, or TokenIds in 'ids' mode.
         """
+        if (output or self.output) == "ids":
+            return self.encode_batch(texts)
         return self.process_batch(texts)
 
-    def fit_transform(self, texts: list[str]) -> list[list[str]]:
+    def fit_transform(
+        self,
+        texts: list[str],
+        output: OutputType | None = None,
+    ) -> list[list[str]] | TokenIds:
         """Fit and transform (sklearn-style API).
 
+        Texts are processed once and used both to build the vocabulary and
+        for the output.
+
         Args:
             texts: Texts to process.
+            output: Override the pipeline's output mode.
 
         Returns:
-            List of processed token lists.
+            List of processed token lists, or TokenIds in 'ids' mode.
         """
-        return self.fit(texts).transform(texts)
+        token_lists = self.process_batch(texts)
+        self._fit_tokens(token_lists)
+        if (output or self.output) == "ids":
+            return self.vocabulary.encode_batch(token_lists)
+        return token_lists
 
     @property
     def config(self) -> dict:
@@ -155,6 +283,10 @@ class Pipeline:
             "remove_stopwords": self.remove_stopwords,
             "normalizer": self.normalizer,
             "language": self.language,
+            "stemmer_algorithm": self.stemmer_algorithm,
+            "lemmatizer_pos": self.lemmatizer_pos,
+            "extra_stopwords": self.extra_stopwords,
+            "keep_stopwords": self.keep_stopwords,
         }
 
     def __repr__(self) -> str:
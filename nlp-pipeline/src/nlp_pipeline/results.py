@@ -0,0 +1,135 @@
+"""Shared cache of nearest-neighbor results."""
+
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+
+from nlp_pipeline.embeddings import WordEmbeddings
+
+# A query is ("word", word) for most_similar or
+# ("analogy", positive, negative) for analogy, with tuples of words
+Query = tuple
+
+
+def _check_top_n(top_n: int) -> None:
+    """Reject a negative top_n, which would slice a ranking from the end."""
+    if top_n < 0:
+        raise ValueError(f"top_n must be non-negative, got {top_n}")
+
+
+class ResultStore:
+    """Thread-safe LRU of nearest-neighbor rankings, shared by the front ends.
+
+    The dashboard and the GraphQL API answer the same questions (neighbors
+    of a word, analogies) against the same embeddings, so they share one
+    store: a ranking computed by either is reused by both. Entries are
+    tied to one embeddings matrix; replacing the embeddings (a reload, a
+    different model) or changing their vocabulary starts fresh entries,
+    and the stale ones age out of the LRU.
+
+    Rankings are deterministic, so a ranking computed for top_n words also
+    answers every smaller top_n with its prefix.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        """Initialize store.
+
+        Args:
+            maxsize: Maximum number of rankings kept.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[int, list]] = OrderedDict()
+        self._tokens: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _token(self, embeddings: WordEmbeddings) -> int:
+        """Get the number identifying the current matrix of embeddings."""
+        matrix = embeddings.matrix
+        entry = self._tokens.get(embeddings)
+        if entry is None or entry[0]() is not matrix:
+            entry = (weakref.ref(matrix), next(self._counter))
+            self._tokens[embeddings] = entry
+        return entry[1]
+
+    def get(
+        self, embeddings: WordEmbeddings, query: Query, top_n: int
+    ) -> list[tuple[str, float]] | None:
+        """Look up a ranking.
+
+        Args:
+            embeddings: Embeddings the ranking is computed against.
+            query: ("word", word) or ("analogy", positive, negative).
+            top_n: Number of results wanted.
+
+        Returns:
+            Copy of the top_n (word, similarity) tuples, or None on a miss.
+
+        Raises:
+            ValueError: If top_n is negative.
+        """
+        _check_top_n(top_n)
+        with self._lock:
+            key = (self._token(embeddings), *query)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < top_n:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1][:top_n]
+
+    def put(
+        self,
+        embeddings: WordEmbeddings,
+        query: Query,
+        top_n: int,
+        result: list[tuple[str, float]],
+    ) -> None:
+        """Store a ranking computed for top_n results.
+
+        Raises:
+            ValueError: If top_n is negative.
+        """
+        _check_top_n(top_n)
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            key = (self._token(embeddings), *query)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < top_n:
+                self._entries[key] = (top_n, list(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all rankings."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        """Get number of stored rankings."""
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"ResultStore(maxsize={self.maxsize}, size={len(self)})"
+
+
+# Store shared by the dashboard and GraphQL API of one process
+default_store = ResultStore()
@@ -1,10 +1,18 @@
 """Stemming module with Porter and Snowball stemmers."""
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Literal
 
 from nltk.stem import PorterStemmer, SnowballStemmer
 
 
+def _stem_words(algorithm: str, language: str, words: list[str]) -> list[str]:
+    """Stem a chunk of words in a worker process."""
+    stemmer = Stemmer(algorithm=algorithm, language=language)
+    return [stemmer.stem(word) for word in words]
+
+
 class Stemmer:
     """Word stemmer supporting multiple algorithms."""
 
@@ -60,13 +68,57 @@ class Stemmer:
     def stem_tokens(self, tokens: list[str]) -> list[str]:
         """Stem a list of tokens.
 
+        Each distinct token is stemmed once.
+
         Args:
             tokens: List of words to stem.
 
         Returns:
             List of stemmed words.
         """
-        return [self.stem(token) for token in tokens]
+        stems = {token: self.stem(token) for token in set(tokens)}
+        return [stems[token] for token in tokens]
+
+    def stem_batch(
+        self,
+        documents: list[list[str]],
+        n_jobs: int = 1,
+        chunk_size: int = 10_000,
+    ) -> list[list[str]]:
+        """Stem a batch of token lists.
+
+        Tokens are deduplicated across the whole batch, only the unique
+        words are stemmed, and the stems are scattered back, so the cost is
+        proportional to the number of unique words rather than tokens.
+
+        Args:
+            documents: List of token lists.
+            n_jobs: Number of worker processes for stemming the unique
+                words. The pool is only used when there are more than
+                chunk_size unique words.
+            chunk_size: Number of unique words sent to a worker at a time.
+
+        Returns:
+            List of stemmed token lists, one per document.
+        """
+        unique = list({token for tokens in documents for token in tokens})
+
+        if n_jobs > 1 and len(unique) > chunk_size:
+            chunks = [
+                unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)
+            ]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                stemmed = executor.map(
+                    _stem_words,
+                    repeat(self.algorithm),
+                    repeat(self.language),
+                    chunks,
+                )
+                stems = dict(zip(unique, (s for chunk in stemmed for s in chunk)))
+        else:
+            stems = {token: self.stem(token) for token in unique}
+
+        return [[stems[token] for token in tokens] for tokens in documents]
 
     def stem_text(self, text: str, tokenizer=None) -> list[str]:
         """Tokenize text and stem all words.
@@ -0,0 +1,192 @@
+"""Token vocabulary and integer id encoding."""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+UNK_TOKEN = "<unk>"
+
+
+class TokenIds:
+    """Ragged batch of token id sequences.
+
+    All sequences are stored back to back in one int32 array. Sequence i
+    is ids[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray):
+        """Initialize batch.
+
+        Args:
+            ids: Concatenated token ids, int32 of shape (total_tokens,).
+            offsets: Sequence boundaries, int64 of shape (n_sequences + 1,).
+        """
+        self.ids = ids
+        self.offsets = offsets
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Get the length of every sequence."""
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        """Get number of sequences."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Get the ids of one sequence (a view, not a copy)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TokenIds index out of range")
+        return self.ids[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Iterate over sequences."""
+        for i in range(len(self)):
+            yield self.ids[self.offsets[i] : self.offsets[i + 1]]
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"TokenIds(sequences={len(self)}, tokens={len(self.ids)})"
+
+
+class Vocabulary:
+    """Mapping between tokens and integer ids.
+
+    Id 0 is reserved for the unknown token; every token not in the
+    vocabulary encodes to it.
+    """
+
+    def __init__(self, tokens: Iterable[str] = (), unk_token: str = UNK_TOKEN):
+        """Initialize vocabulary.
+
+        Args:
+            tokens: Tokens to add, in id order (starting at 1).
+            unk_token: Token reserved for id 0.
+        """
+        self.unk_token = unk_token
+        self._token_to_id: dict[str, int] = {unk_token: 0}
+        self._id_to_token: list[str] = [unk_token]
+        for token in tokens:
+            self.add(token)
+
+    @classmethod
+    def build(
+        cls,
+        token_lists: Iterable[list[str]],
+        min_freq: int = 1,
+        max_size: int | None = None,
+        unk_token: str = UNK_TOKEN,
+    ) -> "Vocabulary":
+        """Build a vocabulary from processed token lists.
+
+        Tokens are ordered by frequency (most frequent first), ties broken
+        by first occurrence.
+
+        Args:
+            token_lists: Processed token lists.
+            min_freq: Minimum count for a token to be included.
+            max_size: Maximum vocabulary size including the unknown token.
+            unk_token: Token reserved for id 0.
+
+        Returns:
+            Vocabulary instance.
+        """
+        counts: Counter = Counter()
+        for tokens in token_lists:
+            counts.update(tokens)
+        counts.pop(unk_token, None)
+
+        limit = max_size - 1 if max_size is not None else None
+        tokens = [
+            token for token, count in counts.most_common(limit) if count >= min_freq
+        ]
+        return cls(tokens, unk_token=unk_token)
+
+    def add(self, token: str) -> int:
+        """Add a token if missing.
+
+        Args:
+            token: Token to add.
+
+        Returns:
+            Id of the token.
+        """
+        token_id = self._token_to_id.get(token)
+        if token_id is None:
+            token_id = len(self._id_to_token)
+            self._token_to_id[token] = token_id
+            self._id_to_token.append(token)
+        return token_id
+
+    def __len__(self) -> int:
+        """Get vocabulary size, including the unknown token."""
+        return len(self._id_to_token)
+
+    def __contains__(self, token: str) -> bool:
+        """Check if token is in vocabulary."""
+        return token in self._token_to_id
+
+    def __getitem__(self, token: str) -> int:
+        """Get id of a token (0 if unknown)."""
+        return self._token_to_id.get(token, 0)
+
+    @property
+    def tokens(self) -> list[str]:
+        """Get tokens in id order."""
+        return self._id_to_token.copy()
+
+    def encode(self, tokens: list[str]) -> np.ndarray:
+        """Map tokens to ids.
+
+        Args:
+            tokens: Token list.
+
+        Returns:
+            int32 array of ids.
+        """
+        get = self._token_to_id.get
+        return np.fromiter(
+            (get(token, 0) for token in tokens), dtype=np.int32, count=len(tokens)
+        )
+
+    def encode_batch(self, token_lists: list[list[str]]) -> TokenIds:
+        """Map a batch of token lists to a ragged id array.
+
+        Args:
+            token_lists: Token lists.
+
+        Returns:
+            TokenIds with all sequences concatenated.
+        """
+        get = self._token_to_id.get
+        lengths = np.fromiter(
+            (len(tokens) for tokens in token_lists),
+            dtype=np.int64,
+            count=len(token_lists),
+        )
+        offsets = np.zeros(len(token_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = np.fromiter(
+            (get(token, 0) for tokens in token_lists for token in tokens),
+            dtype=np.int32,
+            count=int(offsets[-1]),
+        )
+        return TokenIds(ids, offsets)
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        """Map ids back to tokens.
+
+        Args:
+            ids: Token ids.
+
+        Returns:
+            Token list.
+        """
+        return [self._id_to_token[i] for i in ids]
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"Vocabulary(size={len(self)})"
@@ -0,0 +1,116 @@
+"""Tests for the PipelineCache class."""
+
+import tempfile
+from pathlib import Path
+
+from nlp_pipeline import Pipeline, PipelineCache
+
+NAMESPACE = PipelineCache.namespace({"normalizer": "stem"})
+
+
+class TestPipelineCache:
+    """Test suite for PipelineCache."""
+
+    def test_key_depends_on_text_and_config(self):
+        """Test that keys differ by text and by configuration."""
+        other = PipelineCache.namespace({"normalizer": None})
+        key = PipelineCache.make_key("hello", NAMESPACE)
+        assert key == PipelineCache.make_key("hello", NAMESPACE)
+        assert key != PipelineCache.make_key("hello!", NAMESPACE)
+        assert key != PipelineCache.make_key("hello", other)
+
+    def test_namespace_ignores_key_order(self):
+        """Test that config key order does not change the namespace."""
+        assert PipelineCache.namespace({"a": 1, "b": 2}) == PipelineCache.namespace(
+            {"b": 2, "a": 1}
+        )
+
+    def test_get_and_put(self):
+        """Test storing and retrieving token lists."""
+        cache = PipelineCache()
+        assert cache.get("k") is None
+        cache.put("k", ["cat", "run"])
+        assert cache.get("k") == ["cat", "run"]
+        assert cache.stats["memory_hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_returns_copies(self):
+        """Test that mutating a result does not corrupt the cache."""
+        cache = PipelineCache()
+        cache.put("k", ["cat"])
+        cache.get("k").append("dog")
+        assert cache.get("k") == ["cat"]
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted from memory."""
+        cache = PipelineCache(maxsize=2)
+        cache.put("a", ["a"])
+        cache.put("b", ["b"])
+        cache.get("a")
+        cache.put("c", ["c"])
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == ["a"]
+
+    def test_disk_tier_persists(self):
+        """Test entries survive a new cache instance on the same file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "cache" / "pipeline.sqlite"
+            cache = PipelineCache(path=path)
+            cache.put_many({"a": ["cat"], "b": []})
+            cache.close()
+
+            reopened = PipelineCache(path=path)
+            assert len(reopened) == 0
+            assert reopened.get_many(["a", "b", "c"]) == {"a": ["cat"], "b": []}
+            assert reopened.stats["disk_hits"] == 2
+            assert reopened.stats["misses"] == 1
+            assert len(reopened) == 2  # promoted to memory
+            reopened.close()
+
+    def test_clear(self):
+        """Test clearing both tiers."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PipelineCache(path=Path(tmpdir) / "pipeline.sqlite")
+            cache.put("a", ["cat"])
+            cache.clear()
+            assert cache.get("a") is None
+            cache.close()
+
+
+class TestPipelineWithCache:
+    """Test suite for Pipeline with a cache attached."""
+
+    def test_process_uses_cache(self):
+        """Test repeated texts are only processed once."""
+        pipeline = Pipeline(normalizer="stem", cache=PipelineCache())
+        calls = []
+        original = pipeline._tokenize_and_filter
+        pipeline._tokenize_and_filter = lambda text: calls.append(text) or original(text)
+
+        first = pipeline.process("The cats are running")
+        second = pipeline.process("The cats are running")
+        assert first == second == ["cat", "run"]
+        assert len(calls) == 1
+
+    def test_process_batch_only_processes_misses(self):
+        """Test batch processing skips cached texts."""
+        pipeline = Pipeline(normalizer="stem", cache=PipelineCache())
+        pipeline.process("Cats running")
+
+        calls = []
+        original = pipeline._tokenize_and_filter
+        pipeline._tokenize_and_filter = lambda text: calls.append(text) or original(text)
+
+        result = pipeline.process_batch(["Cats running", "Dogs jumping", "Dogs jumping"])
+        assert result == [["cat", "run"], ["dog", "jump"], ["dog", "jump"]]
+        assert calls == ["Dogs jumping"]
+
+    def test_cache_shared_across_configs(self):
+        """Test pipelines with different configs don't share entries."""
+        cache = PipelineCache()
+        stemmed = Pipeline(normalizer="stem", cache=cache).process("cats running")
+        raw = Pipeline(normalizer=None, cache=cache).process("cats running")
+        assert stemmed == ["cat", "run"]
+        assert raw == ["cats", "running"]
+        assert len(cache) == 2
@@ -1,15 +1,43 @@
 """Tests for the dashboard module."""
 
+import json
+import os
+import threading
+import time
+
 import numpy as np
 import pandas as pd
+import pytest
 
 from nlp_pipeline import WordEmbeddings
+from nlp_pipeline.dashboard import projection as projection_module
 from nlp_pipeline.dashboard.app import (
     _compute_tsne,
     _create_sample_embeddings,
     _create_tsne_figure,
+    _visible_labels,
     create_app,
 )
+from nlp_pipeline.dashboard.clusters import cache_path as clusters_cache_path
+from nlp_pipeline.dashboard.clusters import (
+    compute_clusters,
+    default_n_clusters,
+    get_clusters,
+    load_clusters,
+    save_clusters,
+)
+from nlp_pipeline.dashboard.explore import empty_graph, expand, merge
+from nlp_pipeline.dashboard.jobs import JobCancelled, JobRunner, scan_neighbors
+from nlp_pipeline.dashboard.projection import (
+    cache_path,
+    compute_projection,
+    file_hash,
+    get_projection,
+    hash_sidecar,
+    load_projection,
+    save_projection,
+)
+from nlp_pipeline.results import ResultStore
 
 
 class TestDashboardApp:
@@ -127,6 +155,150 @@ class TestTSNE:
         assert len(df) == 6
 
 
+class TestScalableProjection:
+    """Test suite for large-vocabulary projections."""
+
+    @staticmethod
+    def random_embeddings(n_words, dimension):
+        """Create random embeddings."""
+        rng = np.random.default_rng(0)
+        return WordEmbeddings.from_dict(
+            {f"w{i}": rng.normal(size=dimension) for i in range(n_words)}
+        )
+
+    def test_pca_method(self):
+        """PCA projection covers every requested word."""
+        df = compute_projection(self.random_embeddings(2000, 100), max_words=2000, method="pca")
+
+        assert len(df) == 2000
+        assert df["word"].tolist()[:2] == ["w0", "w1"]
+        assert np.isfinite(df[["x", "y"]].to_numpy()).all()
+
+    def test_tsne_with_pca_pre_reduction(self):
+        """t-SNE runs on PCA-reduced vectors of wide embeddings."""
+        df = compute_projection(self.random_embeddings(60, 100), max_words=60, pca_components=10)
+
+        assert len(df) == 60
+        assert np.isfinite(df[["x", "y"]].to_numpy()).all()
+
+    def test_unknown_method(self):
+        """Unknown methods are rejected."""
+        with pytest.raises(ValueError, match="Unknown projection method"):
+            compute_projection(_create_sample_embeddings(), method="umap")
+
+    def test_labels_limited_to_frequent_words(self):
+        """Without zoom, only the first max_labels words are labeled."""
+        df = pd.DataFrame({"word": ["a", "b", "c", "d"], "x": [0, 1, 2, 3], "y": [0, 1, 2, 3]})
+
+        assert _visible_labels(df, None, max_labels=2)["word"].tolist() == ["a", "b"]
+        autorange = {"xaxis.autorange": True, "yaxis.autorange": True}
+        assert len(_visible_labels(df, autorange, max_labels=10)) == 4
+
+    def test_labels_follow_zoom(self):
+        """Zooming in labels the words inside the visible range."""
+        df = pd.DataFrame({"word": ["a", "b", "c", "d"], "x": [0, 1, 2, 3], "y": [0, 1, 2, 3]})
+        zoom = {
+            "xaxis.range[0]": 1.5, "xaxis.range[1]": 3.5,
+            "yaxis.range[0]": 1.5, "yaxis.range[1]": 3.5,
+        }
+
+        assert _visible_labels(df, zoom, max_labels=2)["word"].tolist() == ["c", "d"]
+
+    def test_large_figure_uses_webgl(self):
+        """A 100k point map keeps all points but few labels."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            "word": [f"w{i}" for i in range(100_000)],
+            "x": rng.normal(size=100_000),
+            "y": rng.normal(size=100_000),
+        })
+        fig = _create_tsne_figure(df)
+
+        assert fig.data[0].type == "scattergl"
+        assert len(fig.data[0].x) == 100_000
+        assert len(fig.data[1].text) == 150
+
+
+class TestProjectionCache:
+    """Test suite for the on-disk projection cache."""
+
+    @staticmethod
+    def write_embeddings(path, words):
+        """Write a small word2vec text file and load it."""
+        rng = np.random.default_rng(0)
+        lines = [f"{len(words)} 4"]
+        lines += [f"{w} " + " ".join(f"{v:.4f}" for v in rng.normal(size=4)) for w in words]
+        path.write_text("\n".join(lines) + "\n")
+        embeddings = WordEmbeddings()
+        embeddings.load_word2vec_format(path)
+        return embeddings
+
+    def test_save_and_load(self, tmp_path):
+        """A saved projection loads back unchanged."""
+        df = _compute_tsne(_create_sample_embeddings())
+        loaded = load_projection(save_projection(df, tmp_path / "p.npz"))
+
+        assert loaded["word"].tolist() == df["word"].tolist()
+        np.testing.assert_allclose(loaded[["x", "y"]], df[["x", "y"]], rtol=1e-6)
+
+    def test_cache_written_next_to_embeddings(self, tmp_path):
+        """The first call writes the cache, later calls read it."""
+        path = tmp_path / "emb.txt"
+        embeddings = self.write_embeddings(path, [f"w{i}" for i in range(8)])
+
+        df = get_projection(embeddings, path)
+        cached = cache_path(path, 8)
+        assert cached.exists()
+        assert cached.parent == tmp_path
+
+        # Overwrite the cache with known coordinates: they are returned as is
+        save_projection(df.assign(x=1.0, y=2.0), cached)
+        again = get_projection(embeddings, path)
+        assert (again["x"] == 1.0).all()
+
+    def test_cache_key_changes_with_file_and_params(self, tmp_path):
+        """Different contents or word counts use different cache files."""
+        path = tmp_path / "emb.txt"
+        self.write_embeddings(path, ["a", "b", "c", "d", "e", "f"])
+        before = file_hash(path)
+        assert cache_path(path, 6) != cache_path(path, 5)
+
+        self.write_embeddings(path, ["a", "b", "c", "d", "e", "g"])
+        assert file_hash(path) != before
+
+    def test_file_hash_memoized(self, tmp_path, monkeypatch):
+        """The digest is reused from the sidecar until the file's stamp changes."""
+        path = tmp_path / "emb.txt"
+        self.write_embeddings(path, ["a", "b", "c"])
+        old = time.time() - 60
+        os.utime(path, (old, old))
+        digest = file_hash(path)
+        sidecar = hash_sidecar(path)
+        memo = json.loads(sidecar.read_text())
+        assert memo["sha256"] == digest
+
+        # A new process trusts the sidecar instead of reading the file
+        monkeypatch.setattr(projection_module, "_hashes", {})
+        sidecar.write_text(json.dumps({**memo, "sha256": "memo"}))
+        assert file_hash(path) == "memo"
+
+        # Touching the file invalidates it
+        os.utime(path, (old, old + 1))
+        assert file_hash(path) == digest
+        assert json.loads(sidecar.read_text())["sha256"] == digest
+
+        # Recently written files are always rehashed
+        self.write_embeddings(path, ["a", "b", "d"])
+        assert file_hash(path) != digest
+
+    def test_create_app_with_precomputed_projection(self):
+        """A precomputed projection is used instead of computing one."""
+        embeddings = _create_sample_embeddings()
+        df = pd.DataFrame({"word": ["king", "queen"], "x": [0.0, 1.0], "y": [0.0, 1.0]})
+        app = create_app(embeddings, projection=df)
+        assert "Showing 2 words" in str(app.layout)
+
+
 class TestVisualization:
     """Test suite for visualization functions."""
 
@@ -140,14 +312,14 @@ class TestVisualization:
         assert hasattr(fig, "data")
         assert len(fig.data) > 0
 
-    def test_tsne_figure_has_scatter_trace(self):
-        """Test that figure contains scatter trace."""
+    def test_tsne_figure_has_webgl_scatter_trace(self):
+        """Test that points are drawn with a WebGL scatter trace."""
         embeddings = _create_sample_embeddings()
         df = _compute_tsne(embeddings)
         fig = _create_tsne_figure(df)
 
-        # First trace should be scatter
-        assert fig.data[0].type == "scatter"
+        # First trace should be the WebGL points
+        assert fig.data[0].type == "scattergl"
 
     def test_tsne_figure_has_correct_title(self):
         """Test figure has correct title."""
@@ -187,3 +359,404 @@ class TestEmbeddingOperations:
         embeddings = _create_sample_embeddings()
 
         assert "nonexistent_word" not in embeddings
+
+
+def wait_for(runner, job_id, timeout=5.0):
+    """Poll a job until it finishes."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = runner.status(job_id)
+        if status["state"] in ("done", "failed", "cancelled"):
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobRunner:
+    """Test suite for background dashboard jobs."""
+
+    def test_result_and_progress(self):
+        """A job reports progress and its result."""
+        runner = JobRunner()
+
+        def work(job):
+            for i in range(4):
+                job.report(i / 4)
+            return 42
+
+        status = wait_for(runner, runner.submit(work))
+        assert status["state"] == "done"
+        assert status["result"] == 42
+        assert status["progress"] == 1.0
+        runner.shutdown()
+
+    def test_failure(self):
+        """Errors are reported instead of raised."""
+        runner = JobRunner()
+
+        def work(job):
+            raise ValueError("boom")
+
+        status = wait_for(runner, runner.submit(work))
+        assert status["state"] == "failed"
+        assert status["error"] == "boom"
+        runner.shutdown()
+
+    def test_superseded_job_is_cancelled(self):
+        """Submitting a replacement cancels the running job."""
+        runner = JobRunner()
+        started = threading.Event()
+
+        def slow(job):
+            started.set()
+            while True:
+                job.report(0.5)
+                time.sleep(0.01)
+
+        first = runner.submit(slow)
+        assert started.wait(5)
+        second = runner.submit(lambda job: "new", supersedes=first)
+
+        assert wait_for(runner, first)["state"] == "cancelled"
+        assert wait_for(runner, second)["result"] == "new"
+        runner.shutdown()
+
+    def test_unknown_job(self):
+        """Unknown jobs have no status and cannot be cancelled."""
+        runner = JobRunner()
+        assert runner.status("nope") is None
+        assert not runner.cancel("nope")
+        runner.shutdown()
+
+
+class TestScanNeighbors:
+    """Test suite for the chunked nearest-neighbor scan."""
+
+    def test_matches_most_similar(self):
+        """Chunked scans rank exactly like most_similar, ties included."""
+        rng = np.random.default_rng(0)
+        vectors = {f"w{i}": rng.normal(size=8) for i in range(300)}
+        # Duplicates tie: they must come back in vocabulary order
+        vectors["dup1"] = vectors["w0"]
+        vectors["dup2"] = vectors["w0"]
+        embeddings = WordEmbeddings.from_dict(vectors)
+
+        expected = embeddings.most_similar("w1", topn=20)
+        result = scan_neighbors(embeddings, embeddings["w1"], {"w1"}, 20, chunk_rows=7)
+        assert [w for w, _ in result] == [w for w, _ in expected]
+        np.testing.assert_allclose([s for _, s in result], [s for _, s in expected], rtol=1e-5)
+
+        ties = scan_neighbors(embeddings, embeddings["w0"], set(), 3, chunk_rows=50)
+        assert [w for w, _ in ties] == ["w0", "dup1", "dup2"]
+
+    def test_cancellation(self):
+        """A cancelled job stops the scan."""
+        runner = JobRunner()
+        embeddings = _create_sample_embeddings()
+
+        def work(job):
+            job.cancel()
+            return scan_neighbors(embeddings, embeddings["king"], set(), 5, job, chunk_rows=2)
+
+        assert wait_for(runner, runner.submit(work))["state"] == "cancelled"
+        runner.shutdown()
+
+    def test_cancelled_job_raises(self):
+        """Progress reports raise once a job is cancelled."""
+        runner = JobRunner()
+        errors = []
+
+        def work(job):
+            job.cancel()
+            try:
+                job.report(0.5)
+            except JobCancelled as e:
+                errors.append(e)
+                raise
+
+        wait_for(runner, runner.submit(work))
+        assert len(errors) == 1
+        runner.shutdown()
+
+
+class TestBackgroundCallbacks:
+    """Test suite for the search callbacks running as jobs."""
+
+    @staticmethod
+    def update(client, output, outputs, inputs, state):
+        """Call a Dash callback through the HTTP endpoint."""
+        response = client.post("/_dash-update-component", json={
+            "output": output,
+            "outputs": [{"id": i, "property": p} for i, p in outputs],
+            "inputs": [{"id": i, "property": p, "value": v} for i, p, v in inputs],
+            "state": [{"id": i, "property": p, "value": v} for i, p, v in state],
+            "changedPropIds": [f"{i}.{p}" for i, p, _ in inputs],
+        })
+        assert response.status_code == 200
+        return response.get_json()["response"]
+
+    def test_search_runs_in_background(self):
+        """A search returns a job, polling yields the table, repeats hit the store."""
+        store = ResultStore()
+        app = create_app(store=store)
+        client = app.server.test_client()
+        submit = next(k for k in app.callback_map if k.startswith("..search-results.children..."))
+        poll = next(k for k in app.callback_map if k.startswith("..search-results.children@"))
+        outputs = [("search-results", "children"), ("search-job", "data"),
+                   ("search-poll", "disabled")]
+        inputs = [("search-button", "n_clicks", 1)]
+        state = [("search-input", "value", "king"), ("search-job", "data", None)]
+
+        started = self.update(client, submit, outputs, inputs, state)
+        job = started["search-job"]["data"]
+        assert job["word"] == "king"
+        assert started["search-poll"]["disabled"] is False
+
+        deadline = time.time() + 5
+        while True:
+            polled = self.update(
+                client, poll,
+                [("search-results", "children"), ("search-poll", "disabled")],
+                [("search-poll", "n_intervals", 1)],
+                [("search-job", "data", job)],
+            )
+            if polled["search-poll"]["disabled"] or time.time() > deadline:
+                break
+            time.sleep(0.01)
+        assert "Words similar to 'king'" in str(polled["search-results"]["children"])
+
+        again = self.update(client, submit, outputs, inputs, state)
+        assert again["search-job"]["data"] is None
+        assert "Words similar to 'king'" in str(again["search-results"]["children"])
+        assert store.stats["hits"] == 1
+
+
+class TestNeighborhoodExplorer:
+    """Test suite for the incremental neighborhood graph."""
+
+    def test_expand_adds_neighbors(self):
+        """Expanding a word places it and its k neighbors."""
+        embeddings = _create_sample_embeddings()
+        additions = expand(embeddings, empty_graph(), ["king"], k=4)
+
+        assert additions["expanded"] == ["king"]
+        assert additions["nodes"]["king"] == [0.0, 0.0]
+        assert len(additions["nodes"]) == 5
+        assert [e[1] for e in additions["edges"]] == [
+            w for w, _ in embeddings.most_similar("king", topn=4)
+        ]
+        # Neighbors are placed within distance 1 of their center
+        for x, y in additions["nodes"].values():
+            assert np.hypot(x, y) <= 1.0 + 1e-6
+
+    def test_expand_is_incremental(self):
+        """Expanded words are skipped and placed words keep their position."""
+        embeddings = _create_sample_embeddings()
+        graph = merge(empty_graph(), expand(embeddings, empty_graph(), ["king"], k=4))
+
+        assert expand(embeddings, graph, ["king"], k=4) == empty_graph()
+
+        additions = expand(embeddings, graph, ["queen", "unknown"], k=4)
+        assert additions["expanded"] == ["queen"]
+        assert all(word not in graph["nodes"] for word in additions["nodes"])
+        assert len(additions["edges"]) == 4
+
+    def test_batched_and_cached(self, monkeypatch):
+        """Several words are fetched in one batch, then reused from the store."""
+        embeddings = _create_sample_embeddings()
+        store = ResultStore()
+        calls = []
+        original = embeddings.most_similar_batch
+
+        def spy(vectors, *args, **kwargs):
+            calls.append(len(vectors))
+            return original(vectors, *args, **kwargs)
+
+        monkeypatch.setattr(embeddings, "most_similar_batch", spy)
+        expand(embeddings, empty_graph(), ["king", "computer", "tree"], store=store)
+        expand(embeddings, empty_graph(), ["king", "computer"], store=store)
+        assert calls == [3]
+
+    def test_seeds_are_separated(self):
+        """Unconnected start words are placed apart."""
+        embeddings = _create_sample_embeddings()
+        graph = merge(empty_graph(), expand(embeddings, empty_graph(), ["king"], k=2))
+        additions = expand(embeddings, graph, ["tree"], k=2)
+
+        assert additions["nodes"]["tree"][0] > max(x for x, _ in graph["nodes"].values())
+
+    def test_page_does_not_ship_vocabulary(self):
+        """The page layout only carries the projected words."""
+        embeddings = WordEmbeddings.from_dict(
+            {f"word{i}": [float(i % 7), float(i % 5), 1.0] for i in range(3000)}
+        )
+        app = create_app(embeddings, max_words=20, method="pca")
+        layout = app.server.test_client().get("/_dash-layout").get_data(as_text=True)
+
+        assert '"word19"' in layout
+        assert '"word20"' not in layout
+        assert '"word2999"' not in layout
+
+    def test_explore_callback_sends_additions(self):
+        """Expansions run as jobs; polling patches the graph with the additions only."""
+        app = create_app()
+        client = app.server.test_client()
+        submit = next(k for k in app.callback_map if k.startswith("..explore-status.children..."))
+        poll = next(k for k in app.callback_map if k.startswith("..explore-store.data...explore"))
+
+        def update(output, outputs, inputs, state, changed):
+            response = client.post("/_dash-update-component", json={
+                "output": output,
+                "outputs": [{"id": i, "property": p} for i, p in outputs],
+                "inputs": [{"id": i, "property": p, "value": v} for i, p, v in inputs],
+                "state": [{"id": i, "property": p, "value": v} for i, p, v in state],
+                "changedPropIds": [changed],
+            })
+            assert response.status_code == 200
+            return response.get_json()["response"]
+
+        started = update(
+            submit,
+            [("explore-status", "children"), ("explore-job", "data"),
+             ("explore-poll", "disabled")],
+            [("tsne-plot", "clickData", None), ("explore-graph", "clickData", None),
+             ("explore-button", "n_clicks", 1)],
+            [("explore-input", "value", "King"), ("explore-store", "data", empty_graph()),
+             ("explore-job", "data", None)],
+            "explore-button.n_clicks",
+        )
+        job = started["explore-job"]["data"]
+        assert job["word"] == "king"
+        assert started["explore-poll"]["disabled"] is False
+
+        deadline = time.time() + 5
+        while True:
+            polled = update(
+                poll,
+                [("explore-store", "data"), ("explore-graph", "figure"),
+                 ("explore-status", "children"), ("explore-poll", "disabled")],
+                [("explore-poll", "n_intervals", 1)],
+                [("explore-job", "data", job), ("explore-store", "data", empty_graph())],
+                "explore-poll.n_intervals",
+            )
+            if polled["explore-poll"]["disabled"] or time.time() > deadline:
+                break
+            time.sleep(0.01)
+        patch = polled["explore-store"]["data"]
+        operations = {op["location"][0]: op for op in patch["operations"]}
+
+        assert operations["expanded"]["params"]["value"] == ["king"]
+        assert "king" in operations["nodes"]["params"]["value"]
+
+
+def _blob_embeddings(n_blobs=5, per_blob=200, dim=20):
+    """Create embeddings of well-separated groups of words, in order."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(n_blobs, dim))
+    vectors = np.repeat(centers, per_blob, axis=0) + 0.1 * rng.normal(size=(n_blobs * per_blob, dim))
+    return WordEmbeddings.from_dict({f"w{i}": v for i, v in enumerate(vectors)})
+
+
+class TestClusters:
+    """Test suite for the vocabulary cluster overview."""
+
+    def test_recovers_groups(self):
+        """Streaming mini-batch k-means finds well-separated groups."""
+        embeddings = _blob_embeddings()
+        clusters = compute_clusters(embeddings, 5, batch_size=64, chunk_rows=300)
+
+        assert clusters.n_clusters == 5
+        assert sorted(clusters.sizes) == [200] * 5
+        groups = clusters.labels.reshape(5, 200)
+        assert all(len(set(group)) == 1 for group in groups)
+        assert len({group[0] for group in groups}) == 5
+
+    def test_members_sorted_by_similarity(self):
+        """Members are listed closest to the centroid first, with paging."""
+        embeddings = _blob_embeddings()
+        clusters = compute_clusters(embeddings, 5)
+        cluster = int(clusters.labels[0])
+        members = clusters.members(cluster)
+
+        assert len(members) == clusters.sizes[cluster]
+        assert (np.diff(clusters.similarity[members]) <= 0).all()
+        np.testing.assert_array_equal(clusters.members(cluster, 10, 5), members[5:15])
+        assert len(clusters.representatives(embeddings, 3)[cluster]) == 3
+        with pytest.raises(ValueError):
+            clusters.members(5)
+
+    def test_small_vocabulary(self):
+        """More clusters than words are capped, tiny batches are fine."""
+        embeddings = _create_sample_embeddings()
+        clusters = compute_clusters(embeddings, 50, batch_size=4)
+
+        assert clusters.n_clusters == embeddings.vocab_size
+        assert clusters.sizes.sum() == embeddings.vocab_size
+        assert default_n_clusters(28) == 4
+        assert default_n_clusters(10_000_000) == 100
+
+    def test_cache(self, tmp_path):
+        """Clusters are cached next to the embeddings and reused."""
+        path = tmp_path / "emb.txt"
+        embeddings = TestProjectionCache.write_embeddings(path, [f"w{i}" for i in range(30)])
+
+        clusters = get_clusters(embeddings, path, 3)
+        cached = clusters_cache_path(path, 30, 3)
+        assert cached.exists()
+        loaded = load_clusters(cached)
+        np.testing.assert_array_equal(loaded.labels, clusters.labels)
+        np.testing.assert_array_equal(loaded.order, clusters.order)
+
+        # Overwrite the cache with known labels: they are returned as is
+        save_clusters(type(clusters)(clusters.centroids, np.zeros(30), np.ones(30)), cached)
+        assert get_clusters(embeddings, path, 3).sizes[0] == 30
+
+    def test_overview_in_layout(self):
+        """The overview lists the centroids only, and can be disabled."""
+        embeddings = _blob_embeddings()
+        app = create_app(embeddings, max_words=20, method="pca", n_clusters=5)
+        figure = app.layout["cluster-plot"].figure
+
+        assert len(figure.data) == 1
+        assert len(figure.data[0].x) == 5
+
+        app = create_app(embeddings, max_words=20, method="pca", n_clusters=0)
+        assert "cluster-plot" not in str(app.layout)
+
+    def test_members_callback(self, monkeypatch):
+        """Clicking a centroid lists its closest members, paged."""
+        embeddings = _blob_embeddings(per_blob=150)
+        clusters = compute_clusters(embeddings, 5)
+        app = create_app(embeddings, max_words=20, method="pca", clusters=clusters)
+        words = embeddings.vocab
+        # Only the listed rows are mapped to words, not the whole vocabulary
+        monkeypatch.setattr(
+            WordEmbeddings, "vocab", property(lambda self: pytest.fail("vocab copied"))
+        )
+        client = app.server.test_client()
+        key = next(k for k in app.callback_map if "cluster-members" in k)
+
+        def call(trigger, selected):
+            response = client.post("/_dash-update-component", json={
+                "output": key,
+                "outputs": [{"id": "cluster-members", "property": "children"},
+                            {"id": "cluster-selected", "property": "data"}],
+                "inputs": [
+                    {"id": "cluster-plot", "property": "clickData",
+                     "value": {"points": [{"customdata": 2}]}},
+                    {"id": "cluster-more", "property": "n_clicks", "value": 1},
+                ],
+                "state": [{"id": "cluster-selected", "property": "data", "value": selected}],
+                "changedPropIds": [trigger],
+            })
+            return response.get_json()["response"]
+
+        first = call("cluster-plot.clickData", None)
+        assert first["cluster-selected"]["data"] == {"cluster": 2, "offset": 0}
+        expected = ", ".join(words[i] for i in clusters.members(2, 100))
+        assert expected in str(first["cluster-members"]["children"])
+
+        second = call("cluster-more.n_clicks", first["cluster-selected"]["data"])
+        assert second["cluster-selected"]["data"] == {"cluster": 2, "offset": 100}
+        third = call("cluster-more.n_clicks", second["cluster-selected"]["data"])
+        assert third["cluster-selected"]["data"]["offset"] == 0
@@ -306,3 +306,140 @@ test 0.1 0.2 0.3 0.4
             assert "word1" in embeddings
             assert "word2" in embeddings
             assert "word3" not in embeddings
+
+
+class TestWordEmbeddingsMatrix:
+    """Test contiguous matrix storage and the native format."""
+
+    def test_matrix_rows_follow_vocab(self):
+        """Test matrix rows match vocab order."""
+        embeddings = create_sample_embeddings()
+        matrix = embeddings.matrix
+        assert matrix.shape == (10, 4)
+        assert matrix.dtype == np.float32
+        for i, word in enumerate(embeddings.vocab):
+            assert np.array_equal(matrix[i], embeddings[word])
+
+    def test_vectors_are_matrix_views(self):
+        """Test per-word vectors share memory with the matrix."""
+        embeddings = create_sample_embeddings()
+        matrix = embeddings.matrix
+        assert np.shares_memory(embeddings["king"], matrix)
+        assert embeddings.matrix is matrix
+
+    def test_add_word_rebuilds_matrix(self):
+        """Test adding a word invalidates the cached matrix."""
+        embeddings = create_sample_embeddings()
+        embeddings.matrix
+        embeddings.add_word("newword", np.array([0.1, 0.2, 0.3, 0.4]))
+        assert embeddings.matrix.shape == (11, 4)
+        assert np.allclose(embeddings.matrix[-1], [0.1, 0.2, 0.3, 0.4])
+
+    def test_empty_matrix(self):
+        """Test matrix of empty embeddings."""
+        assert WordEmbeddings().matrix.shape == (0, 0)
+
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_save_and_load(self, mmap):
+        """Test round trip through the native format."""
+        embeddings = create_sample_embeddings()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = embeddings.save(f"{tmpdir}/native")
+            loaded = WordEmbeddings.load(path, mmap=mmap)
+
+            assert loaded.vocab == embeddings.vocab
+            assert loaded.dimension == 4
+            assert np.array_equal(loaded.matrix, embeddings.matrix)
+            assert loaded.most_similar("king", topn=3) == embeddings.most_similar(
+                "king", topn=3
+            )
+            if mmap:
+                assert isinstance(loaded.matrix, np.memmap)
+                assert not loaded["king"].flags.writeable
+            del loaded
+
+    def test_load_mismatched_vocab(self):
+        """Test vocabulary/matrix size mismatch raises error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_sample_embeddings().save(tmpdir)
+            (path / "vocab.txt").write_text("king\nqueen\n", encoding="utf-8")
+            with pytest.raises(ValueError, match="Vocabulary has 2 words"):
+                WordEmbeddings.load(path)
+
+    def test_save_rejects_newlines(self):
+        """Test words with newlines cannot be saved."""
+        embeddings = WordEmbeddings.from_dict({"bad\nword": [0.1, 0.2]})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError, match="newlines"):
+                embeddings.save(tmpdir)
+
+
+class TestWordEmbeddingsBatch:
+    """Test batched similarity queries."""
+
+    def test_most_similar_batch_matches_single(self):
+        """Test batched results equal one query at a time."""
+        embeddings = create_sample_embeddings()
+        words = ["king", "dog", "car"]
+        vectors = np.stack([embeddings[w] for w in words])
+        results = embeddings.most_similar_batch(
+            vectors, topn=4, exclude=[{w} for w in words]
+        )
+        for word, result in zip(words, results):
+            assert result == embeddings.most_similar(word, topn=4)
+
+    def test_most_similar_batch_without_exclude(self):
+        """Test a query vector finds its own word first."""
+        embeddings = create_sample_embeddings()
+        result = embeddings.most_similar_batch(embeddings["cat"][None, :], topn=2)[0]
+        assert result[0][0] == "cat"
+        assert result[0][1] == pytest.approx(1.0)
+
+    def test_ties_in_vocab_order(self):
+        """Test equal scores are ordered by vocabulary position."""
+        embeddings = WordEmbeddings.from_dict({
+            "a": [1.0, 0.0],
+            "b": [0.0, 1.0],
+            "c": [1.0, 0.0],
+            "d": [2.0, 0.0],
+        })
+        result = embeddings.most_similar_batch(np.array([[1.0, 0.0]]), topn=2)[0]
+        assert [w for w, _ in result] == ["a", "c"]
+
+    def test_topn_larger_than_vocab(self):
+        """Test topn is capped by the remaining vocabulary."""
+        embeddings = create_sample_embeddings()
+        assert len(embeddings.most_similar("king", topn=100)) == 9
+
+    def test_zero_vector(self):
+        """Test zero vectors have similarity 0."""
+        embeddings = WordEmbeddings.from_dict({"a": [1.0, 0.0], "zero": [0.0, 0.0]})
+        assert embeddings.most_similar("a") == [("zero", 0.0)]
+        assert embeddings.similarity_batch([("a", "zero")]) == [0.0]
+
+    def test_similarity_batch(self):
+        """Test batched pair similarities equal single calls."""
+        embeddings = create_sample_embeddings()
+        pairs = [("king", "queen"), ("dog", "car"), ("man", "man")]
+        sims = embeddings.similarity_batch(pairs)
+        for pair, sim in zip(pairs, sims):
+            assert sim == pytest.approx(embeddings.similarity(*pair), abs=1e-6)
+
+    def test_similarity_batch_unknown_word(self):
+        """Test unknown word raises KeyError."""
+        embeddings = create_sample_embeddings()
+        with pytest.raises(KeyError):
+            embeddings.similarity_batch([("king", "unknown")])
+
+    def test_row_indices(self):
+        """Test row lookup with unknown words."""
+        embeddings = create_sample_embeddings()
+        rows = embeddings.row_indices(["queen", "unknown", "king"])
+        assert rows.tolist() == [1, -1, 0]
+
+    def test_words_at(self):
+        """Test words of matrix rows."""
+        embeddings = create_sample_embeddings()
+        rows = embeddings.row_indices(["queen", "king"])
+        assert embeddings.words_at(rows) == ["queen", "king"]
+        assert embeddings.words_at([]) == []
@@ -1,12 +1,26 @@
 """Tests for GraphQL API."""
 
+import asyncio
+import io
 import json
+import sys
+import threading
+import time
 
+import numpy as np
 import pytest
 
 from nlp_pipeline.embeddings import WordEmbeddings
-from nlp_pipeline.graphql import create_app, schema
-from nlp_pipeline.graphql.schema import set_embeddings
+from nlp_pipeline.graphql import create_app, create_asgi_app, schema
+from nlp_pipeline.graphql.cost import CostLimiter, estimate_cost, scan_cost
+from nlp_pipeline.graphql.documents import DocumentCache, hash_query
+from nlp_pipeline.graphql.loaders import BatchLoader, BusyError, Offloader
+from nlp_pipeline.graphql.metrics import Histogram
+from nlp_pipeline.graphql.registry import ModelRegistry, memory_bytes
+from nlp_pipeline.graphql.reload import EmbeddingsReloader
+from nlp_pipeline.graphql.schema import execute, set_embeddings, set_registry, versions
+from nlp_pipeline.graphql.vectors import decode_base64, gather_vectors
+from nlp_pipeline.graphql.versions import VersionedEmbeddings
 
 
 @pytest.fixture
@@ -189,6 +203,20 @@ class TestMostSimilarQuery:
         assert "errors" not in result
         assert result["data"]["mostSimilar"] == []
 
+    def test_negative_top_n_rejected(self, client):
+        """A negative topN is an error, not a slice of another field's ranking."""
+        result = graphql_query(client, """{
+            ok: mostSimilar(word: "king", topN: 3) { word }
+            bad: mostSimilar(word: "queen", topN: -1) { word }
+            analogy(positive: ["king"], negative: ["man"], topN: -2) { word }
+        }""")
+        messages = [error["message"] for error in result["errors"]]
+        assert len(messages) == 2
+        assert "topN must be non-negative, got -1" in messages[0]
+        assert "topN must be non-negative, got -2" in messages[1]
+        assert len(result["data"]["ok"]) == 3
+        assert result["data"]["bad"] is None
+
 
 class TestAnalogyQuery:
     """Tests for analogy query."""
@@ -308,3 +336,1324 @@ class TestCreateAppWithoutEmbeddings:
         finally:
             # Restore original embeddings
             setattr(schema_module, "_embeddings", original)
+
+
+class TestGraphQLServer:
+    """Tests for the pre-fork production server."""
+
+    @pytest.fixture
+    def server_cls(self):
+        """Import the server, skipping if gunicorn is not installed."""
+        pytest.importorskip("gunicorn")
+        from nlp_pipeline.graphql.server import GraphQLServer
+
+        return GraphQLServer
+
+    def test_options_applied(self, server_cls, sample_embeddings):
+        """Options are passed to gunicorn with preloading enabled."""
+        server = server_cls(
+            lambda: sample_embeddings,
+            {"workers": 3, "threads": 2, "bind": "127.0.0.1:9999"},
+        )
+        assert server.cfg.workers == 3
+        assert server.cfg.threads == 2
+        assert server.cfg.preload_app is True
+
+    def test_unknown_option_exits(self, server_cls, sample_embeddings):
+        """Unknown gunicorn settings are rejected."""
+        with pytest.raises(SystemExit):
+            server_cls(lambda: sample_embeddings, {"not_a_setting": 1})
+
+    def test_load_serves_loaded_embeddings(self, server_cls, sample_embeddings):
+        """The WSGI app answers queries from the loader's embeddings."""
+        server = server_cls(lambda: sample_embeddings)
+        app = server.wsgi()
+        client = app.test_client()
+
+        result = graphql_query(client, "{ info { vocabSize } }")
+        assert result["data"]["info"]["vocabSize"] == 8
+
+    def test_asgi_app(self, server_cls, sample_embeddings):
+        """With asgi=True the workers load the ASGI app."""
+        from nlp_pipeline.graphql.asgi import GraphQLASGIApp
+
+        server = server_cls(lambda: sample_embeddings, app_options={"timeout": 2.0}, asgi=True)
+        app = server.wsgi()
+        assert isinstance(app, GraphQLASGIApp)
+        assert app.timeout == 2.0
+        app.offloader.shutdown()
+
+    def test_reload_calls_loader_again(self, server_cls, sample_embeddings):
+        """Reloading picks up new embeddings."""
+        versions = iter([sample_embeddings, WordEmbeddings.from_dict({"a": [1.0]})])
+        server = server_cls(lambda: next(versions))
+        first = server.wsgi()
+        server.reload()
+
+        assert server.wsgi() is not first
+        result = graphql_query(server.wsgi().test_client(), "{ info { vocabSize } }")
+        assert result["data"]["info"]["vocabSize"] == 1
+
+    def test_failed_reload_keeps_current_app(self, server_cls, sample_embeddings):
+        """A failing loader on reload keeps the current app."""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            if len(calls) > 1:
+                raise OSError("embeddings file missing")
+            return sample_embeddings
+
+        server = server_cls(loader)
+        first = server.wsgi()
+        server.reload()
+        assert server.wsgi() is first
+
+
+class TestBatchLoader:
+    """Tests for the DataLoader-style batch loader."""
+
+    def test_loads_in_one_batch(self):
+        """Keys requested in the same step are loaded together."""
+        calls = []
+
+        def batch_fn(keys):
+            calls.append(list(keys))
+            return [k * 2 for k in keys]
+
+        async def run():
+            loader = BatchLoader(batch_fn)
+            futures = [loader.load(k) for k in (1, 2, 3, 2)]
+            return await asyncio.gather(*futures)
+
+        assert asyncio.run(run()) == [2, 4, 6, 4]
+        assert calls == [[1, 2, 3]]
+
+    def test_error_propagates_to_all_keys(self):
+        """A failing batch function fails every waiting key."""
+
+        def batch_fn(keys):
+            raise KeyError("missing")
+
+        async def run():
+            loader = BatchLoader(batch_fn)
+            futures = [loader.load("a"), loader.load("b")]
+            return await asyncio.gather(*futures, return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, KeyError) for r in results)
+
+
+class TestBatchedExecution:
+    """Tests for batched resolution of similarity fields."""
+
+    def test_aliased_fields_use_one_scan(self, client, sample_embeddings, monkeypatch):
+        """All mostSimilar/analogy fields share one batched matrix product."""
+        calls = []
+        original = sample_embeddings.most_similar_batch
+
+        def spy(vectors, *args, **kwargs):
+            calls.append(len(vectors))
+            return original(vectors, *args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", spy)
+        result = graphql_query(client, """
+            {
+                a: mostSimilar(word: "king", topN: 2) { word }
+                b: mostSimilar(word: "dog", topN: 3) { word }
+                c: mostSimilar(word: "king", topN: 2) { word }
+                d: analogy(positive: ["king", "woman"], negative: ["man"], topN: 1) { word }
+            }
+        """)
+        assert calls == [3]
+        assert len(result["data"]["b"]) == 3
+        assert result["data"]["a"] == result["data"]["c"]
+        assert result["data"]["d"][0]["word"] == "queen"
+
+    def test_batched_matches_direct_execution(self, client, sample_embeddings):
+        """Batched and direct schema execution give the same results."""
+        query = """
+            {
+                mostSimilar(word: "apple", topN: 4) { word similarity }
+                analogy(positive: ["king", "woman"], negative: ["man"]) { word similarity }
+                similarity(word1: "cat", word2: "dog")
+            }
+        """
+        set_embeddings(sample_embeddings)
+        direct = schema.execute(query)
+        batched = execute(query)
+        assert batched.errors is None
+        assert batched.data["mostSimilar"] == direct.data["mostSimilar"]
+        assert batched.data["analogy"] == direct.data["analogy"]
+        assert batched.data["similarity"] == pytest.approx(direct.data["similarity"])
+
+    def test_rankings_reused_across_requests(self, client, sample_embeddings, monkeypatch):
+        """Repeated neighbor queries are answered from the shared result store."""
+        calls = []
+        original = sample_embeddings.most_similar_batch
+
+        def spy(vectors, *args, **kwargs):
+            calls.append(len(vectors))
+            return original(vectors, *args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", spy)
+        first = graphql_query(client, '{ mostSimilar(word: "cat", topN: 3) { word } }')
+        second = graphql_query(client, '{ mostSimilar(word: "cat", topN: 2) { word } }')
+        assert calls == [1]
+        assert second["data"]["mostSimilar"] == first["data"]["mostSimilar"][:2]
+
+
+class TestBatchedPost:
+    """Tests for JSON-array batched POSTs."""
+
+    def post_batch(self, client, operations):
+        """POST a batch and return (status, body)."""
+        response = client.post("/graphql", json=operations)
+        return response.status_code, json.loads(response.data)
+
+    def test_batch_returns_results_in_order(self, client):
+        """Each operation gets its result at the same index."""
+        status, results = self.post_batch(client, [
+            {"query": "{ info { vocabSize } }"},
+            {"query": 'query($w: String!) { hasWord(word: $w) }', "variables": {"w": "cat"}},
+            {"query": '{ similarity(word1: "king", word2: "queen") }'},
+        ])
+        assert status == 200
+        assert results[0]["data"]["info"]["vocabSize"] == 8
+        assert results[1]["data"]["hasWord"] is True
+        assert isinstance(results[2]["data"]["similarity"], float)
+
+    def test_batch_reports_errors_per_operation(self, client):
+        """Invalid operations fail without failing the batch."""
+        status, results = self.post_batch(client, [
+            {"query": "{ info { vocabSize } }"},
+            {"query": "{ notAField }"},
+            {"variables": {}},
+        ])
+        assert status == 200
+        assert "data" in results[0]
+        assert "errors" in results[1]
+        assert results[2]["errors"][0]["message"] == "No query provided"
+
+    def test_empty_batch_rejected(self, client):
+        """Empty arrays are rejected."""
+        status, body = self.post_batch(client, [])
+        assert status == 400
+        assert "Empty batch" in body["errors"][0]["message"]
+
+    def test_batch_size_limit(self, sample_embeddings):
+        """Batches above max_batch_size are rejected."""
+        client = create_app(sample_embeddings, max_batch_size=2).test_client()
+        status, body = self.post_batch(client, [{"query": "{ info { dimension } }"}] * 3)
+        assert status == 400
+        assert "exceeds limit" in body["errors"][0]["message"]
+
+    def test_batch_shares_loaders(self, client, sample_embeddings, monkeypatch):
+        """mostSimilar fields of all operations share one batched scan."""
+        calls = []
+        original = sample_embeddings.most_similar_batch
+
+        def spy(vectors, *args, **kwargs):
+            calls.append(len(vectors))
+            return original(vectors, *args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", spy)
+        words = ["king", "queen", "dog", "cat", "apple"]
+        status, results = self.post_batch(client, [
+            {"query": f'{{ mostSimilar(word: "{w}", topN: 2) {{ word }} }}'} for w in words
+        ])
+        assert status == 200
+        assert calls == [5]
+        assert all(len(r["data"]["mostSimilar"]) == 2 for r in results)
+
+    def test_batch_on_thread_pool(self, sample_embeddings):
+        """Chunks executed on the thread pool keep result order."""
+        app = create_app(sample_embeddings, batch_workers=2, batch_chunk_size=2)
+        words = ["king", "queen", "man", "woman", "dog", "cat", "apple"]
+        status, results = self.post_batch(app.test_client(), [
+            {"query": f'{{ wordVector(word: "{w}") {{ word }} }}'} for w in words
+        ])
+        assert status == 200
+        assert [r["data"]["wordVector"]["word"] for r in results] == words
+
+
+class TestDocumentCache:
+    """Tests for the parsed-document cache."""
+
+    def test_caches_parsed_documents(self):
+        """The same query is parsed and validated once."""
+        cache = DocumentCache(schema.graphql_schema)
+        document, errors = cache.get("{ info { vocabSize } }")
+        again, _ = cache.get("{ info { vocabSize } }")
+        assert errors == []
+        assert again is document
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_caches_validation_errors(self):
+        """Invalid queries are cached with their errors."""
+        cache = DocumentCache(schema.graphql_schema)
+        document, errors = cache.get("{ notAField }")
+        assert document is None
+        assert "notAField" in errors[0].message
+        assert cache.get("{ notAField }")[1] == errors
+
+    def test_syntax_error(self):
+        """Unparseable queries return a syntax error."""
+        cache = DocumentCache(schema.graphql_schema)
+        document, errors = cache.get("{ info {")
+        assert document is None
+        assert "Syntax Error" in errors[0].message
+
+    def test_lru_eviction(self):
+        """Least recently used documents are evicted first."""
+        cache = DocumentCache(schema.graphql_schema, maxsize=2)
+        cache.get("{ info { vocabSize } }")
+        cache.get("{ info { dimension } }")
+        cache.get("{ info { vocabSize } }")
+        cache.get('{ hasWord(word: "a") }')
+        assert len(cache) == 2
+        assert cache.get(None, hash_query("{ info { dimension } }"))[0] is None
+        assert cache.get(None, hash_query("{ info { vocabSize } }"))[0] is not None
+
+    def test_persisted_query_lookup(self):
+        """A known hash resolves without the query text."""
+        cache = DocumentCache(schema.graphql_schema)
+        query = "{ info { vocabSize } }"
+        document, _ = cache.get(query, hash_query(query))
+        assert cache.get(None, hash_query(query))[0] is document
+
+    def test_persisted_query_not_found(self):
+        """An unknown hash reports PersistedQueryNotFound."""
+        cache = DocumentCache(schema.graphql_schema)
+        document, errors = cache.get(None, "0" * 64)
+        assert document is None
+        assert errors[0].message == "PersistedQueryNotFound"
+        assert errors[0].extensions["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    def test_hash_mismatch(self):
+        """A hash that doesn't match the query is rejected."""
+        cache = DocumentCache(schema.graphql_schema)
+        _, errors = cache.get("{ info { vocabSize } }", "0" * 64)
+        assert errors[0].extensions["code"] == "INVALID_PERSISTED_QUERY_HASH"
+
+
+class TestPersistedQueries:
+    """Tests for Automatic Persisted Queries over HTTP."""
+
+    def post(self, client, body):
+        """POST a body and return (status, result)."""
+        response = client.post("/graphql", json=body)
+        return response.status_code, json.loads(response.data)
+
+    def test_apq_round_trip(self, client):
+        """Hash-only requests work after the query was registered once."""
+        query = '{ similarity(word1: "dog", word2: "cat") }'
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": hash_query(query + " ")}}
+
+        status, result = self.post(client, {"extensions": extensions})
+        assert status == 200
+        assert result["errors"][0]["message"] == "PersistedQueryNotFound"
+        assert result["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+        status, result = self.post(client, {"query": query + " ", "extensions": extensions})
+        assert status == 200
+        expected = result["data"]["similarity"]
+
+        status, result = self.post(client, {"extensions": extensions})
+        assert status == 200
+        assert result["data"]["similarity"] == expected
+
+    def test_apq_hash_mismatch(self, client):
+        """Mismatched hashes are bad requests."""
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": "0" * 64}}
+        status, result = self.post(
+            client, {"query": "{ info { vocabSize } }", "extensions": extensions}
+        )
+        assert status == 400
+        assert result["errors"][0]["message"] == "provided sha does not match query"
+
+    def test_apq_in_batch(self, client):
+        """Batched operations may be hash-only."""
+        query = "{ info { dimension } }"
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": hash_query(query)}}
+        self.post(client, {"query": query, "extensions": extensions})
+
+        status, results = self.post(client, [{"extensions": extensions}])
+        assert status == 200
+        assert results[0]["data"]["info"]["dimension"] == 5
+
+
+class TestPackedVectors:
+    """Tests for compact vector transport."""
+
+    def test_word_vectors_query(self, client, sample_embeddings):
+        """wordVectors returns found words and a decodable buffer."""
+        result = graphql_query(client, """
+            { wordVectors(words: ["king", "unknown", "dog"]) {
+                words missing dimension dtype data } }
+        """)
+        packed = result["data"]["wordVectors"]
+        assert packed["words"] == ["king", "dog"]
+        assert packed["missing"] == ["unknown"]
+        assert packed["dtype"] == "float32"
+
+        vectors = decode_base64(packed["data"], packed["dimension"])
+        assert np.array_equal(vectors[0], sample_embeddings["king"])
+        assert np.array_equal(vectors[1], sample_embeddings["dog"])
+
+    def test_word_vectors_float16(self, client, sample_embeddings):
+        """float16 buffers are half the size."""
+        result = graphql_query(client, """
+            { wordVectors(words: ["king"], dtype: FLOAT16) { dtype data } }
+        """)
+        packed = result["data"]["wordVectors"]
+        vectors = decode_base64(packed["data"], 5, "float16")
+        assert vectors.dtype == np.float16
+        assert np.allclose(vectors[0], sample_embeddings["king"], atol=1e-3)
+
+    def test_word_vector_packed_field(self, client, sample_embeddings):
+        """wordVector can return its vector as base64."""
+        result = graphql_query(client, '{ wordVector(word: "cat") { packed } }')
+        vector = decode_base64(result["data"]["wordVector"]["packed"], 5)[0]
+        assert np.array_equal(vector, sample_embeddings["cat"])
+
+    def test_gather_consecutive_rows_is_view(self, sample_embeddings):
+        """Consecutive vocabulary rows are returned without copying."""
+        _, _, array = gather_vectors(sample_embeddings, ["queen", "man", "woman"])
+        assert np.shares_memory(array, sample_embeddings.matrix)
+
+    def test_gather_invalid_dtype(self, sample_embeddings):
+        """Unsupported dtypes raise error."""
+        with pytest.raises(ValueError, match="not supported"):
+            gather_vectors(sample_embeddings, ["king"], "float64")
+
+    def test_rest_json(self, client, sample_embeddings):
+        """The REST route returns base64 JSON by default."""
+        response = client.get("/vectors?words=king,queen,nope")
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["words"] == ["king", "queen"]
+        assert body["missing"] == ["nope"]
+        assert body["shape"] == [2, 5]
+        vectors = decode_base64(body["data"], body["dimension"])
+        assert np.array_equal(vectors[1], sample_embeddings["queen"])
+
+    def test_rest_npy(self, client, sample_embeddings):
+        """format=npy returns a .npy payload."""
+        response = client.post(
+            "/vectors", json={"words": ["dog", "x", "cat"], "format": "npy"}
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/octet-stream"
+        assert json.loads(response.headers["X-Missing-Words"]) == ["x"]
+        assert int(response.headers["Content-Length"]) == len(response.data)
+
+        vectors = np.load(io.BytesIO(response.data))
+        assert vectors.shape == (2, 5)
+        assert np.array_equal(vectors[0], sample_embeddings["dog"])
+
+    def test_rest_accept_header(self, client):
+        """Accept: application/octet-stream selects the .npy payload."""
+        response = client.get(
+            "/vectors?word=dog&dtype=float16",
+            headers={"Accept": "application/octet-stream"},
+        )
+        assert np.load(io.BytesIO(response.data)).dtype == np.float16
+
+    @pytest.mark.parametrize("query", [
+        "/vectors",
+        "/vectors?words=king&dtype=float64",
+        "/vectors?words=king&format=csv",
+    ])
+    def test_rest_invalid_requests(self, client, query):
+        """Invalid parameters are rejected."""
+        assert client.get(query).status_code == 400
+
+    def test_rest_word_limit(self, sample_embeddings):
+        """Requests above max_vector_words are rejected."""
+        client = create_app(sample_embeddings, max_vector_words=1).test_client()
+        assert client.get("/vectors?words=king,queen").status_code == 400
+
+
+async def asgi_request(app, method: str, path: str, body=None, chunks=None) -> tuple:
+    """Send one HTTP request through an ASGI app.
+
+    Returns:
+        Tuple of (status, headers dict, decoded JSON or text body).
+    """
+    if chunks is None:
+        chunks = [json.dumps(body).encode() if body is not None else b""]
+    messages = [
+        {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+        for i, c in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    await app(scope, receive, send)
+    start, content = sent[0], sent[1]["body"]
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    if headers["content-type"] == "application/json":
+        content = json.loads(content)
+    else:
+        content = content.decode()
+    return start["status"], headers, content
+
+
+def asgi_post(app, body) -> tuple:
+    """POST a GraphQL body to an ASGI app from synchronous code."""
+    return asyncio.run(asgi_request(app, "POST", "/graphql", body))
+
+
+class TestOffloader:
+    """Tests for the bounded executor."""
+
+    def test_runs_off_the_event_loop(self):
+        """Submitted functions run on pool threads."""
+        offloader = Offloader(max_workers=2)
+
+        async def run():
+            return await offloader.submit(lambda: threading.current_thread().name)
+
+        assert asyncio.run(run()).startswith("graphql-batch")
+        assert offloader.pending == 0
+        offloader.shutdown()
+
+    def test_rejects_when_full(self):
+        """Submitting beyond max_pending raises BusyError."""
+        offloader = Offloader(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def run():
+            first = offloader.submit(release.wait)
+            with pytest.raises(BusyError):
+                offloader.submit(lambda: None)
+            release.set()
+            await first
+
+        asyncio.run(run())
+        assert offloader.pending == 0
+        offloader.shutdown()
+
+    def test_busy_fails_loader_keys(self):
+        """A loader whose batch cannot be submitted fails its keys."""
+        offloader = Offloader(max_workers=1, max_pending=0)
+
+        async def run():
+            loader = BatchLoader(lambda keys: keys, offloader)
+            return await asyncio.gather(loader.load("a"), return_exceptions=True)
+
+        assert isinstance(asyncio.run(run())[0], BusyError)
+        offloader.shutdown()
+
+
+class TestASGIApp:
+    """Tests for the async ASGI application."""
+
+    @pytest.fixture
+    def asgi_app(self, sample_embeddings):
+        """Create ASGI app."""
+        app = create_asgi_app(sample_embeddings, max_workers=2, timeout=5.0)
+        yield app
+        app.offloader.shutdown()
+
+    def test_query(self, asgi_app):
+        """Queries are answered with 200 and JSON data."""
+        status, headers, result = asgi_post(asgi_app, {
+            "query": '{ info { vocabSize } mostSimilar(word: "king", topN: 1) { word } }'
+        })
+        assert status == 200
+        assert int(headers["content-length"]) > 0
+        assert result["data"]["info"]["vocabSize"] == 8
+        assert result["data"]["mostSimilar"][0]["word"] == "queen"
+
+    def test_matches_flask_app(self, asgi_app, client):
+        """The ASGI and WSGI apps give the same results."""
+        query = """
+            {
+                mostSimilar(word: "apple", topN: 4) { word similarity }
+                analogy(positive: ["king", "woman"], negative: ["man"]) { word }
+                similarity(word1: "cat", word2: "dog")
+            }
+        """
+        _, _, result = asgi_post(asgi_app, {"query": query})
+        assert result == graphql_query(client, query)
+
+    def test_batch(self, asgi_app):
+        """JSON arrays are executed as a batch."""
+        status, _, result = asgi_post(asgi_app, [
+            {"query": "{ hasWord(word: \"king\") }"},
+            {"query": "{ mostSimilar(word: \"dog\", topN: 1) { word } }"},
+            {},
+        ])
+        assert status == 200
+        assert result[0]["data"]["hasWord"] is True
+        assert result[1]["data"]["mostSimilar"][0]["word"] == "cat"
+        assert result[2]["errors"][0]["message"] == "No query provided"
+
+    def test_routes(self, asgi_app):
+        """Health, info, GraphiQL and unknown paths."""
+
+        async def run():
+            return [
+                await asgi_request(asgi_app, "GET", path)
+                for path in ("/health", "/", "/graphql", "/missing")
+            ]
+
+        health, info, graphiql, missing = asyncio.run(run())
+        assert health[2] == {"status": "ok"}
+        assert "vectors" not in info[2]["endpoints"]
+        assert graphiql[0] == 200 and "graphiql" in graphiql[2].lower()
+        assert missing[0] == 404
+
+    def test_invalid_json(self, asgi_app):
+        """Malformed bodies are rejected with 400."""
+
+        async def run():
+            return await asgi_request(asgi_app, "POST", "/graphql", chunks=[b"{not json"])
+
+        status, _, result = asyncio.run(run())
+        assert status == 400
+        assert "errors" in result
+
+    def test_body_too_large(self, sample_embeddings):
+        """Bodies over max_body_size are rejected with 413."""
+        app = create_asgi_app(sample_embeddings, max_body_size=16)
+
+        async def run():
+            return await asgi_request(app, "POST", "/graphql", chunks=[b"x" * 10] * 3)
+
+        assert asyncio.run(run())[0] == 413
+        app.offloader.shutdown()
+
+    def test_busy_returns_503(self, sample_embeddings):
+        """Heavy fields fail fast when the executor is full; cheap ones still run."""
+        app = create_asgi_app(sample_embeddings, max_pending=0)
+        status, headers, result = asgi_post(
+            app, {"query": '{ mostSimilar(word: "king") { word } }'}
+        )
+        assert status == 503
+        assert headers["retry-after"] == "1"
+        assert "busy" in result["errors"][0]["message"]
+
+        status, _, result = asgi_post(app, {"query": "{ info { vocabSize } }"})
+        assert status == 200
+        app.offloader.shutdown()
+
+    def test_timeout_returns_504(self, sample_embeddings, monkeypatch):
+        """Operations exceeding the timeout are answered with 504."""
+        original = sample_embeddings.most_similar_batch
+
+        def slow(*args, **kwargs):
+            time.sleep(0.5)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", slow)
+        app = create_asgi_app(sample_embeddings, timeout=0.05)
+        status, _, result = asgi_post(
+            app, {"query": '{ mostSimilar(word: "king") { word } }'}
+        )
+        assert status == 504
+        assert result["errors"][0]["extensions"]["code"] == "TIMEOUT"
+        app.offloader.shutdown()
+
+    def test_vocabulary_scans_offloaded(self, sample_embeddings, monkeypatch):
+        """searchVocab, doesntMatch and wordVectors run on the pool threads."""
+        threads = {}
+
+        def recording(name, fn):
+            def wrapper(*args, **kwargs):
+                threads[name] = threading.current_thread().name
+                return fn(*args, **kwargs)
+            return wrapper
+
+        vocab = WordEmbeddings.vocab
+        monkeypatch.setattr(WordEmbeddings, "vocab", property(
+            recording("searchVocab", vocab.fget)
+        ))
+        monkeypatch.setattr(sample_embeddings, "doesnt_match", recording(
+            "doesntMatch", sample_embeddings.doesnt_match
+        ))
+        schema_module = sys.modules["nlp_pipeline.graphql.schema"]
+        monkeypatch.setattr(schema_module, "gather_vectors", recording(
+            "wordVectors", schema_module.gather_vectors
+        ))
+        app = create_asgi_app(sample_embeddings)
+        status, _, result = asgi_post(app, {"query": """{
+            searchVocab(prefix: "k")
+            doesntMatch(words: ["king", "queen", "apple"])
+            wordVectors(words: ["king"]) { words }
+        }"""})
+        app.offloader.shutdown()
+
+        assert status == 200
+        assert result["data"]["searchVocab"] == ["king"]
+        assert result["data"]["wordVectors"] == {"words": ["king"]}
+        assert sorted(threads) == ["doesntMatch", "searchVocab", "wordVectors"]
+        assert all(name.startswith("graphql-batch") for name in threads.values())
+
+    def test_cheap_query_not_blocked(self, sample_embeddings, monkeypatch):
+        """A cheap query completes while a heavy one is still computing."""
+        original = sample_embeddings.most_similar_batch
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", blocking)
+        app = create_asgi_app(sample_embeddings)
+
+        async def run():
+            heavy = asyncio.ensure_future(asgi_request(
+                app, "POST", "/graphql", {"query": '{ mostSimilar(word: "king") { word } }'}
+            ))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            cheap = await asgi_request(
+                app, "POST", "/graphql", {"query": "{ hasWord(word: \"dog\") }"}
+            )
+            done_before = heavy.done()
+            release.set()
+            return cheap, done_before, await heavy
+
+        cheap, done_before, heavy = asyncio.run(run())
+        assert cheap[2]["data"]["hasWord"] is True
+        assert done_before is False
+        assert heavy[0] == 200
+        app.offloader.shutdown()
+
+    def test_lifespan(self, sample_embeddings):
+        """Startup and shutdown are acknowledged; shutdown stops the pool."""
+        app = create_asgi_app(sample_embeddings)
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(app({"type": "lifespan"}, receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+class TestQueryCost:
+    """Tests for static query cost analysis."""
+
+    def cost(self, query: str, vocab_size: int = 100_000, variables=None) -> int:
+        """Estimate the cost of a query."""
+        from graphql import parse
+
+        return estimate_cost(schema.graphql_schema, parse(query), vocab_size, variables)
+
+    def test_cheap_fields(self):
+        """Lookups cost one unit per root field."""
+        assert self.cost('{ info { vocabSize dimension } hasWord(word: "a") }') == 2
+
+    def test_scan_weighted_by_top_n_and_vocab(self):
+        """Neighbor queries cost a vocabulary scan plus their results."""
+        assert scan_cost(100_000) == 10
+        assert self.cost('{ mostSimilar(word: "a", topN: 5) { word } }') == 15
+        assert self.cost('{ mostSimilar(word: "a", topN: 5) { word } }', 1_000_000) == 105
+        # topN is capped by the vocabulary size
+        assert self.cost('{ mostSimilar(word: "a", topN: 1000000) { word } }', 100) == 101
+
+    def test_aliases_fragments_and_variables(self):
+        """Every alias and fragment use counts; variables are resolved."""
+        query = """
+            query ($n: Int) {
+                a: mostSimilar(word: "a", topN: $n) { ...F }
+                b: analogy(positive: ["a", "b"], negative: ["c"]) { ...F }
+            }
+            fragment F on SimilarWord { word similarity }
+        """
+        assert self.cost(query, variables={"n": 5}) == (10 + 5) + (10 + 3 + 10)
+
+    def test_list_arguments(self):
+        """Word lists add one unit per word; skipped fields are free."""
+        query = """
+            {
+                wordVectors(words: ["a", "b", "c"]) { data }
+                searchVocab(prefix: "a") @skip(if: true)
+            }
+        """
+        assert self.cost(query) == 4
+
+
+class TestCostLimiter:
+    """Tests for per-request and per-client cost limits."""
+
+    def test_rejects_over_limit(self):
+        """Operations over max_cost are rejected."""
+        limiter = CostLimiter(max_cost=100)
+        assert limiter.check(100) is None
+        error = limiter.check(101)
+        assert error.extensions["code"] == "QUERY_TOO_COMPLEX"
+        assert limiter.rejected == 1
+
+    def test_client_budget(self):
+        """A client's bucket is drained and other clients are unaffected."""
+        limiter = CostLimiter(max_cost=100, client_rate=1.0, client_burst=150)
+        assert limiter.check(100, "a") is None
+        error = limiter.check(100, "a")
+        assert error.extensions["code"] == "RATE_LIMITED"
+        assert error.extensions["retryAfter"] >= 50
+        assert limiter.check(100, "b") is None
+
+    def test_invalid_limits(self):
+        """Non-positive limits and a burst below max_cost are rejected."""
+        with pytest.raises(ValueError):
+            CostLimiter(max_cost=0)
+        with pytest.raises(ValueError):
+            CostLimiter(max_cost=100, client_rate=1.0, client_burst=10)
+        with pytest.raises(ValueError):
+            CostLimiter(max_cost=100, max_request_cost=50)
+        with pytest.raises(ValueError):
+            CostLimiter(max_cost=100, client_rate=1.0, max_request_cost=200, client_burst=150)
+
+    def test_request_limit(self):
+        """A batch is checked by its summed cost and charged once."""
+        limiter = CostLimiter(max_cost=100, client_rate=0.001, max_request_cost=150)
+        error = limiter.check_request([100, 60], "a")
+        assert error.extensions["code"] == "QUERY_TOO_COMPLEX"
+        assert error.extensions["maxRequestCost"] == 150
+        assert limiter.rejected == 1
+
+        # The operation over max_cost is rejected on its own, not summed
+        assert limiter.check_request([100, 50, 500], "a") is None
+        assert limiter.check(1, "a").extensions["code"] == "RATE_LIMITED"
+
+    def test_http_status(self, sample_embeddings):
+        """Too complex queries get 400, exhausted budgets 429 with Retry-After."""
+        app = create_app(
+            sample_embeddings, max_query_cost=8, client_cost_rate=0.001, client_cost_burst=10
+        )
+        client = app.test_client()
+        query = '{ mostSimilar(word: "king", topN: 5) { word } }'
+
+        response = client.post("/graphql", json={"query": query.replace("5", "8")})
+        assert response.status_code == 400
+        assert response.json["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+
+        assert client.post("/graphql", json={"query": query}).status_code == 200
+        response = client.post("/graphql", json={"query": query})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_batch_entries_checked_separately(self, sample_embeddings):
+        """In a batch only the expensive operation fails."""
+        client = create_app(sample_embeddings, max_query_cost=5).test_client()
+        response = client.post("/graphql", json=[
+            {"query": "{ info { vocabSize } }"},
+            {"query": '{ mostSimilar(word: "king", topN: 8) { word } }'},
+        ])
+        assert response.status_code == 200
+        assert response.json[0]["data"]["info"]["vocabSize"] == 8
+        assert response.json[1]["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+
+    def test_batch_over_request_limit(self, sample_embeddings):
+        """A batch of individually allowed operations over the budget is rejected."""
+        batch = [{"query": '{ mostSimilar(word: "king", topN: 3) { word } }'}] * 3
+        for options in ({}, {"batch_workers": 2, "batch_chunk_size": 1}):
+            client = create_app(sample_embeddings, max_query_cost=5, **options).test_client()
+            assert client.post("/graphql", json=batch[:1]).status_code == 200
+            response = client.post("/graphql", json=batch)
+            assert response.status_code == 400
+            error = response.json["errors"][0]
+            assert error["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+            assert error["extensions"]["maxRequestCost"] == 5
+
+        app = create_asgi_app(sample_embeddings, max_query_cost=5)
+        status, _, result = asgi_post(app, batch)
+        assert status == 400
+        assert result["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+        app.offloader.shutdown()
+
+    def test_batch_charged_once(self, sample_embeddings):
+        """A batch draws its total from the client's budget in one charge."""
+        client = create_app(
+            sample_embeddings, max_query_cost=5, max_request_cost=12, client_cost_rate=0.001
+        ).test_client()
+        batch = [{"query": '{ mostSimilar(word: "king", topN: 3) { word } }'}] * 3
+        response = client.post("/graphql", json=batch)
+        assert response.status_code == 200
+        assert all("data" in result for result in response.json)
+
+        response = client.post("/graphql", json=batch[:1])
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_asgi_status(self, sample_embeddings):
+        """The ASGI app applies the same limits."""
+        app = create_asgi_app(sample_embeddings, max_query_cost=5)
+        status, _, result = asgi_post(
+            app, {"query": '{ mostSimilar(word: "king", topN: 8) { word } }'}
+        )
+        assert status == 400
+        assert result["errors"][0]["extensions"]["code"] == "QUERY_TOO_COMPLEX"
+        app.offloader.shutdown()
+
+
+class TestMetrics:
+    """Tests for request metrics and the /metrics endpoint."""
+
+    def test_histogram_render(self):
+        """Histograms render cumulative buckets, sum and count."""
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+        assert histogram.count("/a") == 3
+
+    def test_metrics_endpoint(self, client):
+        """Route latency, resolver timing and gauges are exposed."""
+        graphql_query(client, '{ info { vocabSize } a: mostSimilar(word: "king") { word } '
+                              'b: mostSimilar(word: "king") { word } }')
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        text = response.get_data(as_text=True)
+        assert ('nlp_graphql_http_request_duration_seconds_count'
+                '{method="POST",route="/graphql",status="200"} 1') in text
+        assert 'nlp_graphql_resolver_duration_seconds_count{field="Query.mostSimilar"} 2' in text
+        assert 'nlp_graphql_operations_total{outcome="ok"} 1' in text
+        assert 'nlp_graphql_loader_cache_hits_total{loader="neighbors"} 1' in text
+        assert "nlp_graphql_document_cache_hit_ratio" in text
+        assert "nlp_embeddings_matrix_bytes 160" in text
+
+    def test_result_store_metrics(self, client):
+        """Hits and misses of the shared result store are exposed."""
+        def counters():
+            text = client.get("/metrics").get_data(as_text=True)
+            values = dict(
+                line.split() for line in text.splitlines()
+                if line.startswith("nlp_result_store_")
+            )
+            return float(values["nlp_result_store_hits_total"]), float(
+                values["nlp_result_store_misses_total"]
+            )
+
+        hits, misses = counters()
+        query = '{ mostSimilar(word: "queen", topN: 3) { word } }'
+        graphql_query(client, query)
+        graphql_query(client, query)
+        assert counters() == (hits + 1, misses + 1)
+
+    def test_metrics_disabled(self, sample_embeddings):
+        """Without metrics there is no /metrics endpoint."""
+        client = create_app(sample_embeddings, metrics=False).test_client()
+        assert client.get("/metrics").status_code == 404
+        assert graphql_query(client, "{ info { vocabSize } }")["data"]["info"]["vocabSize"] == 8
+
+    def test_slow_query_log(self, sample_embeddings, caplog):
+        """Operations over the threshold are logged."""
+        client = create_app(sample_embeddings, slow_query_seconds=0.0).test_client()
+        with caplog.at_level("WARNING", logger="nlp_pipeline.graphql.slow_queries"):
+            graphql_query(client, "query Info {\n  info { vocabSize }\n}")
+        assert "<anonymous>: query Info { info { vocabSize } }" in caplog.text
+        text = client.get("/metrics").get_data(as_text=True)
+        assert "nlp_graphql_slow_operations_total 1" in text
+
+    def test_asgi_metrics(self, sample_embeddings):
+        """The ASGI app records routes and exposes the executor gauge."""
+        app = create_asgi_app(sample_embeddings)
+
+        async def run():
+            await asgi_request(app, "POST", "/graphql", {"query": "{ info { vocabSize } }"})
+            await asgi_request(app, "GET", "/missing")
+            return await asgi_request(app, "GET", "/metrics")
+
+        status, headers, text = asyncio.run(run())
+        assert status == 200
+        assert 'route="/graphql",status="200"' in text
+        assert 'route="<unmatched>",status="404"' in text
+        assert "nlp_graphql_executor_pending 0" in text
+        assert "nlp_result_store_size" in text
+        app.offloader.shutdown()
+
+
+class TestVersionedEmbeddings:
+    """Tests for reference-counted embedding versions."""
+
+    def test_swap_drains_old_version(self, sample_embeddings):
+        """A replaced version is retired when its last request releases it."""
+        store = VersionedEmbeddings()
+        first = store.publish(sample_embeddings, "v1")
+        pinned = store.acquire(sample_embeddings)
+        assert pinned is first and first.refs == 1
+
+        second = store.publish(WordEmbeddings.from_dict({"a": [1.0]}), "v2")
+        assert second.number == first.number + 1
+        assert store.draining == [first]
+
+        store.release(pinned)
+        assert store.draining == []
+        assert store.retired == 1
+        assert store.info()["current"]["source"] == "v2"
+
+    def test_unused_version_retired_immediately(self, sample_embeddings):
+        """A version without requests is retired on swap."""
+        store = VersionedEmbeddings()
+        store.publish(sample_embeddings)
+        store.publish(WordEmbeddings.from_dict({"a": [1.0]}))
+        assert store.draining == [] and store.retired == 1
+
+    def test_acquire_requires_current(self, sample_embeddings):
+        """Embeddings that are not the current version are not counted."""
+        store = VersionedEmbeddings()
+        store.publish(sample_embeddings)
+        assert store.acquire(WordEmbeddings.from_dict({"a": [1.0]})) is None
+
+    def test_request_keeps_its_embeddings(self, sample_embeddings, monkeypatch):
+        """A running query finishes on the embeddings it started with."""
+        original = sample_embeddings.most_similar_batch
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(sample_embeddings, "most_similar_batch", blocking)
+        app = create_asgi_app(sample_embeddings)
+        replacement = WordEmbeddings.from_dict({"king": [1.0, 0.0], "x": [0.0, 1.0]})
+
+        async def run():
+            heavy = asyncio.ensure_future(asgi_request(app, "POST", "/graphql", {
+                "query": '{ info { vocabSize } mostSimilar(word: "king", topN: 1) { word } }'
+            }))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            old_version = versions.current
+            set_embeddings(replacement)
+            draining = list(versions.draining)
+            cheap = await asgi_request(app, "POST", "/graphql", {"query": "{ info { vocabSize } }"})
+            release.set()
+            return old_version, draining, cheap, await heavy
+
+        old_version, draining, cheap, heavy = asyncio.run(run())
+        assert draining == [old_version]
+        assert cheap[2]["data"]["info"]["vocabSize"] == 2
+        assert heavy[2]["data"]["info"]["vocabSize"] == 8
+        assert heavy[2]["data"]["mostSimilar"][0]["word"] == "queen"
+        assert old_version not in versions.draining
+        app.offloader.shutdown()
+
+
+class TestEmbeddingsReloader:
+    """Tests for background reloading."""
+
+    def test_reload_swaps_embeddings(self, client):
+        """A successful reload publishes the loaded embeddings."""
+        loaded = WordEmbeddings.from_dict({"a": [1.0, 0.0], "b": [0.0, 1.0]})
+        reloader = EmbeddingsReloader(lambda path: loaded)
+        assert reloader.start("new.txt")
+        assert reloader.wait(5)
+        assert reloader.status()["state"] == "idle"
+        assert versions.current.source == "new.txt"
+        assert graphql_query(client, "{ info { vocabSize } }")["data"]["info"]["vocabSize"] == 2
+
+    def test_failed_reload_keeps_current(self, client):
+        """A failing loader leaves the served embeddings in place."""
+
+        def loader(path):
+            raise OSError("no such file")
+
+        reloader = EmbeddingsReloader(loader)
+        reloader.start()
+        reloader.wait(5)
+        status = reloader.status()
+        assert status["state"] == "failed"
+        assert "no such file" in status["error"]
+        assert graphql_query(client, "{ info { vocabSize } }")["data"]["info"]["vocabSize"] == 8
+
+    def test_one_reload_at_a_time(self, sample_embeddings):
+        """A reload cannot start while another is running."""
+        release = threading.Event()
+
+        def loader(path):
+            release.wait(5)
+            return sample_embeddings
+
+        reloader = EmbeddingsReloader(loader)
+        assert reloader.start()
+        assert not reloader.start()
+        release.set()
+        assert reloader.wait(5)
+
+
+class TestAdminEndpoints:
+    """Tests for the token-protected admin endpoints."""
+
+    @pytest.fixture
+    def admin_client(self, sample_embeddings):
+        """Create a test client with admin endpoints enabled."""
+        loaded = WordEmbeddings.from_dict({"a": [1.0]})
+        app = create_app(
+            sample_embeddings,
+            reloader=EmbeddingsReloader(lambda path: loaded),
+            admin_token="secret",
+        )
+        return app.test_client()
+
+    def test_requires_token(self, admin_client):
+        """Requests without the right token are rejected."""
+        assert admin_client.get("/admin/embeddings").status_code == 401
+        response = admin_client.post(
+            "/admin/reload", headers={"Authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 401
+
+    def test_reload_and_status(self, admin_client):
+        """A reload is started and reported."""
+        headers = {"Authorization": "Bearer secret"}
+        response = admin_client.post("/admin/reload", json={"path": "v2"}, headers=headers)
+        assert response.status_code == 202
+        assert response.json["state"] == "loading"
+
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            status = admin_client.get("/admin/embeddings", headers=headers).json
+            if status["reload"]["state"] != "loading":
+                break
+            time.sleep(0.01)
+        assert status["reload"]["state"] == "idle"
+        assert status["versions"]["current"]["source"] == "v2"
+        assert status["versions"]["current"]["vocab_size"] == 1
+
+    def test_disabled_without_token(self, client):
+        """Admin endpoints do not exist without an admin token."""
+        assert client.post("/admin/reload").status_code == 404
+
+    def test_asgi_admin(self, sample_embeddings):
+        """The ASGI app serves the same admin endpoints."""
+        reloader = EmbeddingsReloader(lambda path: sample_embeddings)
+        app = create_asgi_app(sample_embeddings, reloader=reloader, admin_token="secret")
+
+        async def request(method, path, token):
+            scope = {
+                "type": "http", "method": method, "path": path,
+                "headers": [(b"authorization", f"Bearer {token}".encode())],
+            }
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": b""}
+
+            async def send(message):
+                sent.append(message)
+
+            await app(scope, receive, send)
+            return sent[0]["status"], json.loads(sent[1]["body"])
+
+        async def run():
+            return (
+                await request("GET", "/admin/embeddings", "wrong"),
+                await request("POST", "/admin/reload", "secret"),
+            )
+
+        denied, started = asyncio.run(run())
+        assert denied[0] == 401
+        assert started[0] == 202
+        assert reloader.wait(5)
+        app.offloader.shutdown()
+
+
+class TestModelRegistry:
+    """Tests for the registry of named models."""
+
+    @staticmethod
+    def make_model(words: int) -> WordEmbeddings:
+        """Create in-memory embeddings of a given vocabulary size."""
+        rng = np.random.default_rng(words)
+        return WordEmbeddings.from_dict(
+            {f"w{i}": rng.normal(size=4).tolist() for i in range(words)}
+        )
+
+    def test_lazy_loading(self):
+        """Models are loaded on first use, once."""
+        calls = []
+        registry = ModelRegistry()
+        registry.register("small", lambda: calls.append(1) or self.make_model(3))
+        assert calls == []
+        assert registry.vocab_size("small") is None
+
+        assert registry.get("small").vocab_size == 3
+        registry.get("small")
+        assert calls == [1]
+        assert registry.loads == 1
+        assert registry.vocab_size("small") == 3
+
+    def test_unknown_and_duplicate_names(self):
+        """Unknown and already registered names are rejected."""
+        registry = ModelRegistry()
+        registry.register("a", lambda: self.make_model(2))
+        with pytest.raises(ValueError, match="Unknown model"):
+            registry.get("b")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register("a", lambda: self.make_model(2))
+
+    def test_path_must_be_native_directory(self, tmp_path):
+        """Registering a file path fails; a saved directory is memory-mapped."""
+        with pytest.raises(ValueError, match="native-format"):
+            ModelRegistry().register("a", tmp_path / "missing.txt")
+
+        path = self.make_model(5).save(tmp_path / "native")
+        registry = ModelRegistry()
+        registry.register("a", path)
+        embeddings = registry.get("a")
+        assert isinstance(embeddings.matrix, np.memmap)
+        # The mapped matrix is shared page cache, not private memory
+        assert memory_bytes(embeddings) < memory_bytes(self.make_model(5))
+
+    def test_evicts_least_recently_used(self):
+        """Idle models are evicted LRU first when over the memory budget."""
+        budget = memory_bytes(self.make_model(10)) * 2
+        registry = ModelRegistry(memory_budget=budget)
+        for name in ("a", "b", "c"):
+            registry.register(name, lambda: self.make_model(10))
+
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")
+        registry.get("c")
+
+        loaded = {m["name"] for m in registry.info() if m["loaded"]}
+        assert loaded == {"a", "c"}
+        assert registry.evictions == 1
+        assert registry.memory_used <= budget
+
+    def test_acquired_model_is_not_evicted(self):
+        """A model in use by a request survives until it is released."""
+        budget = memory_bytes(self.make_model(10))
+        registry = ModelRegistry(memory_budget=budget)
+        registry.register("a", lambda: self.make_model(10))
+        registry.register("b", lambda: self.make_model(10))
+
+        registry.acquire("a")
+        registry.get("b")
+        assert {m["name"] for m in registry.info() if m["loaded"]} == {"a", "b"}
+
+        registry.release("a")
+        assert {m["name"] for m in registry.info() if m["loaded"]} == {"b"}
+
+
+class TestModelArgument:
+    """Tests for querying named models through the API."""
+
+    @pytest.fixture
+    def registry(self):
+        """Register a second model and reset the registry afterwards."""
+        registry = ModelRegistry()
+        registry.register("fruit", lambda: WordEmbeddings.from_dict({
+            "apple": [1.0, 0.0],
+            "pear": [0.9, 0.1],
+            "plum": [0.8, 0.3],
+        }))
+        yield registry
+        set_registry(None)
+
+    def test_model_argument(self, sample_embeddings, registry):
+        """Fields query the selected model; without one the default is used."""
+        client = create_app(sample_embeddings, registry=registry).test_client()
+        result = graphql_query(client, """{
+            default: info { vocabSize }
+            fruit: info(model: "fruit") { vocabSize dimension }
+            mostSimilar(word: "apple", topN: 1, model: "fruit") { word }
+            similarity(word1: "apple", word2: "pear", model: "fruit")
+        }""")
+        assert "errors" not in result
+        assert result["data"]["default"]["vocabSize"] == 8
+        assert result["data"]["fruit"] == {"vocabSize": 3, "dimension": 2}
+        assert result["data"]["mostSimilar"] == [{"word": "pear"}]
+        assert result["data"]["similarity"] > 0.9
+        assert registry.info()[0]["in_flight"] == 0
+
+    def test_unknown_model(self, sample_embeddings, registry):
+        """Querying an unregistered model reports an error."""
+        client = create_app(sample_embeddings, registry=registry).test_client()
+        result = graphql_query(client, '{ info(model: "nope") { vocabSize } }')
+        assert "Unknown model" in result["errors"][0]["message"]
+
+    def test_models_field(self, sample_embeddings, registry):
+        """The models field lists registered models and their state."""
+        client = create_app(sample_embeddings, registry=registry).test_client()
+        query = "{ models { name loaded vocabSize } }"
+        before = graphql_query(client, query)["data"]["models"]
+        assert before == [{"name": "fruit", "loaded": False, "vocabSize": None}]
+
+        graphql_query(client, '{ hasWord(word: "pear", model: "fruit") }')
+        after = graphql_query(client, query)["data"]["models"]
+        assert after == [{"name": "fruit", "loaded": True, "vocabSize": 3}]
+
+    def test_cost_uses_model_vocabulary(self, sample_embeddings, registry):
+        """Result counts are capped by the selected model's vocabulary."""
+        registry.get("fruit")
+        client = create_app(
+            sample_embeddings, registry=registry, max_query_cost=8
+        ).test_client()
+        query = '{ mostSimilar(word: "apple", topN: 100%s) { word } }'
+        assert "errors" in graphql_query(client, query % "")
+        result = graphql_query(client, query % ', model: "fruit"')
+        assert "errors" not in result
+
+    def test_cold_model_loads_off_the_event_loop(self, sample_embeddings):
+        """Loading a model does not block other requests on the ASGI app."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_loader():
+            started.set()
+            release.wait(5)
+            return WordEmbeddings.from_dict({"apple": [1.0, 0.0], "pear": [0.9, 0.1]})
+
+        registry = ModelRegistry()
+        registry.register("slow", slow_loader)
+        app = create_asgi_app(sample_embeddings, registry=registry)
+
+        async def run():
+            slow = asyncio.ensure_future(asgi_request(app, "POST", "/graphql", {
+                "query": '{ a: hasWord(word: "pear", model: "slow") '
+                         'b: info(model: "slow") { vocabSize } }'
+            }))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            cheap = await asgi_request(
+                app, "POST", "/graphql", {"query": '{ hasWord(word: "dog") }'}
+            )
+            done_before = slow.done()
+            release.set()
+            return cheap, done_before, await slow
+
+        try:
+            cheap, done_before, slow = asyncio.run(run())
+        finally:
+            set_registry(None)
+            app.offloader.shutdown()
+        assert cheap[2]["data"]["hasWord"] is True
+        assert done_before is False
+        assert slow[2]["data"] == {"a": True, "b": {"vocabSize": 2}}
+        assert registry.loads == 1
+        assert registry.info()[0]["in_flight"] == 0
+
+    def test_metrics(self, sample_embeddings, registry):
+        """Registry gauges are exposed at /metrics."""
+        client = create_app(sample_embeddings, registry=registry).test_client()
+        graphql_query(client, '{ hasWord(word: "pear", model: "fruit") }')
+        text = client.get("/metrics").data.decode()
+        assert "nlp_models_loaded 1" in text
+        assert "nlp_models_loads_total 1" in text
@@ -0,0 +1,106 @@
+"""Tests for the LemmaTable class."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from nlp_pipeline import LemmaTable, Lemmatizer
+
+
+def create_sample_table() -> LemmaTable:
+    """Create a small hand-written lemma table."""
+    return LemmaTable({
+        ("cats", "n"): "cat",
+        ("running", "n"): "running",
+        ("running", "v"): "run",
+        ("better", "a"): "good",
+    })
+
+
+class TestLemmaTable:
+    """Test suite for LemmaTable."""
+
+    def test_lookup(self):
+        """Test looking up (word, POS) pairs."""
+        table = create_sample_table()
+        assert table.lookup("cats", "n") == "cat"
+        assert table.lookup("running", "v") == "run"
+        assert table.lookup("better", "a") == "good"
+
+    def test_lookup_miss(self):
+        """Test misses return None."""
+        table = create_sample_table()
+        assert table.lookup("dogs", "n") is None
+        assert table.lookup("cats", "v") is None
+        assert table.lookup("cats", "s") is None
+
+    def test_len_and_contains(self):
+        """Test size and membership."""
+        table = create_sample_table()
+        assert len(table) == 3
+        assert "running" in table
+        assert "dogs" not in table
+
+    def test_invalid_pos(self):
+        """Test that unknown POS raises error."""
+        with pytest.raises(ValueError, match="not supported"):
+            LemmaTable({("cats", "noun"): "cat"})
+
+    def test_save_and_load(self):
+        """Test round trip through the .npz file."""
+        table = create_sample_table()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = table.save(Path(tmpdir) / "lemmas")
+            assert path.suffix == ".npz"
+
+            loaded = LemmaTable.load(path)
+
+        assert len(loaded) == len(table)
+        assert loaded.lookup("running", "v") == "run"
+        assert loaded.lookup("running", "n") == "running"
+        assert loaded.lookup("cats", "v") is None
+
+    def test_save_empty(self):
+        """Test saving and loading an empty table."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = LemmaTable().save(Path(tmpdir) / "empty.npz")
+            assert len(LemmaTable.load(path)) == 0
+
+    def test_build_from_wordnet(self):
+        """Test exporting lemmas from WordNet."""
+        table = LemmaTable.build(["Cats", "running", "cats"])
+        assert len(table) == 2
+        assert table.lookup("cats", "n") == "cat"
+        assert table.lookup("running", "v") == "run"
+
+
+class TestLemmatizerWithTable:
+    """Test suite for Lemmatizer using a LemmaTable fast path."""
+
+    def test_table_hit_skips_wordnet(self):
+        """Test table hits are answered without WordNet."""
+        table = LemmaTable({("geese", "n"): "goose-from-table"})
+        lemmatizer = Lemmatizer(lemma_table=table)
+        assert lemmatizer.lemmatize("Geese") == "goose-from-table"
+        assert lemmatizer.cache_info().misses == 0
+
+    def test_table_from_path(self):
+        """Test lemmatizer accepts a path to a saved table."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = create_sample_table().save(Path(tmpdir) / "lemmas.npz")
+            lemmatizer = Lemmatizer(default_pos="verb", lemma_table=path)
+
+        assert isinstance(lemmatizer.lemma_table, LemmaTable)
+        assert lemmatizer.lemmatize("running") == "run"
+
+    def test_table_with_pos_tags(self):
+        """Test Penn-tagged lemmatization uses the table."""
+        lemmatizer = Lemmatizer(lemma_table=create_sample_table())
+        result = lemmatizer.lemmatize_with_pos_tags([("running", "VBG"), ("better", "JJR")])
+        assert result == ["run", "good"]
+
+    def test_table_miss_falls_back_to_wordnet(self):
+        """Test misses fall back to WordNet."""
+        lemmatizer = Lemmatizer(lemma_table=create_sample_table())
+        assert lemmatizer.lemmatize("dogs") == "dog"
@@ -1,5 +1,6 @@
 """Tests for the Lemmatizer class."""
 
+import pickle
 
 from nlp_pipeline import Lemmatizer, Tokenizer
 
@@ -132,3 +133,55 @@ class TestLemmatizer:
         # Both reduce plurals
         assert lemmatizer.lemmatize("cats") == "cat"
         assert stemmer.stem("cats") == "cat"
+
+    def test_lemmatize_batch_uses_context_pos(self):
+        """Test batch lemmatization tags tokens before lemmatizing."""
+        lemmatizer = Lemmatizer()
+        sentences = [
+            ["the", "dogs", "are", "running"],
+            ["she", "ran", "home"],
+        ]
+        result = lemmatizer.lemmatize_batch(sentences)
+        assert result[0] == ["the", "dog", "be", "run"]
+        assert result[1][1] == "run"
+
+    def test_lemmatize_batch_empty(self):
+        """Test batch lemmatization with empty input."""
+        lemmatizer = Lemmatizer()
+        assert lemmatizer.lemmatize_batch([]) == []
+        assert lemmatizer.lemmatize_batch([[]]) == [[]]
+
+    def test_tag_sentences(self):
+        """Test tagging a batch of sentences."""
+        lemmatizer = Lemmatizer()
+        tagged = lemmatizer.tag_sentences([["dogs", "run"], ["cats"]])
+        assert len(tagged) == 2
+        assert [word for word, _ in tagged[0]] == ["dogs", "run"]
+        assert tagged[0][0][1].startswith("NN")
+
+    def test_lemma_cache(self):
+        """Test repeated lookups are served from the cache."""
+        lemmatizer = Lemmatizer()
+        lemmatizer.lemmatize_tokens(["cats", "cats", "Cats"])
+        info = lemmatizer.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+        lemmatizer.clear_cache()
+        assert lemmatizer.cache_info().currsize == 0
+
+    def test_pickle_round_trip(self):
+        """Test a lemmatizer with a warm cache can be pickled."""
+        lemmatizer = Lemmatizer(default_pos="verb", cache_size=10)
+        lemmatizer.lemmatize_batch([["dogs", "running"]])
+        restored = pickle.loads(pickle.dumps(lemmatizer))
+        assert restored.default_pos == "verb"
+        assert restored.cache_info().maxsize == 10
+        assert restored.cache_info().currsize == 0
+        assert restored.lemmatize("running") == "run"
+        assert restored.lemmatize_batch([["dogs", "running"]]) == [["dog", "run"]]
+
+    def test_cache_disabled(self):
+        """Test lemmatizer works with caching disabled."""
+        lemmatizer = Lemmatizer(cache_size=0)
+        assert lemmatizer.lemmatize_tokens(["cats", "cats"]) == ["cat", "cat"]
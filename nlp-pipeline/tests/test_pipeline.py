@@ -1,7 +1,11 @@
 """Tests for the Pipeline class."""
 
+import pickle
 
-from nlp_pipeline import Pipeline
+import numpy as np
+import pytest
+
+from nlp_pipeline import Pipeline, TokenIds
 
 
 class TestPipeline:
@@ -179,3 +183,57 @@ class TestPipeline:
         # Punctuation becomes separate tokens, stopwords removed
         assert "hello" in result
         assert "world" in result
+
+    def test_pipeline_fit_builds_vocabulary(self):
+        """Test that fit builds the token vocabulary."""
+        pipeline = Pipeline(normalizer="stem")
+        assert pipeline.vocabulary is None
+
+        pipeline.fit(["The cats are running", "Cats jump"])
+        assert "cat" in pipeline.vocabulary
+        assert "run" in pipeline.vocabulary
+        assert pipeline.vocabulary.tokens[1] == "cat"  # most frequent
+
+    def test_pipeline_encode(self):
+        """Test encoding text to vocabulary ids."""
+        pipeline = Pipeline(normalizer="stem").fit(["cats running"])
+        ids = pipeline.encode("running cats and dogs")
+        assert ids.dtype == np.int32
+        assert ids.tolist() == [
+            pipeline.vocabulary["run"],
+            pipeline.vocabulary["cat"],
+            0,  # "dog" is unknown
+        ]
+
+    def test_pipeline_encode_requires_fit(self):
+        """Test that encoding before fit raises error."""
+        pipeline = Pipeline()
+        with pytest.raises(RuntimeError, match="not fitted"):
+            pipeline.encode("cats")
+
+    def test_pipeline_ids_output_mode(self):
+        """Test transform returns ragged ids in 'ids' mode."""
+        pipeline = Pipeline(normalizer="stem", output="ids")
+        texts = ["The cats are running", "", "Dogs run"]
+        batch = pipeline.fit_transform(texts)
+        assert isinstance(batch, TokenIds)
+        assert len(batch) == 3
+        assert batch.lengths.tolist() == [2, 0, 2]
+        assert pipeline.vocabulary.decode(batch[2]) == ["dog", "run"]
+
+        # Output mode can be overridden per call
+        assert pipeline.transform(texts, output="tokens")[2] == ["dog", "run"]
+
+    def test_pipeline_max_vocab_size(self):
+        """Test limiting the fitted vocabulary size."""
+        pipeline = Pipeline(normalizer=None, max_vocab_size=2)
+        pipeline.fit(["cats cats dogs"])
+        assert pipeline.vocabulary.tokens == ["<unk>", "cats"]
+
+    def test_pipeline_pickle_round_trip(self):
+        """Test a fitted pipeline survives pickling."""
+        pipeline = Pipeline().fit(["The cats are running", "Cats jump"])
+        restored = pickle.loads(pickle.dumps(pipeline))
+        assert restored.vocabulary.tokens == pipeline.vocabulary.tokens
+        assert restored.process("The cats") == pipeline.process("The cats")
+        assert restored.encode("cats").tolist() == pipeline.encode("cats").tolist()
@@ -0,0 +1,74 @@
+"""Tests for the shared nearest-neighbor result store."""
+
+import pytest
+
+from nlp_pipeline import WordEmbeddings
+from nlp_pipeline.results import ResultStore
+
+
+def make_embeddings() -> WordEmbeddings:
+    """Create small embeddings."""
+    return WordEmbeddings.from_dict({
+        "a": [1.0, 0.0],
+        "b": [0.9, 0.1],
+        "c": [0.0, 1.0],
+    })
+
+
+class TestResultStore:
+    """Test suite for ResultStore."""
+
+    def test_miss_then_hit(self):
+        """A stored ranking is returned for the same embeddings and query."""
+        store = ResultStore()
+        emb = make_embeddings()
+        assert store.get(emb, ("word", "a"), 2) is None
+
+        store.put(emb, ("word", "a"), 2, [("b", 0.99), ("c", 0.0)])
+        assert store.get(emb, ("word", "a"), 2) == [("b", 0.99), ("c", 0.0)]
+        assert store.stats["hits"] == 1
+        assert store.stats["misses"] == 1
+
+    def test_prefix_of_larger_ranking(self):
+        """A ranking answers smaller top_n, but not larger ones."""
+        store = ResultStore()
+        emb = make_embeddings()
+        store.put(emb, ("word", "a"), 2, [("b", 0.99), ("c", 0.0)])
+
+        assert store.get(emb, ("word", "a"), 1) == [("b", 0.99)]
+        assert store.get(emb, ("word", "a"), 3) is None
+
+    def test_negative_top_n(self):
+        """A negative top_n is rejected instead of slicing from the end."""
+        store = ResultStore()
+        emb = make_embeddings()
+        store.put(emb, ("word", "a"), 2, [("b", 0.99), ("c", 0.0)])
+
+        with pytest.raises(ValueError):
+            store.get(emb, ("word", "a"), -1)
+        with pytest.raises(ValueError):
+            store.put(emb, ("word", "b"), -1, [])
+        assert len(store) == 1
+
+    def test_separate_embeddings(self):
+        """Rankings of other embeddings, or changed ones, are not reused."""
+        store = ResultStore()
+        emb = make_embeddings()
+        store.put(emb, ("word", "a"), 1, [("b", 0.99)])
+
+        assert store.get(make_embeddings(), ("word", "a"), 1) is None
+        emb.add_word("d", [1.0, 0.0])
+        assert store.get(emb, ("word", "a"), 1) is None
+
+    def test_lru_eviction(self):
+        """The least recently used ranking is evicted first."""
+        store = ResultStore(maxsize=2)
+        emb = make_embeddings()
+        store.put(emb, ("word", "a"), 1, [("b", 0.99)])
+        store.put(emb, ("word", "b"), 1, [("a", 0.99)])
+        store.get(emb, ("word", "a"), 1)
+        store.put(emb, ("word", "c"), 1, [("b", 0.1)])
+
+        assert len(store) == 2
+        assert store.get(emb, ("word", "b"), 1) is None
+        assert store.get(emb, ("word", "a"), 1) == [("b", 0.99)]
@@ -102,3 +102,35 @@ class TestStemmer:
         assert "english" in Stemmer.SNOWBALL_LANGUAGES
         assert "spanish" in Stemmer.SNOWBALL_LANGUAGES
         assert "german" in Stemmer.SNOWBALL_LANGUAGES
+
+    def test_stem_tokens_stems_each_word_once(self):
+        """Test that repeated tokens are stemmed only once."""
+        stemmer = Stemmer()
+        calls = []
+        original = stemmer._stemmer.stem
+        stemmer._stemmer.stem = lambda word: calls.append(word) or original(word)
+
+        result = stemmer.stem_tokens(["running", "cats", "running", "running"])
+        assert result == ["run", "cat", "run", "run"]
+        assert sorted(calls) == ["cats", "running"]
+
+    def test_stem_batch(self):
+        """Test stemming a batch of token lists."""
+        stemmer = Stemmer()
+        documents = [["running", "cats"], [], ["cats", "jumps", "running"]]
+        result = stemmer.stem_batch(documents)
+        assert result == [["run", "cat"], [], ["cat", "jump", "run"]]
+
+    def test_stem_batch_matches_stem_tokens(self):
+        """Test batch stemming gives the same result as per-document stemming."""
+        stemmer = Stemmer(algorithm="snowball")
+        documents = [["generously", "running"], ["happiness", "generously"]]
+        expected = [stemmer.stem_tokens(tokens) for tokens in documents]
+        assert stemmer.stem_batch(documents) == expected
+
+    def test_stem_batch_process_pool(self):
+        """Test batch stemming across worker processes."""
+        stemmer = Stemmer()
+        documents = [["running", "cats", "jumps"], ["easily", "running"]]
+        result = stemmer.stem_batch(documents, n_jobs=2, chunk_size=2)
+        assert result == [["run", "cat", "jump"], ["easili", "run"]]
@@ -0,0 +1,102 @@
+"""Tests for the Vocabulary and TokenIds classes."""
+
+import numpy as np
+import pytest
+
+from nlp_pipeline import TokenIds, Vocabulary
+
+TOKEN_LISTS = [
+    ["cat", "dog", "cat"],
+    [],
+    ["bird", "cat", "dog"],
+]
+
+
+class TestVocabulary:
+    """Test suite for Vocabulary."""
+
+    def test_unknown_token_is_zero(self):
+        """Test that id 0 is reserved for unknown tokens."""
+        vocab = Vocabulary(["cat"])
+        assert vocab["<unk>"] == 0
+        assert vocab["cat"] == 1
+        assert vocab["missing"] == 0
+
+    def test_build_orders_by_frequency(self):
+        """Test that frequent tokens get the lowest ids."""
+        vocab = Vocabulary.build(TOKEN_LISTS)
+        assert vocab.tokens == ["<unk>", "cat", "dog", "bird"]
+        assert len(vocab) == 4
+
+    def test_build_min_freq(self):
+        """Test minimum frequency filtering."""
+        vocab = Vocabulary.build(TOKEN_LISTS, min_freq=2)
+        assert "cat" in vocab
+        assert "dog" in vocab
+        assert "bird" not in vocab
+
+    def test_build_max_size(self):
+        """Test maximum size includes the unknown token."""
+        vocab = Vocabulary.build(TOKEN_LISTS, max_size=2)
+        assert vocab.tokens == ["<unk>", "cat"]
+
+    def test_add(self):
+        """Test adding tokens."""
+        vocab = Vocabulary()
+        assert vocab.add("cat") == 1
+        assert vocab.add("cat") == 1
+        assert len(vocab) == 2
+
+    def test_encode(self):
+        """Test encoding a token list."""
+        vocab = Vocabulary.build(TOKEN_LISTS)
+        ids = vocab.encode(["dog", "fish", "cat"])
+        assert ids.dtype == np.int32
+        assert ids.tolist() == [2, 0, 1]
+
+    def test_encode_batch(self):
+        """Test encoding a batch into a ragged array."""
+        vocab = Vocabulary.build(TOKEN_LISTS)
+        batch = vocab.encode_batch(TOKEN_LISTS)
+        assert batch.ids.dtype == np.int32
+        assert batch.ids.tolist() == [1, 2, 1, 3, 1, 2]
+        assert batch.offsets.tolist() == [0, 3, 3, 6]
+        assert batch.lengths.tolist() == [3, 0, 3]
+
+    def test_encode_batch_empty(self):
+        """Test encoding an empty batch."""
+        batch = Vocabulary().encode_batch([])
+        assert len(batch) == 0
+        assert len(batch.ids) == 0
+
+    def test_decode(self):
+        """Test decoding ids back to tokens."""
+        vocab = Vocabulary.build(TOKEN_LISTS)
+        assert vocab.decode(vocab.encode(["cat", "bird"])) == ["cat", "bird"]
+
+
+class TestTokenIds:
+    """Test suite for TokenIds."""
+
+    def test_getitem_returns_views(self):
+        """Test that sequences are slices of the shared array."""
+        batch = TokenIds(np.array([1, 2, 3], dtype=np.int32), np.array([0, 2, 3]))
+        first = batch[0]
+        assert first.tolist() == [1, 2]
+        assert np.shares_memory(first, batch.ids)
+
+    def test_negative_index(self):
+        """Test negative indexing."""
+        batch = TokenIds(np.array([1, 2, 3], dtype=np.int32), np.array([0, 2, 3]))
+        assert batch[-1].tolist() == [3]
+
+    def test_index_out_of_range(self):
+        """Test out of range index raises error."""
+        batch = TokenIds(np.array([1], dtype=np.int32), np.array([0, 1]))
+        with pytest.raises(IndexError):
+            batch[1]
+
+    def test_iter(self):
+        """Test iterating over sequences."""
+        batch = TokenIds(np.array([1, 2, 3], dtype=np.int32), np.array([0, 0, 3]))
+        assert [seq.tolist() for seq in batch] == [[], [1, 2, 3]]
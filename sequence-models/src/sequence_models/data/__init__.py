@@ -0,0 +1,28 @@
+"""Data loading utilities."""
+
+from .batching import BucketBatchSampler, bucket_loader, pack_collate, trim_collate
+from .imdb import (
+    PAD_IDX,
+    UNK_IDX,
+    IMDBDataset,
+    build_vocab,
+    clean_text,
+    encode,
+    load_imdb,
+    tokenize,
+)
+
+__all__ = [
+    "BucketBatchSampler",
+    "bucket_loader",
+    "pack_collate",
+    "trim_collate",
+    "PAD_IDX",
+    "UNK_IDX",
+    "IMDBDataset",
+    "build_vocab",
+    "clean_text",
+    "encode",
+    "load_imdb",
+    "tokenize",
+]
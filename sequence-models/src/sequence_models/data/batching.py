@@ -0,0 +1,182 @@
+"""Length-bucketed batching with per-batch dynamic padding."""
+
+import math
+from collections.abc import Iterator, Sequence
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import DataLoader, Dataset, Sampler
+
+from .imdb import PAD_IDX
+
+
+class BucketBatchSampler(Sampler[list[int]]):
+    """Batch sampler grouping sequences of similar length.
+
+    Indices are shuffled, split into pools of batch_size * pool_batches
+    indices, and each pool is sorted by length before being cut into
+    batches; the batches are then shuffled. Batches hold sequences of
+    similar length, so padding them to their own maximum (see
+    trim_collate) wastes little compute, while the order still changes
+    every epoch.
+
+    Args:
+        lengths: Unpadded length of every sequence (e.g. IMDBDataset.lengths)
+        batch_size: Sequences per batch
+        shuffle: Shuffle pools and batches (False sorts globally by length)
+        drop_last: Drop the last batch of each pool if incomplete
+        pool_batches: Batches per sorted pool; larger pools pad less but
+            randomize less
+        seed: Base seed of the shuffling, combined with set_epoch()
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int] | torch.Tensor,
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        pool_batches: int = 100,
+        seed: int = 0,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if pool_batches < 1:
+            raise ValueError(f"pool_batches must be positive, got {pool_batches}")
+        self.lengths = torch.as_tensor(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.pool_batches = pool_batches
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch, so every epoch uses a different (reproducible) order."""
+        self.epoch = epoch
+
+    def _batches(self) -> list[list[int]]:
+        """Build the batches of the current epoch."""
+        n = len(self.lengths)
+        if not self.shuffle:
+            order = torch.argsort(self.lengths, stable=True)
+            return self._split(order)
+
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        order = torch.randperm(n, generator=generator)
+        pool_size = self.batch_size * self.pool_batches
+        batches = []
+        for start in range(0, n, pool_size):
+            pool = order[start : start + pool_size]
+            pool = pool[torch.argsort(self.lengths[pool], stable=True)]
+            batches.extend(self._split(pool))
+        return [batches[i] for i in torch.randperm(len(batches), generator=generator)]
+
+    def _split(self, indices: torch.Tensor) -> list[list[int]]:
+        """Cut sorted indices into batches."""
+        batches = list(torch.split(indices, self.batch_size))
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        return [batch.tolist() for batch in batches]
+
+    def __iter__(self) -> Iterator[list[int]]:
+        yield from self._batches()
+
+    def __len__(self) -> int:
+        n = len(self.lengths)
+        if not self.drop_last:
+            return math.ceil(n / self.batch_size)
+        if not self.shuffle:
+            return n // self.batch_size
+        # Every full pool splits evenly, only the last pool drops a batch
+        pool_size = self.batch_size * self.pool_batches
+        full_pools, rest = divmod(n, pool_size)
+        return full_pools * self.pool_batches + rest // self.batch_size
+
+
+def trim_collate(
+    batch: list[tuple[torch.Tensor, torch.Tensor]], pad_idx: int = PAD_IDX
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Collate (tokens, label) pairs, padding only to the longest sequence.
+
+    Sequences may have different lengths or share a fixed padded length;
+    either way, trailing columns holding only padding are removed.
+
+    Args:
+        batch: List of (token indices, label) pairs
+        pad_idx: Padding index
+
+    Returns:
+        (X, y): X of shape (batch_size, longest sequence), y stacked labels
+    """
+    sequences, labels = zip(*batch)
+    X = pad_sequence(sequences, batch_first=True, padding_value=pad_idx)
+    used = (X != pad_idx).any(dim=0).nonzero()
+    X = X[:, : int(used[-1]) + 1 if len(used) else 1]
+    return X, torch.stack(labels)
+
+
+def pack_collate(
+    batch: list[tuple[torch.Tensor, torch.Tensor]], pad_idx: int = PAD_IDX
+) -> tuple[tuple[torch.Tensor, torch.Tensor], torch.Tensor]:
+    """Collate (tokens, label) pairs into a packed batch without padding.
+
+    Padding ids are dropped and the remaining ids of all sequences are
+    concatenated, for models taking (ids, offsets) such as
+    EmbeddingClassifier.
+
+    Args:
+        batch: List of (token indices, label) pairs
+        pad_idx: Padding index
+
+    Returns:
+        ((ids, offsets), y): ids of shape (num_tokens,), offsets of shape
+        (batch_size,) with the start of each sequence in ids, y stacked labels
+    """
+    sequences, labels = zip(*batch)
+    sequences = [x[x != pad_idx] for x in sequences]
+    ids = torch.cat(sequences)
+    lengths = torch.tensor([0] + [len(x) for x in sequences[:-1]], dtype=ids.dtype)
+    return (ids, lengths.cumsum(0).to(ids.dtype)), torch.stack(labels)
+
+
+def bucket_loader(
+    dataset: Dataset,
+    batch_size: int,
+    lengths: Sequence[int] | torch.Tensor | None = None,
+    shuffle: bool = True,
+    drop_last: bool = False,
+    pool_batches: int = 100,
+    seed: int = 0,
+    collate_fn=trim_collate,
+    **loader_kwargs,
+) -> DataLoader:
+    """Create a DataLoader with length bucketing and dynamic padding.
+
+    Args:
+        dataset: Dataset of (token indices, label) pairs
+        batch_size: Sequences per batch
+        lengths: Sequence lengths; defaults to dataset.lengths
+        shuffle: Shuffle pools and batches
+        drop_last: Drop incomplete batches (see BucketBatchSampler)
+        pool_batches: Batches per sorted pool
+        seed: Base seed of the shuffling
+        collate_fn: trim_collate for padded batches, pack_collate for
+            packed ones
+        **loader_kwargs: Other DataLoader arguments (num_workers, ...).
+            pin_memory defaults to True when CUDA is available, so
+            batches are copied to the GPU asynchronously
+
+    Returns:
+        DataLoader yielding (X, y) batches, X trimmed to the longest
+        sequence (or packed)
+    """
+    if lengths is None:
+        lengths = dataset.lengths
+    loader_kwargs.setdefault("pin_memory", torch.cuda.is_available())
+    sampler = BucketBatchSampler(
+        lengths, batch_size, shuffle, drop_last, pool_batches, seed
+    )
+    return DataLoader(
+        dataset, batch_sampler=sampler, collate_fn=collate_fn, **loader_kwargs
+    )
@@ -0,0 +1,288 @@
+"""IMDB sentiment data: loading, vocabulary and pre-tokenized datasets."""
+
+import hashlib
+import os
+import re
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+PAD_TOKEN = "<pad>"
+UNK_TOKEN = "<unk>"
+PAD_IDX = 0
+UNK_IDX = 1
+
+# Texts handed to a worker process at a time
+CHUNK_SIZE = 2000
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Bump when tokenization changes, to invalidate cached tensors
+CACHE_VERSION = 1
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_NON_WORD = re.compile(r"[^a-z0-9']+")
+
+
+def clean_text(text: str) -> str:
+    """Clean a review: strip HTML tags and punctuation, lowercase.
+
+    Args:
+        text: Raw review text
+
+    Returns:
+        Lowercase words separated by single spaces
+    """
+    text = _HTML_TAG.sub(" ", text).lower()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a raw review into cleaned tokens."""
+    return clean_text(text).split()
+
+
+def load_imdb(path: str | Path) -> dict:
+    """Load the IMDB reviews from the extracted aclImdb directory.
+
+    Expects the layout of the original archive:
+    {train,test}/{pos,neg}/*.txt.
+
+    Args:
+        path: Path to the aclImdb directory
+
+    Returns:
+        Dict with "train" and "test" splits, each a dict of "texts" (list
+        of str) and "labels" (list of int, 1 = positive)
+
+    Raises:
+        FileNotFoundError: If a split directory is missing
+    """
+    path = Path(path)
+    data = {}
+    for split in ("train", "test"):
+        texts, labels = [], []
+        for label, sentiment in ((1, "pos"), (0, "neg")):
+            directory = path / split / sentiment
+            if not directory.is_dir():
+                raise FileNotFoundError(f"IMDB directory not found: {directory}")
+            for file in sorted(directory.glob("*.txt")):
+                texts.append(file.read_text(encoding="utf-8"))
+                labels.append(label)
+        data[split] = {"texts": texts, "labels": labels}
+    return data
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[list[str]]:
+    """Split texts into lists of at most size texts, lazily."""
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _map_chunks(
+    fn: Callable[[list[str]], object],
+    texts: Iterable[str],
+    num_workers: int,
+    chunk_size: int,
+) -> Iterator:
+    """Apply fn to chunks of texts in worker processes, yielding results in order.
+
+    Texts are read lazily, with at most two chunks per worker in flight, so
+    memory stays bounded for streamed inputs. A single chunk, or
+    num_workers <= 1, is processed in this process.
+    """
+    chunks = _chunks(texts, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None or num_workers <= 1:
+        yield fn(first)
+        if second is not None:
+            yield fn(second)
+            yield from map(fn, chunks)
+        return
+
+    with ProcessPoolExecutor(num_workers) as executor:
+        pending = deque([executor.submit(fn, first), executor.submit(fn, second)])
+        for chunk in chunks:
+            if len(pending) >= 2 * num_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, chunk))
+        while pending:
+            yield pending.popleft().result()
+
+
+def _count_tokens(texts: list[str]) -> Counter:
+    """Count the tokens of a chunk of texts."""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    return counts
+
+
+def build_vocab(
+    texts: Iterable[str],
+    max_vocab_size: int = 10000,
+    min_freq: int = 2,
+    num_workers: int = DEFAULT_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict[str, int]:
+    """Build a vocabulary from the most frequent tokens.
+
+    Texts are streamed: they can come from a generator, are counted in
+    chunks by num_workers processes, and only the token counts are kept in
+    memory.
+
+    Args:
+        texts: Raw texts (any iterable)
+        max_vocab_size: Maximum vocabulary size, special tokens included
+        min_freq: Minimum number of occurrences of a token
+        num_workers: Worker processes counting tokens
+        chunk_size: Texts counted per task
+
+    Returns:
+        Dict mapping token to index, with <pad> = 0 and <unk> = 1; other
+        tokens by decreasing frequency (ties alphabetically)
+    """
+    counts = Counter()
+    for chunk_counts in _map_chunks(_count_tokens, texts, num_workers, chunk_size):
+        counts.update(chunk_counts)
+
+    vocab = {PAD_TOKEN: PAD_IDX, UNK_TOKEN: UNK_IDX}
+    ranked = sorted(
+        (item for item in counts.items() if item[1] >= min_freq),
+        key=lambda item: (-item[1], item[0]),
+    )
+    for token, _ in ranked[: max(0, max_vocab_size - len(vocab))]:
+        vocab[token] = len(vocab)
+    return vocab
+
+
+def _encode_chunk(
+    texts: list[str], vocab: dict[str, int], max_len: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Tokenize and index a chunk of texts into padded rows and lengths."""
+    rows = np.full((len(texts), max_len), PAD_IDX, dtype=np.int32)
+    lengths = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        ids = [vocab.get(token, UNK_IDX) for token in tokenize(text)[:max_len]]
+        rows[i, : len(ids)] = ids
+        lengths[i] = len(ids)
+    return rows, lengths
+
+
+def encode(
+    texts: list[str],
+    vocab: dict[str, int],
+    max_len: int,
+    num_workers: int = DEFAULT_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Tokenize and index texts into one padded tensor.
+
+    Args:
+        texts: Raw texts
+        vocab: Token to index mapping (see build_vocab)
+        max_len: Length of every row; longer texts are truncated
+        num_workers: Worker processes tokenizing texts
+        chunk_size: Texts tokenized per task
+
+    Returns:
+        (tokens, lengths): int32 tensor of shape (len(texts), max_len)
+        padded with PAD_IDX, and int64 tensor of unpadded lengths
+    """
+    tokens = np.full((len(texts), max_len), PAD_IDX, dtype=np.int32)
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    fn = partial(_encode_chunk, vocab=vocab, max_len=max_len)
+    start = 0
+    for rows, chunk_lengths in _map_chunks(fn, texts, num_workers, chunk_size):
+        tokens[start : start + len(rows)] = rows
+        lengths[start : start + len(rows)] = chunk_lengths
+        start += len(rows)
+    return torch.from_numpy(tokens), torch.from_numpy(lengths)
+
+
+def cache_key(texts: list[str], labels: list, vocab: dict[str, int], max_len: int) -> str:
+    """Get the cache key of an encoded dataset (hash of its inputs)."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}:{max_len}\0".encode())
+    for token, index in vocab.items():
+        digest.update(f"{token}\0{index}\0".encode())
+    for text in texts:
+        digest.update(text.encode("utf-8", "surrogatepass") + b"\0")
+    digest.update(np.asarray(labels, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class IMDBDataset(Dataset):
+    """Sentiment dataset of pre-tokenized, padded reviews.
+
+    Texts are tokenized and indexed once, in worker processes, into a
+    single (num_texts, max_len) int32 tensor, so __getitem__ returns a view
+    of a row instead of re-tokenizing every epoch. With cache_dir, the
+    tensors are saved to disk, keyed by a hash of the texts, labels, vocab
+    and max_len, and later runs memory-map them instead of tokenizing.
+
+    Args:
+        texts: Raw review texts
+        labels: Labels (1 = positive, 0 = negative)
+        vocab: Token to index mapping (see build_vocab)
+        max_len: Sequence length; shorter reviews are padded with <pad>
+        cache_dir: Directory of the tensor cache (None disables caching)
+        num_workers: Worker processes used for tokenizing
+    """
+
+    def __init__(
+        self,
+        texts: list[str],
+        labels: list,
+        vocab: dict[str, int],
+        max_len: int = 256,
+        cache_dir: str | Path | None = None,
+        num_workers: int = DEFAULT_WORKERS,
+    ):
+        if len(texts) != len(labels):
+            raise ValueError(
+                f"Got {len(texts)} texts but {len(labels)} labels"
+            )
+        self.max_len = max_len
+        self.cache_path = None
+
+        if cache_dir is not None:
+            key = cache_key(texts, labels, vocab, max_len)
+            self.cache_path = Path(cache_dir) / f"imdb-{key}.pt"
+            if self.cache_path.exists():
+                cached = torch.load(self.cache_path, mmap=True, weights_only=True)
+                self.tokens = cached["tokens"]
+                self.lengths = cached["lengths"]
+                self.labels = cached["labels"]
+                return
+
+        self.tokens, self.lengths = encode(texts, vocab, max_len, num_workers)
+        self.labels = torch.tensor(labels, dtype=torch.float32)
+        if self.cache_path is not None:
+            self._save_cache()
+
+    def _save_cache(self):
+        """Save the tensors, writing to a temporary file first."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        torch.save(
+            {"tokens": self.tokens, "lengths": self.lengths, "labels": self.labels},
+            tmp,
+        )
+        tmp.replace(self.cache_path)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, idx: int) -> tuple[torch.Tensor, torch.Tensor]:
+        return self.tokens[idx], self.labels[idx]
@@ -2,6 +2,7 @@
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 
 class EmbeddingClassifier(nn.Module):
@@ -9,6 +10,16 @@ class EmbeddingClassifier(nn.Module):
 
     Architecture: Embedding → Mean Pool → FC layers → Output
 
+    Accepts either padded batches of shape (batch_size, seq_len), or packed
+    batches: the token ids of all sequences concatenated into one 1-D
+    tensor, plus the offset where each sequence starts (see
+    sequence_models.data.pack_collate). Packed batches are pooled with
+    F.embedding_bag, which never materializes the (batch, seq_len,
+    embed_dim) tensor, so their cost follows the real number of tokens
+    instead of the padded length. Both give the same outputs in eval mode;
+    in training, dropout applies to the token embeddings of padded batches
+    and to the pooled embedding of packed batches.
+
     Args:
         vocab_size: Size of vocabulary
         embed_dim: Embedding dimension
@@ -41,15 +52,31 @@ class EmbeddingClassifier(nn.Module):
             nn.Linear(hidden_dim, output_dim),
         )
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(
+        self, x: torch.Tensor, offsets: torch.Tensor | None = None
+    ) -> torch.Tensor:
         """Forward pass.
 
         Args:
-            x: Token indices of shape (batch_size, seq_len)
+            x: Token indices of shape (batch_size, seq_len), or of shape
+                (num_tokens,) when offsets is given
+            offsets: Start of each sequence in x, of shape (batch_size,),
+                for packed input
 
         Returns:
             Logits of shape (batch_size, output_dim)
         """
+        if offsets is not None:
+            # Mean of each bag, padding ids excluded; empty bags give zeros
+            pooled = F.embedding_bag(
+                x,
+                self.embedding.weight,
+                offsets,
+                mode="mean",
+                padding_idx=self.embedding.padding_idx,
+            )
+            return self.fc(self.dropout(pooled))
+
         # x: (batch, seq_len)
         embedded = self.embedding(x)  # (batch, seq_len, embed_dim)
         embedded = self.dropout(embedded)
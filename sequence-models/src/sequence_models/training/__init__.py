@@ -1,5 +1,5 @@
 """Training utilities."""
 
-from .trainer import Trainer, TrainConfig, train_epoch, evaluate
+from .trainer import AMP_DTYPES, Trainer, TrainConfig, train_epoch, evaluate
 
-__all__ = ["Trainer", "TrainConfig", "train_epoch", "evaluate"]
+__all__ = ["AMP_DTYPES", "Trainer", "TrainConfig", "train_epoch", "evaluate"]
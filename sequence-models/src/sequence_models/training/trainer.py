@@ -1,5 +1,6 @@
 """Training loop implementation."""
 
+import contextlib
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -8,16 +9,52 @@ import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader
 
+# Mixed precision types accepted by TrainConfig.amp_dtype
+AMP_DTYPES = {"bfloat16": torch.bfloat16, "float16": torch.float16}
+
 
 @dataclass
 class TrainConfig:
-    """Training configuration."""
+    """Training configuration.
+
+    amp_dtype enables mixed precision: "bfloat16" (CPUs with AVX-512 BF16
+    or AMX, recent GPUs) or "float16" (GPUs, with loss scaling). With
+    grad_accum_steps > 1, gradients of that many batches are summed before
+    each optimizer step, for an effective batch size of batch_size *
+    grad_accum_steps. compile runs the model through torch.compile.
+    """
 
     epochs: int = 10
     learning_rate: float = 0.001
     device: str = "auto"
     checkpoint_dir: str | None = None
     log_interval: int = 100
+    amp_dtype: str | None = None
+    grad_accum_steps: int = 1
+    compile: bool = False
+
+
+def _to_device(X, device: torch.device):
+    """Move a batch input, a tensor or a tuple of tensors, to device.
+
+    Copies are non-blocking: from pinned memory (DataLoader
+    pin_memory=True) they overlap with the computation already queued.
+    """
+    if isinstance(X, (tuple, list)):
+        return tuple(t.to(device, non_blocking=True) for t in X)
+    return X.to(device, non_blocking=True)
+
+
+def _forward(model: nn.Module, X) -> torch.Tensor:
+    """Call model on a batch input; tuples (e.g. packed ids and offsets) are unpacked."""
+    return model(*X) if isinstance(X, tuple) else model(X)
+
+
+def _autocast(device: torch.device, amp_dtype: torch.dtype | None):
+    """Autocast context for mixed precision, or a no-op if amp_dtype is None."""
+    if amp_dtype is None:
+        return contextlib.nullcontext()
+    return torch.autocast(device_type=device.type, dtype=amp_dtype)
 
 
 def train_epoch(
@@ -27,9 +64,20 @@ def train_epoch(
     optimizer: torch.optim.Optimizer,
     device: torch.device,
     log_interval: int = 100,
+    amp_dtype: torch.dtype | None = None,
+    grad_accum_steps: int = 1,
+    scaler: torch.amp.GradScaler | None = None,
 ) -> dict:
     """Train for one epoch.
 
+    Batches are (X, y) pairs. X is a tensor, or a tuple of tensors passed
+    to the model as separate arguments, e.g. the (ids, offsets) of
+    sequence_models.data.pack_collate.
+
+    The loss is summed on the device and only read back at log intervals
+    and at the end of the epoch, so the host never waits for the device
+    between batches.
+
     Args:
         model: The neural network
         loader: Training data loader
@@ -37,39 +85,77 @@ def train_epoch(
         optimizer: Optimizer
         device: Device to train on
         log_interval: Print progress every N batches
+        amp_dtype: Autocast dtype (e.g. torch.bfloat16), None for fp32
+        grad_accum_steps: Batches whose gradients are accumulated per
+            optimizer step. An incomplete group at the end of the epoch is
+            averaged over its own batches
+        scaler: Gradient scaler for float16 training
 
     Returns:
-        Dict with 'loss' (average) and 'num_samples'
+        Dict with 'loss' (average), 'num_samples', 'elapsed' (seconds)
+        and 'samples_per_sec'
     """
     model.train()
-    total_loss = 0.0
+    total_loss = torch.zeros((), device=device)
     num_samples = 0
+    start_time = time.perf_counter()
+    optimizer.zero_grad(set_to_none=True)
 
+    batch_idx = -1
     for batch_idx, (X, y) in enumerate(loader):
-        X, y = X.to(device), y.to(device)
+        X, y = _to_device(X, device), y.to(device, non_blocking=True)
 
         # Forward pass
-        output = model(X)
-        if output.dim() > 1 and output.size(1) == 1:
-            output = output.squeeze(1)
-        loss = criterion(output, y)
-
-        # Backward pass
-        optimizer.zero_grad()
-        loss.backward()
-        optimizer.step()
+        with _autocast(device, amp_dtype):
+            output = _forward(model, X)
+            if output.dim() > 1 and output.size(1) == 1:
+                output = output.squeeze(1)
+            loss = criterion(output, y)
+
+        # Backward pass; step once every grad_accum_steps batches
+        scaled = loss / grad_accum_steps
+        (scaler.scale(scaled) if scaler else scaled).backward()
+        if (batch_idx + 1) % grad_accum_steps == 0:
+            _optimizer_step(optimizer, scaler)
 
         # Track metrics
-        batch_size = X.size(0)
-        total_loss += loss.item() * batch_size
+        batch_size = y.size(0)
+        total_loss += loss.detach().float() * batch_size
         num_samples += batch_size
 
-        # Log progress
+        # Log progress (the only sync inside the epoch)
         if log_interval and (batch_idx + 1) % log_interval == 0:
-            avg_loss = total_loss / num_samples
+            avg_loss = total_loss.item() / num_samples
             print(f"  Batch {batch_idx + 1}/{len(loader)}: loss={avg_loss:.4f}")
 
-    return {"loss": total_loss / num_samples, "num_samples": num_samples}
+    # Apply gradients left over from an incomplete accumulation, rescaled
+    # from 1 / grad_accum_steps to 1 / (batches in the group)
+    leftover = (batch_idx + 1) % grad_accum_steps
+    if leftover:
+        for group in optimizer.param_groups:
+            for param in group["params"]:
+                if param.grad is not None:
+                    param.grad.mul_(grad_accum_steps / leftover)
+        _optimizer_step(optimizer, scaler)
+
+    total_loss = total_loss.item()
+    elapsed = time.perf_counter() - start_time
+    return {
+        "loss": total_loss / num_samples,
+        "num_samples": num_samples,
+        "elapsed": elapsed,
+        "samples_per_sec": num_samples / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _optimizer_step(optimizer: torch.optim.Optimizer, scaler: torch.amp.GradScaler | None):
+    """Apply and clear the accumulated gradients."""
+    if scaler:
+        scaler.step(optimizer)
+        scaler.update()
+    else:
+        optimizer.step()
+    optimizer.zero_grad(set_to_none=True)
 
 
 def evaluate(
@@ -77,41 +163,48 @@ def evaluate(
     loader: DataLoader,
     criterion: nn.Module,
     device: torch.device,
+    amp_dtype: torch.dtype | None = None,
 ) -> dict:
     """Evaluate model on a dataset.
 
+    Loss and correct predictions are accumulated on the device and read
+    back once, after the last batch.
+
     Args:
         model: The neural network
         loader: Data loader
         criterion: Loss function
         device: Device to evaluate on
+        amp_dtype: Autocast dtype (e.g. torch.bfloat16), None for fp32
 
     Returns:
         Dict with 'loss', 'accuracy', 'num_samples'
     """
     model.eval()
-    total_loss = 0.0
-    correct = 0
+    total_loss = torch.zeros((), device=device)
+    correct = torch.zeros((), device=device)
     num_samples = 0
 
     with torch.no_grad():
         for X, y in loader:
-            X, y = X.to(device), y.to(device)
+            X, y = _to_device(X, device), y.to(device, non_blocking=True)
 
-            output = model(X)
-            if output.dim() > 1 and output.size(1) == 1:
-                output = output.squeeze(1)
-
-            loss = criterion(output, y)
+            with _autocast(device, amp_dtype):
+                output = _forward(model, X)
+                if output.dim() > 1 and output.size(1) == 1:
+                    output = output.squeeze(1)
+                loss = criterion(output, y)
 
             # For binary classification
             predictions = (torch.sigmoid(output) > 0.5).float()
-            correct += (predictions == y).sum().item()
+            correct += (predictions == y).sum()
 
-            batch_size = X.size(0)
-            total_loss += loss.item() * batch_size
+            batch_size = y.size(0)
+            total_loss += loss.float() * batch_size
             num_samples += batch_size
 
+    # One device-to-host copy for both metrics
+    total_loss, correct = torch.stack([total_loss, correct]).tolist()
     return {
         "loss": total_loss / num_samples,
         "accuracy": correct / num_samples,
@@ -119,14 +212,32 @@ def evaluate(
     }
 
 
+def _set_epoch(loader: DataLoader, epoch: int):
+    """Tell the loader's samplers the epoch, if they reshuffle per epoch.
+
+    Covers batch samplers such as BucketBatchSampler as well as samplers
+    such as DistributedSampler.
+    """
+    for sampler in (getattr(loader, "batch_sampler", None), getattr(loader, "sampler", None)):
+        if hasattr(sampler, "set_epoch"):
+            sampler.set_epoch(epoch)
+
+
 class Trainer:
     """Training manager with logging and checkpointing.
 
+    Loaders with dynamic padding or packed batches (see
+    sequence_models.data.bucket_loader and pack_collate) work unchanged:
+    batches may have a different sequence length each.
+
     Args:
         model: Neural network to train
         train_loader: Training data loader
         val_loader: Validation data loader (optional)
         config: Training configuration
+
+    Raises:
+        ValueError: If config.amp_dtype is unknown or grad_accum_steps < 1
     """
 
     def __init__(
@@ -141,6 +252,17 @@ class Trainer:
         self.val_loader = val_loader
         self.config = config or TrainConfig()
 
+        if self.config.amp_dtype not in (None, *AMP_DTYPES):
+            raise ValueError(
+                f"Unknown amp_dtype '{self.config.amp_dtype}'. "
+                f"Use one of {list(AMP_DTYPES)} or None"
+            )
+        if self.config.grad_accum_steps < 1:
+            raise ValueError(
+                f"grad_accum_steps must be at least 1, got {self.config.grad_accum_steps}"
+            )
+        self.amp_dtype = AMP_DTYPES.get(self.config.amp_dtype)
+
         # Setup device
         if self.config.device == "auto":
             if torch.cuda.is_available():
@@ -153,6 +275,15 @@ class Trainer:
             self.device = torch.device(self.config.device)
 
         self.model.to(self.device)
+        # Compiled wrapper runs the steps; self.model keeps checkpoint keys plain
+        self.step_model = torch.compile(self.model) if self.config.compile else self.model
+
+        # float16 gradients underflow without loss scaling
+        self.scaler = (
+            torch.amp.GradScaler(self.device.type)
+            if self.amp_dtype == torch.float16
+            else None
+        )
 
         # Loss and optimizer
         self.criterion = nn.BCEWithLogitsLoss()
@@ -161,7 +292,12 @@ class Trainer:
         )
 
         # History
-        self.history = {"train_loss": [], "val_loss": [], "val_accuracy": []}
+        self.history = {
+            "train_loss": [],
+            "val_loss": [],
+            "val_accuracy": [],
+            "train_samples_per_sec": [],
+        }
 
     def train(self) -> dict:
         """Run full training loop.
@@ -170,6 +306,12 @@ class Trainer:
             Training history dict
         """
         print(f"Training on {self.device}")
+        if self.amp_dtype or self.config.grad_accum_steps > 1 or self.config.compile:
+            print(
+                f"amp_dtype={self.config.amp_dtype}, "
+                f"grad_accum_steps={self.config.grad_accum_steps}, "
+                f"compile={self.config.compile}"
+            )
         print(f"Train batches: {len(self.train_loader)}")
         if self.val_loader:
             print(f"Val batches: {len(self.val_loader)}")
@@ -179,22 +321,31 @@ class Trainer:
 
         for epoch in range(self.config.epochs):
             start_time = time.time()
+            _set_epoch(self.train_loader, epoch)
 
             # Train
             train_metrics = train_epoch(
-                self.model,
+                self.step_model,
                 self.train_loader,
                 self.criterion,
                 self.optimizer,
                 self.device,
                 log_interval=self.config.log_interval,
+                amp_dtype=self.amp_dtype,
+                grad_accum_steps=self.config.grad_accum_steps,
+                scaler=self.scaler,
             )
             self.history["train_loss"].append(train_metrics["loss"])
+            self.history["train_samples_per_sec"].append(train_metrics["samples_per_sec"])
 
             # Validate
             if self.val_loader:
                 val_metrics = evaluate(
-                    self.model, self.val_loader, self.criterion, self.device
+                    self.step_model,
+                    self.val_loader,
+                    self.criterion,
+                    self.device,
+                    amp_dtype=self.amp_dtype,
                 )
                 self.history["val_loss"].append(val_metrics["loss"])
                 self.history["val_accuracy"].append(val_metrics["accuracy"])
@@ -222,6 +373,7 @@ class Trainer:
         """Log epoch results."""
         msg = f"Epoch {epoch + 1}/{self.config.epochs}: "
         msg += f"train_loss={train['loss']:.4f}"
+        msg += f", {train['samples_per_sec']:,.0f} samples/s"
         if val:
             msg += f", val_loss={val['loss']:.4f}, val_acc={val['accuracy']:.1%}"
         msg += f" ({elapsed:.1f}s)"
@@ -232,7 +384,7 @@ class Trainer:
         checkpoint_dir = Path(self.config.checkpoint_dir)
         checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
-        path = checkpoint_dir / f"best_model.pt"
+        path = checkpoint_dir / "best_model.pt"
         torch.save(
             {
                 "epoch": epoch,
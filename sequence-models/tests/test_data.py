@@ -3,7 +3,17 @@
 import pytest
 import torch
 
-from sequence_models.data import IMDBDataset, build_vocab, clean_text
+from sequence_models.data import (
+    BucketBatchSampler,
+    IMDBDataset,
+    bucket_loader,
+    build_vocab,
+    clean_text,
+    encode,
+    load_imdb,
+    pack_collate,
+    trim_collate,
+)
 
 
 class TestCleanText:
@@ -48,6 +58,16 @@ class TestBuildVocab:
         assert "hello" in vocab
         assert "world" not in vocab  # Only appears once
 
+    def test_streams_texts_across_workers(self):
+        texts = [f"word{i % 7} common <br> word{i % 3}" for i in range(50)]
+        expected = build_vocab(texts, max_vocab_size=8, min_freq=1, num_workers=1)
+        # Generator input, several chunks counted by worker processes
+        vocab = build_vocab(
+            (t for t in texts), max_vocab_size=8, min_freq=1, num_workers=2, chunk_size=7
+        )
+        assert vocab == expected
+        assert vocab["common"] == 2  # Most frequent token comes first
+
 
 class TestIMDBDataset:
     """Tests for IMDB dataset."""
@@ -90,3 +110,147 @@ class TestIMDBDataset:
         # "terrible" is not in vocab, should map to <unk>=1
         x, _ = dataset[1]
         assert vocab["<unk>"] in x.tolist()
+
+    def test_items_are_views(self, sample_data):
+        texts, labels, vocab = sample_data
+        dataset = IMDBDataset(texts, labels, vocab, max_len=10)
+        x, _ = dataset[2]
+        assert x.dtype == torch.int32
+        assert x.untyped_storage().data_ptr() == dataset.tokens.untyped_storage().data_ptr()
+        assert dataset.lengths.tolist() == [4, 4, 2]
+
+    def test_multiprocess_encoding_matches(self, sample_data):
+        texts, labels, vocab = sample_data
+        texts, labels = texts * 5, labels * 5
+        single = IMDBDataset(texts, labels, vocab, max_len=4, num_workers=1)
+        tokens, lengths = encode(texts, vocab, 4, num_workers=2, chunk_size=2)
+        assert torch.equal(tokens, single.tokens)
+        assert torch.equal(lengths, single.lengths)
+
+    def test_cache(self, sample_data, tmp_path, monkeypatch):
+        texts, labels, vocab = sample_data
+        dataset = IMDBDataset(texts, labels, vocab, max_len=10, cache_dir=tmp_path)
+        assert dataset.cache_path.exists()
+
+        # A second dataset loads the cached tensors instead of tokenizing
+        def fail(*args, **kwargs):
+            raise AssertionError("texts were tokenized again")
+
+        monkeypatch.setattr("sequence_models.data.imdb.encode", fail)
+        cached = IMDBDataset(texts, labels, vocab, max_len=10, cache_dir=tmp_path)
+        assert torch.equal(cached.tokens, dataset.tokens)
+        assert torch.equal(cached.labels, dataset.labels)
+
+        # Other parameters use another cache file
+        with pytest.raises(AssertionError):
+            IMDBDataset(texts, labels, vocab, max_len=5, cache_dir=tmp_path)
+
+    def test_mismatched_labels(self, sample_data):
+        texts, labels, vocab = sample_data
+        with pytest.raises(ValueError):
+            IMDBDataset(texts, labels[:2], vocab)
+
+
+class TestLoadIMDB:
+    """Tests for loading the aclImdb directory."""
+
+    def test_loads_splits(self, tmp_path):
+        for split in ("train", "test"):
+            for sentiment in ("pos", "neg"):
+                directory = tmp_path / split / sentiment
+                directory.mkdir(parents=True)
+                (directory / "0_7.txt").write_text(f"{split} {sentiment} review")
+
+        data = load_imdb(tmp_path)
+        assert data["train"]["texts"] == ["train pos review", "train neg review"]
+        assert data["train"]["labels"] == [1, 0]
+        assert len(data["test"]["texts"]) == 2
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_imdb(tmp_path)
+
+
+class TestBucketBatchSampler:
+    """Tests for length-bucketed batching."""
+
+    def test_covers_every_index_once(self):
+        lengths = torch.randint(1, 100, (103,))
+        sampler = BucketBatchSampler(lengths, batch_size=8, pool_batches=3)
+        batches = list(sampler)
+        assert len(batches) == len(sampler)
+        assert sorted(i for batch in batches for i in batch) == list(range(103))
+
+    def test_groups_similar_lengths(self):
+        lengths = torch.randint(1, 500, (1000,))
+        sampler = BucketBatchSampler(lengths, batch_size=10, pool_batches=100)
+        spread = [int(lengths[b].max() - lengths[b].min()) for b in sampler]
+        assert sum(spread) / len(spread) < 50  # Random batches spread ~400
+
+    def test_epochs_reshuffle_reproducibly(self):
+        lengths = torch.randint(1, 100, (64,))
+        sampler = BucketBatchSampler(lengths, batch_size=8, pool_batches=2)
+        first = list(sampler)
+        sampler.set_epoch(1)
+        second = list(sampler)
+        assert first != second
+        sampler.set_epoch(0)
+        assert list(sampler) == first
+
+    def test_drop_last(self):
+        lengths = torch.arange(50)
+        for shuffle in (True, False):
+            sampler = BucketBatchSampler(
+                lengths, batch_size=8, shuffle=shuffle, drop_last=True, pool_batches=2
+            )
+            batches = list(sampler)
+            assert len(batches) == len(sampler)
+            assert all(len(batch) == 8 for batch in batches)
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            BucketBatchSampler([1, 2, 3], batch_size=0)
+
+
+class TestTrimCollate:
+    """Tests for dynamic padding."""
+
+    def test_trims_fixed_length_rows(self):
+        batch = [
+            (torch.tensor([5, 6, 0, 0, 0]), torch.tensor(1.0)),
+            (torch.tensor([7, 0, 0, 0, 0]), torch.tensor(0.0)),
+        ]
+        X, y = trim_collate(batch)
+        assert X.tolist() == [[5, 6], [7, 0]]
+        assert y.tolist() == [1.0, 0.0]
+
+    def test_pads_variable_lengths(self):
+        batch = [(torch.tensor([5]), torch.tensor(1.0)), (torch.tensor([6, 7, 8]), torch.tensor(0.0))]
+        X, _ = trim_collate(batch)
+        assert X.tolist() == [[5, 0, 0], [6, 7, 8]]
+
+    def test_pack_collate(self):
+        batch = [
+            (torch.tensor([5, 6, 0], dtype=torch.int32), torch.tensor(1.0)),
+            (torch.tensor([0, 0, 0], dtype=torch.int32), torch.tensor(0.0)),
+            (torch.tensor([7, 0, 0], dtype=torch.int32), torch.tensor(1.0)),
+        ]
+        (ids, offsets), y = pack_collate(batch)
+        assert ids.tolist() == [5, 6, 7]
+        assert offsets.tolist() == [0, 2, 2]  # Empty sequence is an empty bag
+        assert offsets.dtype == ids.dtype
+        assert y.tolist() == [1.0, 0.0, 1.0]
+
+    def test_bucket_loader(self):
+        texts = ["good " * n for n in range(1, 41)]
+        vocab = {"<pad>": 0, "<unk>": 1, "good": 2}
+        dataset = IMDBDataset(texts, [1] * 40, vocab, max_len=64)
+        loader = bucket_loader(dataset, batch_size=4, pool_batches=10)
+        assert loader.pin_memory == torch.cuda.is_available()
+
+        seen = 0
+        for X, y in loader:
+            lengths = (X != 0).sum(dim=1)
+            assert X.shape[1] == int(lengths.max())
+            seen += len(y)
+        assert seen == 40
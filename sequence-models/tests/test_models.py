@@ -1,7 +1,8 @@
 """Tests for neural network models."""
 
 import torch
-from sequence_models.models import FeedforwardClassifier
+from sequence_models.data import pack_collate
+from sequence_models.models import EmbeddingClassifier, FeedforwardClassifier
 
 
 class TestFeedforwardClassifier:
@@ -77,3 +78,43 @@ class TestFeedforwardClassifier:
         # total = 193
         total = sum(p.numel() for p in model.parameters())
         assert total == 193
+
+
+class TestEmbeddingClassifier:
+    """Tests for EmbeddingClassifier."""
+
+    def make_batch(self):
+        """Padded rows and the matching packed ids and offsets."""
+        padded = torch.tensor([[5, 6, 7, 0], [8, 0, 0, 0], [9, 3, 0, 0]])
+        (ids, offsets), _ = pack_collate([(row, torch.tensor(0.0)) for row in padded])
+        return padded, ids, offsets
+
+    def test_forward_shape(self):
+        model = EmbeddingClassifier(vocab_size=20, embed_dim=8, hidden_dim=4)
+        padded, _, _ = self.make_batch()
+        assert model(padded).shape == (3, 1)
+
+    def test_packed_matches_padded(self):
+        """Packed and padded input give the same outputs in eval mode."""
+        model = EmbeddingClassifier(vocab_size=20, embed_dim=8, hidden_dim=4)
+        model.eval()
+        padded, ids, offsets = self.make_batch()
+        assert ids.tolist() == [5, 6, 7, 8, 9, 3]
+        assert offsets.tolist() == [0, 3, 4]
+        torch.testing.assert_close(model(ids, offsets), model(padded))
+
+    def test_packed_ignores_padding_ids(self):
+        model = EmbeddingClassifier(vocab_size=20, embed_dim=8, hidden_dim=4)
+        model.eval()
+        with_pad = model(torch.tensor([5, 0, 6, 7]), torch.tensor([0, 2]))
+        without = model(torch.tensor([5, 6, 7]), torch.tensor([0, 1]))
+        torch.testing.assert_close(with_pad, without)
+
+    def test_packed_gradient_flow(self):
+        torch.manual_seed(0)
+        model = EmbeddingClassifier(vocab_size=20, embed_dim=8, hidden_dim=16, dropout=0.0)
+        _, ids, offsets = self.make_batch()
+        model(ids.int(), offsets.int()).sum().backward()
+        grad = model.embedding.weight.grad
+        assert grad[ids].abs().sum() > 0
+        assert grad[0].abs().sum() == 0  # Padding row is never updated
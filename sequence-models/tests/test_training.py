@@ -1,9 +1,14 @@
 """Tests for training utilities."""
 
+import sys
+
+import pytest
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader, TensorDataset
 
+from sequence_models.data import bucket_loader, pack_collate
+from sequence_models.models import EmbeddingClassifier
 from sequence_models.training import train_epoch, evaluate, Trainer, TrainConfig
 
 
@@ -96,6 +101,146 @@ class TestEvaluate:
             assert p.grad is None
 
 
+class TestMixedPrecisionAndAccumulation:
+    """Tests for autocast, gradient accumulation and throughput reporting."""
+
+    def test_accumulation_matches_large_batch(self):
+        torch.manual_seed(0)
+        X = torch.randn(16, 10)
+        y = torch.randint(0, 2, (16,)).float()
+        criterion = nn.BCEWithLogitsLoss()
+        results = []
+        for batch_size, steps in ((16, 1), (8, 2)):
+            torch.manual_seed(1)
+            model = SimpleModel()
+            optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+            loader = DataLoader(TensorDataset(X, y), batch_size=batch_size)
+            train_epoch(
+                model, loader, criterion, optimizer, torch.device("cpu"),
+                log_interval=0, grad_accum_steps=steps,
+            )
+            results.append(model.fc.weight.detach().clone())
+        torch.testing.assert_close(results[0], results[1])
+
+    def test_leftover_accumulation_is_averaged(self):
+        torch.manual_seed(0)
+        X = torch.randn(24, 10)
+        y = torch.randint(0, 2, (24,)).float()
+        criterion = nn.BCEWithLogitsLoss()
+        results = []
+        # 3 batches of 8 with 2 accumulation steps: the last batch steps alone
+        for batch_size, steps in ((16, 1), (8, 2)):
+            torch.manual_seed(1)
+            model = SimpleModel()
+            optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+            loader = DataLoader(TensorDataset(X, y), batch_size=batch_size)
+            train_epoch(
+                model, loader, criterion, optimizer, torch.device("cpu"),
+                log_interval=0, grad_accum_steps=steps,
+            )
+            results.append(model.fc.weight.detach().clone())
+        torch.testing.assert_close(results[0], results[1])
+
+    def test_steps_per_accumulation(self):
+        model = SimpleModel()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        steps = []
+        step = optimizer.step
+        optimizer.step = lambda: (steps.append(1), step())
+        loader = make_dataloader(n_samples=80, batch_size=16)  # 5 batches
+        train_epoch(
+            model, loader, nn.BCEWithLogitsLoss(), optimizer, torch.device("cpu"),
+            log_interval=0, grad_accum_steps=2,
+        )
+        assert len(steps) == 3  # 2 full accumulations + the leftover batch
+        assert all(p.grad is None for p in model.parameters())
+
+    def test_bf16_autocast(self):
+        model = SimpleModel()
+        optimizer = torch.optim.Adam(model.parameters())
+        metrics = train_epoch(
+            model, make_dataloader(), nn.BCEWithLogitsLoss(), optimizer,
+            torch.device("cpu"), log_interval=0, amp_dtype=torch.bfloat16,
+        )
+        assert torch.isfinite(torch.tensor(metrics["loss"]))
+        assert metrics["samples_per_sec"] > 0
+        assert model.fc.weight.dtype == torch.float32  # Master weights stay fp32
+
+        result = evaluate(
+            model, make_dataloader(), nn.BCEWithLogitsLoss(), torch.device("cpu"),
+            amp_dtype=torch.bfloat16,
+        )
+        assert 0 <= result["accuracy"] <= 1
+
+    def test_trainer_options(self):
+        config = TrainConfig(
+            epochs=2, log_interval=0, device="cpu", amp_dtype="bfloat16", grad_accum_steps=2
+        )
+        trainer = Trainer(SimpleModel(), make_dataloader(), make_dataloader(), config)
+        history = trainer.train()
+        assert len(history["train_samples_per_sec"]) == 2
+        assert trainer.amp_dtype == torch.bfloat16
+
+    def test_trainer_compile(self, tmp_path):
+        config = TrainConfig(
+            epochs=1, log_interval=0, device="cpu", compile=True, checkpoint_dir=str(tmp_path)
+        )
+        trainer = Trainer(SimpleModel(), make_dataloader(), make_dataloader(), config)
+        trainer.train()
+        assert trainer.step_model is not trainer.model
+        checkpoint = torch.load(tmp_path / "best_model.pt")
+        assert set(checkpoint["model_state_dict"]) == {"fc.weight", "fc.bias"}
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            Trainer(SimpleModel(), make_dataloader(), config=TrainConfig(amp_dtype="int8"))
+        with pytest.raises(ValueError):
+            Trainer(SimpleModel(), make_dataloader(), config=TrainConfig(grad_accum_steps=0))
+
+
+class TestHostSync:
+    """Tests that metrics stay on the device between log intervals."""
+
+    @staticmethod
+    def count_reads(monkeypatch):
+        """Count reads of tensor values made by the training loop itself."""
+        reads = []
+        for name in ("item", "tolist"):
+            original = getattr(torch.Tensor, name)
+
+            def read(self, *args, _original=original, _name=name, **kwargs):
+                # DataLoader reads a CPU seed tensor, which never syncs a device
+                if sys._getframe(1).f_code.co_filename.endswith("trainer.py"):
+                    reads.append(_name)
+                return _original(self, *args, **kwargs)
+
+            monkeypatch.setattr(torch.Tensor, name, read)
+        return reads
+
+    def test_train_epoch_reads_once(self, monkeypatch):
+        model = SimpleModel()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        loader = make_dataloader(n_samples=80, batch_size=16)
+        reads = self.count_reads(monkeypatch)
+
+        train_epoch(model, loader, nn.BCEWithLogitsLoss(), optimizer, torch.device("cpu"), log_interval=0)
+        assert len(reads) == 1
+
+        reads.clear()
+        train_epoch(model, loader, nn.BCEWithLogitsLoss(), optimizer, torch.device("cpu"), log_interval=2)
+        assert len(reads) == 3  # Batches 2 and 4, then the epoch end
+
+    def test_evaluate_reads_once(self, monkeypatch):
+        model = SimpleModel()
+        loader = make_dataloader(n_samples=80, batch_size=16)
+        reads = self.count_reads(monkeypatch)
+
+        metrics = evaluate(model, loader, nn.BCEWithLogitsLoss(), torch.device("cpu"))
+        assert len(reads) == 1
+        assert isinstance(metrics["accuracy"], float)
+        assert isinstance(metrics["loss"], float)
+
+
 class TestTrainer:
     """Tests for Trainer class."""
 
@@ -123,3 +268,31 @@ class TestTrainer:
         history = trainer.train()
 
         assert len(history["train_loss"]) == 3
+
+    def test_bucketed_loader(self):
+        lengths = torch.randint(1, 20, (40,))
+        tokens = torch.randint(2, 50, (40, 20))
+        tokens[torch.arange(20) >= lengths[:, None]] = 0
+        dataset = TensorDataset(tokens, torch.randint(0, 2, (40,)).float())
+        loader = bucket_loader(dataset, batch_size=8, lengths=lengths)
+        epochs = []
+        loader.batch_sampler.set_epoch = epochs.append
+
+        model = EmbeddingClassifier(vocab_size=50, embed_dim=8, hidden_dim=4)
+        trainer = Trainer(model, loader, loader, TrainConfig(epochs=2, log_interval=0))
+        history = trainer.train()
+
+        assert len(history["train_loss"]) == 2
+        assert epochs == [0, 1]
+
+    def test_packed_loader(self):
+        tokens = torch.randint(0, 50, (40, 12))
+        dataset = TensorDataset(tokens, torch.randint(0, 2, (40,)).float())
+        loader = DataLoader(dataset, batch_size=8, collate_fn=pack_collate)
+
+        model = EmbeddingClassifier(vocab_size=50, embed_dim=8, hidden_dim=4)
+        trainer = Trainer(model, loader, loader, TrainConfig(epochs=1, log_interval=0))
+        history = trainer.train()
+
+        assert len(history["val_accuracy"]) == 1
+        assert evaluate(model, loader, trainer.criterion, trainer.device)["num_samples"] == 40